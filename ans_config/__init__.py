@@ -4,6 +4,7 @@ Módulo de configuración del generador de informes ETB
 from .ans_config import (
     UMBRAL_ANS,
     PENALIDAD_CONFIG,
+    ESCALA_PENALIDAD,
     ESTADOS_OPERATIVOS,
     ESTADOS_NO_OPERATIVOS,
     ESTADOS_MANTENIMIENTO,
@@ -14,6 +15,7 @@ from .ans_config import (
 __all__ = [
     'UMBRAL_ANS',
     'PENALIDAD_CONFIG',
+    'ESCALA_PENALIDAD',
     'ESTADOS_OPERATIVOS',
     'ESTADOS_NO_OPERATIVOS',
     'ESTADOS_MANTENIMIENTO',
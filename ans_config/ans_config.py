@@ -18,6 +18,15 @@ PENALIDAD_CONFIG = {
     "valor_mensual_contrato": 150000000,
 }
 
+# Escala escalonada de penalidad usada en el informe (Sección 3.1):
+# (déficit máximo en puntos porcentuales, % del valor mensual)
+ESCALA_PENALIDAD = [
+    (0.5, 0.5),
+    (1.0, 1.0),
+    (1.5, 1.5),
+    (float("inf"), 2.0),
+]
+
 # Fórmula de disponibilidad
 # Disponibilidad (%) = (Horas Operativas / Horas Totales) × 100
 
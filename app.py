@@ -6,16 +6,17 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
-import uvicorn
+from src.utils.log_utils import FORMATO_API, configurar_logging
 
 # Cargar variables de entorno
 load_dotenv()
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO if os.getenv("DEBUG", "False").lower() == "true" else logging.WARNING,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Configurar logging (asíncrono: los handlers escriben desde un QueueListener)
+configurar_logging(
+    nivel=os.getenv("LOG_LEVEL") or ("INFO" if os.getenv("DEBUG", "False").lower() == "true" else "WARNING"),
+    formato=FORMATO_API
 )
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,12 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    try:
+        from src.services.informes_service import get_informes_service
+        get_informes_service().cerrar()
+    except Exception as e:
+        logger.warning(f"No se pudo cerrar el pool de generación de informes: {e}")
+    
     logger.info("=" * 80)
     logger.info("Cerrando aplicación...")
     logger.info("=" * 80)
@@ -67,6 +74,20 @@ try:
 except Exception as e:
     logger.warning(f"No se pudieron incluir rutas de obligaciones: {e}")
 
+try:
+    from src.routes import informes_routes
+    app.include_router(informes_routes.router, prefix="/api")
+    logger.info("✓ Rutas de informes incluidas")
+except Exception as e:
+    logger.warning(f"No se pudieron incluir rutas de informes: {e}")
+
+try:
+    from src.routes import ans_routes
+    app.include_router(ans_routes.router, prefix="/api")
+    logger.info("✓ Rutas de ANS incluidas")
+except Exception as e:
+    logger.warning(f"No se pudieron incluir rutas de ANS: {e}")
+
 # Intentar incluir otras rutas si existen
 try:
     from src.routes import section1_routes
@@ -99,6 +120,10 @@ async def root():
         "docs": "/docs",
         "endpoints": {
             "obligaciones": "/api/obligaciones/procesar",
+            "generar_informe": "/api/informes/{anio}/{mes}",
+            "descargar_informe": "/api/informes/{anio}/{mes}/{version}",
+            "simulacion_ans": "/api/ans/simulacion",
+            "metricas": "/metrics",
             "swagger": "/docs",
             "redoc": "/redoc"
         }
@@ -114,6 +139,21 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Tiempos por etapa en formato de texto de Prometheus
+
+    Incluye los histogramas del proceso del API y los de las generaciones
+    de informes terminadas en el pool de workers.
+    """
+    from src.utils.metricas import get_registro_metricas
+    return PlainTextResponse(
+        get_registro_metricas().formato_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8000"))
@@ -122,6 +162,7 @@ if __name__ == "__main__":
     logger.info(f"Iniciando servidor en http://{host}:{port}")
     logger.info(f"Documentación disponible en http://{host}:{port}/docs")
     
+    import uvicorn
     uvicorn.run(
         "app:app",
         host=host,
@@ -0,0 +1,103 @@
+"""
+Benchmark del tiempo de arranque (python -X importtime)
+
+Mide en un intérprete limpio el costo de importar los puntos de entrada
+(CLI y API) y verifica que no carguen dependencias pesadas que solo se
+necesitan al generar secciones.
+
+Uso:
+    python benchmark_arranque.py                 # Reporte de main y app
+    python benchmark_arranque.py -m src.generadores.seccion_3_ans --top 15
+    python benchmark_arranque.py --max-ms 300    # Falla si main supera 300 ms
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BASE_DIR = Path(__file__).parent
+
+# Módulo -> dependencias que NO deben cargarse al importarlo
+MODULOS_ARRANQUE: Dict[str, Tuple[str, ...]] = {
+    "main": ("docx", "docxtpl", "pandas", "numpy", "matplotlib", "PyPDF2", "openai", "office365"),
+    "app": ("docx", "docxtpl", "pandas", "numpy", "matplotlib", "PyPDF2", "openai", "office365", "pymongo", "motor"),
+}
+
+
+def medir_importacion(modulo: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """
+    Importa el módulo en un subproceso con -X importtime
+
+    Args:
+        modulo: Nombre del módulo a importar (ej: "main")
+
+    Returns:
+        (registros, modulos_cargados): registros es una lista de
+        (módulo, tiempo propio us, tiempo acumulado us) y modulos_cargados
+        el contenido final de sys.modules
+    """
+    codigo = f"import sys, {modulo}; print('\\n'.join(sorted(sys.modules)))"
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+
+    registros = []
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|", 2)
+        registros.append((nombre[1:].rstrip(), int(propio), int(acumulado)))
+    return registros, resultado.stdout.split()
+
+
+def tiempo_total_ms(registros: List[Tuple[str, int, int]], modulo: str) -> float:
+    """Tiempo acumulado (ms) de la importación del módulo raíz"""
+    for nombre, _, acumulado in registros:
+        if nombre == modulo:
+            return acumulado / 1000
+    return 0.0
+
+
+def paquetes_mas_costosos(registros: List[Tuple[str, int, int]], top: int = 10) -> List[Tuple[str, float]]:
+    """Módulos raíz y sus importaciones directas, ordenados por tiempo acumulado (ms)"""
+    raiz = [(n.strip(), a / 1000) for n, _, a in registros if not n.startswith("    ")]
+    return sorted(raiz, key=lambda x: x[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de arranque (importtime)")
+    parser.add_argument("--modulo", "-m", action="append",
+                        help="Módulo a medir (repetible, default: main y app)")
+    parser.add_argument("--top", type=int, default=10, help="Dependencias más costosas a mostrar")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Falla (exit 1) si algún módulo supera este tiempo")
+    args = parser.parse_args()
+
+    modulos = args.modulo or list(MODULOS_ARRANQUE)
+    fallo = False
+
+    for modulo in modulos:
+        registros, cargados = medir_importacion(modulo)
+        total = tiempo_total_ms(registros, modulo)
+
+        print("=" * 70)
+        print(f"ARRANQUE: import {modulo} -> {total:.1f} ms")
+        print("=" * 70)
+        for nombre, ms in paquetes_mas_costosos(registros, args.top):
+            print(f"   {ms:9.1f} ms  {nombre}")
+
+        prohibidos = [m for m in MODULOS_ARRANQUE.get(modulo, ()) if m in cargados]
+        if prohibidos:
+            print(f"[WARNING] Dependencias pesadas cargadas al arrancar: {', '.join(prohibidos)}")
+            fallo = True
+        if args.max_ms is not None and total > args.max_ms:
+            print(f"[WARNING] {modulo} supera el presupuesto de {args.max_ms:.0f} ms")
+            fallo = True
+
+    sys.exit(1 if fallo else 0)
+
+
+if __name__ == "__main__":
+    main()
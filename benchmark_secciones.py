@@ -0,0 +1,649 @@
+"""
+Benchmark de generación de secciones con fuentes sintéticas a escala
+
+Genera fuentes de datos sintéticas con volúmenes configurables (obligaciones,
+tickets GLPI, equipos de laboratorio, riesgos, eventos de cámaras...) en un
+directorio de trabajo aislado y ejecuta cada GeneradorSeccion de extremo a
+extremo, más el ensamblado del informe consolidado. Cada etapa corre en un
+subproceso propio para medir por separado:
+
+- tiempo_s: generar + guardar la sección (sin contar importaciones)
+- importacion_s: importar el módulo de la sección y crear el generador
+- rss_pico_mb: memoria residente máxima del subproceso
+- tamano_kb: tamaño del .docx producido
+
+Los resultados se guardan como JSON (línea base) y se pueden comparar contra
+una línea base anterior para detectar regresiones entre commits.
+
+Uso:
+    python benchmark_secciones.py                           # Escala completa, todas las secciones
+    python benchmark_secciones.py --escala 0.1 -s 2,3,5     # 10% del volumen, solo 2, 3 y 5
+    python benchmark_secciones.py --tickets 200000          # Sobrescribe un volumen
+    python benchmark_secciones.py --guardar base.json       # Guarda la línea base
+    python benchmark_secciones.py --comparar base.json --tolerancia 0.25
+"""
+import argparse
+import csv
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import config
+from src.utils.perfil_memoria import rss_pico_mb
+
+BASE_DIR = Path(__file__).parent
+
+# Volúmenes con --escala 1 (se pueden sobrescribir uno a uno por CLI)
+VOLUMENES_BASE: Dict[str, int] = {
+    "obligaciones": 10000,   # Sección 1: filas de las tablas de obligaciones
+    "tickets": 100000,       # Sección 2: tickets GLPI del mes (almacén local)
+    "camaras": 2000,         # Sección 3: inventario (5 eventos por cámara)
+    "bienes": 1000,          # Sección 4: ítems de entradas y equipos no operativos (Excel)
+    "equipos": 5000,         # Sección 5: equipos de laboratorio
+    "riesgos": 2000,         # Sección 9: filas de la matriz de riesgos
+    "filas": 500,            # Secciones 6-8 y 10-14: filas de las demás fuentes
+}
+
+# Métricas comparadas y variación absoluta mínima para considerarla regresión
+# (evita falsos positivos por ruido en etapas que tardan milisegundos)
+METRICAS: Dict[str, float] = {
+    "tiempo_s": 0.25,
+    "rss_pico_mb": 10.0,
+    "tamano_kb": 5.0,
+}
+
+ETAPA_ENSAMBLADO = "ensamblado"
+
+LOCALIDADES = ["USAQUÉN", "CHAPINERO", "SANTA FE", "SAN CRISTÓBAL", "USME", "TUNJUELITO", "BOSA",
+               "KENNEDY", "FONTIBÓN", "ENGATIVÁ", "SUBA", "BARRIOS UNIDOS", "TEUSAQUILLO",
+               "LOS MÁRTIRES", "ANTONIO NARIÑO", "PUENTE ARANDA", "CANDELARIA", "RAFAEL URIBE URIBE",
+               "CIUDAD BOLÍVAR"]
+SUBSISTEMAS = ["DOMO PTZ", "CÁMARA FIJA", "DVR/NVR", "RED/COMUNICACIÓN", "ENERGÍA"]
+PROYECTOS = ["CIUDADANA", "COLEGIOS", "TRANSMILENIO", "ESTADIOS"]
+
+
+def volumenes(escala: float = 1.0, **sobrescritos: Optional[int]) -> Dict[str, int]:
+    """
+    Volúmenes de cada fuente para una escala
+
+    Args:
+        escala: Factor sobre VOLUMENES_BASE (ej: 0.1)
+        **sobrescritos: Volumen explícito por fuente (None = usar la escala)
+
+    Returns:
+        {fuente: cantidad}, mínimo 1 por fuente
+    """
+    resultado = {}
+    for fuente, base in VOLUMENES_BASE.items():
+        valor = sobrescritos.get(fuente)
+        resultado[fuente] = int(valor) if valor is not None else max(1, int(round(base * escala)))
+    return resultado
+
+
+# ---------------------------------------------------------------------------
+# Fuentes sintéticas
+# ---------------------------------------------------------------------------
+
+def _escribir_json(ruta: Path, datos: Any) -> None:
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+
+
+def _escribir_csv(ruta: Path, columnas: List[str], filas) -> None:
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(columnas)
+        escritor.writerows(filas)
+
+
+def _fecha(rng: random.Random, anio: int, mes: int, formato: str = "%Y-%m-%d") -> str:
+    return date(anio, mes, rng.randint(1, 28)).strftime(formato)
+
+
+def _obligaciones(rng: random.Random, cantidad: int, prefijo: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "item": f"{prefijo}.{i + 1}",
+            "obligacion": f"Obligación sintética {i + 1}: mantener operativos los puntos de videovigilancia "
+                          f"asignados y reportar novedades a la supervisión del contrato.",
+            "periodicidad": rng.choice(["Mensual", "Permanente", "Trimestral"]),
+            "cumplio": rng.choice(["SI", "SI", "SI", "NO APLICA"]),
+            "observaciones": f"Se cumplió la obligación en el periodo (registro {rng.randint(1000, 9999)}).",
+            "anexo": f"Anexo_{i + 1}.pdf",
+        }
+        for i in range(cantidad)
+    ]
+
+
+def _tickets_glpi(rng: random.Random, cantidad: int, anio: int, mes: int) -> List[Dict[str, Any]]:
+    """Tickets con el formato de AlmacenTicketsGLPI, abiertos dentro del mes"""
+    inicio = datetime(anio, mes, 1)
+    segundos_mes = 28 * 24 * 3600
+    tickets = []
+    for i in range(cantidad):
+        apertura = inicio + timedelta(seconds=rng.randrange(segundos_mes))
+        estado = rng.choice((1, 2, 4, 5, 5, 5, 6, 6))
+        cierre = apertura + timedelta(hours=rng.randint(1, 72)) if estado in (5, 6) else None
+        tickets.append({
+            "id": i + 1,
+            "nombre": f"Falla punto SCJ{i:07d}",
+            "estado": estado,
+            "fecha_apertura": apertura.strftime("%Y-%m-%d %H:%M:%S"),
+            "fecha_cierre": cierre.strftime("%Y-%m-%d %H:%M:%S") if cierre else None,
+            "date_mod": (cierre or apertura).strftime("%Y-%m-%d %H:%M:%S"),
+            "entidad": f"ETB > {rng.choice(PROYECTOS)}",
+            "categoria": f"Videovigilancia > {rng.choice(SUBSISTEMAS)}",
+        })
+    return tickets
+
+
+def _escalamientos(rng: random.Random, cantidad: int, anio: int, mes: int, prefijo: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "ticket": f"{prefijo}-{i + 1:06d}",
+            "localidad": rng.choice(LOCALIDADES),
+            "fecha": _fecha(rng, anio, mes),
+            "descripcion": "Pérdida de energía/enlace en el punto",
+            "estado": rng.choice(["CERRADO", "EN PROCESO"]),
+        }
+        for i in range(cantidad)
+    ]
+
+
+def _libro_excel(ruta: Path, hoja: str, filas: List[Dict[str, Any]]) -> None:
+    import pandas as pd
+
+    with pd.ExcelWriter(ruta, engine="openpyxl") as escritor:
+        pd.DataFrame(filas).to_excel(escritor, sheet_name=hoja, index=False)
+        pd.DataFrame([{"numero": "GSC-0001-2025", "titulo": "Comunicado sintético", "fecha": "2025-09-30"}]).to_excel(
+            escritor, sheet_name="Comunicado", index=False
+        )
+
+
+def generar_fuentes_sinteticas(destino: Path, anio: int, mes: int, escala: Dict[str, int],
+                               ruta_glpi: Optional[Path] = None, semilla: int = 42) -> Dict[str, int]:
+    """
+    Escribe fuentes sintéticas para todas las secciones en un directorio
+
+    Los nombres de archivo y columnas son los que leen los generadores desde
+    config.FUENTES_DIR. Los tickets se cargan en un almacén GLPI local
+    (AlmacenTicketsGLPI) que la Sección 2 agrega con SQL.
+
+    Args:
+        destino: Directorio que hará de FUENTES_DIR
+        anio: Año del informe
+        mes: Mes del informe
+        escala: Volúmenes por fuente (ver volumenes())
+        ruta_glpi: Archivo SQLite del almacén de tickets (None = no sembrar tickets)
+        semilla: Semilla del generador aleatorio (datos reproducibles)
+
+    Returns:
+        Número de registros escritos por archivo/fuente
+    """
+    rng = random.Random(semilla)
+    destino.mkdir(parents=True, exist_ok=True)
+    conteo: Dict[str, int] = {}
+
+    # Sección 1: obligaciones (repartidas en las cuatro tablas) y comunicados
+    n = escala["obligaciones"]
+    partes = [n // 2, n // 4, n // 8, n - n // 2 - n // 4 - n // 8]
+    _escribir_json(destino / f"obligaciones_{mes}_{anio}.json", {
+        clave: _obligaciones(rng, cantidad, prefijo)
+        for clave, cantidad, prefijo in zip(
+            ("obligaciones_generales", "obligaciones_especificas", "obligaciones_ambientales", "obligaciones_anexos"),
+            partes, ("1", "2", "3", "4")
+        )
+    })
+    _escribir_json(destino / f"comunicados_{mes}_{anio}.json", {
+        tipo: [{"numero": f"GSC-{i:04d}-{anio}", "fecha": _fecha(rng, anio, mes, "%d/%m/%Y"),
+                "asunto": f"COMUNICADO SINTÉTICO {i}", "adjuntos": f"Anexo_{i}.pdf"}
+               for i in range(escala["filas"] // 10 + 1)]
+        for tipo in ("emitidos", "recibidos")
+    })
+    conteo["obligaciones"] = n
+
+    # Sección 2: tickets en el almacén GLPI + JSON de mesa de servicio
+    if ruta_glpi is not None:
+        from src.extractores.glpi_almacen import AlmacenTicketsGLPI
+
+        almacen = AlmacenTicketsGLPI(ruta_glpi)
+        try:
+            # Generador propio: el resto de fuentes no cambia si no se siembran tickets
+            tickets = _tickets_glpi(random.Random(semilla + 1), escala["tickets"], anio, mes)
+            conteo["tickets"] = almacen.guardar_tickets(tickets)
+        finally:
+            almacen.cerrar()
+    escalamientos = max(1, escala["tickets"] // 100)
+    _escribir_json(destino / f"mesa_servicio_{mes}_{anio}.json", {
+        "informes_mesa_servicio": [
+            {"tipo": "Informe semanal", "fecha": _fecha(rng, anio, mes), "descripcion": f"Semana {i + 1}",
+             "estado": "ENTREGADO"} for i in range(4)
+        ],
+        "visitas_diagnostico": [
+            {"subsistema": s, "cantidad_visitas": rng.randint(10, 500), "observaciones": "Sin novedad"}
+            for s in SUBSISTEMAS
+        ],
+        "escalamientos_enel_detalle": _escalamientos(rng, escalamientos, anio, mes, "ENEL"),
+        "escalamientos_conectividad_detalle": _escalamientos(rng, escalamientos, anio, mes, "CON"),
+        "hojas_vida": [
+            {"subsistema": s, "total_puntos": 1000, "actualizados": 950, "porcentaje_actualizado": 95.0}
+            for s in SUBSISTEMAS
+        ],
+        "estado_por_localidad": [
+            {"localidad": l, "operativas": 300, "no_operativas": 5, "mantenimiento": 2, "total": 307}
+            for l in LOCALIDADES
+        ],
+    })
+    conteo["escalamientos"] = escalamientos * 2
+
+    # Sección 3: inventario y eventos de cámaras
+    camaras = [f"CAM{i:06d}" for i in range(escala["camaras"])]
+    _escribir_csv(destino / "inventario_camaras.csv", ["id_camara", "localidad", "subsistema"],
+                  ((c, rng.choice(LOCALIDADES), rng.choice(SUBSISTEMAS)) for c in camaras))
+    inicio_mes = datetime(anio, mes, 1)
+    eventos = []
+    for camara in camaras:
+        for _ in range(5):
+            inicio = inicio_mes + timedelta(minutes=rng.randrange(28 * 24 * 60))
+            fin = inicio + timedelta(minutes=rng.randint(5, 600))
+            eventos.append((camara, f"{inicio:%Y-%m-%d %H:%M:%S}", f"{fin:%Y-%m-%d %H:%M:%S}",
+                            rng.choice(["CAIDA", "CAIDA", "MANTENIMIENTO"])))
+    _escribir_csv(destino / f"eventos_camaras_{mes}_{anio}.csv", ["id_camara", "inicio", "fin", "estado"], eventos)
+    conteo["eventos_camaras"] = len(eventos)
+
+    # Sección 4: Excel de entradas de almacén y equipos no operativos
+    _libro_excel(destino / f"entradas_almacen_{mes}_{anio}.xlsx", "Items", [
+        {"descripcion": f"Repuesto sintético {i}", "cantidad": rng.randint(1, 20), "unidad": "UN",
+         "valor_unitario": 150000.0, "valor_total": 150000.0 * (i % 20 + 1)}
+        for i in range(escala["bienes"])
+    ])
+    _libro_excel(destino / f"equipos_no_operativos_{mes}_{anio}.xlsx", "Equipos", [
+        {"descripcion": f"Cámara sintética {i}", "serial": f"SN{i:07d}", "cantidad": 1,
+         "motivo": "Daño irreparable", "valor": 2500000.0}
+        for i in range(escala["bienes"])
+    ])
+    conteo["bienes"] = escala["bienes"] * 2
+
+    # Sección 5: laboratorio
+    n = escala["equipos"]
+    tipos = ["Cámara PTZ Domo", "Cámara IP 4MP", "Cámara PTZ Bullet", "NVR 32 canales"]
+    repuestos = ["Motor pan/tilt", "Fuente de poder", "Tarjeta de video", "Lente varifocal", "Disco duro 4TB"]
+    _escribir_json(destino / f"laboratorio_{mes}_{anio}.json", {
+        "estadisticas": {"equipos_recibidos": n, "equipos_reparados": n // 2,
+                         "equipos_no_reparables": n // 4, "equipos_rma": n // 8},
+        "equipos_reparados": [
+            {"tipo_equipo": rng.choice(tipos), "serial": f"LAB-R-{i:06d}", "diagnostico": "Fuente averiada",
+             "reparacion": "Reemplazo de fuente", "fecha_ingreso": _fecha(rng, anio, mes, "%d/%m/%Y"),
+             "fecha_salida": _fecha(rng, anio, mes, "%d/%m/%Y")} for i in range(n // 2)
+        ],
+        "equipos_no_operativos": [
+            {"tipo_equipo": rng.choice(tipos), "serial": f"LAB-N-{i:06d}", "diagnostico": "Placa quemada",
+             "justificacion": "Costo de reparación superior al 80%",
+             "fecha_concepto": _fecha(rng, anio, mes, "%d/%m/%Y")} for i in range(n // 4)
+        ],
+        "equipos_rma_proceso": [
+            {"tipo_equipo": rng.choice(tipos), "serial": f"LAB-M-{i:06d}", "fabricante": "Hikvision",
+             "fecha_solicitud": _fecha(rng, anio, mes, "%d/%m/%Y"), "estado_tramite": "En revisión",
+             "dias_espera": rng.randint(1, 60)} for i in range(n // 8)
+        ],
+        "equipos_pendientes_parte": [
+            {"tipo_equipo": rng.choice(tipos), "serial": f"LAB-P-{i:06d}", "parte_requerida": rng.choice(repuestos),
+             "fecha_solicitud": _fecha(rng, anio, mes, "%d/%m/%Y"),
+             "estado_gestion": rng.choice(["En compra", "Solicitado", "En tránsito"])}
+            for i in range(n - n // 2 - n // 4 - n // 8)
+        ],
+        # Sin resumen_partes_requeridas: el generador lo agrupa desde los equipos
+    })
+    conteo["equipos"] = n
+
+    # Secciones 6, 7 y 12: JSON de visitas, siniestros y conclusiones
+    filas = escala["filas"]
+    _escribir_json(destino / f"visitas_{mes}_{anio}.json", {
+        "visitas": [{"fecha": _fecha(rng, anio, mes), "localidad": rng.choice(LOCALIDADES),
+                     "objetivo": "Visita de verificación", "resultado": "Sin novedad"} for _ in range(filas)],
+        "observaciones": [], "hallazgos": [], "seguimiento": [],
+    })
+    _escribir_json(destino / f"siniestros_{mes}_{anio}.json", {
+        "siniestros": [{"fecha": _fecha(rng, anio, mes), "localidad": rng.choice(LOCALIDADES),
+                        "tipo": "Vandalismo", "descripcion": "Daño en carcasa"} for _ in range(filas)],
+        "afectaciones": [], "acciones": [], "seguimiento": [],
+    })
+    _escribir_json(destino / f"conclusiones_{mes}_{anio}.json", {
+        "conclusiones": [f"Conclusión sintética {i + 1} del periodo." for i in range(filas // 10 + 1)],
+    })
+
+    # Secciones 8-11, 13 y 14: CSV
+    _escribir_csv(destino / "ejecucion_presupuestal.csv",
+                  ["categoria", "presupuesto", "ejecutado", "mes", "presupuesto_mes", "ejecutado_mes"],
+                  ((f"Categoría {i}", 5000000 + i, 4000000 + i, config.MESES[i % 12 + 1], 100000000, 90000000)
+                   for i in range(filas)))
+    # Libro presupuestal del contrato: 24 meses hasta el periodo, una fila por categoría
+    periodos = [divmod(anio * 12 + mes - 1 - atras, 12) for atras in range(23, -1, -1)]
+    _escribir_csv(destino / "libro_presupuestal.csv", ["anio", "mes", "categoria", "presupuesto", "ejecutado"],
+                  ((a, m + 1, f"Categoría {i}", 5000000 + i, rng.randint(3000000, 5000000))
+                   for a, m in periodos for i in range(filas)))
+    _escribir_csv(destino / "matriz_riesgos.csv",
+                  ["id", "riesgo", "probabilidad", "impacto", "descripcion", "mitigacion", "responsable",
+                   "fecha_compromiso"],
+                  ((i + 1, f"Riesgo sintético {i + 1}", rng.randint(1, 5), rng.randint(1, 5),
+                    "Descripción del riesgo", "Plan de mitigación", "Coordinación Técnica",
+                    _fecha(rng, anio, mes)) for i in range(escala["riesgos"])))
+    conteo["riesgos"] = escala["riesgos"]
+    _escribir_csv(destino / "sgsst.csv",
+                  ["tipo", "tema", "fecha", "participantes", "responsable", "tipo_incidente", "descripcion",
+                   "clasificacion", "accion_tomada", "item", "cantidad", "entregado_a"],
+                  (("capacitacion", f"Tema {i}", _fecha(rng, anio, mes), 10, "HSE", "", "", "", "", "", "", "")
+                   if i % 3 == 0 else
+                   ("incidente", "", _fecha(rng, anio, mes), "", "", "Cuasi accidente", "Sin lesión", "Leve",
+                    "Señalización", "", "", "")
+                   if i % 3 == 1 else
+                   ("epp", "", _fecha(rng, anio, mes), "", "", "", "", "", "", "Casco", 5, "Equipo técnico")
+                   for i in range(filas)))
+    _escribir_csv(destino / "valores_publicos.csv",
+                  ["tipo", "titulo", "descripcion", "estado", "fecha_aprobacion", "responsable", "valor_aprobado",
+                   "nombre", "alcance", "fecha_inicio", "fecha_fin", "coste"],
+                  (("piloto", f"Piloto {i}", "Descripción", "Aprobado", _fecha(rng, anio, mes), "I+D", 1000000.0,
+                    "", "", "", "", "")
+                   if i % 2 == 0 else
+                   ("proyecto", "", "", "En ejecución", "", "", "", f"Proyecto {i}", "Alcance",
+                    _fecha(rng, anio, mes), _fecha(rng, anio, mes), 2000000.0)
+                   for i in range(filas)))
+    _escribir_csv(destino / "anexos.csv", ["nombre", "tipo", "ruta"],
+                  ((f"Anexo sintético {i}", "PDF", f"anexos/anexo_{i}.pdf") for i in range(filas)))
+    _escribir_csv(destino / "control_cambios.csv", ["version", "fecha", "responsable", "descripcion", "observaciones"],
+                  ((f"1.{i}", _fecha(rng, anio, mes), "Coordinación", f"Cambio {i}", "N/A") for i in range(filas)))
+    conteo["filas"] = filas
+    return conteo
+
+
+# ---------------------------------------------------------------------------
+# Ejecución de etapas (subproceso por sección)
+# ---------------------------------------------------------------------------
+
+def _configurar_trabajo(trabajo: Path) -> None:
+    """Redirige fuentes, salida y cachés de config al directorio de trabajo"""
+    config.FUENTES_DIR = trabajo / "fuentes"
+    config.OUTPUT_DIR = trabajo / "output"
+    config.CACHE_DIR = trabajo / "cache"
+    config.GLPI_DB_PATH = config.CACHE_DIR / "glpi_tickets.db"
+    config.ANS_SERIE_DB_PATH = config.CACHE_DIR / "ans_mensual.db"
+    config.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class _ClienteGLPISinRed:
+    """Cliente GLPI sin tickets nuevos: la Sección 2 agrega solo el almacén sembrado"""
+
+    def buscar_tickets(self, modificados_desde=None):
+        return []
+
+
+def ejecutar_etapa(etapa: str, trabajo: Path, anio: int, mes: int) -> Dict[str, Any]:
+    """
+    Ejecuta una etapa en el proceso actual (lo invoca el subproceso)
+
+    Args:
+        etapa: Número de sección ("3") o ETAPA_ENSAMBLADO
+        trabajo: Directorio de trabajo con fuentes/ (y output/ de las secciones)
+        anio: Año del informe
+        mes: Mes del informe
+
+    Returns:
+        Métricas de la etapa
+    """
+    _configurar_trabajo(trabajo)
+    inicio = time.perf_counter()
+    if etapa == ETAPA_ENSAMBLADO:
+        from src.utils.documento_utils import combinar_documentos
+
+        secciones = json.loads((trabajo / "secciones.json").read_text(encoding="utf-8"))
+        salida = config.OUTPUT_DIR / config.get_nombre_informe(anio, mes, 1)
+        importacion = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        combinar_documentos([Path(s) for s in secciones], salida)
+    else:
+        from src.generadores import obtener_generador
+
+        numero = int(etapa)
+        argumentos = {}
+        if numero == 1:
+            argumentos["usar_llm_observaciones"] = False  # Sin llamadas a OpenAI/SharePoint
+        if numero == 2:
+            from src.extractores import glpi_extractor
+
+            glpi_extractor._glpi_extractor_instance = glpi_extractor.GLPIExtractor(cliente=_ClienteGLPISinRed())
+        generador = obtener_generador(numero)(anio, mes, **argumentos)
+        salida = config.OUTPUT_DIR / generador.template_file
+        importacion = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        generador.guardar(salida)
+
+    return {
+        "tiempo_s": round(time.perf_counter() - inicio, 3),
+        "importacion_s": round(importacion, 3),
+        "rss_pico_mb": rss_pico_mb(),
+        "tamano_kb": round(salida.stat().st_size / 1024, 1),
+        "archivo": str(salida),
+    }
+
+
+def medir_etapa(etapa: str, trabajo: Path, anio: int, mes: int, timeout: float = 1800,
+                verbose: bool = False) -> Dict[str, Any]:
+    """
+    Ejecuta una etapa en un subproceso limpio y retorna sus métricas
+
+    Returns:
+        Métricas de ejecutar_etapa() o {"error": ...} si la etapa falló
+    """
+    resultado_json = trabajo / "resultados" / f"{etapa}.json"
+    resultado_json.parent.mkdir(parents=True, exist_ok=True)
+    resultado_json.unlink(missing_ok=True)
+    comando = [sys.executable, str(Path(__file__).resolve()), "--etapa", etapa, "--trabajo", str(trabajo),
+               "--anio", str(anio), "--mes", str(mes)]
+    try:
+        proceso = subprocess.run(comando, cwd=BASE_DIR, capture_output=not verbose, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timeout ({timeout:.0f} s)"}
+    if proceso.returncode != 0 or not resultado_json.exists():
+        detalle = (proceso.stderr or "").strip().splitlines()
+        return {"error": detalle[-1] if detalle else f"código de salida {proceso.returncode}"}
+    return json.loads(resultado_json.read_text(encoding="utf-8"))
+
+
+def ejecutar_benchmark(secciones: List[int], escala: Dict[str, int], anio: int = 2025, mes: int = 9,
+                       trabajo: Optional[Path] = None, timeout: float = 1800,
+                       verbose: bool = False) -> Dict[str, Any]:
+    """
+    Genera las fuentes sintéticas y mide cada sección y el ensamblado
+
+    Args:
+        secciones: Números de sección a medir
+        escala: Volúmenes por fuente (ver volumenes())
+        anio: Año del informe
+        mes: Mes del informe
+        trabajo: Directorio de trabajo (default: uno temporal que se borra al final)
+        timeout: Tiempo máximo por etapa (s)
+        verbose: Mostrar la salida de los generadores
+
+    Returns:
+        Línea base: {"fecha", "commit", "python", "plataforma", "anio", "mes",
+        "escala", "registros", "resultados": {etapa: métricas}}
+    """
+    temporal = trabajo is None
+    trabajo = Path(tempfile.mkdtemp(prefix="benchmark_secciones_")) if temporal else Path(trabajo)
+    try:
+        inicio = time.perf_counter()
+        registros = generar_fuentes_sinteticas(trabajo / "fuentes", anio, mes, escala,
+                                               ruta_glpi=trabajo / "cache" / "glpi_tickets.db")
+        print(f"[INFO] Fuentes sintéticas generadas en {time.perf_counter() - inicio:.1f} s: {registros}")
+
+        resultados: Dict[str, Any] = {}
+        archivos = []
+        for numero in secciones:
+            etapa = str(numero)
+            resultados[f"seccion_{numero}"] = metricas = medir_etapa(etapa, trabajo, anio, mes, timeout, verbose)
+            _imprimir_etapa(f"seccion_{numero}", metricas)
+            if "archivo" in metricas:
+                archivos.append(metricas.pop("archivo"))
+
+        if archivos:
+            (trabajo / "secciones.json").write_text(json.dumps(archivos), encoding="utf-8")
+            resultados[ETAPA_ENSAMBLADO] = metricas = medir_etapa(ETAPA_ENSAMBLADO, trabajo, anio, mes, timeout, verbose)
+            metricas.pop("archivo", None)
+            _imprimir_etapa(ETAPA_ENSAMBLADO, metricas)
+
+        return {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit_actual(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "anio": anio,
+            "mes": mes,
+            "escala": escala,
+            "registros": registros,
+            "resultados": resultados,
+        }
+    finally:
+        if temporal:
+            shutil.rmtree(trabajo, ignore_errors=True)
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _imprimir_etapa(nombre: str, metricas: Dict[str, Any]) -> None:
+    if "error" in metricas:
+        print(f"   [ERROR] {nombre:<14} {metricas['error']}")
+        return
+    rss = f"{metricas['rss_pico_mb']:8.1f} MB" if metricas.get("rss_pico_mb") is not None else "       - MB"
+    print(f"   {nombre:<14} {metricas['tiempo_s']:8.2f} s  (import {metricas['importacion_s']:.2f} s)"
+          f"  {rss}  {metricas['tamano_kb']:9.1f} KB")
+
+
+# ---------------------------------------------------------------------------
+# Comparación de líneas base
+# ---------------------------------------------------------------------------
+
+def comparar(base: Dict[str, Any], actual: Dict[str, Any], tolerancia: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Detecta regresiones de una ejecución frente a una línea base
+
+    Una métrica es regresión si supera el valor base en más de la tolerancia
+    relativa y además en más del mínimo absoluto de METRICAS. Una etapa que
+    funcionaba en la base y ahora falla también es regresión.
+
+    Args:
+        base: Línea base (resultado de ejecutar_benchmark)
+        actual: Ejecución a evaluar
+        tolerancia: Aumento relativo permitido (0.2 = 20%)
+
+    Returns:
+        Lista de {"etapa", "metrica", "base", "actual", "variacion"}
+        (variacion relativa; None para etapas que fallan)
+    """
+    if base.get("escala") != actual.get("escala"):
+        print("[WARNING] Las escalas de las ejecuciones no coinciden; la comparación puede no ser válida")
+
+    regresiones = []
+    for etapa, metricas_base in base.get("resultados", {}).items():
+        metricas = actual.get("resultados", {}).get(etapa)
+        if metricas is None or "error" in metricas_base:
+            continue
+        if "error" in metricas:
+            regresiones.append({"etapa": etapa, "metrica": "error", "base": None,
+                                "actual": metricas["error"], "variacion": None})
+            continue
+        for metrica, minimo in METRICAS.items():
+            valor_base, valor = metricas_base.get(metrica), metricas.get(metrica)
+            if valor_base is None or valor is None:
+                continue
+            if valor > valor_base * (1 + tolerancia) and valor - valor_base > minimo:
+                regresiones.append({
+                    "etapa": etapa, "metrica": metrica, "base": valor_base, "actual": valor,
+                    "variacion": round((valor - valor_base) / valor_base, 3) if valor_base else None,
+                })
+    return regresiones
+
+
+def _parsear_secciones(texto: str) -> List[int]:
+    from src.generadores import secciones_disponibles
+
+    secciones = [int(s) for s in texto.split(",") if s.strip()]
+    invalidas = [s for s in secciones if s not in secciones_disponibles()]
+    if invalidas or not secciones:
+        raise argparse.ArgumentTypeError(f"Secciones inválidas: {texto}. Disponibles: {secciones_disponibles()}")
+    return secciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de secciones con fuentes sintéticas a escala")
+    parser.add_argument("--secciones", "-s", type=_parsear_secciones, default=None,
+                        help="Secciones a medir separadas por coma (default: todas)")
+    parser.add_argument("--escala", type=float, default=1.0, help="Factor sobre los volúmenes base (default: 1)")
+    for fuente, base in VOLUMENES_BASE.items():
+        parser.add_argument(f"--{fuente}", type=int, default=None, help=f"Volumen de {fuente} (base: {base})")
+    parser.add_argument("--anio", "-a", type=int, default=2025, help="Año del informe")
+    parser.add_argument("--mes", "-m", type=int, default=9, help="Mes del informe")
+    parser.add_argument("--guardar", type=Path, default=None, help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", type=Path, default=None, help="Línea base JSON contra la cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Aumento relativo permitido antes de marcar regresión (default: 0.2)")
+    parser.add_argument("--timeout", type=float, default=1800, help="Tiempo máximo por etapa en segundos")
+    parser.add_argument("--trabajo", type=Path, default=None,
+                        help="Directorio de trabajo (se conserva; default: temporal)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Mostrar la salida de los generadores")
+    parser.add_argument("--etapa", default=None, help=argparse.SUPPRESS)  # Uso interno (subproceso)
+    args = parser.parse_args()
+
+    if args.etapa is not None:
+        metricas = ejecutar_etapa(args.etapa, args.trabajo, args.anio, args.mes)
+        (args.trabajo / "resultados" / f"{args.etapa}.json").write_text(json.dumps(metricas), encoding="utf-8")
+        return
+
+    from src.generadores import secciones_disponibles
+
+    secciones = args.secciones or secciones_disponibles()
+    escala = volumenes(args.escala, **{fuente: getattr(args, fuente) for fuente in VOLUMENES_BASE})
+
+    print("=" * 70)
+    print(f"BENCHMARK DE SECCIONES - escala {args.escala:g}")
+    print("=" * 70)
+    resultado = ejecutar_benchmark(secciones, escala, args.anio, args.mes, args.trabajo, args.timeout, args.verbose)
+
+    if args.guardar:
+        args.guardar.parent.mkdir(parents=True, exist_ok=True)
+        args.guardar.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"[OK] Resultados guardados en: {args.guardar}")
+
+    fallo = any("error" in m for m in resultado["resultados"].values())
+    if args.comparar:
+        base = json.loads(args.comparar.read_text(encoding="utf-8"))
+        regresiones = comparar(base, resultado, args.tolerancia)
+        print("-" * 70)
+        print(f"Comparación contra {args.comparar} (commit {base.get('commit')}, tolerancia {args.tolerancia:.0%})")
+        for r in regresiones:
+            if r["metrica"] == "error":
+                print(f"[WARNING] {r['etapa']}: falla ({r['actual']})")
+            else:
+                variacion = f" (+{r['variacion']:.0%})" if r["variacion"] is not None else ""
+                print(f"[WARNING] {r['etapa']}: {r['metrica']} {r['base']} -> {r['actual']}{variacion}")
+        if not regresiones:
+            print("[OK] Sin regresiones")
+        fallo = fallo or bool(regresiones)
+
+    sys.exit(1 if fallo else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,9 +20,10 @@ OUTPUT_DIR = BASE_DIR / "output"
 FIJOS_DIR = DATA_DIR / "fijos"
 FUENTES_DIR = DATA_DIR / "fuentes"
 INFORMES_APROBADOS_DIR = BASE_DIR / "informesAprobados"
+CACHE_DIR = DATA_DIR / "cache"  # Artefactos derivados (gráficos, etc.), se pueden borrar
 
 # Crear directorios si no existen
-for dir_path in [TEMPLATES_DIR, DATA_DIR, OUTPUT_DIR, FIJOS_DIR, FUENTES_DIR]:
+for dir_path in [TEMPLATES_DIR, DATA_DIR, OUTPUT_DIR, FIJOS_DIR, FUENTES_DIR, CACHE_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 # Información del contrato (FIJO) - Datos oficiales del contrato SCJ-1809-2024
@@ -92,13 +93,71 @@ def get_nombre_informe(anio: int, mes: int, version: int = 1) -> str:
     nombre_mes = MESES[mes].upper()
     return f"INFORME_MENSUAL_{nombre_mes}_{anio}_V{version}.docx"
 
+def get_nombre_reporte_tiempos(anio: int, mes: int, version: int = 1) -> str:
+    """Nombre del reporte de tiempos por etapa que acompaña al informe"""
+    return get_nombre_informe(anio, mes, version).replace(".docx", "_tiempos.json")
+
+def get_nombre_reporte_memoria(anio: int, mes: int, version: int = 1) -> str:
+    """Nombre del perfil de memoria por etapa (main.py --perfil-memoria)"""
+    return get_nombre_informe(anio, mes, version).replace(".docx", "_memoria.json")
+
+def get_directorio_salida(anio: int, mes: int) -> Path:
+    """Retorna el directorio de salida del periodo: output/2025/09_Septiembre"""
+    return OUTPUT_DIR / f"{anio}" / f"{mes:02d}_{MESES[mes]}"
+
+def get_ruta_snapshot_datos(anio: int, mes: int, seccion: int) -> Path:
+    """Snapshot JSON del contexto de una sección (main.py --solo-datos)"""
+    return get_directorio_salida(anio, mes) / "datos" / f"seccion_{seccion:02d}.json"
+
 def get_periodo_texto(anio: int, mes: int) -> str:
     """Retorna el periodo en formato texto: 'Septiembre de 2025'"""
     return f"{MESES[mes]} de {anio}"
 
+# Periodos que cubren los informes del contrato (primer y último mes)
+PERIODO_INFORMES_INICIO = datetime(2024, 11, 1)  # Noviembre 2024
+PERIODO_INFORMES_FIN = datetime(2025, 10, 31)    # Octubre 2025
+
+def periodo_en_contrato(anio: int, mes: int) -> bool:
+    """Indica si el periodo está dentro del rango de informes del contrato"""
+    return PERIODO_INFORMES_INICIO <= datetime(anio, mes, 1) <= PERIODO_INFORMES_FIN
+
+def get_rango_periodos_texto() -> str:
+    """Retorna el rango de informes del contrato: 'Noviembre 2024 - Octubre 2025'"""
+    inicio, fin = PERIODO_INFORMES_INICIO, PERIODO_INFORMES_FIN
+    return f"{MESES[inicio.month]} {inicio.year} - {MESES[fin.month]} {fin.year}"
+
 # Configuración GLPI
-GLPI_API_URL = "https://glpi.etb.com.co/apirest.php"
+GLPI_API_URL = os.getenv("GLPI_API_URL", "https://glpi.etb.com.co/apirest.php")
 GLPI_API_TOKEN = os.getenv("GLPI_API_TOKEN", "TU_TOKEN_AQUI")
+GLPI_APP_TOKEN = os.getenv("GLPI_APP_TOKEN", "")
+GLPI_TAMANO_PAGINA = int(os.getenv("GLPI_TAMANO_PAGINA", "1000"))  # Tickets por petición (range)
+GLPI_HILOS = int(os.getenv("GLPI_HILOS", "4"))                     # Páginas descargadas en paralelo
+GLPI_DB_PATH = CACHE_DIR / "glpi_tickets.db"                       # Copia local sincronizada por date_mod
+GLPI_SINCRONIZACION_TTL_S = int(os.getenv("GLPI_SINCRONIZACION_TTL_S", "300"))  # Vigencia de una sincronización
+
+# Espera máxima por el bloqueo de un informe que otra ejecución está generando
+INFORME_BLOQUEO_TIMEOUT_S = float(os.getenv("INFORME_BLOQUEO_TIMEOUT_S", "1800"))
+
+# Caché de gráficos PNG: se podan los más antiguos por edad y por tamaño total
+GRAFICOS_CACHE_MAX_DIAS = int(os.getenv("GRAFICOS_CACHE_MAX_DIAS", "30"))
+GRAFICOS_CACHE_MAX_MB = int(os.getenv("GRAFICOS_CACHE_MAX_MB", "200"))
+
+# Serie mensual del ANS (total, localidad, subsistema) con acumulados y promedios móviles
+ANS_SERIE_DB_PATH = CACHE_DIR / "ans_mensual.db"
+
+# Configuración MySQL (base de monitoreo de disponibilidad de cámaras)
+# DISPONIBILIDAD_DB_MOTOR: "mysql" o "sqlite" (base local para pruebas/benchmarks)
+# Sin MYSQL_HOST (ni base sqlite) la disponibilidad se lee de data/fuentes/ans_{mes}_{anio}.json
+MYSQL_CONFIG = {
+    "motor": os.getenv("DISPONIBILIDAD_DB_MOTOR", "mysql"),
+    "host": os.getenv("MYSQL_HOST", ""),
+    "port": int(os.getenv("MYSQL_PORT", "3306")),
+    "user": os.getenv("MYSQL_USER", ""),
+    "password": os.getenv("MYSQL_PASSWORD", ""),
+    "database": os.getenv("MYSQL_DATABASE", ""),
+    "ruta": os.getenv("DISPONIBILIDAD_SQLITE_PATH", ""),
+    "pool_size": int(os.getenv("MYSQL_POOL_SIZE", "4")),
+}
 
 # Configuración OpenAI (LLM)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
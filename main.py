@@ -3,28 +3,29 @@ Generador de Informes Mensuales ETB
 Punto de entrada principal
 """
 import argparse
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import config
-from src.generadores.seccion_1_info_general import GeneradorSeccion1
-from src.generadores.seccion_2_mesa_servicio import GeneradorSeccion2
-from src.generadores.seccion_3_ans import GeneradorSeccion3
-from src.generadores.seccion_4_bienes import GeneradorSeccion4
-from src.generadores.seccion_5_laboratorio import GeneradorSeccion5
-from src.generadores.seccion_6_visitas import GeneradorSeccion6
-from src.generadores.seccion_7_siniestros import GeneradorSeccion7
-from src.generadores.seccion_8_presupuesto import GeneradorSeccion8
-from src.generadores.seccion_9_riesgos import GeneradorSeccion9
-from src.generadores.seccion_10_sgsst import GeneradorSeccion10
-from src.generadores.seccion_11_valores import GeneradorSeccion11
-from src.generadores.seccion_12_conclusiones import GeneradorSeccion12
-from src.generadores.seccion_13_anexos import GeneradorSeccion13
-from src.generadores.seccion_14_control_cambios import GeneradorSeccion14
-
-# Importar otros generadores conforme se vayan creando
-# ...
-
-def generar_informe(anio: int, mes: int, version: int = 1):
+from src.generadores import obtener_generador, secciones_disponibles
+from src.generadores import parsear_secciones as _parsear_secciones
+from src.utils.escritura_segura import BloqueoOcupado, bloqueo_archivo
+from src.utils.log_utils import campos_log, configurar_logging
+from src.utils.metricas import medir, reporte_tiempos
+from src.utils.perfil_memoria import medir_memoria, perfil_memoria as iniciar_perfil_memoria
+from src.utils.snapshot_datos import guardar_snapshot, leer_snapshot, snapshot_json
+
+# Los módulos de cada sección (python-docx, pandas, extractores) se importan
+# solo para las secciones que se van a generar
+
+def generar_informe(anio: int, mes: int, version: int = 1,
+                    secciones: Optional[List[int]] = None,
+                    perfil_memoria: bool = False,
+                    guardar_secciones: bool = False,
+                    desde_datos: bool = False) -> Optional[Path]:
     """
     Genera el informe mensual completo
     
@@ -32,6 +33,18 @@ def generar_informe(anio: int, mes: int, version: int = 1):
         anio: Año del informe (ej: 2025)
         mes: Mes del informe (1-12)
         version: Versión del documento
+        secciones: Números de sección a generar (default: todas)
+        perfil_memoria: Registrar memoria (tracemalloc + RSS) por sección y
+                        por obligación, y guardar el perfil junto al informe
+        guardar_secciones: Con el informe completo, escribir además el .docx de
+                           cada sección (depuración); las secciones se ensamblan
+                           en memoria y el informe se escribe una sola vez
+        desde_datos: Renderizar desde los snapshots de generar_datos (--solo-datos)
+                     sin consultar las fuentes; las secciones sin snapshot
+                     cargan sus datos normalmente
+    
+    Returns:
+        Ruta del informe consolidado o None si no se pudo generar
     """
     print(f"\n{'='*60}")
     print(f">>> GENERADOR DE INFORMES MENSUALES ETB")
@@ -42,60 +55,196 @@ def generar_informe(anio: int, mes: int, version: int = 1):
     # Validar rango de fechas
     if not validar_periodo(anio, mes):
         print("[ERROR] Periodo fuera del rango del contrato")
-        print(f"   Rango válido: Noviembre 2024 - Octubre 2025")
-        return
+        print(f"   Rango válido: {config.get_rango_periodos_texto()}")
+        return None
     
     # Crear directorio de salida si no existe
-    output_dir = config.OUTPUT_DIR / f"{anio}" / f"{mes:02d}_{config.MESES[mes]}"
+    output_dir = config.get_directorio_salida(anio, mes)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Lista de generadores a ejecutar
-    generadores = [
-        GeneradorSeccion1(anio, mes),
-        GeneradorSeccion2(anio, mes),
-        GeneradorSeccion3(anio, mes),
-        GeneradorSeccion4(anio, mes),
-        GeneradorSeccion5(anio, mes),
-        GeneradorSeccion6(anio, mes),
-        GeneradorSeccion7(anio, mes),
-        GeneradorSeccion8(anio, mes),
-        GeneradorSeccion9(anio, mes),
-        GeneradorSeccion10(anio, mes),
-        GeneradorSeccion11(anio, mes),
-        GeneradorSeccion12(anio, mes),
-        GeneradorSeccion13(anio, mes),
-        GeneradorSeccion14(anio, mes),
-        # Agregar más generadores conforme se desarrollen
-        # ...
-    ]
-    
-    # Generar cada sección
-    secciones_generadas = []
-    for generador in generadores:
+    # Un bloqueo por (anio, mes, version) entre hilos y procesos: dos workers que
+    # piden el mismo informe no escriben a la vez los mismos archivos, y el que
+    # esperó reutiliza el informe que terminó el otro en lugar de repetirlo.
+    # Solo se reutiliza para un informe simple: con secciones, perfil de memoria,
+    # secciones guardadas o snapshots el resultado del otro no es el pedido
+    informe = output_dir / config.get_nombre_informe(anio, mes, version)
+    informe_simple = not (secciones or perfil_memoria or guardar_secciones or desde_datos)
+    firma_previa = _firma_archivo(informe)
+    try:
+        with bloqueo_archivo(output_dir / f".{informe.stem}.lock",
+                             timeout=config.INFORME_BLOQUEO_TIMEOUT_S) as espero:
+            if espero and informe_simple and _firma_archivo(informe) not in (None, firma_previa):
+                print(f"[INFO] Otra ejecución generó el informe mientras se esperaba: {informe}")
+                return informe
+            return _construir_informe(anio, mes, version, output_dir, secciones,
+                                      perfil_memoria, guardar_secciones, desde_datos)
+    except BloqueoOcupado as e:
+        print(f"[ERROR] Otra ejecución sigue generando el informe: {e}")
+        return None
+
+
+def _firma_archivo(ruta: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, tamaño) del archivo, o None si no existe"""
+    try:
+        estado = ruta.stat()
+    except FileNotFoundError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+
+def _construir_informe(anio: int, mes: int, version: int, output_dir: Path,
+                       secciones: Optional[List[int]], perfil_memoria: bool,
+                       guardar_secciones: bool, desde_datos: bool) -> Optional[Path]:
+    """Genera las secciones y el informe consolidado (ver generar_informe)"""
+    nombre_ejecucion = f"informe_{anio}_{mes:02d}_v{version}"
+    with reporte_tiempos(nombre_ejecucion) as reporte, \
+            (iniciar_perfil_memoria(nombre_ejecucion) if perfil_memoria else nullcontext()) as perfil:
+        # Generar cada sección (el módulo se importa al llegar a ella).
+        # Con el informe completo cada sección queda en memoria para el ensamblado;
+        # con una selección parcial el resultado son los archivos de cada sección.
+        secciones_generadas = []
+        tablas_diferidas = []
+        for numero in secciones or secciones_disponibles():
+            try:
+                generador = obtener_generador(numero)(anio, mes)
+            except Exception as e:
+                print(f"[ERROR] No se pudo cargar la sección {numero}: {e}")
+                continue
+            # Generación del informe: la sección puede registrar el mes (serie del ANS)
+            generador.registrar_resultados = True
+            try:
+                print(f"[*] Generando: {generador.nombre_seccion}...")
+                if desde_datos:
+                    snapshot = leer_snapshot(config.get_ruta_snapshot_datos(anio, mes, numero))
+                    if snapshot is not None:
+                        generador.restaurar_contexto(snapshot["contexto"])
+                    else:
+                        print(f"[WARNING] Sin snapshot de datos para la sección {numero}; se consultan las fuentes")
+                output_file = output_dir / f"{generador.template_file}"
+                with medir("seccion", seccion=type(generador).__name__), \
+                        medir_memoria("seccion", seccion=type(generador).__name__), \
+                        campos_log(seccion=numero):
+                    if secciones:
+                        generador.guardar(output_file)
+                        secciones_generadas.append(output_file)
+                    else:
+                        documento = generador.documento()
+                        if guardar_secciones:
+                            generador.guardar_documento(documento, output_file)
+                            print(f"[OK] {generador.nombre_seccion} guardada en: {output_file}")
+                        secciones_generadas.append(documento)
+                        tablas_diferidas.append(generador.tablas_diferidas)
+            except Exception as e:
+                print(f"[ERROR] Error en {generador.nombre_seccion}: {e}")
+        
+        # Combinar todas las secciones en un solo documento
+        # (solo con el informe completo: una selección parcial no reemplaza el consolidado)
+        informe_final = None
+        if secciones:
+            print("[INFO] Generación parcial de secciones: no se genera el informe consolidado")
+        elif secciones_generadas:
+            informe_final = output_dir / config.get_nombre_informe(anio, mes, version)
+            try:
+                from src.utils.documento_utils import combinar_documentos
+                with medir("combinar_documentos"), medir_memoria("combinar_documentos"):
+                    combinar_documentos(secciones_generadas, informe_final, tablas_diferidas)
+                print(f"[OK] Informe consolidado guardado en: {informe_final}")
+            except Exception as e:
+                print(f"[ERROR] Error al combinar secciones: {e}")
+                informe_final = None
+    
+    # Reporte de tiempos por etapa junto al informe
+    try:
+        ruta_tiempos = reporte.guardar(output_dir / config.get_nombre_reporte_tiempos(anio, mes, version))
+        print(f"[INFO] Reporte de tiempos: {ruta_tiempos}")
+    except Exception as e:
+        print(f"[WARNING] No se pudo guardar el reporte de tiempos: {e}")
+    
+    # Perfil de memoria por etapa (--perfil-memoria)
+    if perfil is not None:
+        perfil.imprimir_resumen()
         try:
-            print(f"[*] Generando: {generador.nombre_seccion}...")
-            output_file = output_dir / f"{generador.template_file}"
-            generador.guardar(output_file)
-            secciones_generadas.append(output_file)
+            ruta_memoria = perfil.guardar(output_dir / config.get_nombre_reporte_memoria(anio, mes, version))
+            print(f"[INFO] Perfil de memoria: {ruta_memoria}")
         except Exception as e:
-            print(f"[ERROR] Error en {generador.nombre_seccion}: {e}")
-    
-    # TODO: Combinar todas las secciones en un solo documento
-    # combinar_secciones(secciones_generadas, output_dir, anio, mes, version)
+            print(f"[WARNING] No se pudo guardar el perfil de memoria: {e}")
     
     print(f"\n{'='*60}")
     print(f"[OK] Proceso completado")
     print(f"   Secciones generadas: {len(secciones_generadas)}")
     print(f"   Ubicación: {output_dir}")
     print(f"{'='*60}\n")
+    
+    return informe_final
+
+def _datos_seccion(numero: int, anio: int, mes: int) -> str:
+    """Ejecuta cargar_datos + procesar de una sección y guarda su snapshot"""
+    generador = obtener_generador(numero)(anio, mes)
+    with medir("seccion_datos", seccion=type(generador).__name__), campos_log(seccion=numero):
+        contexto = generador.datos_contexto()
+        texto = snapshot_json(numero, generador.nombre_seccion, anio, mes, contexto)
+    ruta = guardar_snapshot(config.get_ruta_snapshot_datos(anio, mes, numero), texto)
+    print(f"[OK] Datos de {generador.nombre_seccion}: {ruta} ({len(texto) / 1024:.1f} KB)")
+    return texto
+
+def generar_datos(anio: int, mes: int, secciones: Optional[List[int]] = None,
+                  max_workers: Optional[int] = None) -> Dict[int, str]:
+    """
+    Carga y procesa los datos de cada sección en paralelo, sin renderizar templates
+    
+    Cada sección se guarda como snapshot JSON compacto en <salida>/datos/,
+    que generar_informe(desde_datos=True) puede renderizar después sin
+    volver a consultar las fuentes.
+    
+    Args:
+        anio: Año del informe
+        mes: Mes del informe (1-12)
+        secciones: Números de sección (default: todas)
+        max_workers: Hilos para procesar las secciones (default: una por sección, máximo 8)
+    
+    Returns:
+        Snapshot JSON por número de sección (sin las secciones que fallaron)
+    """
+    if not validar_periodo(anio, mes):
+        print("[ERROR] Periodo fuera del rango del contrato")
+        return {}
+    
+    numeros = secciones or secciones_disponibles()
+    snapshots = {}
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, len(numeros))) as executor:
+        # Cada hilo conserva el reporte de tiempos y los campos de log del llamador
+        futuros = {
+            numero: executor.submit(contextvars.copy_context().run, _datos_seccion, numero, anio, mes)
+            for numero in numeros
+        }
+        for numero, futuro in futuros.items():
+            try:
+                snapshots[numero] = futuro.result()
+            except Exception as e:
+                print(f"[ERROR] Error en los datos de la sección {numero}: {e}")
+    
+    print(f"[OK] Datos de {len(snapshots)}/{len(numeros)} secciones en: "
+          f"{config.get_ruta_snapshot_datos(anio, mes, 1).parent}")
+    return snapshots
 
 def validar_periodo(anio: int, mes: int) -> bool:
     """Valida que el periodo esté dentro del rango del contrato"""
-    fecha = datetime(anio, mes, 1)
-    fecha_inicio = datetime(2024, 11, 1)  # Noviembre 2024
-    fecha_fin = datetime(2025, 10, 31)    # Octubre 2025
-    
-    return fecha_inicio <= fecha <= fecha_fin
+    return config.periodo_en_contrato(anio, mes)
+
+def parsear_secciones(texto: str) -> List[int]:
+    """
+    Convierte "2,3,8" en [2, 3, 8] validando contra el registro de generadores
+
+    Args:
+        texto: Números de sección separados por coma
+
+    Returns:
+        Lista de secciones sin duplicados, en el orden indicado
+    """
+    try:
+        return _parsear_secciones(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 def main():
     """Punto de entrada con argumentos de línea de comandos"""
@@ -120,15 +269,56 @@ def main():
         default=1,
         help="Versión del documento (default: 1)"
     )
+    parser.add_argument(
+        "--secciones", "-s",
+        type=parsear_secciones,
+        default=None,
+        help="Secciones a generar separadas por coma, ej: 2,3,8 (default: todas)"
+    )
+    parser.add_argument(
+        "--perfil-memoria",
+        action="store_true",
+        help="Registrar memoria por sección y por obligación (tracemalloc + RSS); "
+             "más lento, genera *_memoria.json junto al informe"
+    )
+    parser.add_argument(
+        "--guardar-secciones",
+        action="store_true",
+        help="Escribir también el .docx de cada sección (depuración); por defecto "
+             "las secciones se ensamblan en memoria"
+    )
+    parser.add_argument(
+        "--solo-datos",
+        action="store_true",
+        help="Solo cargar y procesar los datos de cada sección (en paralelo, sin "
+             "renderizar) y guardarlos como JSON en <salida>/datos/"
+    )
+    parser.add_argument(
+        "--desde-datos",
+        action="store_true",
+        help="Renderizar desde los snapshots de --solo-datos sin consultar las fuentes"
+    )
+    parser.add_argument(
+        "--log-nivel",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default=None,
+        help="Nivel de logging de extractores y generadores (default: LOG_LEVEL o INFO)"
+    )
     
     args = parser.parse_args()
+    configurar_logging(args.log_nivel)
     
     # Validar mes
     if not 1 <= args.mes <= 12:
         print("[ERROR] El mes debe estar entre 1 y 12")
         return
     
-    generar_informe(args.anio, args.mes, args.version)
+    if args.solo_datos:
+        generar_datos(args.anio, args.mes, args.secciones)
+        return
+    
+    generar_informe(args.anio, args.mes, args.version, args.secciones, args.perfil_memoria,
+                    args.guardar_secciones, args.desde_datos)
 
 if __name__ == "__main__":
     main()
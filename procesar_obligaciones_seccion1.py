@@ -5,13 +5,11 @@ import sys
 from pathlib import Path
 import logging
 from src.services.obligaciones_service import ObligacionesService
+from src.utils.log_utils import FORMATO_API, configurar_logging
 import config
 
 # Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+configurar_logging(formato=FORMATO_API)
 
 logger = logging.getLogger(__name__)
 
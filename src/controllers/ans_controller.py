@@ -0,0 +1,39 @@
+"""
+Controller para la simulación de penalidades del ANS
+"""
+from typing import Dict, Any
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+import logging
+from ..services.ans_service import get_ans_service
+
+logger = logging.getLogger(__name__)
+
+
+class AnsController:
+    """Controller del ANS"""
+
+    def __init__(self):
+        self.service = get_ans_service()
+
+    async def simular(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Evalúa los escenarios de penalidad
+
+        El cálculo es NumPy (sin I/O) pero con barridos grandes puede tomar
+        decenas de milisegundos, así que corre en el threadpool y no en el
+        event loop.
+        """
+        try:
+            return await run_in_threadpool(self.service.simular, data)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception as e:
+            logger.error(f"Error al simular penalidades del ANS: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al simular penalidades del ANS: {str(e)}"
+            )
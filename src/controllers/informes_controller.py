@@ -0,0 +1,177 @@
+"""
+Controller para generar y descargar el informe mensual consolidado
+"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+import asyncio
+from email.utils import parsedate_to_datetime
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+import logging
+from ..services.informes_service import (
+    get_informes_service,
+    ESTADO_EN_COLA,
+    ESTADO_GENERANDO,
+)
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPE_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class InformesController:
+    """Controller para el informe mensual"""
+
+    def __init__(self):
+        self.service = get_informes_service()
+
+    async def generar_informe(self, anio: int, mes: int, version: int = 1,
+                              perfil_memoria: bool = False) -> Dict[str, Any]:
+        """
+        Encola la generación del informe y retorna inmediatamente
+
+        La generación corre en el pool de procesos del service, nunca en el
+        event loop.
+        """
+        try:
+            return self.service.encolar_generacion(anio, mes, version, perfil_memoria)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception as e:
+            logger.error(f"Error al encolar generación del informe: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al encolar generación del informe: {str(e)}"
+            )
+
+    async def obtener_datos(self, anio: int, mes: int, secciones: Optional[str] = None) -> Response:
+        """
+        Carga y procesa los datos de las secciones en el pool de procesos,
+        sin renderizar, y retorna el contexto de cada una como JSON
+        """
+        try:
+            futuro = self.service.generar_datos(anio, mes, self.service.parsear_secciones(secciones))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        try:
+            resultado = await asyncio.wrap_future(futuro)
+        except Exception as e:
+            logger.error(f"Error al obtener los datos del informe: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al obtener los datos del informe: {str(e)}"
+            )
+        return Response(content=self.service.respuesta_datos(anio, mes, resultado), media_type="application/json")
+
+    async def preview_seccion(self, anio: int, mes: int, numero: int, desde_datos: bool = True) -> HTMLResponse:
+        """Retorna la vista previa HTML de una sección (cacheada mientras el contexto no cambie)"""
+        try:
+            futuro = self.service.preview_seccion(anio, mes, numero, desde_datos)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        try:
+            html = await asyncio.wrap_future(futuro)
+        except Exception as e:
+            logger.error(f"Error al generar la vista previa de la sección {numero}: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al generar la vista previa de la sección {numero}: {str(e)}"
+            )
+        return HTMLResponse(content=html, headers={"Cache-Control": "no-cache"})
+
+    async def descargar_informe(self, request: Request, anio: int, mes: int, version: int) -> Response:
+        """
+        Transmite el .docx generado
+
+        Responde 304 si el cliente ya tiene la versión actual (If-None-Match /
+        If-Modified-Since), 202 si la generación sigue en curso y 404 si el
+        informe no existe.
+        """
+        try:
+            self.service.validar_periodo(anio, mes, version)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        estado = self.service.obtener_estado(anio, mes, version)
+        if estado and estado["estado"] in (ESTADO_EN_COLA, ESTADO_GENERANDO):
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=estado)
+
+        ruta = self.service.get_ruta_informe(anio, mes, version)
+        if not ruta.exists():
+            detalle = "Informe no generado"
+            if estado and estado.get("error"):
+                detalle = f"Error en la generación del informe: {estado['error']}"
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=detalle
+            )
+
+        metadatos = self.service.get_metadatos_archivo(ruta)
+        headers = {
+            "ETag": metadatos["etag"],
+            "Last-Modified": metadatos["last_modified"],
+            "Cache-Control": "no-cache",
+        }
+
+        if self._no_modificado(request, metadatos):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        headers["Content-Length"] = str(metadatos["tamano"])
+        headers["Content-Disposition"] = f'attachment; filename="{ruta.name}"'
+        return StreamingResponse(
+            self.service.iterar_archivo(ruta),
+            media_type=MEDIA_TYPE_DOCX,
+            headers=headers
+        )
+
+    async def obtener_perfil_memoria(self, anio: int, mes: int, version: int) -> Dict[str, Any]:
+        """Retorna el perfil de memoria guardado junto al informe"""
+        try:
+            perfil = self.service.leer_perfil_memoria(anio, mes, version)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        if perfil is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No hay perfil de memoria para este informe"
+            )
+        return perfil
+
+    def _no_modificado(self, request: Request, metadatos: Dict[str, Any]) -> bool:
+        """Evalúa los encabezados condicionales (If-None-Match tiene prioridad)"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            etags = [etag.strip() for etag in if_none_match.split(",")]
+            return "*" in etags or metadatos["etag"] in etags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            fecha = self._parsear_fecha_http(if_modified_since)
+            return fecha is not None and metadatos["mtime"] <= fecha
+
+        return False
+
+    def _parsear_fecha_http(self, valor: str) -> Optional[datetime]:
+        """Parsea una fecha HTTP; retorna None si no es válida"""
+        try:
+            fecha = parsedate_to_datetime(valor)
+        except (TypeError, ValueError):
+            return None
+        return fecha if fecha.tzinfo else None
@@ -4,7 +4,6 @@ Controller para procesar obligaciones de la sección 1.5
 from typing import Dict, Any
 from fastapi import HTTPException, status
 import logging
-from ..services.obligaciones_service import ObligacionesService
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +12,20 @@ class ObligacionesController:
     """Controller para procesar obligaciones"""
     
     def __init__(self):
-        self.service = ObligacionesService()
+        self._service = None
+
+    @property
+    def service(self):
+        """
+        Service de obligaciones, creado en la primera petición
+
+        Importarlo al cargar las rutas arrastraría OpenAI, PyPDF2, SharePoint y
+        MongoDB al arranque de la API aunque el endpoint no se use.
+        """
+        if self._service is None:
+            from ..services.obligaciones_service import ObligacionesService
+            self._service = ObligacionesService()
+        return self._service
     
     async def procesar_obligaciones(
         self,
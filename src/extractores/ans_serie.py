@@ -0,0 +1,326 @@
+"""
+Serie de tiempo del ANS mensual con agregados acumulados y móviles
+
+Cada mes cerrado se guarda en config.ANS_SERIE_DB_PATH (SQLite) a nivel
+total, por localidad y por subsistema. Al cerrar un mes se actualizan de
+forma incremental, a partir del acumulado del mes anterior, los agregados
+de todo el periodo del contrato (meses evaluados, meses con ANS cumplido,
+promedio, disponibilidad ponderada por horas) y los promedios móviles de 3
+y 12 meses. Las tablas históricas y los gráficos de tendencia leen esos
+valores precalculados sin recorrer los archivos de cada mes.
+
+Si se vuelve a cerrar un mes ya registrado (datos corregidos) o se cierra
+un mes anterior a otros ya guardados, se recalculan solo los acumulados de
+ese mes en adelante para las claves afectadas.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+import sqlite3
+import threading
+import config
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_TOTAL = "total"
+DIMENSION_LOCALIDAD = "localidad"
+DIMENSION_SUBSISTEMA = "subsistema"
+CLAVE_TOTAL = "TOTAL"
+
+VENTANAS_MOVILES = (3, 12)
+
+_ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS ans_mensual (
+        dimension TEXT NOT NULL,
+        clave TEXT NOT NULL,
+        periodo INTEGER NOT NULL,
+        disponibilidad REAL NOT NULL,
+        horas_totales REAL,
+        horas_operativas REAL,
+        total_camaras INTEGER,
+        umbral REAL NOT NULL,
+        observaciones TEXT,
+        PRIMARY KEY (dimension, clave, periodo)
+    );
+    CREATE TABLE IF NOT EXISTS ans_acumulado (
+        dimension TEXT NOT NULL,
+        clave TEXT NOT NULL,
+        periodo INTEGER NOT NULL,
+        meses INTEGER NOT NULL,
+        meses_cumplidos INTEGER NOT NULL,
+        suma_disponibilidad REAL NOT NULL,
+        suma_horas_totales REAL NOT NULL,
+        suma_horas_operativas REAL NOT NULL,
+        movil_3 REAL,
+        movil_12 REAL,
+        PRIMARY KEY (dimension, clave, periodo)
+    );
+"""
+
+
+def periodo(anio: int, mes: int) -> int:
+    """Índice consecutivo de mes (para rangos y ventanas sin aritmética de fechas)"""
+    return anio * 12 + mes - 1
+
+
+def anio_mes(indice: int) -> tuple:
+    """Inverso de periodo(): (anio, mes)"""
+    return indice // 12, indice % 12 + 1
+
+
+def _mes_texto(indice: int) -> str:
+    anio, mes = anio_mes(indice)
+    return f"{config.MESES[mes]} {anio}"
+
+
+def _mes_desde_texto(texto: str) -> Optional[int]:
+    """'Septiembre 2025' -> periodo (None si no se reconoce)"""
+    partes = str(texto).strip().split()
+    if len(partes) != 2 or not partes[1].isdigit():
+        return None
+    nombres = {nombre.lower(): numero for numero, nombre in config.MESES.items()}
+    mes = nombres.get(partes[0].lower())
+    return periodo(int(partes[1]), mes) if mes else None
+
+
+class SerieANS:
+    """Serie mensual del ANS persistida localmente"""
+
+    def __init__(self, ruta: Optional[Path] = None):
+        """
+        Args:
+            ruta: Archivo SQLite (default: config.ANS_SERIE_DB_PATH)
+        """
+        self.ruta = Path(ruta or config.ANS_SERIE_DB_PATH)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        with self._lock:
+            self._conexion.executescript(_ESQUEMA)
+
+    def cerrar(self) -> None:
+        with self._lock:
+            self._conexion.close()
+
+    def cerrar_mes(self, anio: int, mes: int, disponibilidad: float,
+                   horas_totales: Optional[float] = None, horas_operativas: Optional[float] = None,
+                   total_camaras: Optional[int] = None, por_localidad: Iterable[Dict[str, Any]] = (),
+                   por_subsistema: Iterable[Dict[str, Any]] = (), observaciones: str = "-",
+                   umbral: Optional[float] = None) -> None:
+        """
+        Registra (o corrige) el ANS de un mes y actualiza sus agregados
+
+        Args:
+            anio: Año del mes cerrado
+            mes: Mes cerrado (1-12)
+            disponibilidad: Disponibilidad total del mes (%)
+            horas_totales: Horas base del cálculo (para la disponibilidad ponderada)
+            horas_operativas: Horas operativas del mes
+            total_camaras: Cámaras evaluadas
+            por_localidad: Filas con localidad (o nombre), disponibilidad y opcionalmente
+                horas/total_camaras (formato de disponibilidad_por_localidad)
+            por_subsistema: Igual, con la llave subsistema (o nombre)
+            observaciones: Texto para la tabla histórica
+            umbral: Umbral del ANS (default: config.CONTRATO["umbral_ans"])
+        """
+        umbral = umbral if umbral is not None else config.CONTRATO["umbral_ans"]
+        indice = periodo(anio, mes)
+        filas = [(DIMENSION_TOTAL, CLAVE_TOTAL, indice, float(disponibilidad), horas_totales,
+                  horas_operativas, total_camaras, umbral, observaciones)]
+        for dimension, registros in ((DIMENSION_LOCALIDAD, por_localidad), (DIMENSION_SUBSISTEMA, por_subsistema)):
+            omitidas = 0
+            for r in registros:
+                # Las fuentes JSON usan "nombre" o la llave de la dimensión
+                clave = r.get(dimension, r.get("nombre"))
+                if clave is None or r.get("disponibilidad") is None:
+                    omitidas += 1
+                    continue
+                horas_op = r.get("horas_operativas")
+                horas_no_op = r.get("horas_no_operativas")
+                horas_tot = r.get("horas_totales")
+                if horas_tot is None and horas_op is not None and horas_no_op is not None:
+                    horas_tot = horas_op + horas_no_op
+                filas.append((dimension, str(clave), indice, float(r["disponibilidad"]), horas_tot,
+                              horas_op, r.get("total_camaras"), umbral, None))
+            if omitidas:
+                logger.warning(f"{omitidas} filas por {dimension} sin {dimension}/nombre o disponibilidad "
+                               f"no se registraron en la serie del ANS ({_mes_texto(indice)})")
+
+        with self._lock, self._conexion:
+            self._conexion.executemany(
+                "INSERT OR REPLACE INTO ans_mensual VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", filas
+            )
+            for dimension, clave, *_ in filas:
+                self._actualizar_acumulados(dimension, clave, indice)
+
+    def importar_historico(self, historico: Iterable[Dict[str, Any]], umbral: Optional[float] = None) -> int:
+        """
+        Agrega a la serie total los meses de un histórico en formato del informe
+        ({"mes": "Enero 2025", "disponibilidad", "observaciones"}) que aún no
+        estén registrados
+
+        Returns:
+            Número de meses agregados
+        """
+        umbral = umbral if umbral is not None else config.CONTRATO["umbral_ans"]
+        registrados = set(self._periodos(DIMENSION_TOTAL, CLAVE_TOTAL))
+        nuevos = []
+        for h in historico:
+            indice = _mes_desde_texto(h.get("mes", ""))
+            if indice is None or indice in registrados or h.get("disponibilidad") is None:
+                continue
+            registrados.add(indice)
+            nuevos.append((DIMENSION_TOTAL, CLAVE_TOTAL, indice, float(h["disponibilidad"]), None, None, None,
+                           umbral, h.get("observaciones", "-")))
+        if not nuevos:
+            return 0
+        with self._lock, self._conexion:
+            self._conexion.executemany(
+                "INSERT INTO ans_mensual VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", nuevos
+            )
+            self._actualizar_acumulados(DIMENSION_TOTAL, CLAVE_TOTAL, min(f[2] for f in nuevos))
+        return len(nuevos)
+
+    def _periodos(self, dimension: str, clave: str) -> List[int]:
+        with self._lock:
+            return [f["periodo"] for f in self._conexion.execute(
+                "SELECT periodo FROM ans_mensual WHERE dimension = ? AND clave = ? ORDER BY periodo",
+                (dimension, clave)
+            )]
+
+    def _actualizar_acumulados(self, dimension: str, clave: str, desde: int) -> None:
+        """
+        Recalcula los acumulados de una clave desde el periodo indicado
+
+        Parte del acumulado del último mes anterior a `desde`; en el caso normal
+        (cerrar el mes siguiente al último) solo se escribe una fila. Se llama
+        con el lock tomado y dentro de la transacción.
+        """
+        conexion = self._conexion
+        previo = conexion.execute(
+            "SELECT * FROM ans_acumulado WHERE dimension = ? AND clave = ? AND periodo < ? "
+            "ORDER BY periodo DESC LIMIT 1", (dimension, clave, desde)
+        ).fetchone()
+        meses = previo["meses"] if previo else 0
+        cumplidos = previo["meses_cumplidos"] if previo else 0
+        suma_disp = previo["suma_disponibilidad"] if previo else 0.0
+        suma_tot = previo["suma_horas_totales"] if previo else 0.0
+        suma_op = previo["suma_horas_operativas"] if previo else 0.0
+
+        ventana_max = max(VENTANAS_MOVILES)
+        filas = conexion.execute(
+            "SELECT periodo, disponibilidad, horas_totales, horas_operativas, umbral FROM ans_mensual "
+            "WHERE dimension = ? AND clave = ? AND periodo >= ? ORDER BY periodo",
+            (dimension, clave, desde - ventana_max + 1)
+        ).fetchall()
+
+        acumulados = []
+        for i, fila in enumerate(filas):
+            if fila["periodo"] < desde:
+                continue
+            meses += 1
+            cumplidos += int(fila["disponibilidad"] >= fila["umbral"])
+            suma_disp += fila["disponibilidad"]
+            if fila["horas_totales"] and fila["horas_operativas"] is not None:
+                suma_tot += fila["horas_totales"]
+                suma_op += fila["horas_operativas"]
+            moviles = []
+            for n in VENTANAS_MOVILES:
+                valores = [f["disponibilidad"] for f in filas[:i + 1] if f["periodo"] > fila["periodo"] - n]
+                moviles.append(sum(valores) / len(valores))
+            acumulados.append((dimension, clave, fila["periodo"], meses, cumplidos, suma_disp, suma_tot, suma_op,
+                               *moviles))
+
+        conexion.executemany(
+            "INSERT OR REPLACE INTO ans_acumulado VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", acumulados
+        )
+
+    def historico(self, anio: int, mes: int, meses_atras: int = 12, dimension: str = DIMENSION_TOTAL,
+                  clave: str = CLAVE_TOTAL) -> List[Dict[str, Any]]:
+        """
+        Meses registrados en la ventana que termina en (anio, mes)
+
+        Returns:
+            [{"mes": "Enero 2025", "disponibilidad", "observaciones", "movil_3", "movil_12"}, ...]
+        """
+        fin = periodo(anio, mes)
+        with self._lock:
+            filas = self._conexion.execute("""
+                SELECT m.periodo, m.disponibilidad, m.observaciones, a.movil_3, a.movil_12
+                FROM ans_mensual m
+                JOIN ans_acumulado a USING (dimension, clave, periodo)
+                WHERE m.dimension = ? AND m.clave = ? AND m.periodo > ? AND m.periodo <= ?
+                ORDER BY m.periodo
+            """, (dimension, clave, fin - meses_atras, fin)).fetchall()
+        return [
+            {"mes": _mes_texto(f["periodo"]), "disponibilidad": f["disponibilidad"],
+             "observaciones": f["observaciones"] or "-", "movil_3": f["movil_3"], "movil_12": f["movil_12"]}
+            for f in filas
+        ]
+
+    def acumulado(self, anio: int, mes: int, dimension: str = DIMENSION_TOTAL,
+                  clave: str = CLAVE_TOTAL) -> Optional[Dict[str, Any]]:
+        """
+        Agregados acumulados hasta (anio, mes) inclusive
+
+        Returns:
+            {"meses", "meses_cumplidos", "meses_no_cumplidos", "porcentaje_cumplimiento",
+             "promedio", "disponibilidad_ponderada", "movil_3", "movil_12"} o None si no
+            hay meses registrados
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT * FROM ans_acumulado WHERE dimension = ? AND clave = ? AND periodo <= ? "
+                "ORDER BY periodo DESC LIMIT 1", (dimension, clave, periodo(anio, mes))
+            ).fetchone()
+        if fila is None:
+            return None
+        return {
+            "meses": fila["meses"],
+            "meses_cumplidos": fila["meses_cumplidos"],
+            "meses_no_cumplidos": fila["meses"] - fila["meses_cumplidos"],
+            "porcentaje_cumplimiento": fila["meses_cumplidos"] * 100 / fila["meses"],
+            "promedio": fila["suma_disponibilidad"] / fila["meses"],
+            "disponibilidad_ponderada": (fila["suma_horas_operativas"] * 100 / fila["suma_horas_totales"]
+                                         if fila["suma_horas_totales"] else None),
+            "movil_3": fila["movil_3"],
+            "movil_12": fila["movil_12"],
+        }
+
+    def ranking(self, anio: int, mes: int, dimension: str = DIMENSION_LOCALIDAD) -> List[Dict[str, Any]]:
+        """
+        Claves de una dimensión ordenadas por promedio acumulado hasta (anio, mes)
+
+        Returns:
+            [{dimension: clave, "promedio", "meses", "meses_cumplidos", "movil_3"}, ...]
+        """
+        with self._lock:
+            filas = self._conexion.execute("""
+                SELECT a.* FROM ans_acumulado a
+                JOIN (
+                    SELECT clave, MAX(periodo) AS periodo FROM ans_acumulado
+                    WHERE dimension = ? AND periodo <= ? GROUP BY clave
+                ) u USING (clave, periodo)
+                WHERE a.dimension = ?
+            """, (dimension, periodo(anio, mes), dimension)).fetchall()
+        resultado = [
+            {dimension: f["clave"], "promedio": f["suma_disponibilidad"] / f["meses"], "meses": f["meses"],
+             "meses_cumplidos": f["meses_cumplidos"], "movil_3": f["movil_3"]}
+            for f in filas
+        ]
+        return sorted(resultado, key=lambda r: r["promedio"], reverse=True)
+
+
+# Instancias por ruta (las pruebas apuntan config.ANS_SERIE_DB_PATH a otra base)
+_instancias: Dict[str, SerieANS] = {}
+_instancias_lock = threading.Lock()
+
+
+def get_serie_ans(ruta: Optional[Path] = None) -> SerieANS:
+    """Obtiene la serie del ANS para la ruta dada (default: config.ANS_SERIE_DB_PATH)"""
+    clave = str(Path(ruta or config.ANS_SERIE_DB_PATH).resolve())
+    with _instancias_lock:
+        if clave not in _instancias:
+            _instancias[clave] = SerieANS(Path(clave))
+        return _instancias[clave]
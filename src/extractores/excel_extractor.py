@@ -4,10 +4,27 @@ Para comunicados, inventario, facturas
 """
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from datetime import datetime
 import config
 
+# Esquemas de columnas: nombre -> (tipo, valor por defecto)
+COLUMNAS_ITEMS = {
+    "descripcion": (str, ""),
+    "cantidad": (int, 0),
+    "unidad": (str, "UN"),
+    "valor_unitario": (float, 0.0),
+    "valor_total": (float, 0.0),
+}
+COLUMNAS_ITEMS_BOLSA = dict(COLUMNAS_ITEMS, justificacion=(str, ""))
+COLUMNAS_EQUIPOS = {
+    "descripcion": (str, ""),
+    "serial": (str, "N/A"),
+    "cantidad": (int, 1),
+    "motivo": (str, ""),
+    "valor": (float, 0.0),
+}
+
 
 def leer_excel(ruta: Path, hoja: str = None) -> pd.DataFrame:
     """
@@ -39,6 +56,76 @@ def leer_csv(ruta: Path, separador: str = ',') -> pd.DataFrame:
     return pd.read_csv(ruta, sep=separador, encoding='utf-8')
 
 
+def leer_hojas(ruta: Path, hojas: Iterable[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Lee varias hojas de un Excel abriendo el libro una sola vez
+    
+    Usa openpyxl en modo read-only (las filas se leen en streaming, sin
+    cargar estilos ni el modelo completo de celdas). La primera fila de cada
+    hoja son los encabezados; las filas completamente vacías se descartan.
+    
+    Args:
+        ruta: Ruta al archivo Excel
+        hojas: Nombres de las hojas a leer
+    
+    Returns:
+        {nombre_hoja: DataFrame}; las hojas que no existen no se incluyen
+    """
+    from openpyxl import load_workbook
+    
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        resultado = {}
+        for hoja in hojas:
+            if hoja not in libro.sheetnames:
+                continue
+            filas = libro[hoja].iter_rows(values_only=True)
+            encabezados = next(filas, None)
+            if encabezados is None:
+                resultado[hoja] = pd.DataFrame()
+                continue
+            columnas = [str(c).strip() if c is not None else f"columna_{i}" for i, c in enumerate(encabezados)]
+            datos = [fila for fila in filas if any(v is not None for v in fila)]
+            resultado[hoja] = pd.DataFrame.from_records(datos, columns=columnas)
+        return resultado
+    finally:
+        libro.close()
+
+
+def _convertir_columnas(df: pd.DataFrame, esquema: Dict[str, Tuple[type, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convierte las columnas del esquema de forma vectorizada y retorna registros
+    
+    Las columnas faltantes toman el valor por defecto; en las numéricas los
+    valores vacíos o no numéricos también.
+    
+    Args:
+        df: DataFrame leído de la hoja
+        esquema: {columna: (tipo, valor por defecto)} con tipo str, int o float
+    
+    Returns:
+        Lista de diccionarios con las llaves del esquema
+    """
+    convertido = pd.DataFrame(index=df.index)
+    for columna, (tipo, defecto) in esquema.items():
+        if columna not in df.columns:
+            convertido[columna] = defecto
+        elif tipo is str:
+            convertido[columna] = df[columna].where(df[columna].notna(), defecto).astype(str)
+        else:
+            convertido[columna] = pd.to_numeric(df[columna], errors="coerce").fillna(defecto).astype(tipo)
+    return convertido.to_dict("records")
+
+
+def _comunicado(hojas: Dict[str, pd.DataFrame], campos: Iterable[str] = ("numero", "titulo", "fecha")) -> Dict[str, str]:
+    """Metadatos del comunicado (primera fila de la hoja 'Comunicado')"""
+    df_meta = hojas.get("Comunicado")
+    if df_meta is None or df_meta.empty:
+        return {}
+    fila = df_meta.iloc[0]
+    return {campo: str(fila.get(campo, "")) for campo in campos}
+
+
 def dataframe_a_dict(df: pd.DataFrame) -> List[Dict[str, Any]]:
     """
     Convierte un DataFrame a lista de diccionarios
@@ -81,31 +168,9 @@ class ExcelExtractor:
             return {"comunicado": {}, "items": [], "anexos": []}
         
         try:
-            # Leer datos
-            df = pd.read_excel(archivo, sheet_name="Items")
-            
-            items = []
-            for _, row in df.iterrows():
-                items.append({
-                    "descripcion": str(row.get("descripcion", "")),
-                    "cantidad": int(row.get("cantidad", 0)),
-                    "unidad": str(row.get("unidad", "UN")),
-                    "valor_unitario": float(row.get("valor_unitario", 0)),
-                    "valor_total": float(row.get("valor_total", 0))
-                })
-            
-            # Leer metadatos del comunicado (otra hoja)
-            comunicado = {}
-            try:
-                df_meta = pd.read_excel(archivo, sheet_name="Comunicado")
-                if not df_meta.empty:
-                    comunicado = {
-                        "numero": str(df_meta.iloc[0].get("numero", "")),
-                        "titulo": str(df_meta.iloc[0].get("titulo", "")),
-                        "fecha": str(df_meta.iloc[0].get("fecha", ""))
-                    }
-            except:
-                pass
+            hojas = leer_hojas(archivo, ("Items", "Comunicado"))
+            items = _convertir_columnas(hojas["Items"], COLUMNAS_ITEMS)
+            comunicado = _comunicado(hojas)
             
             return {
                 "comunicado": comunicado,
@@ -131,30 +196,9 @@ class ExcelExtractor:
             return {"comunicado": {}, "equipos": [], "anexos": []}
         
         try:
-            df = pd.read_excel(archivo, sheet_name="Equipos")
-            
-            equipos = []
-            for _, row in df.iterrows():
-                equipos.append({
-                    "descripcion": str(row.get("descripcion", "")),
-                    "serial": str(row.get("serial", "N/A")),
-                    "cantidad": int(row.get("cantidad", 1)),
-                    "motivo": str(row.get("motivo", "")),
-                    "valor": float(row.get("valor", 0))
-                })
-            
-            # Leer metadatos del comunicado
-            comunicado = {}
-            try:
-                df_meta = pd.read_excel(archivo, sheet_name="Comunicado")
-                if not df_meta.empty:
-                    comunicado = {
-                        "numero": str(df_meta.iloc[0].get("numero", "")),
-                        "titulo": str(df_meta.iloc[0].get("titulo", "")),
-                        "fecha": str(df_meta.iloc[0].get("fecha", ""))
-                    }
-            except:
-                pass
+            hojas = leer_hojas(archivo, ("Equipos", "Comunicado"))
+            equipos = _convertir_columnas(hojas["Equipos"], COLUMNAS_EQUIPOS)
+            comunicado = _comunicado(hojas)
             
             return {
                 "comunicado": comunicado,
@@ -180,33 +224,12 @@ class ExcelExtractor:
             return {"comunicado": {}, "items": [], "estado": "Sin solicitudes", "anexos": []}
         
         try:
-            df = pd.read_excel(archivo, sheet_name="Items")
-            
-            items = []
-            for _, row in df.iterrows():
-                items.append({
-                    "descripcion": str(row.get("descripcion", "")),
-                    "cantidad": int(row.get("cantidad", 0)),
-                    "unidad": str(row.get("unidad", "UN")),
-                    "valor_unitario": float(row.get("valor_unitario", 0)),
-                    "valor_total": float(row.get("valor_total", 0)),
-                    "justificacion": str(row.get("justificacion", ""))
-                })
-            
-            # Leer metadatos del comunicado
-            comunicado = {}
+            hojas = leer_hojas(archivo, ("Items", "Comunicado"))
+            items = _convertir_columnas(hojas["Items"], COLUMNAS_ITEMS_BOLSA)
+            comunicado = _comunicado(hojas)
             estado = "En trámite"
-            try:
-                df_meta = pd.read_excel(archivo, sheet_name="Comunicado")
-                if not df_meta.empty:
-                    comunicado = {
-                        "numero": str(df_meta.iloc[0].get("numero", "")),
-                        "titulo": str(df_meta.iloc[0].get("titulo", "")),
-                        "fecha": str(df_meta.iloc[0].get("fecha", ""))
-                    }
-                    estado = str(df_meta.iloc[0].get("estado", "En trámite"))
-            except:
-                pass
+            if comunicado:
+                estado = str(hojas["Comunicado"].iloc[0].get("estado", "En trámite"))
             
             return {
                 "comunicado": comunicado,
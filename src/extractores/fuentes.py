@@ -0,0 +1,151 @@
+"""
+Caché compartida de archivos fuente parseados (data/fuentes)
+
+Cada archivo JSON se parsea una sola vez mientras no cambie: la caché se
+indexa por ruta y se invalida cuando cambian su mtime o su tamaño. Varios
+extractores y secciones leen el mismo archivo (p. ej. mesa_servicio_{mes}_{año}.json
+lo usan la Sección 2 y GLPIExtractor) sin volver a abrirlo.
+
+Los datos se entregan como vistas de solo lectura (dict/list que no admiten
+modificación) porque se comparten entre todos los consumidores. Para
+modificarlos se copian: dict(vista) para el primer nivel o copy.deepcopy(vista)
+para obtener dict/list normales en todos los niveles.
+
+Es seguro usarla desde varios hilos: cada archivo se parsea una sola vez
+aunque varias secciones lo pidan al mismo tiempo.
+"""
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def _solo_lectura(self, *args, **kwargs):
+    raise TypeError("Los datos de fuentes son de solo lectura: use dict()/copy.deepcopy() para modificarlos")
+
+
+class DictSoloLectura(dict):
+    """dict inmutable con los datos de un archivo fuente"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _solo_lectura
+    clear = pop = popitem = setdefault = update = _solo_lectura
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {clave: copy.deepcopy(valor, memo) for clave, valor in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class ListaSoloLectura(list):
+    """list inmutable con los datos de un archivo fuente"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _solo_lectura
+    append = extend = insert = pop = remove = clear = sort = reverse = _solo_lectura
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(valor, memo) for valor in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _congelar(valor: Any) -> Any:
+    """Convierte recursivamente dict/list en sus versiones de solo lectura"""
+    if isinstance(valor, dict):
+        return DictSoloLectura((clave, _congelar(v)) for clave, v in valor.items())
+    if isinstance(valor, list):
+        return ListaSoloLectura(_congelar(v) for v in valor)
+    return valor
+
+
+# ruta -> ((mtime_ns, tamaño), datos)
+_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_cache_lock = threading.Lock()
+_locks_archivo: Dict[str, threading.Lock] = {}
+_estadisticas = {"lecturas": 0, "aciertos": 0}
+
+
+def _lock_archivo(clave: str) -> threading.Lock:
+    with _cache_lock:
+        return _locks_archivo.setdefault(clave, threading.Lock())
+
+
+def leer_fuente_json(ruta: Path) -> Optional[Any]:
+    """
+    Retorna el contenido parseado del archivo JSON, parseándolo solo si cambió
+
+    Args:
+        ruta: Ruta del archivo fuente
+
+    Returns:
+        Datos de solo lectura (DictSoloLectura / ListaSoloLectura) o None si el
+        archivo no existe o no se pudo parsear
+    """
+    clave = str(Path(ruta).resolve())
+    try:
+        stat = Path(clave).stat()
+    except OSError:
+        return None
+    firma = (stat.st_mtime_ns, stat.st_size)
+
+    entrada = _cache.get(clave)
+    if entrada is not None and entrada[0] == firma:
+        _estadisticas["aciertos"] += 1
+        return entrada[1]
+
+    with _lock_archivo(clave):
+        # Otro hilo pudo parsearlo mientras se esperaba el lock
+        entrada = _cache.get(clave)
+        if entrada is not None and entrada[0] == firma:
+            _estadisticas["aciertos"] += 1
+            return entrada[1]
+        try:
+            with open(clave, 'r', encoding='utf-8') as f:
+                datos = _congelar(json.load(f))
+        except Exception as e:
+            print(f"[WARNING] Error al cargar {ruta}: {e}")
+            return None
+        with _cache_lock:
+            _cache[clave] = (firma, datos)
+            _estadisticas["lecturas"] += 1
+        return datos
+
+
+def obtener_campo_fuente(ruta: Path, campo: str, default: Any = None) -> Any:
+    """
+    Retorna un campo del primer nivel de un archivo fuente JSON
+
+    Args:
+        ruta: Ruta del archivo fuente
+        campo: Nombre del campo
+        default: Valor si el archivo o el campo no existen
+
+    Returns:
+        Valor del campo (de solo lectura) o default
+    """
+    datos = leer_fuente_json(ruta)
+    if not isinstance(datos, dict):
+        return default
+    return datos.get(campo, default)
+
+
+def limpiar_cache_fuentes() -> None:
+    """Descarta los archivos parseados (p. ej. al terminar la generación del informe)"""
+    with _cache_lock:
+        _cache.clear()
+        _locks_archivo.clear()
+        _estadisticas.update(lecturas=0, aciertos=0)
+
+
+def estadisticas_cache_fuentes() -> Dict[str, int]:
+    """Archivos en caché, parseos realizados y lecturas servidas desde la caché"""
+    with _cache_lock:
+        return {"archivos": len(_cache), **_estadisticas}
@@ -0,0 +1,166 @@
+"""
+Caché columnar de archivos fuente tabulares (CSV/XLSX de data/fuentes)
+
+La primera lectura de cada archivo lo convierte a un archivo tipado en
+config.CACHE_DIR / "fuentes" (Parquet si pyarrow está instalado; si no,
+un pickle del DataFrame). Las lecturas siguientes cargan esa copia sin
+volver a parsear el CSV/Excel y, en Parquet, solo las columnas pedidas
+(proyección) con memory map.
+
+Invalidación:
+- Si el mtime y el tamaño del archivo fuente no cambiaron, se usa la copia.
+- Si cambiaron pero el SHA-256 del contenido es el mismo (p. ej. el archivo
+  se copió de nuevo), se usa la copia y se actualiza la firma.
+- Si el contenido cambió, se vuelve a convertir.
+
+La clave de la copia incluye la ruta y las opciones de lectura (hoja,
+dtype, parse_dates...), así que un mismo archivo leído con opciones
+distintas tiene copias independientes.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+import pandas as pd
+import config
+from src.utils.escritura_segura import escribir_atomico, escribir_texto_atomico
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIBLE = True
+except ImportError:
+    PARQUET_DISPONIBLE = False
+
+CACHE_FUENTES_DIR = config.CACHE_DIR / "fuentes"
+
+_lock = threading.Lock()
+_locks_archivo: Dict[str, threading.Lock] = {}
+_estadisticas = {"conversiones": 0, "aciertos": 0}
+
+
+def _lock_archivo(clave: str) -> threading.Lock:
+    with _lock:
+        return _locks_archivo.setdefault(clave, threading.Lock())
+
+
+def _hash_archivo(ruta: Path) -> str:
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _leer_original(ruta: Path, hoja: Optional[str], opciones: Dict[str, Any]) -> pd.DataFrame:
+    if ruta.suffix.lower() in (".xlsx", ".xlsm", ".xls"):
+        return pd.read_excel(ruta, sheet_name=hoja or 0, **opciones)
+    return pd.read_csv(ruta, encoding=opciones.pop("encoding", "utf-8"), **opciones)
+
+
+def _guardar_copia(df: pd.DataFrame, base: Path) -> str:
+    """Guarda la copia tipada y retorna su formato ('parquet' o 'pickle')"""
+    if PARQUET_DISPONIBLE:
+        try:
+            escribir_atomico(base.with_suffix(".parquet"), lambda p: df.to_parquet(p, engine="pyarrow", index=False))
+            return "parquet"
+        except Exception as e:
+            # Columnas object con tipos mezclados que Arrow no puede tipar
+            print(f"[WARNING] No se pudo convertir a Parquet ({e}); se usa pickle")
+    escribir_atomico(base.with_suffix(".pkl"), lambda p: df.to_pickle(p))
+    return "pickle"
+
+
+def _cargar_copia(base: Path, meta: Dict[str, Any], columnas: Optional[Iterable[str]]) -> pd.DataFrame:
+    seleccion = None
+    if columnas is not None:
+        seleccion = [c for c in columnas if c in meta["columnas"]]
+    if meta["formato"] == "parquet":
+        return pd.read_parquet(base.with_suffix(".parquet"), engine="pyarrow", columns=seleccion, memory_map=True)
+    df = pd.read_pickle(base.with_suffix(".pkl"))
+    return df[seleccion] if seleccion is not None else df
+
+
+def leer_fuente_tabla(ruta: Path, columnas: Optional[Iterable[str]] = None,
+                      hoja: Optional[str] = None, **opciones) -> pd.DataFrame:
+    """
+    Lee un CSV/XLSX fuente a través de la caché columnar
+
+    Args:
+        ruta: Archivo CSV o Excel
+        columnas: Columnas a cargar (las que no existen se ignoran); None = todas
+        hoja: Hoja del Excel (default: la primera)
+        **opciones: Opciones de pd.read_csv / pd.read_excel (dtype, parse_dates...)
+
+    Returns:
+        DataFrame con las columnas pedidas
+
+    Raises:
+        FileNotFoundError: Si el archivo fuente no existe
+        Exception: Los errores de parseo de pandas en la primera lectura
+    """
+    ruta = Path(ruta).resolve()
+    stat = ruta.stat()
+    firma = [stat.st_mtime_ns, stat.st_size]
+    clave = hashlib.sha256(
+        json.dumps([str(ruta), hoja, opciones], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:32]
+    CACHE_FUENTES_DIR.mkdir(parents=True, exist_ok=True)
+    base = CACHE_FUENTES_DIR / clave
+    archivo_meta = base.with_suffix(".json")
+
+    with _lock_archivo(clave):
+        meta = None
+        if archivo_meta.exists():
+            try:
+                meta = json.loads(archivo_meta.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                meta = None
+
+        if meta is not None and meta["firma"] != firma:
+            # mtime/tamaño distintos: solo se reconvierte si cambió el contenido
+            if meta["sha256"] == _hash_archivo(ruta):
+                meta["firma"] = firma
+                escribir_texto_atomico(archivo_meta, json.dumps(meta))
+            else:
+                meta = None
+
+        if meta is not None:
+            try:
+                df = _cargar_copia(base, meta, columnas)
+                with _lock:
+                    _estadisticas["aciertos"] += 1
+                return df
+            except (OSError, ValueError, KeyError, ImportError) as e:
+                print(f"[WARNING] Copia en caché de {ruta.name} inválida, se reconvierte: {e}")
+
+        df = _leer_original(ruta, hoja, dict(opciones))
+        sha256 = _hash_archivo(ruta)
+        formato = _guardar_copia(df, base)
+        meta = {"firma": firma, "sha256": sha256, "formato": formato,
+                "columnas": [str(c) for c in df.columns], "fuente": str(ruta)}
+        escribir_texto_atomico(archivo_meta, json.dumps(meta))
+        with _lock:
+            _estadisticas["conversiones"] += 1
+
+    if columnas is not None:
+        df = df[[c for c in columnas if c in df.columns]]
+    return df
+
+
+def limpiar_cache_tablas() -> None:
+    """Borra las copias convertidas (se regeneran en la siguiente lectura)"""
+    with _lock:
+        if CACHE_FUENTES_DIR.exists():
+            for archivo in CACHE_FUENTES_DIR.iterdir():
+                # Los temporales (.nombre...tmp.ext) pertenecen a escrituras en curso
+                if archivo.suffix in (".parquet", ".pkl", ".json") and not archivo.name.startswith("."):
+                    archivo.unlink(missing_ok=True)
+        _locks_archivo.clear()
+        _estadisticas.update(conversiones=0, aciertos=0)
+
+
+def estadisticas_cache_tablas() -> Dict[str, Any]:
+    """Conversiones realizadas, lecturas servidas desde la caché y formato en uso"""
+    with _lock:
+        return {**_estadisticas, "formato": "parquet" if PARQUET_DISPONIBLE else "pickle"}
@@ -0,0 +1,207 @@
+"""
+Almacén local de tickets GLPI (SQLite) con sincronización incremental
+
+Los tickets descargados de GLPI se guardan en config.GLPI_DB_PATH. Cada
+sincronización pide solo los tickets modificados desde el último date_mod
+registrado y los inserta/actualiza por id, de modo que los agregados
+mensuales se calculan con SQL local sin volver a descargar el histórico.
+"""
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import sqlite3
+import threading
+import config
+
+# Estados de ticket de GLPI -> estado del informe
+ESTADOS_GLPI = {
+    1: "NUEVO",
+    2: "EN PROCESO",
+    3: "EN PROCESO",
+    4: "PENDIENTE",
+    5: "CERRADO",
+    6: "CERRADO",
+}
+ESTADOS_CERRADOS = (5, 6)
+
+_ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS tickets (
+        id INTEGER PRIMARY KEY,
+        nombre TEXT,
+        estado INTEGER,
+        fecha_apertura TEXT,
+        fecha_cierre TEXT,
+        date_mod TEXT,
+        entidad TEXT,
+        categoria TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_tickets_apertura ON tickets (fecha_apertura);
+    CREATE TABLE IF NOT EXISTS sincronizacion (
+        clave TEXT PRIMARY KEY,
+        valor TEXT
+    );
+"""
+
+_COLUMNAS = ("id", "nombre", "estado", "fecha_apertura", "fecha_cierre", "date_mod", "entidad", "categoria")
+
+
+def _ultimo_segmento(nombre: Optional[str]) -> str:
+    """'ETB > CIUDADANA' -> 'CIUDADANA' (GLPI retorna nombres completos jerárquicos)"""
+    if not nombre:
+        return "SIN CLASIFICAR"
+    return str(nombre).split(">")[-1].strip().upper()
+
+
+class AlmacenTicketsGLPI:
+    """Tickets de GLPI persistidos localmente"""
+
+    def __init__(self, ruta: Optional[Path] = None):
+        """
+        Args:
+            ruta: Archivo SQLite (default: config.GLPI_DB_PATH)
+        """
+        self.ruta = Path(ruta or config.GLPI_DB_PATH)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        with self._lock:
+            self._conexion.executescript(_ESQUEMA)
+
+    def cerrar(self) -> None:
+        with self._lock:
+            self._conexion.close()
+
+    def ultimo_date_mod(self) -> Optional[str]:
+        """date_mod más reciente sincronizado"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT valor FROM sincronizacion WHERE clave = 'ultimo_date_mod'"
+            ).fetchone()
+        return fila["valor"] if fila else None
+
+    def guardar_tickets(self, tickets: List[Dict[str, Any]]) -> int:
+        """
+        Inserta o actualiza tickets por id y avanza la marca de sincronización
+
+        Returns:
+            Número de tickets guardados
+        """
+        if not tickets:
+            return 0
+        filas = [tuple(t.get(c) for c in _COLUMNAS) for t in tickets]
+        maximo = max((t.get("date_mod") or "" for t in tickets), default="")
+        with self._lock, self._conexion:
+            self._conexion.executemany(
+                f"INSERT OR REPLACE INTO tickets ({', '.join(_COLUMNAS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNAS))})",
+                filas
+            )
+            actual = self._conexion.execute(
+                "SELECT valor FROM sincronizacion WHERE clave = 'ultimo_date_mod'"
+            ).fetchone()
+            if maximo and (actual is None or maximo > actual["valor"]):
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO sincronizacion (clave, valor) VALUES ('ultimo_date_mod', ?)",
+                    (maximo,)
+                )
+        return len(filas)
+
+    def sincronizar(self, cliente) -> int:
+        """
+        Descarga de GLPI los tickets modificados desde la última sincronización
+
+        Se pide desde un segundo antes del último date_mod (el filtro de GLPI es
+        estricto) y se guarda por id, así que los tickets repetidos se
+        sobrescriben sin duplicarse.
+
+        Args:
+            cliente: GLPIClient
+
+        Returns:
+            Número de tickets recibidos
+        """
+        desde = self.ultimo_date_mod()
+        if desde:
+            desde = (datetime.strptime(desde, "%Y-%m-%d %H:%M:%S") - timedelta(seconds=1)).strftime("%Y-%m-%d %H:%M:%S")
+        tickets = cliente.buscar_tickets(modificados_desde=desde)
+        return self.guardar_tickets(tickets)
+
+    def _consultar(self, consulta: str, parametros: tuple) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conexion.execute(consulta, parametros).fetchall()
+
+    @staticmethod
+    def _rango_mes(mes: int, anio: int):
+        inicio = date(anio, mes, 1)
+        fin = date(anio + 1, 1, 1) if mes == 12 else date(anio, mes + 1, 1)
+        return inicio.isoformat(), fin.isoformat()
+
+    def contar_tickets_mes(self, mes: int, anio: int) -> int:
+        """Tickets abiertos en el mes"""
+        return self._consultar(
+            "SELECT COUNT(*) AS n FROM tickets WHERE fecha_apertura >= ? AND fecha_apertura < ?",
+            self._rango_mes(mes, anio)
+        )[0]["n"]
+
+    def tickets_por_proyecto(self, mes: int, anio: int) -> List[Dict[str, Any]]:
+        """Tickets del mes agrupados por entidad (proyecto)"""
+        filas = self._consultar(f"""
+            SELECT entidad,
+                   COUNT(*) AS generados,
+                   SUM(CASE WHEN estado IN {ESTADOS_CERRADOS} THEN 1 ELSE 0 END) AS cerrados
+            FROM tickets
+            WHERE fecha_apertura >= ? AND fecha_apertura < ?
+            GROUP BY entidad
+        """, self._rango_mes(mes, anio))
+
+        proyectos: Dict[str, Dict[str, Any]] = {}
+        for fila in filas:
+            proyecto = proyectos.setdefault(_ultimo_segmento(fila["entidad"]), {
+                "proyecto": _ultimo_segmento(fila["entidad"]), "generados": 0, "cerrados": 0, "abiertos": 0
+            })
+            proyecto["generados"] += fila["generados"]
+            proyecto["cerrados"] += fila["cerrados"]
+            proyecto["abiertos"] = proyecto["generados"] - proyecto["cerrados"]
+        return sorted(proyectos.values(), key=lambda p: p["generados"], reverse=True)
+
+    def tickets_por_estado(self, mes: int, anio: int) -> List[Dict[str, Any]]:
+        """Tickets del mes agrupados por estado del informe"""
+        filas = self._consultar("""
+            SELECT estado, COUNT(*) AS cantidad
+            FROM tickets
+            WHERE fecha_apertura >= ? AND fecha_apertura < ?
+            GROUP BY estado
+        """, self._rango_mes(mes, anio))
+        return self._con_porcentaje(
+            self._sumar((ESTADOS_GLPI.get(f["estado"], "OTRO"), f["cantidad"]) for f in filas), "estado"
+        )
+
+    def tickets_por_subsistema(self, mes: int, anio: int) -> List[Dict[str, Any]]:
+        """Tickets del mes agrupados por categoría (subsistema)"""
+        filas = self._consultar("""
+            SELECT categoria, COUNT(*) AS cantidad
+            FROM tickets
+            WHERE fecha_apertura >= ? AND fecha_apertura < ?
+            GROUP BY categoria
+        """, self._rango_mes(mes, anio))
+        return self._con_porcentaje(
+            self._sumar((_ultimo_segmento(f["categoria"]), f["cantidad"]) for f in filas), "subsistema"
+        )
+
+    @staticmethod
+    def _sumar(pares) -> Dict[str, int]:
+        """Suma cantidades de claves repetidas (p. ej. estados 2 y 3 -> EN PROCESO)"""
+        totales: Dict[str, int] = {}
+        for clave, cantidad in pares:
+            totales[clave] = totales.get(clave, 0) + cantidad
+        return totales
+
+    @staticmethod
+    def _con_porcentaje(totales: Dict[str, int], nombre: str) -> List[Dict[str, Any]]:
+        pares = sorted(totales.items(), key=lambda p: p[1], reverse=True)
+        total = sum(cantidad for _, cantidad in pares)
+        return [
+            {nombre: clave, "cantidad": cantidad, "porcentaje": round(cantidad * 100 / total, 1) if total else 0}
+            for clave, cantidad in pares
+        ]
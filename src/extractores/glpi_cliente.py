@@ -0,0 +1,171 @@
+"""
+Cliente REST de GLPI con sesión reutilizable y paginación concurrente
+
+- Una sesión HTTP (requests.Session) con pool de conexiones para todas las
+  peticiones; el session_token de GLPI se obtiene con initSession y se
+  renueva si GLPI lo rechaza (sesión vencida en un worker de larga vida).
+- Búsqueda de tickets por /search/Ticket con paginación por `range`: la
+  primera página retorna el total y las siguientes se piden en paralelo.
+- Filtro por date_mod para sincronización incremental.
+
+Referencia: https://github.com/glpi-project/glpi/blob/main/apirest.md
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+import config
+
+# Campos de búsqueda de GLPI (search options de Ticket) -> nombre local
+CAMPOS_TICKET = {
+    2: "id",
+    1: "nombre",
+    12: "estado",
+    15: "fecha_apertura",
+    16: "fecha_cierre",
+    19: "date_mod",
+    80: "entidad",
+    7: "categoria",
+}
+CAMPO_DATE_MOD = 19
+
+
+class GLPIError(Exception):
+    """Error de comunicación con la API de GLPI"""
+
+
+def _sesion_rechazada(respuesta: requests.Response) -> bool:
+    """True si GLPI rechazó el Session-Token (401 / ERROR_SESSION_TOKEN_INVALID)"""
+    return respuesta.status_code == 401 or "ERROR_SESSION_TOKEN_INVALID" in respuesta.text[:200]
+
+
+class GLPIClient:
+    """Cliente de la API REST de GLPI"""
+
+    def __init__(self, api_url: Optional[str] = None, user_token: Optional[str] = None,
+                 app_token: Optional[str] = None, tamano_pagina: Optional[int] = None,
+                 hilos: Optional[int] = None, timeout: float = 30):
+        """
+        Args:
+            api_url: URL de apirest.php (default: config.GLPI_API_URL)
+            user_token: Token de usuario (default: config.GLPI_API_TOKEN)
+            app_token: App-Token del cliente API (default: config.GLPI_APP_TOKEN)
+            tamano_pagina: Tickets por petición (default: config.GLPI_TAMANO_PAGINA)
+            hilos: Páginas pedidas en paralelo (default: config.GLPI_HILOS)
+            timeout: Timeout por petición en segundos
+        """
+        self.api_url = (api_url or config.GLPI_API_URL).rstrip("/")
+        self.user_token = user_token or config.GLPI_API_TOKEN
+        self.app_token = app_token if app_token is not None else getattr(config, 'GLPI_APP_TOKEN', '')
+        self.tamano_pagina = tamano_pagina or getattr(config, 'GLPI_TAMANO_PAGINA', 1000)
+        self.hilos = hilos or getattr(config, 'GLPI_HILOS', 4)
+        self.timeout = timeout
+
+        self._http = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.hilos)
+        self._http.mount("http://", adaptador)
+        self._http.mount("https://", adaptador)
+        self._session_token: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _encabezados(self, con_sesion: bool = True) -> Dict[str, str]:
+        encabezados = {"Content-Type": "application/json"}
+        if self.app_token:
+            encabezados["App-Token"] = self.app_token
+        if con_sesion:
+            encabezados["Session-Token"] = self.iniciar_sesion()
+        else:
+            encabezados["Authorization"] = f"user_token {self.user_token}"
+        return encabezados
+
+    def iniciar_sesion(self) -> str:
+        """Obtiene el session_token (se reutiliza hasta que GLPI lo rechace)"""
+        with self._lock:
+            if self._session_token is None:
+                respuesta = self._http.get(
+                    f"{self.api_url}/initSession", headers=self._encabezados(con_sesion=False),
+                    timeout=self.timeout
+                )
+                if respuesta.status_code != 200:
+                    raise GLPIError(f"initSession falló ({respuesta.status_code}): {respuesta.text[:200]}")
+                self._session_token = respuesta.json()["session_token"]
+            return self._session_token
+
+    def cerrar_sesion(self) -> None:
+        """Cierra la sesión de GLPI y las conexiones HTTP"""
+        with self._lock:
+            token, self._session_token = self._session_token, None
+        if token:
+            try:
+                encabezados = {"Session-Token": token}
+                if self.app_token:
+                    encabezados["App-Token"] = self.app_token
+                self._http.get(f"{self.api_url}/killSession", headers=encabezados, timeout=self.timeout)
+            except requests.RequestException:
+                pass
+        self._http.close()
+
+    def _invalidar_sesion(self, token: str) -> None:
+        """Descarta el session_token rechazado (si otro hilo no lo renovó ya)"""
+        with self._lock:
+            if self._session_token == token:
+                self._session_token = None
+
+    def _pagina(self, parametros: Dict[str, Any], inicio: int) -> Dict[str, Any]:
+        """Pide una página de /search/Ticket (range inclusivo inicio-fin)"""
+        parametros = dict(parametros, range=f"{inicio}-{inicio + self.tamano_pagina - 1}")
+        for intento in range(2):
+            encabezados = self._encabezados()
+            respuesta = self._http.get(
+                f"{self.api_url}/search/Ticket", params=parametros, headers=encabezados,
+                timeout=self.timeout
+            )
+            if intento == 0 and _sesion_rechazada(respuesta):
+                # Sesión vencida: se pide un session_token nuevo y se reintenta una vez
+                self._invalidar_sesion(encabezados["Session-Token"])
+                continue
+            break
+        if respuesta.status_code not in (200, 206):
+            raise GLPIError(f"search/Ticket falló ({respuesta.status_code}): {respuesta.text[:200]}")
+        return respuesta.json()
+
+    def buscar_tickets(self, modificados_desde: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Descarga los tickets (opcionalmente solo los modificados desde una fecha)
+
+        Args:
+            modificados_desde: Fecha "AAAA-MM-DD HH:MM:SS"; solo tickets con
+                date_mod posterior
+
+        Returns:
+            Lista de tickets con las llaves de CAMPOS_TICKET
+        """
+        parametros: Dict[str, Any] = {
+            "uid_cols": 0,
+            "sort": CAMPO_DATE_MOD,
+            "order": "ASC",
+        }
+        for i, campo in enumerate(CAMPOS_TICKET):
+            parametros[f"forcedisplay[{i}]"] = campo
+        if modificados_desde:
+            parametros.update({
+                "criteria[0][field]": CAMPO_DATE_MOD,
+                "criteria[0][searchtype]": "morethan",
+                "criteria[0][value]": modificados_desde,
+            })
+
+        primera = self._pagina(parametros, 0)
+        total = int(primera.get("totalcount", 0))
+        paginas = [primera]
+
+        inicios = list(range(self.tamano_pagina, total, self.tamano_pagina))
+        if inicios:
+            with ThreadPoolExecutor(max_workers=self.hilos) as executor:
+                paginas.extend(executor.map(lambda inicio: self._pagina(parametros, inicio), inicios))
+
+        tickets = []
+        for pagina in paginas:
+            for fila in pagina.get("data", []):
+                tickets.append({nombre: fila.get(str(campo)) for campo, nombre in CAMPOS_TICKET.items()})
+        return tickets
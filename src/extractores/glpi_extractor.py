@@ -1,25 +1,115 @@
 """
 Extractor de datos del sistema GLPI
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
-import json
 from pathlib import Path
+import threading
+import time
 import config
+from .fuentes import obtener_campo_fuente
 
 
 class GLPIExtractor:
-    """Extrae datos del sistema GLPI"""
+    """
+    Extrae datos del sistema GLPI
     
-    def __init__(self, api_url: str = None, api_token: str = None):
-        """Inicializa el extractor con configuración de API"""
+    Con la API configurada, los tickets se sincronizan de forma incremental
+    (por date_mod) a un almacén local y los agregados del mes se calculan
+    sobre esa copia. Sin API se usan los JSON de fuentes o datos de ejemplo.
+    """
+    
+    # Segundos antes de reintentar una sincronización fallida
+    REINTENTO_FALLIDO_S = 60
+    
+    def __init__(self, api_url: str = None, api_token: str = None, almacen=None, cliente=None):
+        """
+        Inicializa el extractor con configuración de API
+        
+        Args:
+            api_url: URL de apirest.php (default: config.GLPI_API_URL)
+            api_token: Token de usuario de GLPI (default: config.GLPI_API_TOKEN)
+            almacen: AlmacenTicketsGLPI a usar (default: config.GLPI_DB_PATH)
+            cliente: GLPIClient a usar (default: uno con api_url/api_token)
+        """
         self.api_url = api_url or getattr(config, 'GLPI_API_URL', None)
         self.api_token = api_token or getattr(config, 'GLPI_API_TOKEN', None)
+        self._almacen = almacen
+        self._cliente = cliente
+        self._sincronizado_en: Optional[float] = None
+        self._fallido_en: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def api_configurada(self) -> bool:
+        """True si hay URL y token real de GLPI (o un cliente inyectado)"""
+        if self._cliente is not None:
+            return True
+        return bool(self.api_url) and bool(self.api_token) and self.api_token != "TU_TOKEN_AQUI"
+    
+    @property
+    def almacen(self):
+        """Almacén local de tickets (se abre en el primer uso)"""
+        if self._almacen is None:
+            from .glpi_almacen import AlmacenTicketsGLPI
+            self._almacen = AlmacenTicketsGLPI()
+        return self._almacen
+    
+    def sincronizar(self, forzar: bool = False) -> int:
+        """
+        Trae de GLPI los tickets modificados desde la última sincronización
+        
+        Los get_* la invocan en cada consulta: una sincronización exitosa vale
+        por config.GLPI_SINCRONIZACION_TTL_S segundos (la instancia es un
+        singleton que vive lo que el worker del API) y una fallida se
+        reintenta tras REINTENTO_FALLIDO_S segundos.
+        
+        Args:
+            forzar: Sincronizar aunque la última sincronización siga vigente
+        
+        Returns:
+            Número de tickets recibidos
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            if not forzar:
+                ttl = getattr(config, 'GLPI_SINCRONIZACION_TTL_S', 300)
+                if self._sincronizado_en is not None and ahora - self._sincronizado_en < ttl:
+                    return 0
+                if self._fallido_en is not None and ahora - self._fallido_en < self.REINTENTO_FALLIDO_S:
+                    return 0
+            try:
+                if self._cliente is None:
+                    from .glpi_cliente import GLPIClient
+                    self._cliente = GLPIClient(api_url=self.api_url, user_token=self.api_token)
+                recibidos = self.almacen.sincronizar(self._cliente)
+            except Exception as e:
+                self._fallido_en = ahora
+                print(f"[WARNING] No se pudo sincronizar GLPI: {e}")
+                return 0
+            self._sincronizado_en, self._fallido_en = ahora, None
+            print(f"[INFO] GLPI: {recibidos} tickets sincronizados")
+            return recibidos
+    
+    def _agregado_glpi(self, metodo: str, mes: int, año: int) -> Optional[List[Dict]]:
+        """Agregado del mes desde el almacén local (None si no hay tickets del mes)"""
+        if not self.api_configurada:
+            return None
+        self.sincronizar()
+        try:
+            if self.almacen.contar_tickets_mes(mes, año) == 0:
+                return None
+            return getattr(self.almacen, metodo)(mes, año)
+        except Exception as e:
+            print(f"[WARNING] Error al consultar tickets GLPI locales: {e}")
+            return None
     
     def get_tickets_por_proyecto(self, mes: int, año: int) -> List[Dict]:
         """Tickets agrupados por proyecto"""
-        # Por ahora retorna datos de ejemplo
-        # TODO: Implementar query real a GLPI
+        datos_glpi = self._agregado_glpi("tickets_por_proyecto", mes, año)
+        if datos_glpi:
+            return datos_glpi
+        
         datos_json = self._cargar_datos_desde_json(mes, año, "tickets_por_proyecto", None)
         if datos_json:
             return datos_json
@@ -33,6 +123,10 @@ class GLPIExtractor:
     
     def get_tickets_por_estado(self, mes: int, año: int) -> List[Dict]:
         """Tickets agrupados por estado"""
+        datos_glpi = self._agregado_glpi("tickets_por_estado", mes, año)
+        if datos_glpi:
+            return datos_glpi
+        
         datos_json = self._cargar_datos_desde_json(mes, año, "tickets_por_estado", None)
         if datos_json:
             return datos_json
@@ -47,6 +141,10 @@ class GLPIExtractor:
     
     def get_tickets_por_subsistema(self, mes: int, año: int) -> List[Dict]:
         """Tickets agrupados por subsistema"""
+        datos_glpi = self._agregado_glpi("tickets_por_subsistema", mes, año)
+        if datos_glpi:
+            return datos_glpi
+        
         datos_json = self._cargar_datos_desde_json(mes, año, "tickets_por_subsistema", None)
         if datos_json:
             return datos_json
@@ -104,20 +202,11 @@ class GLPIExtractor:
             default: Valor por defecto si no se encuentra
         
         Returns:
-            Valor del campo o default
+            Valor del campo (de solo lectura) o default
         """
         archivo = config.FUENTES_DIR / f"mesa_servicio_{mes}_{año}.json"
-        
-        if archivo.exists():
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get(campo, default)
-            except Exception as e:
-                print(f"[WARNING] Error al cargar {archivo}: {e}")
-                return default
-        
-        return default
+        # El archivo se parsea una sola vez y se comparte entre todos los get_*
+        return obtener_campo_fuente(archivo, campo, default)
 
 
 # Singleton
@@ -1,55 +1,279 @@
 """
 Extractor de datos de disponibilidad desde MySQL
 Base de datos de monitoreo de cámaras
+
+Las consultas filtran por rangos de fecha (fecha >= inicio AND fecha < fin)
+para que MySQL use el índice sobre `fecha`, y agregan en el servidor (SUM,
+GROUP BY) en lugar de traer las filas diarias. Las conexiones se toman de un
+pool. El mismo código funciona sobre SQLite (motor "sqlite") para pruebas y
+benchmarks sin servidor MySQL.
+
+Tabla esperada:
+    disponibilidad_diaria(fecha DATE, id_camara, localidad,
+                          horas_operativas, horas_no_operativas)
+    con índice sobre (fecha, localidad)
+
+Si no hay base configurada, los datos se leen de data/fuentes/ans_{mes}_{anio}.json.
 """
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, date
 from calendar import monthrange
-import json
+from contextlib import contextmanager
+from decimal import Decimal
 from pathlib import Path
+import queue
+import sqlite3
+import threading
 import config
+from .fuentes import obtener_campo_fuente
+from .ans_serie import get_serie_ans
+
+# Intentar importar el conector de MySQL
+try:
+    from mysql.connector import pooling as mysql_pooling
+    MYSQL_DISPONIBLE = True
+except ImportError:
+    MYSQL_DISPONIBLE = False
+
+
+# Esquema de la base local (SQLite). En MySQL la tabla la administra el sistema de monitoreo
+ESQUEMA_SQLITE = """
+    CREATE TABLE IF NOT EXISTS disponibilidad_diaria (
+        fecha TEXT NOT NULL,
+        id_camara TEXT NOT NULL,
+        localidad TEXT NOT NULL,
+        horas_operativas REAL NOT NULL DEFAULT 0,
+        horas_no_operativas REAL NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_disponibilidad_fecha_localidad
+        ON disponibilidad_diaria (fecha, localidad);
+"""
+
+# Expresión "AAAA-MM" de la fecha según el motor (solo en SELECT/GROUP BY, nunca en WHERE)
+_EXPRESION_PERIODO = {
+    "mysql": "DATE_FORMAT(fecha, '%Y-%m')",
+    "sqlite": "strftime('%Y-%m', fecha)",
+}
+
+_SQL_DISPONIBILIDAD_MES = """
+    SELECT
+        SUM(horas_operativas) AS horas_op,
+        SUM(horas_no_operativas) AS horas_no_op
+    FROM disponibilidad_diaria
+    WHERE fecha >= %s AND fecha < %s
+"""
+
+_SQL_DISPONIBILIDAD_LOCALIDAD = """
+    SELECT
+        localidad,
+        COUNT(DISTINCT id_camara) AS total_camaras,
+        SUM(horas_operativas) AS horas_operativas,
+        SUM(horas_no_operativas) AS horas_no_operativas,
+        SUM(horas_operativas) * 100.0
+            / NULLIF(SUM(horas_operativas) + SUM(horas_no_operativas), 0) AS disponibilidad
+    FROM disponibilidad_diaria
+    WHERE fecha >= %s AND fecha < %s
+    GROUP BY localidad
+    ORDER BY disponibilidad DESC
+"""
+
+_SQL_HISTORICO = """
+    SELECT
+        {periodo} AS periodo,
+        SUM(horas_operativas) * 100.0
+            / NULLIF(SUM(horas_operativas) + SUM(horas_no_operativas), 0) AS disponibilidad
+    FROM disponibilidad_diaria
+    WHERE fecha >= %s AND fecha < %s
+    GROUP BY periodo
+    ORDER BY periodo
+"""
+
+_SQL_DETALLE_DIARIO = """
+    SELECT fecha, id_camara, localidad, horas_operativas, horas_no_operativas
+    FROM disponibilidad_diaria
+    WHERE fecha >= %s AND fecha < %s
+    ORDER BY fecha, id_camara
+"""
+
+
+def rango_mes(anio: int, mes: int) -> Tuple[str, str]:
+    """
+    Rango semiabierto [inicio, fin) del mes en formato ISO
+
+    Comparar la columna contra constantes (en lugar de YEAR(fecha)/MONTH(fecha))
+    permite que el motor use el índice sobre fecha.
+    """
+    inicio = date(anio, mes, 1)
+    fin = date(anio + 1, 1, 1) if mes == 12 else date(anio, mes + 1, 1)
+    return inicio.isoformat(), fin.isoformat()
+
+
+def _numero(valor: Any) -> float:
+    """Convierte SUM() de MySQL (Decimal) / None a float"""
+    if valor is None:
+        return 0.0
+    return float(valor) if isinstance(valor, Decimal) else valor
+
+
+class _PoolSQLite:
+    """Pool mínimo de conexiones SQLite con la misma interfaz de uso que el de MySQL"""
+
+    def __init__(self, ruta: str, tamano: int):
+        self._conexiones: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(max(1, tamano)):
+            conexion = sqlite3.connect(ruta, check_same_thread=False)
+            conexion.row_factory = sqlite3.Row
+            self._conexiones.put(conexion)
+
+    def obtener(self) -> sqlite3.Connection:
+        return self._conexiones.get()
+
+    def devolver(self, conexion: sqlite3.Connection) -> None:
+        self._conexiones.put(conexion)
+
+    def cerrar(self) -> None:
+        while not self._conexiones.empty():
+            self._conexiones.get_nowait().close()
 
 
 class MySQLExtractor:
     """Extrae datos de disponibilidad del sistema de monitoreo"""
-    
+
     def __init__(self, config_db: dict = None):
         """
         Args:
-            config_db: Diccionario con host, user, password, database
+            config_db: Diccionario con motor ("mysql"/"sqlite"), host, port, user,
+                password, database, ruta (sqlite) y pool_size. Por defecto
+                config.MYSQL_CONFIG
         """
-        self.config_db = config_db or {}
-        self.connection = None
-    
+        self.config_db = dict(config_db if config_db is not None else getattr(config, 'MYSQL_CONFIG', {}))
+        self.motor = self.config_db.get("motor", "mysql")
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def configurado(self) -> bool:
+        """True si hay una base de datos configurada (si no, se usan los JSON de fuentes)"""
+        if self.motor == "sqlite":
+            return bool(self.config_db.get("ruta"))
+        return bool(self.config_db.get("host")) and MYSQL_DISPONIBLE
+
     def conectar(self):
-        """Establece conexión con MySQL"""
-        # TODO: Implementar conexión real
-        # try:
-        #     self.connection = mysql.connector.connect(
-        #         host=self.config_db.get('host'),
-        #         user=self.config_db.get('user'),
-        #         password=self.config_db.get('password'),
-        #         database=self.config_db.get('database')
-        #     )
-        # except mysql.connector.Error as e:
-        #     print(f"[ERROR] Error al conectar a MySQL: {e}")
-        #     raise
-        pass
-    
+        """Crea el pool de conexiones (una sola vez)"""
+        with self._pool_lock:
+            if self._pool is not None:
+                return self._pool
+            tamano = int(self.config_db.get("pool_size", 4))
+            if self.motor == "sqlite":
+                self._pool = _PoolSQLite(str(self.config_db["ruta"]), tamano)
+            elif self.motor == "mysql":
+                if not MYSQL_DISPONIBLE:
+                    raise RuntimeError("mysql-connector-python no está instalado")
+                try:
+                    self._pool = mysql_pooling.MySQLConnectionPool(
+                        pool_name="disponibilidad",
+                        pool_size=tamano,
+                        host=self.config_db.get('host'),
+                        port=self.config_db.get('port', 3306),
+                        user=self.config_db.get('user'),
+                        password=self.config_db.get('password'),
+                        database=self.config_db.get('database'),
+                    )
+                except Exception as e:
+                    print(f"[ERROR] Error al conectar a MySQL: {e}")
+                    raise
+            else:
+                raise ValueError(f"Motor de base de datos no soportado: {self.motor}")
+            return self._pool
+
     def desconectar(self):
-        """Cierra la conexión con MySQL"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-    
+        """Cierra el pool de conexiones"""
+        with self._pool_lock:
+            if isinstance(self._pool, _PoolSQLite):
+                self._pool.cerrar()
+            # Las conexiones de MySQLConnectionPool se cierran al liberar el pool
+            self._pool = None
+
+    @contextmanager
+    def _conexion(self):
+        """Toma una conexión del pool y la devuelve al terminar"""
+        pool = self.conectar()
+        if self.motor == "sqlite":
+            conexion = pool.obtener()
+            try:
+                yield conexion
+            finally:
+                pool.devolver(conexion)
+        else:
+            conexion = pool.get_connection()
+            try:
+                yield conexion
+            finally:
+                conexion.close()  # Devuelve la conexión al pool
+
+    def _sql(self, consulta: str) -> str:
+        """Adapta los marcadores de parámetros al motor (%s en MySQL, ? en SQLite)"""
+        return consulta.replace("%s", "?") if self.motor == "sqlite" else consulta
+
+    def _cursor(self, conexion):
+        return conexion.cursor() if self.motor == "sqlite" else conexion.cursor(dictionary=True)
+
+    def consultar(self, consulta: str, parametros: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Ejecuta una consulta parametrizada y retorna todas las filas como dicts
+
+        Args:
+            consulta: SQL con marcadores %s
+            parametros: Valores de los marcadores
+
+        Returns:
+            Lista de filas
+        """
+        with self._conexion() as conexion:
+            cursor = self._cursor(conexion)
+            try:
+                cursor.execute(self._sql(consulta), parametros)
+                return [dict(fila) for fila in cursor.fetchall()]
+            finally:
+                cursor.close()
+
+    def iterar(self, consulta: str, parametros: tuple = (), tamano_lote: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Ejecuta una consulta y entrega las filas por lotes (cursor sin buffer)
+
+        Evita cargar en memoria resultados grandes (p. ej. el detalle diario
+        por cámara). La conexión permanece tomada hasta agotar el iterador.
+
+        Args:
+            consulta: SQL con marcadores %s
+            parametros: Valores de los marcadores
+            tamano_lote: Filas leídas por cada fetchmany
+
+        Yields:
+            Filas como dict
+        """
+        with self._conexion() as conexion:
+            cursor = self._cursor(conexion)
+            try:
+                cursor.execute(self._sql(consulta), parametros)
+                while True:
+                    lote = cursor.fetchmany(tamano_lote)
+                    if not lote:
+                        break
+                    for fila in lote:
+                        yield dict(fila)
+            finally:
+                cursor.close()
+
     def calcular_horas_mes(self, anio: int, mes: int) -> int:
         """Calcula las horas totales del mes"""
         dias = monthrange(anio, mes)[1]
         return dias * 24
-    
+
     def get_disponibilidad_mes(self, anio: int, mes: int) -> dict:
         """
         Calcula la disponibilidad del mes
-        
+
         Returns:
             {
                 "horas_totales_mes": 720,
@@ -58,46 +282,31 @@ class MySQLExtractor:
                 "disponibilidad_porcentaje": 99.12
             }
         """
-        # TODO: Query real a la base de datos
-        # if not self.connection:
-        #     self.conectar()
-        # 
-        # cursor = self.connection.cursor(dictionary=True)
-        # query = """
-        #     SELECT 
-        #         SUM(horas_operativas) as horas_op,
-        #         SUM(horas_no_operativas) as horas_no_op
-        #     FROM disponibilidad_diaria
-        #     WHERE YEAR(fecha) = %s AND MONTH(fecha) = %s
-        # """
-        # cursor.execute(query, (anio, mes))
-        # result = cursor.fetchone()
-        # cursor.close()
-        # 
-        # horas_op = result['horas_op'] or 0
-        # horas_no_op = result['horas_no_op'] or 0
-        # horas_totales = self.calcular_horas_mes(anio, mes)
-        # disponibilidad = (horas_op / (horas_op + horas_no_op)) * 100 if (horas_op + horas_no_op) > 0 else 0
-        # 
-        # return {
-        #     "horas_totales_mes": horas_totales,
-        #     "horas_operativas": horas_op,
-        #     "horas_no_operativas": horas_no_op,
-        #     "disponibilidad_porcentaje": disponibilidad
-        # }
-        
-        # Por ahora, cargar desde archivo JSON si existe
-        return self._cargar_datos_desde_json(anio, mes, "disponibilidad_mes", {
-            "horas_totales_mes": self.calcular_horas_mes(anio, mes),
-            "horas_operativas": 0,
-            "horas_no_operativas": 0,
-            "disponibilidad_porcentaje": 0
-        })
-    
+        horas_totales = self.calcular_horas_mes(anio, mes)
+        if not self.configurado:
+            return self._cargar_datos_desde_json(anio, mes, "disponibilidad_mes", {
+                "horas_totales_mes": horas_totales,
+                "horas_operativas": 0,
+                "horas_no_operativas": 0,
+                "disponibilidad_porcentaje": 0
+            })
+
+        resultado = self.consultar(_SQL_DISPONIBILIDAD_MES, rango_mes(anio, mes))[0]
+        horas_op = _numero(resultado['horas_op'])
+        horas_no_op = _numero(resultado['horas_no_op'])
+        disponibilidad = (horas_op / (horas_op + horas_no_op)) * 100 if (horas_op + horas_no_op) > 0 else 0
+
+        return {
+            "horas_totales_mes": horas_totales,
+            "horas_operativas": horas_op,
+            "horas_no_operativas": horas_no_op,
+            "disponibilidad_porcentaje": disponibilidad
+        }
+
     def get_disponibilidad_por_localidad(self, anio: int, mes: int) -> List[dict]:
         """
         Obtiene disponibilidad desglosada por localidad
-        
+
         Returns:
             [
                 {
@@ -110,94 +319,113 @@ class MySQLExtractor:
                 ...
             ]
         """
-        # TODO: Query real
-        # if not self.connection:
-        #     self.conectar()
-        # 
-        # cursor = self.connection.cursor(dictionary=True)
-        # query = """
-        #     SELECT 
-        #         localidad,
-        #         COUNT(DISTINCT id_camara) as total_camaras,
-        #         SUM(horas_operativas) as horas_op,
-        #         SUM(horas_no_operativas) as horas_no_op,
-        #         (SUM(horas_operativas) / (SUM(horas_operativas) + SUM(horas_no_operativas))) * 100 as disponibilidad
-        #     FROM disponibilidad_diaria
-        #     WHERE YEAR(fecha) = %s AND MONTH(fecha) = %s
-        #     GROUP BY localidad
-        #     ORDER BY disponibilidad DESC
-        # """
-        # cursor.execute(query, (anio, mes))
-        # results = cursor.fetchall()
-        # cursor.close()
-        # 
-        # return results
-        
-        # Por ahora, cargar desde archivo JSON si existe
-        return self._cargar_datos_desde_json(anio, mes, "disponibilidad_por_localidad", [])
-    
-    def get_historico_ans(self, meses_atras: int = 12) -> List[dict]:
+        if not self.configurado:
+            return self._cargar_datos_desde_json(anio, mes, "disponibilidad_por_localidad", [])
+
+        return [
+            {
+                "localidad": fila['localidad'],
+                "total_camaras": int(fila['total_camaras']),
+                "horas_operativas": _numero(fila['horas_operativas']),
+                "horas_no_operativas": _numero(fila['horas_no_operativas']),
+                "disponibilidad": _numero(fila['disponibilidad']),
+            }
+            for fila in self.consultar(_SQL_DISPONIBILIDAD_LOCALIDAD, rango_mes(anio, mes))
+        ]
+
+    def get_historico_ans(self, meses_atras: int = 12, anio: Optional[int] = None,
+                          mes: Optional[int] = None, registrar: bool = False) -> List[dict]:
         """
         Obtiene el histórico de ANS de los últimos N meses
-        
+
+        Orden: serie del ANS (si el mes de referencia está cerrado), base de
+        monitoreo y por último ans_{mes}_{anio}.json. La lectura no escribe la
+        serie (ni la crea si no existe); solo con registrar los meses terminados
+        que se leen de la base se importan en ella.
+
+        Args:
+            meses_atras: Cantidad de meses (incluyendo el de referencia)
+            anio: Año del mes de referencia (default: mes actual)
+            mes: Mes de referencia (default: mes actual)
+            registrar: Importar en la serie del ANS los meses terminados
+
         Returns:
             [
                 {"mes": "Enero 2025", "disponibilidad": 99.05, "observaciones": "-"},
                 ...
             ]
         """
-        # TODO: Query real
-        # if not self.connection:
-        #     self.conectar()
-        # 
-        # cursor = self.connection.cursor(dictionary=True)
-        # query = """
-        #     SELECT 
-        #         DATE_FORMAT(fecha, '%%M %%Y') as mes,
-        #         (SUM(horas_operativas) / (SUM(horas_operativas) + SUM(horas_no_operativas))) * 100 as disponibilidad
-        #     FROM disponibilidad_diaria
-        #     WHERE fecha >= DATE_SUB(CURDATE(), INTERVAL %s MONTH)
-        #     GROUP BY YEAR(fecha), MONTH(fecha)
-        #     ORDER BY YEAR(fecha), MONTH(fecha)
-        # """
-        # cursor.execute(query, (meses_atras,))
-        # results = cursor.fetchall()
-        # cursor.close()
-        # 
-        # return [{"mes": r['mes'], "disponibilidad": r['disponibilidad'], "observaciones": "-"} for r in results]
-        
-        # Por ahora, cargar desde archivo JSON si existe
-        return self._cargar_datos_desde_json(None, None, "historico_ans", [])
-    
-    def _cargar_datos_desde_json(self, anio: Optional[int], mes: Optional[int], campo: str, default: any) -> any:
+        hoy = datetime.now()
+        anio = anio or hoy.year
+        mes = mes or hoy.month
+
+        # Si el mes de referencia ya está cerrado en la serie del ANS se usan sus
+        # valores precalculados sin reconsultar la base ni los archivos
+        serie = None
+        if registrar or Path(config.ANS_SERIE_DB_PATH).exists():
+            serie = get_serie_ans()
+            historico = serie.historico(anio, mes, meses_atras)
+            if historico and historico[-1]["mes"] == f"{config.MESES[mes]} {anio}":
+                return historico
+
+        if not self.configurado:
+            return self._cargar_datos_desde_json(anio, mes, "historico_ans", [])
+
+        # Primer mes del histórico: retroceder meses_atras - 1 meses desde el de referencia
+        indice_inicio = anio * 12 + (mes - 1) - (meses_atras - 1)
+        inicio, _ = rango_mes(indice_inicio // 12, indice_inicio % 12 + 1)
+        _, fin = rango_mes(anio, mes)
+
+        consulta = _SQL_HISTORICO.format(periodo=_EXPRESION_PERIODO[self.motor])
+        historico = []
+        for fila in self.consultar(consulta, (inicio, fin)):
+            anio_fila, mes_fila = (int(p) for p in str(fila['periodo']).split("-"))
+            historico.append({
+                "mes": f"{config.MESES[mes_fila]} {anio_fila}",
+                "disponibilidad": _numero(fila['disponibilidad']),
+                "observaciones": "-"
+            })
+
+        if registrar:
+            # Registrar en la serie los meses ya terminados (el mes en curso aún puede cambiar)
+            mes_en_curso = f"{config.MESES[hoy.month]} {hoy.year}"
+            serie.importar_historico(h for h in historico if h["mes"] != mes_en_curso)
+        return historico
+
+    def iterar_disponibilidad_diaria(self, anio: int, mes: int, tamano_lote: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Detalle diario por cámara del mes, leído en streaming
+
+        Yields:
+            {"fecha", "id_camara", "localidad", "horas_operativas", "horas_no_operativas"}
+        """
+        return self.iterar(_SQL_DETALLE_DIARIO, rango_mes(anio, mes), tamano_lote)
+
+    def crear_esquema(self) -> None:
+        """Crea la tabla e índices en la base local SQLite (pruebas y benchmarks)"""
+        if self.motor != "sqlite":
+            raise ValueError("crear_esquema solo aplica al motor sqlite")
+        with self._conexion() as conexion:
+            conexion.executescript(ESQUEMA_SQLITE)
+            conexion.commit()
+
+    def _cargar_datos_desde_json(self, anio: int, mes: int, campo: str, default: any) -> any:
         """
         Carga datos desde archivo JSON de fuentes
-        
+
         Args:
-            anio: Año (puede ser None para histórico)
-            mes: Mes (puede ser None para histórico)
+            anio: Año
+            mes: Mes
             campo: Nombre del campo a extraer del JSON
             default: Valor por defecto si no se encuentra
-        
+
         Returns:
-            Valor del campo o default
+            Valor del campo (de solo lectura) o default
         """
-        if anio and mes:
-            archivo = config.FUENTES_DIR / f"ans_{mes}_{anio}.json"
-        else:
-            # Para histórico, buscar el archivo más reciente
-            archivo = config.FUENTES_DIR / "ans_septiembre_2025.json"  # Por defecto
-        
-        if archivo.exists():
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get(campo, default)
-            except Exception as e:
-                print(f"[WARNING] Error al cargar {archivo}: {e}")
-                return default
-        
-        return default
+        archivo = config.FUENTES_DIR / f"ans_{mes}_{anio}.json"
+
+        # El archivo se parsea una sola vez y se comparte con la Sección 3
+        return obtener_campo_fuente(archivo, campo, default)
 
 
 # Instancia global del extractor
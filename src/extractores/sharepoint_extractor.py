@@ -3,11 +3,17 @@ Extractor de datos y archivos de SharePoint
 """
 from typing import List, Dict, Any, Optional, BinaryIO
 from pathlib import Path
+import logging
 import os
 import tempfile
+import time
 import requests
 from requests.auth import HTTPBasicAuth
 from urllib.parse import urlparse, quote
+from src.utils.escritura_segura import escribir_atomico
+from src.utils.metricas import medido
+
+logger = logging.getLogger(__name__)
 
 # Cargar variables de entorno desde .env
 try:
@@ -23,7 +29,14 @@ try:
     OFFICE365_DISPONIBLE = True
 except ImportError:
     OFFICE365_DISPONIBLE = False
-    print("[WARNING] Office365-REST-Python-Client no está disponible. Usando método alternativo con requests.")
+    logger.warning("Office365-REST-Python-Client no está disponible. Usando método alternativo con requests.")
+
+
+def _guardar_respuesta(response: requests.Response, ruta: Path) -> None:
+    """Escribe por bloques el cuerpo de una respuesta HTTP"""
+    with open(ruta, "wb") as f:
+        for chunk in response.iter_content(chunk_size=8192):
+            f.write(chunk)
 
 
 class SharePointExtractor:
@@ -71,12 +84,13 @@ class SharePointExtractor:
                         self.client_id, self.client_secret
                     )
                 else:
-                    print("[WARNING] SHAREPOINT_CLIENT_ID y SHAREPOINT_CLIENT_SECRET son requeridos")
+                    logger.warning("SHAREPOINT_CLIENT_ID y SHAREPOINT_CLIENT_SECRET son requeridos")
                     self.ctx = None
             except Exception as e:
-                print(f"[WARNING] Error al inicializar SharePoint: {e}")
+                logger.warning("Error al inicializar SharePoint: %s", e)
                 self.ctx = None
     
+    @medido("sharepoint", operacion="descargar")
     def descargar_archivo(self, ruta_sharepoint: str, archivo_destino: Optional[Path] = None) -> Optional[Path]:
         """
         Descarga un archivo desde SharePoint
@@ -154,7 +168,7 @@ class SharePointExtractor:
                 # Agregar la ruta del archivo
                 ruta_archivo_clean = ruta_sharepoint.lstrip('/')
                 server_relative_url = '/' + '/'.join(path_parts) + '/' + ruta_archivo_clean
-                print(f"[DEBUG] SharePoint - Ruta relativa del servidor construida: {server_relative_url}")
+                logger.debug("SharePoint - Ruta relativa del servidor construida: %s", server_relative_url)
             else:
                 # Fallback
                 server_relative_url = '/' + ruta_sharepoint.lstrip('/')
@@ -175,62 +189,69 @@ class SharePointExtractor:
                 if resultado:
                     return resultado
                 # Si Office365 falla, intentar con requests como fallback
-                print(f"[INFO] Office365 falló, intentando método alternativo con requests...")
+                logger.info("Office365 falló, intentando método alternativo con requests...")
             
             # Método 2: Usar requests con autenticación OAuth
             # Usar server_relative_url para construir la URL de API REST
             # No usar url_archivo porque puede tener la ruta duplicada
-            print(f"[DEBUG] Intentando descargar con requests usando server_relative_url: {server_relative_url}")
+            logger.debug("Intentando descargar con requests usando server_relative_url: %s", server_relative_url)
             return self._descargar_con_requests(server_relative_url, archivo_destino)
             
         except Exception as e:
-            print(f"[WARNING] Error al descargar archivo desde SharePoint: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error al descargar archivo desde SharePoint: %s", e, exc_info=True)
             return None
     
     def _descargar_con_office365(self, server_relative_url: str, archivo_destino: Path) -> Optional[Path]:
         """Descarga usando Office365-REST-Python-Client"""
+        inicio = time.perf_counter()
         try:
-            print(f"[DEBUG] Intentando descargar con Office365: {server_relative_url}")
+            logger.debug("Intentando descargar con Office365: %s", server_relative_url)
             # Obtener archivo usando ruta relativa del servidor
             file = self.ctx.web.get_file_by_server_relative_url(server_relative_url)
             self.ctx.load(file)
             self.ctx.execute_query()
             
             # Descargar contenido
-            with open(archivo_destino, "wb") as f:
-                file.download(f)
-                self.ctx.execute_query()
+            def descargar(ruta: Path) -> None:
+                with open(ruta, "wb") as f:
+                    file.download(f)
+                    self.ctx.execute_query()
+
+            escribir_atomico(archivo_destino, descargar)
             
-            print(f"[INFO] Archivo descargado exitosamente con Office365: {archivo_destino}")
+            logger.info("Archivo descargado exitosamente con Office365: %s", archivo_destino,
+                        extra={"archivo": server_relative_url, "duracion_s": time.perf_counter() - inicio})
             return archivo_destino
         except Exception as e:
             error_msg = str(e)
-            print(f"[WARNING] Error con Office365: {error_msg}")
+            logger.warning("Error con Office365: %s", error_msg)
             
             # Si es error 403, podría ser problema de permisos o ruta incorrecta
             if "403" in error_msg or "Forbidden" in error_msg:
-                print(f"[INFO] Error 403 Forbidden - Posibles causas:")
-                print(f"  1. La App Registration no tiene permisos suficientes")
-                print(f"  2. La ruta del archivo no es correcta: {server_relative_url}")
-                print(f"  3. El archivo no existe en esa ubicación")
-                print(f"[INFO] Intentando método alternativo con requests...")
+                logger.info(
+                    "Error 403 Forbidden - Posibles causas:\n"
+                    "  1. La App Registration no tiene permisos suficientes\n"
+                    "  2. La ruta del archivo no es correcta: %s\n"
+                    "  3. El archivo no existe en esa ubicación",
+                    server_relative_url
+                )
+                logger.info("Intentando método alternativo con requests...")
             
             return None
     
     def _descargar_con_requests(self, server_relative_url: str, archivo_destino: Path) -> Optional[Path]:
         """Descarga usando requests (método alternativo)"""
+        inicio = time.perf_counter()
         try:
             # Obtener token OAuth con App Registration
             if not self.client_id or not self.client_secret:
-                print("[WARNING] SHAREPOINT_CLIENT_ID y SHAREPOINT_CLIENT_SECRET son requeridos")
+                logger.warning("SHAREPOINT_CLIENT_ID y SHAREPOINT_CLIENT_SECRET son requeridos")
                 return None
             
             # Intentar primero con SharePoint REST API
             token = self._obtener_token_oauth(usar_microsoft_graph=False)
             if not token:
-                print("[WARNING] No se pudo obtener token OAuth para SharePoint")
+                logger.warning("No se pudo obtener token OAuth para SharePoint")
                 return None
             
             # Construir URL de API REST usando server_relative_url
@@ -242,7 +263,7 @@ class SharePointExtractor:
             # Construir URL de API REST
             api_url = f"{self.site_url.rstrip('/')}/_api/web/GetFileByServerRelativeUrl('{quote(server_relative_url, safe='')}')/$value"
             
-            print(f"[DEBUG] Descargando desde SharePoint REST API: {api_url}")
+            logger.debug("Descargando desde SharePoint REST API: %s", api_url)
             
             # Headers con token OAuth
             headers = {
@@ -257,49 +278,48 @@ class SharePointExtractor:
             if response.status_code == 401:
                 error_text = response.text
                 if "Unsupported app only token" in error_text or "app only" in error_text.lower():
-                    print(f"[INFO] SharePoint REST API no acepta tokens de aplicación, intentando con Microsoft Graph API...")
+                    logger.info("SharePoint REST API no acepta tokens de aplicación, intentando con Microsoft Graph API...")
                     return self._descargar_con_microsoft_graph(server_relative_url, archivo_destino)
                 
-                print(f"[ERROR] 401 Unauthorized - El token OAuth no tiene permisos suficientes")
-                print(f"[INFO] Ruta intentada: {server_relative_url}")
-                print(f"[INFO] Verifica:")
-                print(f"  1. Que la App Registration tenga permisos de SharePoint (no solo Microsoft Graph)")
-                print(f"  2. En Azure Portal > App registrations > API permissions:")
-                print(f"     - Agregar permisos de 'SharePoint' (no Microsoft Graph)")
-                print(f"     - Seleccionar 'Application permissions'")
-                print(f"     - Agregar: Sites.Read.All o Sites.ReadWrite.All")
-                print(f"     - Dar 'Grant admin consent'")
-                print(f"  3. Esperar unos minutos después de otorgar permisos para que se propaguen")
+                logger.error(
+                    "401 Unauthorized - El token OAuth no tiene permisos suficientes. Verifica:\n"
+                    "  1. Que la App Registration tenga permisos de SharePoint (no solo Microsoft Graph)\n"
+                    "  2. En Azure Portal > App registrations > API permissions:\n"
+                    "     - Agregar permisos de 'SharePoint' (no Microsoft Graph)\n"
+                    "     - Seleccionar 'Application permissions'\n"
+                    "     - Agregar: Sites.Read.All o Sites.ReadWrite.All\n"
+                    "     - Dar 'Grant admin consent'\n"
+                    "  3. Esperar unos minutos después de otorgar permisos para que se propaguen",
+                    extra={"archivo": server_relative_url, "status": 401}
+                )
                 # Intentar obtener detalles del error
                 try:
                     error_detail = response.text[:500]
-                    print(f"[DEBUG] Detalle del error 401: {error_detail}")
+                    logger.debug("Detalle del error 401: %s", error_detail)
                 except:
                     pass
                 return None
             elif response.status_code == 403:
-                print(f"[ERROR] 403 Forbidden - La App Registration no tiene permisos o la ruta es incorrecta")
-                print(f"[INFO] Ruta intentada: {server_relative_url}")
-                print(f"[INFO] Verifica:")
-                print(f"  1. Que la App Registration tenga permisos de lectura en SharePoint")
-                print(f"  2. Que la ruta del archivo sea correcta")
-                print(f"  3. Que el archivo exista en esa ubicación")
+                logger.error(
+                    "403 Forbidden - La App Registration no tiene permisos o la ruta es incorrecta. Verifica:\n"
+                    "  1. Que la App Registration tenga permisos de lectura en SharePoint\n"
+                    "  2. Que la ruta del archivo sea correcta\n"
+                    "  3. Que el archivo exista en esa ubicación",
+                    extra={"archivo": server_relative_url, "status": 403}
+                )
                 return None
             
             response.raise_for_status()
             
             # Guardar archivo
-            with open(archivo_destino, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            escribir_atomico(archivo_destino, lambda ruta: _guardar_respuesta(response, ruta))
             
-            print(f"[INFO] Archivo descargado exitosamente con SharePoint REST API: {archivo_destino}")
+            logger.info("Archivo descargado exitosamente con SharePoint REST API: %s", archivo_destino,
+                        extra={"archivo": server_relative_url, "duracion_s": time.perf_counter() - inicio})
             return archivo_destino
             
         except Exception as e:
-            print(f"[WARNING] Error con requests: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error con requests: %s", e, exc_info=True)
             return None
     
     def _descargar_con_microsoft_graph(self, server_relative_url: str, archivo_destino: Path) -> Optional[Path]:
@@ -313,11 +333,12 @@ class SharePointExtractor:
         Returns:
             Path al archivo descargado o None si falla
         """
+        inicio = time.perf_counter()
         try:
             # Obtener token OAuth para Microsoft Graph
             token = self._obtener_token_oauth(usar_microsoft_graph=True)
             if not token:
-                print("[WARNING] No se pudo obtener token OAuth para Microsoft Graph")
+                logger.warning("No se pudo obtener token OAuth para Microsoft Graph")
                 return None
             
             # Microsoft Graph API requiere un proceso de 3 pasos:
@@ -344,39 +365,39 @@ class SharePointExtractor:
             
             from urllib.parse import quote
             site_url = f"https://graph.microsoft.com/v1.0/sites/{hostname}:/{quote(site_path, safe='')}"
-            print(f"[DEBUG] Obteniendo site-id desde: {site_url}")
+            logger.debug("Obteniendo site-id desde: %s", site_url)
             
             site_response = requests.get(site_url, headers=headers)
             if site_response.status_code != 200:
-                print(f"[ERROR] No se pudo obtener site-id (status {site_response.status_code})")
+                logger.error("No se pudo obtener site-id (status %s)", site_response.status_code)
                 try:
                     error_detail = site_response.json()
-                    print(f"[DEBUG] Detalle del error: {error_detail}")
+                    logger.debug("Detalle del error: %s", error_detail)
                 except:
-                    print(f"[DEBUG] Respuesta: {site_response.text[:500]}")
+                    logger.debug("Respuesta: %s", site_response.text[:500])
                 return None
             
             site_data = site_response.json()
             site_id = site_data.get('id')
             if not site_id:
-                print(f"[ERROR] No se encontró site-id en la respuesta")
+                logger.error("No se encontró site-id en la respuesta")
                 return None
             
-            print(f"[DEBUG] Site ID obtenido: {site_id}")
+            logger.debug("Site ID obtenido: %s", site_id)
             
             # Paso 2: Obtener el drive-id (el drive de "Shared Documents")
             drives_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives"
-            print(f"[DEBUG] Obteniendo drive-id desde: {drives_url}")
+            logger.debug("Obteniendo drive-id desde: %s", drives_url)
             
             drives_response = requests.get(drives_url, headers=headers)
             if drives_response.status_code != 200:
-                print(f"[ERROR] No se pudo obtener drive-id (status {drives_response.status_code})")
+                logger.error("No se pudo obtener drive-id (status %s)", drives_response.status_code)
                 return None
             
             drives_data = drives_response.json()
             drives = drives_data.get('value', [])
             if not drives:
-                print(f"[ERROR] No se encontraron drives en el sitio")
+                logger.error("No se encontraron drives en el sitio")
                 return None
             
             # Buscar el drive de "Shared Documents" o usar el primero
@@ -389,7 +410,7 @@ class SharePointExtractor:
             if not drive_id:
                 drive_id = drives[0].get('id')  # Usar el primer drive si no encontramos "Shared Documents"
             
-            print(f"[DEBUG] Drive ID obtenido: {drive_id}")
+            logger.debug("Drive ID obtenido: %s", drive_id)
             
             # Paso 3: Obtener el archivo
             # Extraer la ruta del archivo relativa al drive
@@ -408,40 +429,40 @@ class SharePointExtractor:
                     file_path = server_relative_url.lstrip('/')
             
             file_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{quote(file_path, safe='')}:/content"
-            print(f"[DEBUG] Descargando archivo desde: {file_url}")
+            logger.debug("Descargando archivo desde: %s", file_url)
             
             # Cambiar Accept header para descargar el contenido binario
             headers['Accept'] = "application/octet-stream"
             response = requests.get(file_url, headers=headers, stream=True)
             
             if response.status_code == 401:
-                print(f"[ERROR] 401 Unauthorized - El token OAuth no tiene permisos para Microsoft Graph")
-                print(f"[INFO] Verifica que la App Registration tenga permisos de Microsoft Graph:")
-                print(f"  - Sites.Read.All o Sites.ReadWrite.All")
-                print(f"  - Files.Read.All o Files.ReadWrite.All")
+                logger.error(
+                    "401 Unauthorized - El token OAuth no tiene permisos para Microsoft Graph. "
+                    "Verifica que la App Registration tenga permisos de Microsoft Graph:\n"
+                    "  - Sites.Read.All o Sites.ReadWrite.All\n"
+                    "  - Files.Read.All o Files.ReadWrite.All",
+                    extra={"status": 401}
+                )
                 return None
             elif response.status_code == 404:
-                print(f"[ERROR] 404 Not Found - El archivo no existe en la ruta especificada")
-                print(f"[INFO] Ruta intentada: {file_path}")
-                print(f"[INFO] URL completa: {file_url}")
+                logger.error("404 Not Found - El archivo no existe en la ruta especificada",
+                             extra={"archivo": file_path, "url": file_url, "status": 404})
                 return None
             
             response.raise_for_status()
             
             # Guardar archivo
-            with open(archivo_destino, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            escribir_atomico(archivo_destino, lambda ruta: _guardar_respuesta(response, ruta))
             
-            print(f"[INFO] Archivo descargado exitosamente con Microsoft Graph API: {archivo_destino}")
+            logger.info("Archivo descargado exitosamente con Microsoft Graph API: %s", archivo_destino,
+                        extra={"archivo": server_relative_url, "duracion_s": time.perf_counter() - inicio})
             return archivo_destino
             
         except Exception as e:
-            print(f"[WARNING] Error con Microsoft Graph API: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error con Microsoft Graph API: %s", e, exc_info=True)
             return None
     
+    @medido("sharepoint", operacion="token")
     def _obtener_token_oauth(self, usar_microsoft_graph: bool = False) -> Optional[str]:
         """
         Obtiene token OAuth para SharePoint o Microsoft Graph usando Client ID y Client Secret
@@ -462,14 +483,14 @@ class SharePointExtractor:
             if self.tenant_id:
                 # Usar Tenant ID directamente (más confiable para permisos de aplicación)
                 tenant = self.tenant_id
-                print(f"[DEBUG] Usando Tenant ID configurado: {tenant[:8]}...")
+                logger.debug("Usando Tenant ID configurado: %s...", tenant[:8])
             else:
                 # Extraer tenant del dominio como fallback
                 # Formato: https://{tenant}.sharepoint.com/sites/...
                 parsed = urlparse(self.site_url)
                 domain = parsed.netloc  # ej: verytelcsp.sharepoint.com
                 tenant = domain.split('.')[0]  # ej: verytelcsp
-                print(f"[DEBUG] Tenant extraído del dominio: {tenant}")
+                logger.debug("Tenant extraído del dominio: %s", tenant)
             
             # Para permisos de aplicación, usar el tenant específico
             token_url = f"https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token"
@@ -478,7 +499,7 @@ class SharePointExtractor:
             if usar_microsoft_graph:
                 # Para Microsoft Graph API con permisos de aplicación
                 scope = "https://graph.microsoft.com/.default"
-                print(f"[DEBUG] Usando Microsoft Graph API (scope: {scope})")
+                logger.debug("Usando Microsoft Graph API (scope: %s)", scope)
             else:
                 # Para SharePoint REST API con permisos de aplicación
                 # NOTA: Si usamos Tenant ID, necesitamos el dominio del sitio para el scope
@@ -490,7 +511,7 @@ class SharePointExtractor:
                 else:
                     # Si no hay Tenant ID, usar el tenant extraído
                     scope = f"https://{tenant}.sharepoint.com/.default"
-                print(f"[DEBUG] Usando SharePoint REST API (scope: {scope})")
+                logger.debug("Usando SharePoint REST API (scope: %s)", scope)
             
             # Datos para la solicitud con permisos de aplicación (client_credentials)
             data = {
@@ -500,49 +521,50 @@ class SharePointExtractor:
                 "grant_type": "client_credentials"
             }
             
-            print(f"[DEBUG] Intentando obtener token OAuth")
-            print(f"[DEBUG] Tenant: {tenant}")
-            print(f"[DEBUG] Scope: {scope}")
-            print(f"[DEBUG] Token URL: {token_url}")
-            print(f"[DEBUG] Grant type: client_credentials (permisos de aplicación)")
+            logger.debug("Intentando obtener token OAuth")
+            logger.debug("Tenant: %s", tenant)
+            logger.debug("Scope: %s", scope)
+            logger.debug("Token URL: %s", token_url)
+            logger.debug("Grant type: client_credentials (permisos de aplicación)")
             
             # Realizar solicitud
-            print(f"[DEBUG] Realizando solicitud OAuth...")
+            logger.debug("Realizando solicitud OAuth...")
             response = requests.post(token_url, data=data)
             
             if response.status_code != 200:
-                print(f"[ERROR] Error al obtener token OAuth: {response.status_code}")
+                logger.error("Error al obtener token OAuth: %s", response.status_code)
                 try:
                     error_detail = response.json()
-                    print(f"[ERROR] Detalle del error: {error_detail}")
+                    logger.error("Detalle del error: %s", error_detail)
                     # Mostrar información útil del error
                     if 'error_description' in error_detail:
-                        print(f"[ERROR] Descripción: {error_detail['error_description']}")
+                        logger.error("Descripción: %s", error_detail['error_description'])
                     if 'error' in error_detail:
-                        print(f"[ERROR] Tipo de error: {error_detail['error']}")
+                        logger.error("Tipo de error: %s", error_detail['error'])
                 except:
-                    print(f"[ERROR] Respuesta: {response.text[:500]}")
+                    logger.error("Respuesta: %s", response.text[:500])
                 
-                print(f"[DEBUG] Información de la solicitud:")
-                print(f"  - Tenant: {tenant}")
-                print(f"  - Scope: {scope}")
-                print(f"  - Token URL: {token_url}")
-                print(f"  - Grant type: client_credentials")
-                print(f"  - Client ID: {self.client_id[:20]}...")
+                logger.debug(
+                    "Información de la solicitud:\n"
+                    "  - Tenant: %s\n"
+                    "  - Scope: %s\n"
+                    "  - Token URL: %s\n"
+                    "  - Grant type: client_credentials\n"
+                    "  - Client ID: %s...",
+                    tenant, scope, token_url, self.client_id[:20]
+                )
                 
                 return None
             
             token_data = response.json()
             access_token = token_data.get("access_token")
             if access_token:
-                print(f"[INFO] Token OAuth obtenido exitosamente")
-                print(f"[DEBUG] Token expira en: {token_data.get('expires_in', 'N/A')} segundos")
+                logger.info("Token OAuth obtenido exitosamente")
+                logger.debug("Token expira en: %s segundos", token_data.get('expires_in', 'N/A'))
             return access_token
             
         except Exception as e:
-            print(f"[WARNING] Error al obtener token OAuth: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error al obtener token OAuth: %s", e, exc_info=True)
             return None
     
     def es_url_sharepoint(self, ruta: str) -> bool:
@@ -575,6 +597,7 @@ class SharePointExtractor:
         
         return any(dom in dominio for dom in dominios_sharepoint)
     
+    @medido("sharepoint", operacion="verificar")
     def verificar_archivo_existe(self, ruta_sharepoint: str) -> bool:
         """
         Verifica si un archivo existe en SharePoint sin descargarlo
@@ -590,7 +613,7 @@ class SharePointExtractor:
             # Obtener token OAuth para Microsoft Graph
             token = self._obtener_token_oauth(usar_microsoft_graph=True)
             if not token:
-                print("[WARNING] No se pudo obtener token OAuth para Microsoft Graph")
+                logger.warning("No se pudo obtener token OAuth para Microsoft Graph")
                 return False
             
             # Construir la URL para verificar la existencia del archivo
@@ -638,24 +661,23 @@ class SharePointExtractor:
             head_response = requests.head(file_url, headers=headers)
             
             if head_response.status_code == 200:
-                print(f"[INFO] Archivo existe en SharePoint: {ruta_sharepoint}")
+                logger.info("Archivo existe en SharePoint: %s", ruta_sharepoint)
                 return True
             elif head_response.status_code == 404:
-                print(f"[WARNING] Archivo NO existe en SharePoint: {ruta_sharepoint}")
+                logger.warning("Archivo NO existe en SharePoint: %s", ruta_sharepoint)
                 return False
             else:
-                print(f"[WARNING] Error al verificar archivo en SharePoint (status {head_response.status_code}): {ruta_sharepoint}")
+                logger.warning("Error al verificar archivo en SharePoint (status %s): %s", head_response.status_code, ruta_sharepoint)
                 return False
         
         except requests.exceptions.RequestException as e:
-            print(f"[WARNING] Error de red o HTTP al verificar archivo en SharePoint: {e}")
+            logger.warning("Error de red o HTTP al verificar archivo en SharePoint: %s", e)
             return False
         except Exception as e:
-            print(f"[WARNING] Error inesperado al verificar archivo en SharePoint: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error inesperado al verificar archivo en SharePoint: %s", e, exc_info=True)
             return False
     
+    @medido("sharepoint", operacion="buscar")
     def buscar_archivo_por_nombre(self, nombre_archivo: str, carpeta_base: str = "/") -> Optional[str]:
         """
         Busca un archivo en SharePoint por nombre
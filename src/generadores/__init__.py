@@ -1,20 +1,88 @@
 """
 Generadores de secciones del informe
+
+Los módulos de cada sección se importan bajo demanda: importar este paquete
+no carga python-docx, pandas ni los extractores. Usar obtener_generador(n)
+o acceder a GeneradorSeccionN (p. ej. `from src.generadores import
+GeneradorSeccion3`), que importa únicamente el módulo de esa sección.
 """
-from .seccion_1_info_general import GeneradorSeccion1
-from .seccion_2_mesa_servicio import GeneradorSeccion2
-from .seccion_3_ans import GeneradorSeccion3
-from .seccion_4_bienes import GeneradorSeccion4
-from .seccion_5_laboratorio import GeneradorSeccion5
-from .seccion_6_visitas import GeneradorSeccion6
-from .seccion_7_siniestros import GeneradorSeccion7
-from .seccion_8_presupuesto import GeneradorSeccion8
-from .seccion_9_riesgos import GeneradorSeccion9
-from .seccion_10_sgsst import GeneradorSeccion10
-from .seccion_11_valores import GeneradorSeccion11
-from .seccion_12_conclusiones import GeneradorSeccion12
-from .seccion_13_anexos import GeneradorSeccion13
-from .seccion_14_control_cambios import GeneradorSeccion14
-
-__all__ = ['GeneradorSeccion1', 'GeneradorSeccion2', 'GeneradorSeccion3', 'GeneradorSeccion4', 'GeneradorSeccion5', 'GeneradorSeccion6', 'GeneradorSeccion7', 'GeneradorSeccion8', 'GeneradorSeccion9', 'GeneradorSeccion10', 'GeneradorSeccion11', 'GeneradorSeccion12', 'GeneradorSeccion13', 'GeneradorSeccion14']
+import importlib
+from typing import Dict, List, Tuple, Type
+
+# Número de sección -> (módulo, clase generadora), en el orden del informe
+REGISTRO_GENERADORES: Dict[int, Tuple[str, str]] = {
+    1: ("seccion_1_info_general", "GeneradorSeccion1"),
+    2: ("seccion_2_mesa_servicio", "GeneradorSeccion2"),
+    3: ("seccion_3_ans", "GeneradorSeccion3"),
+    4: ("seccion_4_bienes", "GeneradorSeccion4"),
+    5: ("seccion_5_laboratorio", "GeneradorSeccion5"),
+    6: ("seccion_6_visitas", "GeneradorSeccion6"),
+    7: ("seccion_7_siniestros", "GeneradorSeccion7"),
+    8: ("seccion_8_presupuesto", "GeneradorSeccion8"),
+    9: ("seccion_9_riesgos", "GeneradorSeccion9"),
+    10: ("seccion_10_sgsst", "GeneradorSeccion10"),
+    11: ("seccion_11_valores", "GeneradorSeccion11"),
+    12: ("seccion_12_conclusiones", "GeneradorSeccion12"),
+    13: ("seccion_13_anexos", "GeneradorSeccion13"),
+    14: ("seccion_14_control_cambios", "GeneradorSeccion14"),
+}
+
+_CLASE_A_SECCION = {clase: numero for numero, (_, clase) in REGISTRO_GENERADORES.items()}
+
+
+def secciones_disponibles() -> List[int]:
+    """Números de sección registrados, en orden"""
+    return sorted(REGISTRO_GENERADORES)
+
+
+def parsear_secciones(texto: str) -> List[int]:
+    """
+    Convierte "2,3,8" en [2, 3, 8] validando contra el registro (CLI y API)
+
+    Args:
+        texto: Números de sección separados por coma (se ignoran los vacíos)
+
+    Returns:
+        Lista de secciones sin duplicados, en el orden indicado
+
+    Raises:
+        ValueError: Si alguna sección no existe o no se indicó ninguna
+    """
+    secciones = []
+    for parte in texto.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if not parte.isdigit() or int(parte) not in REGISTRO_GENERADORES:
+            raise ValueError(f"Sección inválida: '{parte}'. Disponibles: {secciones_disponibles()}")
+        if int(parte) not in secciones:
+            secciones.append(int(parte))
+    if not secciones:
+        raise ValueError("Debe indicar al menos una sección")
+    return secciones
+
+
+def obtener_generador(numero: int) -> Type:
+    """
+    Importa el módulo de la sección y retorna su clase generadora
+
+    Args:
+        numero: Número de sección (1-14)
+
+    Returns:
+        Clase GeneradorSeccionN
+    """
+    if numero not in REGISTRO_GENERADORES:
+        raise ValueError(f"Sección no registrada: {numero}")
+    modulo, clase = REGISTRO_GENERADORES[numero]
+    return getattr(importlib.import_module(f".{modulo}", __name__), clase)
+
+
+def __getattr__(nombre: str):
+    """Importación diferida de GeneradorSeccionN al accederlo (PEP 562)"""
+    if nombre in _CLASE_A_SECCION:
+        return obtener_generador(_CLASE_A_SECCION[nombre])
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
 
+__all__ = ['REGISTRO_GENERADORES', 'secciones_disponibles', 'parsear_secciones', 'obtener_generador'] + list(_CLASE_A_SECCION)
@@ -2,20 +2,40 @@
 Clase base para todos los generadores de secciones
 """
 from abc import ABC, abstractmethod
+from io import BytesIO
 from pathlib import Path
+from docx import Document
 from docxtpl import DocxTemplate
-from typing import Dict, Any
+from typing import IO, Dict, Any, FrozenSet, Optional, Tuple, Union
 import config
+from src.utils.analisis_plantilla import ContextoPerezoso, variables_plantilla
+from src.utils.docx_streaming import TablasDiferidas
+from src.utils.escritura_segura import escribir_atomico
+from src.utils.formato_moneda import get_entorno_jinja
+from src.utils.metricas import medir
 
 class GeneradorSeccion(ABC):
     """Clase base abstracta para generadores de secciones"""
     
+    # Atributos que generar() usa además del contexto (secciones con python-docx
+    # o tablas llenadas por anclas): van en el snapshot de --solo-datos y se restauran desde él
+    ATRIBUTOS_DATOS: Tuple[str, ...] = ()
+    
     def __init__(self, anio: int, mes: int):
         self.anio = anio
         self.mes = mes
         self.periodo = config.get_periodo_texto(anio, mes)
         self.contrato = config.CONTRATO
-        self.contexto: Dict[str, Any] = {}
+        self.contexto: Dict[str, Any] = ContextoPerezoso()
+        self._variables_template: Optional[FrozenSet[str]] = None
+        self._template_analizado = False
+        self._contexto_restaurado: Optional[Dict[str, Any]] = None
+        # Solo la generación del informe (main.generar_informe) lo activa: la sección
+        # puede persistir resultados del mes fuera del documento (serie del ANS).
+        # Vistas previas, snapshots y benchmarks cargan los datos sin escribir nada.
+        self.registrar_resultados = False
+        # Tablas grandes que se escriben al guardar el paquete (ver docx_streaming)
+        self.tablas_diferidas = TablasDiferidas()
     
     @property
     @abstractmethod
@@ -34,6 +54,24 @@ class GeneradorSeccion(ABC):
         """Ruta completa al template"""
         return config.TEMPLATES_DIR / self.template_file
     
+    def variables_template(self) -> Optional[FrozenSet[str]]:
+        """
+        Variables Jinja que referencia el template (cacheadas por hash del archivo)
+        
+        Returns:
+            Conjunto de variables, o None si no hay template o no se pudo analizar
+        """
+        if not self._template_analizado:
+            if self.template_path.exists():
+                self._variables_template = variables_plantilla(self.template_path)
+            self._template_analizado = True
+        return self._variables_template
+    
+    def usa_variable(self, *nombres: str) -> bool:
+        """Indica si el template referencia alguna de las variables (True si se desconoce)"""
+        variables = self.variables_template()
+        return variables is None or any(nombre in variables for nombre in nombres)
+    
     def cargar_contexto_base(self) -> Dict[str, Any]:
         """Carga el contexto base común a todas las secciones"""
         return {
@@ -56,31 +94,122 @@ class GeneradorSeccion(ABC):
         """Procesa los datos y retorna el contexto para el template"""
         pass
     
+    def datos_contexto(self) -> Dict[str, Any]:
+        """
+        Ejecuta cargar_datos y procesar sin renderizar el template
+        
+        Returns:
+            Contexto completo de la sección (todas las claves, aunque el
+            template no las use) más los ATRIBUTOS_DATOS
+        """
+        # Contexto completo: la carga no se recorta según el template
+        self._variables_template = None
+        self._template_analizado = True
+        
+        with self._medir("cargar_contexto_base"):
+            contexto = ContextoPerezoso(self.cargar_contexto_base())
+        with self._medir("cargar_datos"):
+            self.cargar_datos()
+        with self._medir("procesar"):
+            contexto.update(self.procesar())
+        for atributo in self.ATRIBUTOS_DATOS:
+            contexto[atributo] = getattr(self, atributo)
+        return contexto.resolver()
+    
+    def restaurar_contexto(self, contexto: Dict[str, Any]) -> None:
+        """
+        Usa un contexto guardado (ver datos_contexto) en lugar de las fuentes:
+        generar() ya no llama a cargar_datos ni a procesar
+        """
+        for atributo in self.ATRIBUTOS_DATOS:
+            if atributo in contexto:
+                setattr(self, atributo, contexto[atributo])
+        self._contexto_restaurado = dict(contexto)
+    
+    def _medir(self, etapa: str):
+        """Span de una etapa de la sección (histograma generador por seccion/etapa)"""
+        return medir("generador", seccion=type(self).__name__, etapa=etapa)
+    
     def generar(self) -> DocxTemplate:
         """Genera la sección completa"""
-        # Cargar contexto base
-        self.contexto = self.cargar_contexto_base()
-        
-        # Cargar datos específicos
-        self.cargar_datos()
+        # Variables del template: las claves perezosas que no use no se calculan
+        with self._medir("analizar_template"):
+            variables = self.variables_template()
         
-        # Procesar y agregar al contexto
-        datos_seccion = self.procesar()
-        self.contexto.update(datos_seccion)
+        if self._contexto_restaurado is not None:
+            # Contexto de un snapshot: no se vuelven a consultar las fuentes
+            self.contexto = ContextoPerezoso(self._contexto_restaurado)
+        else:
+            # Cargar contexto base
+            with self._medir("cargar_contexto_base"):
+                self.contexto = ContextoPerezoso(self.cargar_contexto_base())
+            
+            # Cargar datos específicos
+            with self._medir("cargar_datos"):
+                self.cargar_datos()
+            
+            # Procesar y agregar al contexto
+            with self._medir("procesar"):
+                datos_seccion = self.procesar()
+            self.contexto.update(datos_seccion)
         
         # Renderizar template
         if not self.template_path.exists():
             raise FileNotFoundError(f"Template no encontrado: {self.template_path}")
         
-        doc = DocxTemplate(self.template_path)
-        doc.render(self.contexto)
+        with self._medir("render"):
+            doc = DocxTemplate(self.template_path)
+            # Filtros de formato disponibles en los templates ({{ valor|moneda }})
+            doc.render(self.contexto.resolver(variables), get_entorno_jinja())
         
         return doc
     
+    def documento(self) -> Document:
+        """
+        Genera la sección y retorna el documento python-docx en memoria
+        (sin escribirlo a disco), listo para ensamblarlo en el informe
+        
+        Las tablas reservadas en self.tablas_diferidas quedan como marcadores
+        y se escriben al guardar el documento final.
+        """
+        doc = self.generar()
+        if not isinstance(doc, DocxTemplate):
+            return doc
+        if doc.crc_to_new_media or doc.crc_to_new_embedded or doc.zipname_to_replace:
+            # Reemplazos que docxtpl aplica sobre el paquete ya guardado
+            paquete = BytesIO()
+            doc.save(paquete)
+            paquete.seek(0)
+            return Document(paquete)
+        doc.pre_processing()
+        return doc.docx
+    
+    def guardar_documento(self, doc: Document, destino: Union[Path, IO[bytes]]) -> None:
+        """Guarda el documento (con sus tablas diferidas) en una ruta o archivo binario"""
+        def escribir(archivo):
+            if self.tablas_diferidas:
+                self.tablas_diferidas.guardar(doc, archivo)
+            else:
+                doc.save(archivo if hasattr(archivo, "write") else str(archivo))
+
+        if hasattr(destino, "write"):
+            escribir(destino)
+        else:
+            escribir_atomico(destino, escribir)
+    
+    def a_bytes(self) -> bytes:
+        """Genera la sección y retorna el paquete .docx en memoria"""
+        doc = self.documento()
+        paquete = BytesIO()
+        with self._medir("guardar"):
+            self.guardar_documento(doc, paquete)
+        return paquete.getvalue()
+    
     def guardar(self, output_path: Path) -> None:
         """Genera y guarda la sección"""
         doc = self.generar()
-        doc.save(str(output_path))
+        with self._medir("guardar"):
+            escribir_atomico(output_path, lambda ruta: doc.save(str(ruta)))
         print(f"[OK] {self.nombre_seccion} guardada en: {output_path}")
 
 
@@ -16,6 +16,8 @@ from typing import Dict, Any, List
 import json
 import pandas as pd
 from .base import GeneradorSeccion
+from src.extractores.fuentes_tabulares import leer_fuente_tabla
+from src.utils.escritura_segura import escribir_atomico
 import config
 
 
@@ -49,7 +51,7 @@ class GeneradorSeccion10(GeneradorSeccion):
         
         if archivo_csv.exists():
             try:
-                df = pd.read_csv(archivo_csv, encoding='utf-8')
+                df = leer_fuente_tabla(archivo_csv)
                 # Procesar datos según estructura del CSV
                 # Asumir que el CSV tiene columnas que permiten separar por tipo
                 self._procesar_datos_csv(df)
@@ -281,7 +283,7 @@ class GeneradorSeccion10(GeneradorSeccion):
             
             df = pd.DataFrame(datos_demo)
             csv_demo = config.FUENTES_DIR / "sgsst_dummy.csv"
-            df.to_csv(csv_demo, index=False, encoding='utf-8')
+            escribir_atomico(csv_demo, lambda ruta: df.to_csv(ruta, index=False, encoding='utf-8'))
             print(f"[INFO] CSV de ejemplo guardado en: {csv_demo}")
         except Exception as e:
             print(f"[WARNING] No se pudo guardar CSV de ejemplo: {e}")
@@ -14,7 +14,9 @@ from typing import Dict, Any, List
 import json
 import pandas as pd
 from .base import GeneradorSeccion
-from src.utils.formato_moneda import formato_moneda_cop
+from src.extractores.fuentes_tabulares import leer_fuente_tabla
+from src.utils.escritura_segura import escribir_atomico
+from src.utils.formato_moneda import formato_moneda_cop, formatear_columnas_moneda
 import config
 
 
@@ -47,7 +49,7 @@ class GeneradorSeccion11(GeneradorSeccion):
         
         if archivo_csv.exists():
             try:
-                df = pd.read_csv(archivo_csv, encoding='utf-8')
+                df = leer_fuente_tabla(archivo_csv)
                 self._procesar_datos_csv(df)
                 datos_cargados = True
                 print(f"[INFO] Datos cargados desde CSV: {archivo_csv}")
@@ -69,6 +71,12 @@ class GeneradorSeccion11(GeneradorSeccion):
             if 'proyecto' in df['tipo'].values:
                 self.proyectos = df[df['tipo'] == 'proyecto'].to_dict('records')
             # ... etc
+        
+        # Valores monetarios formateados por columna
+        if 'valor_aprobado' in df.columns:
+            formatear_columnas_moneda(self.pilotos, {"valor_aprobado": "valor_aprobado_formato"})
+        if 'coste' in df.columns:
+            formatear_columnas_moneda(self.proyectos, {"coste": "coste_formato"})
     
     def _generar_datos_dummy(self) -> None:
         """Genera datos dummy para pruebas cuando no hay fuentes externas"""
@@ -82,8 +90,7 @@ class GeneradorSeccion11(GeneradorSeccion):
                 "estado": "Aprobado",
                 "fecha_aprobacion": f"2025-{self.mes-1:02d}-20" if self.mes > 1 else f"2024-12-20",
                 "responsable": "Innovación ETB",
-                "valor_aprobado": 32000000,
-                "valor_aprobado_formato": formato_moneda_cop(32000000)
+                "valor_aprobado": 32000000
             },
             {
                 "titulo": "Módulos de mantenimiento IoT",
@@ -91,8 +98,7 @@ class GeneradorSeccion11(GeneradorSeccion):
                 "estado": "En implementación",
                 "fecha_aprobacion": f"2025-{self.mes:02d}-02",
                 "responsable": "I+D",
-                "valor_aprobado": 18000000,
-                "valor_aprobado_formato": formato_moneda_cop(18000000)
+                "valor_aprobado": 18000000
             },
             {
                 "titulo": "Sistema de alertas tempranas",
@@ -100,10 +106,10 @@ class GeneradorSeccion11(GeneradorSeccion):
                 "estado": "En evaluación",
                 "fecha_aprobacion": f"2025-{self.mes:02d}-10",
                 "responsable": "Innovación ETB",
-                "valor_aprobado": 25000000,
-                "valor_aprobado_formato": formato_moneda_cop(25000000)
+                "valor_aprobado": 25000000
             }
         ]
+        formatear_columnas_moneda(self.pilotos, {"valor_aprobado": "valor_aprobado_formato"})
         
         # 11.2 Proyectos aprobados y en implementación
         self.proyectos = [
@@ -113,8 +119,7 @@ class GeneradorSeccion11(GeneradorSeccion):
                 "estado": "Culminado",
                 "fecha_inicio": f"2025-{self.mes-2:02d}-10" if self.mes > 2 else f"2024-{12+self.mes-2:02d}-10",
                 "fecha_fin": f"2025-{self.mes-1:02d}-30" if self.mes > 1 else f"2024-12-30",
-                "coste": 9500000,
-                "coste_formato": formato_moneda_cop(9500000)
+                "coste": 9500000
             },
             {
                 "nombre": "Ampliación cobertura Kennedy",
@@ -122,8 +127,7 @@ class GeneradorSeccion11(GeneradorSeccion):
                 "estado": "En ejecución",
                 "fecha_inicio": f"2025-{self.mes:02d}-05",
                 "fecha_fin": f"2025-{self.mes+1:02d}-15" if self.mes < 12 else f"2026-01-15",
-                "coste": 45000000,
-                "coste_formato": formato_moneda_cop(45000000)
+                "coste": 45000000
             },
             {
                 "nombre": "Mejora infraestructura red",
@@ -131,10 +135,10 @@ class GeneradorSeccion11(GeneradorSeccion):
                 "estado": "Programado",
                 "fecha_inicio": f"2025-{self.mes+1:02d}-01" if self.mes < 12 else f"2026-01-01",
                 "fecha_fin": f"2025-{self.mes+2:02d}-20" if self.mes < 11 else f"2026-02-20",
-                "coste": 68000000,
-                "coste_formato": formato_moneda_cop(68000000)
+                "coste": 68000000
             }
         ]
+        formatear_columnas_moneda(self.proyectos, {"coste": "coste_formato"})
         
         # 11.3 Aprobaciones / actas y soportes
         self.actas_soportes = [
@@ -229,7 +233,7 @@ class GeneradorSeccion11(GeneradorSeccion):
             
             df = pd.DataFrame(datos_demo)
             csv_demo = config.FUENTES_DIR / "valores_publicos_demo.csv"
-            df.to_csv(csv_demo, index=False, encoding='utf-8')
+            escribir_atomico(csv_demo, lambda ruta: df.to_csv(ruta, index=False, encoding='utf-8'))
             print(f"[INFO] CSV de ejemplo guardado en: {csv_demo}")
         except Exception as e:
             print(f"[WARNING] No se pudo guardar CSV de ejemplo: {e}")
@@ -10,6 +10,8 @@ from typing import Dict, Any, List
 import json
 import pandas as pd
 from .base import GeneradorSeccion
+from src.extractores.fuentes_tabulares import leer_fuente_tabla
+from src.utils.escritura_segura import escribir_atomico
 import config
 
 
@@ -37,7 +39,7 @@ class GeneradorSeccion14(GeneradorSeccion):
         
         if archivo_csv.exists():
             try:
-                df = pd.read_csv(archivo_csv, encoding='utf-8')
+                df = leer_fuente_tabla(archivo_csv)
                 # Convertir DataFrame a lista de diccionarios
                 self.cambios = df.to_dict('records')
                 datos_cargados = True
@@ -100,7 +102,7 @@ class GeneradorSeccion14(GeneradorSeccion):
         try:
             df = pd.DataFrame(self.cambios)
             csv_demo = config.FUENTES_DIR / "control_cambios_demo.csv"
-            df.to_csv(csv_demo, index=False, encoding='utf-8')
+            escribir_atomico(csv_demo, lambda ruta: df.to_csv(ruta, index=False, encoding='utf-8'))
             print(f"[INFO] CSV de ejemplo guardado en: {csv_demo}")
         except Exception as e:
             print(f"[WARNING] No se pudo guardar CSV de ejemplo: {e}")
@@ -5,19 +5,37 @@ Tipo: 🟦 CONTENIDO FIJO (mayoría) + 🟩 EXTRACCIÓN (comunicados, personal)
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import json
+import logging
 import os
 from .base import GeneradorSeccion
+from src.utils.analisis_plantilla import ContextoPerezoso, Perezoso
 from src.utils.formato_moneda import formato_moneda_cop
-from src.ia.extractor_observaciones import get_extractor_observaciones
 from src.utils.informes_aprobados import obtener_contexto_informes_aprobados
+from src.utils.tabla_plantilla import IndiceAnclas, llenar_tabla_desde_prototipo
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 import config
 
+logger = logging.getLogger(__name__)
+
 class GeneradorSeccion1(GeneradorSeccion):
     """Genera la sección 1: Información General del Contrato"""
     
+    # Campos de las tablas de obligaciones (en el orden de las columnas del template)
+    COLUMNAS_OBLIGACIONES = ['item', 'obligacion', 'periodicidad', 'cumplio', 'observaciones', 'anexo']
+    # Títulos de esas columnas (para las que falten en el template)
+    TITULOS_OBLIGACIONES = ['ÍTEM', 'OBLIGACIÓN', 'PERIODICIDAD', 'CUMPLIÓ / NO CUMPLIÓ', 'OBSERVACIONES', 'ANEXO']
+    # Palabras que identifican el encabezado de las tablas de obligaciones
+    ENCABEZADOS_OBLIGACIONES = ('ITEM', 'OBLIGACION', 'PERIODICIDAD')
+    # Variables del template que dependen de los comunicados y del personal
+    VARIABLES_COMUNICADOS = ('comunicados_emitidos', 'comunicados_recibidos', 'total_comunicados_emitidos',
+                             'total_comunicados_recibidos', 'tabla_comunicados_emitidos',
+                             'tabla_comunicados_recibidos')
+    VARIABLES_PERSONAL = ('personal_minimo', 'personal_apoyo', 'tabla_personal_minimo', 'tabla_personal_apoyo')
+    # Obligaciones que se llenan por anclas en generar(): van en el snapshot de --solo-datos
+    ATRIBUTOS_DATOS = ('obligaciones_generales_raw', 'obligaciones_especificas_raw')
+    
     @property
     def nombre_seccion(self) -> str:
         return "1. INFORMACIÓN GENERAL DEL CONTRATO"
@@ -40,6 +58,9 @@ class GeneradorSeccion1(GeneradorSeccion):
         self.extractor_observaciones = None
         if usar_llm_observaciones:
             try:
+                # Importación diferida: OpenAI, PyPDF2 y SharePoint solo si se usan observaciones LLM
+                from src.ia.extractor_observaciones import get_extractor_observaciones
+                
                 # Obtener credenciales de SharePoint desde config (que ya carga del .env)
                 sharepoint_site_url = getattr(config, 'SHAREPOINT_SITE_URL', None) or os.getenv("SHAREPOINT_SITE_URL")
                 sharepoint_client_id = getattr(config, 'SHAREPOINT_CLIENT_ID', None) or os.getenv("SHAREPOINT_CLIENT_ID")
@@ -53,7 +74,7 @@ class GeneradorSeccion1(GeneradorSeccion):
                     sharepoint_base_path=sharepoint_base_path
                 )
             except Exception as e:
-                print(f"[WARNING] No se pudo inicializar extractor de observaciones: {e}")
+                logger.warning("No se pudo inicializar extractor de observaciones: %s", e)
                 self.usar_llm_observaciones = False
     
     def cargar_datos(self) -> None:
@@ -63,11 +84,13 @@ class GeneradorSeccion1(GeneradorSeccion):
         # 1.5: Obligaciones (EXTRACCIÓN + LLM para observaciones)
         self._cargar_obligaciones()
         
-        # 1.6: Comunicados (EXTRACCIÓN)
-        self._cargar_comunicados()
+        # 1.6: Comunicados (EXTRACCIÓN), solo si el template los referencia
+        if self.usa_variable(*self.VARIABLES_COMUNICADOS):
+            self._cargar_comunicados()
         
-        # 1.7 - 1.8: Personal (FIJO + EXTRACCIÓN)
-        self._cargar_personal()
+        # 1.7 - 1.8: Personal (FIJO + EXTRACCIÓN), solo si el template lo referencia
+        if self.usa_variable(*self.VARIABLES_PERSONAL):
+            self._cargar_personal()
     
     def _cargar_comunicados(self) -> None:
         """Carga comunicados emitidos y recibidos del mes"""
@@ -123,10 +146,10 @@ class GeneradorSeccion1(GeneradorSeccion):
                     
                     # Generar observaciones dinámicas si está habilitado
                     if self.usar_llm_observaciones and self.extractor_observaciones:
-                        print("[INFO] Generando observaciones dinámicas desde anexos usando LLM...")
+                        logger.info("Generando observaciones dinámicas desde anexos usando LLM...")
                         
                         # Obtener contexto de los últimos 3 informes aprobados
-                        print("[INFO] Obteniendo contexto de informes aprobados anteriores...")
+                        logger.info("Obteniendo contexto de informes aprobados anteriores...")
                         contexto_informes = obtener_contexto_informes_aprobados(cantidad=3)
                         
                         # Procesar obligaciones con contexto de informes aprobados
@@ -138,18 +161,21 @@ class GeneradorSeccion1(GeneradorSeccion):
                             self.extractor_observaciones.procesar_obligacion(obl, contexto_informes)
                             for obl in self.obligaciones_especificas_raw
                         ]
-                        self.obligaciones_ambientales_raw = [
-                            self.extractor_observaciones.procesar_obligacion(obl, contexto_informes)
-                            for obl in self.obligaciones_ambientales_raw
-                        ]
-                        self.obligaciones_anexos_raw = [
-                            self.extractor_observaciones.procesar_obligacion(obl, contexto_informes)
-                            for obl in self.obligaciones_anexos_raw
-                        ]
+                        # Ambientales y anexos solo se llenan desde el template (sin tabla por anclas)
+                        if self.usa_variable("tabla_obligaciones_ambientales"):
+                            self.obligaciones_ambientales_raw = [
+                                self.extractor_observaciones.procesar_obligacion(obl, contexto_informes)
+                                for obl in self.obligaciones_ambientales_raw
+                            ]
+                        if self.usa_variable("tabla_obligaciones_anexos"):
+                            self.obligaciones_anexos_raw = [
+                                self.extractor_observaciones.procesar_obligacion(obl, contexto_informes)
+                                for obl in self.obligaciones_anexos_raw
+                            ]
             except Exception as e:
-                print(f"[WARNING] Error al cargar obligaciones desde {archivo_obligaciones}: {e}")
+                logger.warning("Error al cargar obligaciones desde %s: %s", archivo_obligaciones, e)
         else:
-            print(f"[INFO] Archivo de obligaciones no encontrado: {archivo_obligaciones}")
+            logger.info("Archivo de obligaciones no encontrado: %s", archivo_obligaciones)
             # Las listas quedan vacías - se usarán datos fijos del texto
     
     def _cargar_personal(self) -> None:
@@ -183,7 +209,12 @@ class GeneradorSeccion1(GeneradorSeccion):
         return ""
     
     def procesar(self) -> Dict[str, Any]:
-        """Procesa y retorna el contexto para el template"""
+        """
+        Procesa y retorna el contexto para el template
+        
+        Las tablas y textos fijos son Perezoso: al renderizar solo se calculan
+        los que el template referencia.
+        """
         # Texto introductorio oficial
         texto_intro = (
             f"Se celebra el número de proceso {config.CONTRATO['numero_proceso']} bajo número de contrato "
@@ -193,12 +224,16 @@ class GeneradorSeccion1(GeneradorSeccion):
             f"Se detalla la información general del contrato."
         )
         
-        return {
+        componentes = Perezoso(self._cargar_tabla_componentes)
+        centros = Perezoso(self._cargar_tabla_centros_monitoreo)
+        forma_pago = Perezoso(self._cargar_tabla_forma_pago)
+        
+        return ContextoPerezoso({
             # Texto introductorio
             "texto_intro": texto_intro,
             
             # TABLA 1: Información General del Contrato (formato lista para docxtpl)
-            "tabla_1_filas": self._formatear_tabla_1(),
+            "tabla_1_filas": Perezoso(self._formatear_tabla_1),
             "tabla_1_info_general": {
                 "nit": config.CONTRATO["nit_entidad"],
                 "razon_social": config.CONTRATO["razon_social"],
@@ -228,49 +263,49 @@ class GeneradorSeccion1(GeneradorSeccion):
             "objeto_contrato": config.CONTRATO["objeto_corto"],
             
             # 1.2 Alcance (FIJO)
-            "alcance": self._cargar_contenido_fijo("alcance.txt"),
+            "alcance": Perezoso(lambda: self._cargar_contenido_fijo("alcance.txt")),
             
             # 1.3 Descripción infraestructura (FIJO + TABLAS)
-            "descripcion_infraestructura": self._cargar_contenido_fijo("infraestructura.txt"),
+            "descripcion_infraestructura": Perezoso(lambda: self._cargar_contenido_fijo("infraestructura.txt")),
             "subsistemas": config.SUBSISTEMAS,
-            "componentes": self._cargar_tabla_componentes(),  # Renombrado para consistencia
-            "centros": self._cargar_tabla_centros_monitoreo(),  # Renombrado para consistencia
-            "forma_pago": self._cargar_tabla_forma_pago(),  # Renombrado para consistencia
-            "tabla_componentes": self._cargar_tabla_componentes(),  # Mantener compatibilidad
-            "tabla_centros_monitoreo": self._cargar_tabla_centros_monitoreo(),  # Mantener compatibilidad
-            "tabla_forma_pago": self._cargar_tabla_forma_pago(),  # Mantener compatibilidad
+            "componentes": componentes,  # Renombrado para consistencia
+            "centros": centros,  # Renombrado para consistencia
+            "forma_pago": forma_pago,  # Renombrado para consistencia
+            "tabla_componentes": componentes,  # Mantener compatibilidad
+            "tabla_centros_monitoreo": centros,  # Mantener compatibilidad
+            "tabla_forma_pago": forma_pago,  # Mantener compatibilidad
             "nota_infraestructura": self._obtener_nota_infraestructura(),
             
             # 1.4 Glosario (FIJO)
-            "glosario": self._cargar_glosario(),
-            "glosario_tablas": self._formatear_glosario_tablas(),
+            "glosario": Perezoso(self._cargar_glosario),
+            "glosario_tablas": Perezoso(self._formatear_glosario_tablas),
             
             # 1.5 Obligaciones (FIJO texto + DINÁMICO tablas)
-            "obligaciones_generales": self._cargar_contenido_fijo("obligaciones_generales.txt"),
-            "obligaciones_especificas": self._cargar_contenido_fijo("obligaciones_especificas.txt"),
-            "obligaciones_ambientales": self._cargar_contenido_fijo("obligaciones_ambientales.txt"),
-            "obligaciones_anexos": self._cargar_contenido_fijo("obligaciones_anexos.txt"),
+            "obligaciones_generales": Perezoso(lambda: self._cargar_contenido_fijo("obligaciones_generales.txt")),
+            "obligaciones_especificas": Perezoso(lambda: self._cargar_contenido_fijo("obligaciones_especificas.txt")),
+            "obligaciones_ambientales": Perezoso(lambda: self._cargar_contenido_fijo("obligaciones_ambientales.txt")),
+            "obligaciones_anexos": Perezoso(lambda: self._cargar_contenido_fijo("obligaciones_anexos.txt")),
             
             # Tablas de obligaciones (DINÁMICAS - con cumplimiento)
-            "tabla_obligaciones_generales": self._formatear_obligaciones_generales(),
-            "tabla_obligaciones_especificas": self._formatear_obligaciones_especificas(),
-            "tabla_obligaciones_ambientales": self._formatear_obligaciones_ambientales(),
-            "tabla_obligaciones_anexos": self._formatear_obligaciones_anexos(),
+            "tabla_obligaciones_generales": Perezoso(self._formatear_obligaciones_generales),
+            "tabla_obligaciones_especificas": Perezoso(self._formatear_obligaciones_especificas),
+            "tabla_obligaciones_ambientales": Perezoso(self._formatear_obligaciones_ambientales),
+            "tabla_obligaciones_anexos": Perezoso(self._formatear_obligaciones_anexos),
             
             # 1.6 Comunicados (EXTRACCIÓN)
             "comunicados_emitidos": self.comunicados_emitidos,
             "comunicados_recibidos": self.comunicados_recibidos,
             "total_comunicados_emitidos": len(self.comunicados_emitidos),
             "total_comunicados_recibidos": len(self.comunicados_recibidos),
-            "tabla_comunicados_emitidos": self._formatear_comunicados_emitidos(),
-            "tabla_comunicados_recibidos": self._formatear_comunicados_recibidos(),
+            "tabla_comunicados_emitidos": Perezoso(self._formatear_comunicados_emitidos),
+            "tabla_comunicados_recibidos": Perezoso(self._formatear_comunicados_recibidos),
             
             # 1.7 - 1.8 Personal (FIJO estructura + EXTRACCIÓN datos)
             "personal_minimo": self.personal_minimo,
             "personal_apoyo": self.personal_apoyo,
-            "tabla_personal_minimo": self._formatear_personal_minimo(),
-            "tabla_personal_apoyo": self._formatear_personal_apoyo(),
-        }
+            "tabla_personal_minimo": Perezoso(self._formatear_personal_minimo),
+            "tabla_personal_apoyo": Perezoso(self._formatear_personal_apoyo),
+        })
     
     def _cargar_glosario(self) -> List[Dict[str, str]]:
         """Carga el glosario de términos"""
@@ -523,7 +558,7 @@ class GeneradorSeccion1(GeneradorSeccion):
     
     def generar(self):
         """
-        Genera la sección completa, reemplazando dinámicamente la tabla de obligaciones generales
+        Genera la sección completa, reemplazando dinámicamente las tablas de obligaciones
         """
         # Primero, generar el documento base usando el método de la clase padre
         doc_template = super().generar()
@@ -531,11 +566,16 @@ class GeneradorSeccion1(GeneradorSeccion):
         # Acceder al documento interno de DocxTemplate (atributo .docx es un Document de python-docx)
         doc = doc_template.docx
         
-        # Reemplazar la tabla de obligaciones generales dinámicamente
-        self._reemplazar_tabla_obligaciones_generales(doc)
-        
-        # Reemplazar la tabla de obligaciones específicas dinámicamente
-        self._reemplazar_tabla_obligaciones_especificas(doc)
+        with self._medir("tablas_obligaciones"):
+            # Índice título → tabla construido en una sola pasada por el documento
+            indice = IndiceAnclas(doc)
+            
+            # Reemplazar la tabla de obligaciones generales dinámicamente
+            tabla_generales = self._reemplazar_tabla_obligaciones_generales(indice)
+            
+            # Reemplazar la tabla de obligaciones específicas dinámicamente
+            excluir = [tabla_generales] if tabla_generales is not None else []
+            self._reemplazar_tabla_obligaciones_especificas(indice, excluir)
         
         # Retornar el DocxTemplate modificado
         return doc_template
@@ -548,395 +588,111 @@ class GeneradorSeccion1(GeneradorSeccion):
         
         # Guardar el documento modificado directamente desde el Document interno
         # Esto asegura que los cambios en las tablas se guarden correctamente
-        doc_template.docx.save(str(output_path))
-        print(f"[OK] {self.nombre_seccion} guardada en: {output_path}")
+        with self._medir("guardar"):
+            self.guardar_documento(doc_template.docx, output_path)
+        logger.info("%s guardada en: %s", self.nombre_seccion, output_path)
     
-    def _reemplazar_tabla_obligaciones_generales(self, doc: Document) -> None:
+    def _buscar_tabla_obligaciones(self, indice: IndiceAnclas, titulo: List[str],
+                                   excluir: List = None):
         """
-        Busca y reemplaza la tabla de obligaciones generales con datos dinámicos
-        """
-        if not self.obligaciones_generales_raw:
-            print("[WARNING] No hay obligaciones generales para reemplazar en la tabla")
-            return
-        
-        # Buscar la tabla que está después del texto "1.5.1" o "OBLIGACIONES GENERALES"
-        tabla_encontrada = None
+        Busca la tabla de obligaciones que sigue al título indicado
         
-        # Estrategia 1: Buscar párrafos que mencionen "1.5.1" o "OBLIGACIONES GENERALES"
-        # y luego buscar la siguiente tabla
-        encontro_titulo = False
-        for parrafo in doc.paragraphs:
-            texto = parrafo.text.upper()
-            if '1.5.1' in texto or ('OBLIGACIONES' in texto and 'GENERALES' in texto):
-                encontro_titulo = True
-                # Buscar la siguiente tabla después de este párrafo
-                # Necesitamos encontrar el elemento XML del párrafo y buscar el siguiente elemento tabla
-                break
+        Args:
+            indice: Índice de anclas del documento
+            titulo: Palabras del título de la subsección (ej: ["OBLIGACIONES", "GENERALES"])
+            excluir: Tablas ya utilizadas
         
-        # Si encontramos el título, buscar la tabla siguiente
-        if encontro_titulo:
-            # Buscar en el XML del documento
-            elementos = doc.element.body
-            tabla_count_before = 0
-            encontro_titulo_xml = False
-            
-            for i, elemento in enumerate(elementos):
-                # Si encontramos una tabla antes del título, incrementar contador
-                if hasattr(elemento, 'tag') and elemento.tag.endswith('}tbl'):
-                    if not encontro_titulo_xml:
-                        tabla_count_before += 1
-                
-                # Verificar si es un párrafo con el texto buscado
-                if hasattr(elemento, 'text') and elemento.text:
-                    texto = elemento.text.upper()
-                    if '1.5.1' in texto or ('OBLIGACIONES' in texto and 'GENERALES' in texto):
-                        encontro_titulo_xml = True
-                        print(f"[INFO] Título encontrado en elemento {i}, tablas antes: {tabla_count_before}")
-                        # Buscar la siguiente tabla después del título
-                        for j in range(i + 1, len(elementos)):
-                            siguiente = elementos[j]
-                            if hasattr(siguiente, 'tag') and siguiente.tag.endswith('}tbl'):
-                                # Esta es la tabla que buscamos
-                                tabla_index = tabla_count_before
-                                if tabla_index < len(doc.tables):
-                                    tabla_candidata = doc.tables[tabla_index]
-                                    # Verificar que sea la tabla correcta por sus encabezados
-                                    if len(tabla_candidata.rows) > 0:
-                                        primera_fila = tabla_candidata.rows[0]
-                                        encabezados = [celda.text.strip().upper() for celda in primera_fila.cells]
-                                        tiene_item = any('ITEM' in h or 'ÍTEM' in h for h in encabezados)
-                                        tiene_obligacion = any('OBLIGACION' in h or 'OBLIGACIÓN' in h for h in encabezados)
-                                        if tiene_item and tiene_obligacion:
-                                            tabla_encontrada = tabla_candidata
-                                            print(f"[INFO] Tabla de obligaciones encontrada (índice {tabla_index})")
-                                            break
-                                tabla_count_before += 1
-                        break
-        
-        # Estrategia 2: Si no encontramos por título, buscar tabla con formato correcto
-        if not tabla_encontrada:
-            print("[INFO] Buscando tabla por formato de encabezados...")
-            for idx, tabla in enumerate(doc.tables):
-                if len(tabla.rows) > 0:
-                    primera_fila = tabla.rows[0]
-                    encabezados = [celda.text.strip().upper() for celda in primera_fila.cells]
-                    print(f"[DEBUG] Tabla {idx}: {len(tabla.columns)} columnas, encabezados: {encabezados[:3]}...")
-                    
-                    # Buscar palabras clave en los encabezados
-                    tiene_item = any('ITEM' in h or 'ÍTEM' in h for h in encabezados)
-                    tiene_obligacion = any('OBLIGACION' in h or 'OBLIGACIÓN' in h for h in encabezados)
-                    tiene_periodicidad = any('PERIODICIDAD' in h for h in encabezados)
-                    tiene_observaciones = any('OBSERVACION' in h or 'OBSERVACIÓN' in h for h in encabezados)
-                    tiene_anexo = any('ANEXO' in h for h in encabezados)
-                    
-                    # Priorizar tablas con más columnas y más palabras clave
-                    puntuacion = sum([tiene_item, tiene_obligacion, tiene_periodicidad, tiene_observaciones, tiene_anexo])
-                    
-                    if tiene_item and tiene_obligacion and tiene_periodicidad:
-                        if not tabla_encontrada or (puntuacion > 3 and len(tabla.columns) >= 5):
-                            tabla_encontrada = tabla
-                            print(f"[INFO] Tabla candidata encontrada (índice {idx}): {len(tabla.columns)} columnas, puntuación: {puntuacion}")
-                            if puntuacion >= 4 and len(tabla.columns) >= 5:
-                                print(f"[INFO] Tabla seleccionada: {len(tabla.columns)} columnas")
-                                break
-        
-        if not tabla_encontrada:
-            print("[WARNING] No se encontró la tabla de obligaciones generales en el template")
-            print("[INFO] Listando todas las tablas disponibles...")
-            for idx, tabla in enumerate(doc.tables):
-                primera_fila = tabla.rows[0] if tabla.rows else None
-                encabezados = [celda.text.strip().upper() for celda in primera_fila.cells] if primera_fila else []
-                print(f"[INFO] Tabla {idx}: {len(tabla.columns)} columnas, {len(tabla.rows)} filas, encabezados: {encabezados}")
-            
-            print("[INFO] Intentando usar la primera tabla con más de 5 columnas...")
-            # Último recurso: usar la primera tabla grande
-            for tabla in doc.tables:
-                if len(tabla.columns) >= 5:
-                    tabla_encontrada = tabla
-                    print(f"[INFO] Usando tabla con {len(tabla.columns)} columnas y {len(tabla.rows)} filas")
-                    break
-        
-        if tabla_encontrada:
-            # Verificar que sea la tabla correcta antes de reemplazar
-            if len(tabla_encontrada.rows) > 0:
-                primera_fila = tabla_encontrada.rows[0]
-                encabezados = [celda.text.strip().upper() for celda in primera_fila.cells]
-                tiene_item = any('ITEM' in h or 'ÍTEM' in h for h in encabezados)
-                tiene_obligacion = any('OBLIGACION' in h or 'OBLIGACIÓN' in h for h in encabezados)
-                
-                if not (tiene_item and tiene_obligacion):
-                    print(f"[WARNING] La tabla encontrada no parece ser la tabla de obligaciones generales")
-                    print(f"[WARNING] Encabezados: {encabezados}")
-                    print(f"[WARNING] Buscando tabla alternativa...")
-                    tabla_encontrada = None
-                    # Buscar por formato específico
-                    for tabla in doc.tables:
-                        if len(tabla.rows) > 0:
-                            primera_fila = tabla.rows[0]
-                            encabezados = [celda.text.strip().upper() for celda in primera_fila.cells]
-                            tiene_item = any('ITEM' in h or 'ÍTEM' in h for h in encabezados)
-                            tiene_obligacion = any('OBLIGACION' in h or 'OBLIGACIÓN' in h for h in encabezados)
-                            tiene_periodicidad = any('PERIODICIDAD' in h for h in encabezados)
-                            if tiene_item and tiene_obligacion and tiene_periodicidad:
-                                tabla_encontrada = tabla
-                                print(f"[INFO] Tabla correcta encontrada por formato")
-                                break
-        
-        if tabla_encontrada:
-            # Reemplazar la tabla encontrada
-            self._crear_tabla_obligaciones_generales(doc, tabla_encontrada)
-        else:
-            print("[ERROR] No se pudo encontrar ninguna tabla para reemplazar")
-            print("[ERROR] Asegúrate de que el template tenga una tabla con encabezados: ÍTEM, OBLIGACIÓN, PERIODICIDAD, etc.")
-    
-    def _crear_tabla_obligaciones_generales(self, doc: Document, tabla_existente) -> None:
+        Returns:
+            Tabla encontrada o None
         """
-        Reemplaza el contenido de la tabla existente con los datos dinámicos de obligaciones generales
+        excluir = excluir or []
+        tabla = indice.tabla_despues_de(*titulo, encabezados=self.ENCABEZADOS_OBLIGACIONES, excluir=excluir)
+        if tabla is None:
+            # Respaldo: primera tabla con el formato de obligaciones que no se haya usado
+            tabla = indice.tabla_por_encabezados(*self.ENCABEZADOS_OBLIGACIONES, excluir=excluir)
+        return tabla
+    
+    def _reemplazar_tabla_obligaciones_generales(self, indice: IndiceAnclas):
         """
-        print(f"[INFO] Reemplazando tabla de obligaciones generales con {len(self.obligaciones_generales_raw)} obligaciones")
-        
-        # Limpiar todas las filas excepto el encabezado (fila 0)
-        num_filas_originales = len(tabla_existente.rows)
-        while len(tabla_existente.rows) > 1:
-            tbl = tabla_existente._tbl
-            tbl.remove(tabla_existente.rows[-1]._tr)
-        
-        print(f"[INFO] Tabla limpiada: {num_filas_originales} filas -> {len(tabla_existente.rows)} fila(s) (encabezado)")
-        
-        # Obtener número de columnas
-        num_cols = len(tabla_existente.columns)
-        print(f"[INFO] Tabla tiene {num_cols} columnas")
-        
-        # Verificar encabezados de la tabla para entender su estructura
-        if len(tabla_existente.rows) > 0:
-            encabezados = [celda.text.strip().upper() for celda in tabla_existente.rows[0].cells]
-            print(f"[INFO] Encabezados de la tabla: {encabezados}")
-        
-        # Si la tabla tiene menos de 6 columnas, intentar agregar columnas faltantes
-        if num_cols < 6:
-            print(f"[WARNING] La tabla tiene solo {num_cols} columnas, se necesitan 6. Intentando agregar columnas...")
-            # Agregar columnas faltantes
-            columnas_faltantes = 6 - num_cols
-            for i in range(columnas_faltantes):
-                tabla_existente.add_column(Inches(1.5))
-                print(f"[INFO] Columna {num_cols + i + 1} agregada")
-            num_cols = len(tabla_existente.columns)
-            print(f"[INFO] Tabla ahora tiene {num_cols} columnas")
-        
-        # Actualizar encabezados si es necesario
-        if len(tabla_existente.rows) > 0:
-            encabezados_esperados = ['ÍTEM', 'OBLIGACIÓN', 'PERIODICIDAD', 'CUMPLIÓ / NO CUMPLIÓ', 'OBSERVACIONES', 'ANEXO']
-            primera_fila = tabla_existente.rows[0]
-            for i in range(min(num_cols, 6)):
-                if i < len(primera_fila.cells):
-                    celda = primera_fila.cells[i]
-                    texto_actual = celda.text.strip().upper()
-                    texto_esperado = encabezados_esperados[i].upper()
-                    if texto_actual != texto_esperado and len(texto_actual) < 5:  # Solo actualizar si está vacío o muy corto
-                        celda.text = encabezados_esperados[i]
-                        # Formatear encabezado
-                        for parrafo in celda.paragraphs:
-                            for run in parrafo.runs:
-                                run.font.bold = True
-                                run.font.size = Pt(10)
-        
-        # Mapeo de columnas
-        columnas_esperadas = ['item', 'obligacion', 'periodicidad', 'cumplio', 'observaciones', 'anexo']
-        mapeo_columnas = {
-            0: 'item',
-            1: 'obligacion', 
-            2: 'periodicidad',
-            3: 'cumplio',
-            4: 'observaciones',
-            5: 'anexo'
-        }
-        
-        # Agregar filas con los datos
-        for obligacion in self.obligaciones_generales_raw:
-            fila = tabla_existente.add_row()
-            celdas = fila.cells
-            
-            # Llenar cada celda según el mapeo
-            for i in range(min(num_cols, 6)):
-                campo = mapeo_columnas.get(i, '')
-                valor = obligacion.get(campo, '')
-                
-                if i < len(celdas):
-                    # Limpiar contenido existente de la celda
-                    celdas[i].text = ''
-                    # Agregar el nuevo texto
-                    parrafo = celdas[i].paragraphs[0] if celdas[i].paragraphs else celdas[i].add_paragraph()
-                    parrafo.clear()
-                    run = parrafo.add_run(str(valor) if valor else '')
-                    
-                    # Aplicar formato según la columna
-                    if i == 0:  # ÍTEM
-                        parrafo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        run.font.size = Pt(10)
-                    elif i == 1:  # OBLIGACIÓN
-                        parrafo.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                        run.font.size = Pt(10)
-                    elif i == 2:  # PERIODICIDAD
-                        parrafo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        run.font.size = Pt(10)
-                    elif i == 3:  # CUMPLIÓ
-                        parrafo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        run.font.size = Pt(10)
-                    elif i == 4:  # OBSERVACIONES
-                        parrafo.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                        run.font.size = Pt(9)
-                    elif i == 5:  # ANEXO
-                        parrafo.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                        run.font.size = Pt(9)
-                    
-                    run.font.name = 'Calibri'
+        Busca y reemplaza la tabla de obligaciones generales con datos dinámicos
         
-        print(f"[INFO] Tabla actualizada: {len(tabla_existente.rows)} filas totales (1 encabezado + {len(self.obligaciones_generales_raw)} datos)")
+        Returns:
+            Tabla reemplazada o None
+        """
+        if not self.obligaciones_generales_raw:
+            logger.warning("No hay obligaciones generales para reemplazar en la tabla")
+            return None
+        
+        tabla = self._buscar_tabla_obligaciones(indice, ["OBLIGACIONES", "GENERALES"])
+        if tabla is None:
+            logger.error("No se pudo encontrar ninguna tabla para reemplazar. Asegúrate de que el template "
+                         "tenga una tabla con encabezados: ÍTEM, OBLIGACIÓN, PERIODICIDAD, etc.")
+            return None
+        
+        # Formato de las columnas: ÍTEM, OBLIGACIÓN, PERIODICIDAD, CUMPLIÓ, OBSERVACIONES, ANEXO
+        columnas = [
+            {"alineacion": WD_ALIGN_PARAGRAPH.CENTER, "tamano": 10, "fuente": "Calibri"},
+            {"alineacion": WD_ALIGN_PARAGRAPH.LEFT, "tamano": 10, "fuente": "Calibri"},
+            {"alineacion": WD_ALIGN_PARAGRAPH.CENTER, "tamano": 10, "fuente": "Calibri"},
+            {"alineacion": WD_ALIGN_PARAGRAPH.CENTER, "tamano": 10, "fuente": "Calibri"},
+            {"alineacion": WD_ALIGN_PARAGRAPH.LEFT, "tamano": 9, "fuente": "Calibri"},
+            {"alineacion": WD_ALIGN_PARAGRAPH.LEFT, "tamano": 9, "fuente": "Calibri"},
+        ]
+        self._llenar_tabla_obligaciones(tabla, self.obligaciones_generales_raw, columnas)
+        return tabla
     
-    def _reemplazar_tabla_obligaciones_especificas(self, doc: Document) -> None:
+    def _reemplazar_tabla_obligaciones_especificas(self, indice: IndiceAnclas, excluir: List = None):
         """
         Busca y reemplaza la tabla de obligaciones específicas con datos dinámicos
-        Similar a _reemplazar_tabla_obligaciones_generales pero busca "1.5.2" o "OBLIGACIONES ESPECÍFICAS"
+        
+        Returns:
+            Tabla reemplazada o None
         """
         if not self.obligaciones_especificas_raw:
-            print("[WARNING] No hay obligaciones específicas para reemplazar en la tabla")
-            return
-        
-        tabla_encontrada = None
-        
-        # Estrategia: Buscar el párrafo "1.5.2" o "OBLIGACIONES ESPECÍFICAS" y luego la siguiente tabla con 6 columnas
-        encontro_titulo = False
-        elementos = doc.element.body
-        
-        for i, elemento in enumerate(elementos):
-            if hasattr(elemento, 'text') and elemento.text:
-                texto = elemento.text.strip().upper()
-                if ('1.5.2' in texto or '1.5.2.' in texto) and ('OBLIGACIONES' in texto and 'ESPECÍFICAS' in texto):
-                    print(f"[INFO] Título '1.5.2. OBLIGACIONES ESPECÍFICAS' encontrado en elemento {i}")
-                    encontro_titulo = True
-                    
-                    # Contar cuántas tablas hay antes de este título
-                    tablas_antes = sum(1 for x in elementos[:i] if hasattr(x, 'tag') and x.tag.endswith('}tbl'))
-                    print(f"[INFO] Tablas antes del título: {tablas_antes}")
-                    
-                    # Buscar la siguiente tabla después de este párrafo
-                    tabla_idx_en_doc_tables = -1
-                    current_table_count = 0
-                    for k, doc_table in enumerate(doc.tables):
-                        if current_table_count >= tablas_antes:
-                            # Esta es una tabla que aparece después del título
-                            if len(doc_table.columns) == 6:  # Buscamos una tabla con 6 columnas
-                                # Verificar que tenga encabezados de obligaciones
-                                if len(doc_table.rows) > 0:
-                                    primera_fila = doc_table.rows[0]
-                                    encabezados = [celda.text.strip().upper() for celda in primera_fila.cells]
-                                    tiene_item = any('ITEM' in h or 'ÍTEM' in h for h in encabezados)
-                                    tiene_obligacion = any('OBLIGACION' in h or 'OBLIGACIÓN' in h for h in encabezados)
-                                    if tiene_item and tiene_obligacion:
-                                        tabla_encontrada = doc_table
-                                        tabla_idx_en_doc_tables = k
-                                        print(f"[INFO] Tabla de obligaciones específicas encontrada (índice {k})")
-                                        break
-                        if hasattr(doc_table._element, 'tag') and doc_table._element.tag.endswith('}tbl'):
-                            current_table_count += 1
-                    break
-        
-        # Estrategia 2: Si no encontramos por título, buscar tabla con formato correcto después de la tabla de generales
-        if not tabla_encontrada:
-            print("[INFO] Intentando buscar tabla de obligaciones específicas por formato...")
-            for k, doc_table in enumerate(doc.tables):
-                if len(doc_table.rows) > 0 and len(doc_table.columns) == 6:
-                    primera_fila = doc_table.rows[0]
-                    encabezados = [celda.text.strip().upper() for celda in primera_fila.cells]
-                    tiene_item = any('ITEM' in h or 'ÍTEM' in h for h in encabezados)
-                    tiene_obligacion = any('OBLIGACION' in h or 'OBLIGACIÓN' in h for h in encabezados)
-                    tiene_periodicidad = any('PERIODICIDAD' in h for h in encabezados)
-                    tiene_observaciones = any('OBSERVACION' in h or 'OBSERVACIÓN' in h for h in encabezados)
-                    tiene_anexo = any('ANEXO' in h for h in encabezados)
-                    
-                    # Si tiene todas las columnas esperadas y no es la tabla de generales (ya procesada)
-                    if tiene_item and tiene_obligacion and tiene_periodicidad and tiene_observaciones and tiene_anexo:
-                        # Verificar que no sea la tabla de generales (comparar número de filas)
-                        # La tabla de generales ya debería tener 16 filas de datos
-                        if len(doc_table.rows) != 17:  # 1 encabezado + 16 datos de generales
-                            tabla_encontrada = doc_table
-                            print(f"[INFO] Tabla de obligaciones específicas encontrada por formato (índice {k})")
-                            break
-        
-        if tabla_encontrada:
-            self._crear_tabla_obligaciones_especificas(doc, tabla_encontrada)
-        else:
-            print("[WARNING] No se encontró la tabla de obligaciones específicas en el template con 6 columnas.")
-            print("[INFO] Intentando buscar la primera tabla con 6 columnas que no sea la de generales...")
-            for k, doc_table in enumerate(doc.tables):
-                if len(doc_table.columns) == 6 and len(doc_table.rows) != 17:
-                    tabla_encontrada = doc_table
-                    print(f"[INFO] Usando tabla con 6 columnas (índice {k}) para obligaciones específicas")
-                    self._crear_tabla_obligaciones_especificas(doc, tabla_encontrada)
-                    break
-            
-            if not tabla_encontrada:
-                print("[ERROR] No se pudo encontrar ninguna tabla para reemplazar las obligaciones específicas.")
+            logger.warning("No hay obligaciones específicas para reemplazar en la tabla")
+            return None
+        
+        tabla = self._buscar_tabla_obligaciones(indice, ["OBLIGACIONES", "ESPECIFICAS", "CONTRATISTA"], excluir)
+        if tabla is None:
+            logger.error("No se pudo encontrar ninguna tabla para reemplazar las obligaciones específicas.")
+            return None
+        
+        columnas = [
+            {"tamano": 10},
+            {"tamano": 10},
+            {"alineacion": WD_ALIGN_PARAGRAPH.CENTER, "tamano": 10},
+            {"alineacion": WD_ALIGN_PARAGRAPH.CENTER, "tamano": 10},
+            {"tamano": 10},
+            {"tamano": 10},
+        ]
+        self._llenar_tabla_obligaciones(tabla, self.obligaciones_especificas_raw, columnas)
+        return tabla
     
-    def _crear_tabla_obligaciones_especificas(self, doc: Document, tabla_existente) -> None:
+    def _llenar_tabla_obligaciones(self, tabla, obligaciones: List[Dict[str, Any]],
+                                   columnas: List[Dict[str, Any]]) -> None:
         """
-        Reemplaza el contenido de la tabla existente con los datos dinámicos de obligaciones específicas
-        """
-        print(f"[INFO] Reemplazando tabla de obligaciones específicas con {len(self.obligaciones_especificas_raw)} obligaciones")
-        
-        # Limpiar todas las filas excepto el encabezado (fila 0)
-        num_filas_originales = len(tabla_existente.rows)
-        while len(tabla_existente.rows) > 1:
-            tbl = tabla_existente._tbl
-            tbl.remove(tabla_existente.rows[-1]._tr)
-        
-        print(f"[INFO] Tabla limpiada: {num_filas_originales} filas -> {len(tabla_existente.rows)} fila(s) (encabezado)")
-        
-        # Obtener número de columnas
-        num_cols = len(tabla_existente.columns)
-        print(f"[INFO] Tabla tiene {num_cols} columnas")
+        Reemplaza las filas de datos de la tabla clonando la primera fila de la plantilla
         
-        # Encabezados esperados
-        encabezados_esperados = ["ÍTEM", "OBLIGACIÓN", "PERIODICIDAD", "CUMPLIÓ / NO CUMPLIÓ", "OBSERVACIONES", "ANEXO"]
-        
-        # Actualizar encabezados si no coinciden
-        if len(tabla_existente.rows) > 0:
-            header_cells = tabla_existente.rows[0].cells
-            current_headers = [self._limpiar_texto_celda(c.text) for c in header_cells]
-            print(f"[INFO] Encabezados de la tabla: {current_headers}")
-            
-            if current_headers != encabezados_esperados:
-                print("[INFO] Los encabezados de la tabla no coinciden, actualizando...")
-                for i, header_text in enumerate(encabezados_esperados):
-                    if i < num_cols:
-                        self._formatear_celda(header_cells[i], header_text, bold=True, center=True)
-                    else:
-                        print(f"[WARNING] No hay suficientes columnas para el encabezado: {header_text}")
-        
-        # Agregar datos
-        for obligacion in self.obligaciones_especificas_raw:
-            row_cells = tabla_existente.add_row().cells
-            self._formatear_celda(row_cells[0], str(obligacion.get("item", "")))
-            self._formatear_celda(row_cells[1], obligacion.get("obligacion", ""))
-            self._formatear_celda(row_cells[2], obligacion.get("periodicidad", ""), center=True)
-            self._formatear_celda(row_cells[3], obligacion.get("cumplio", ""), center=True)
-            self._formatear_celda(row_cells[4], obligacion.get("observaciones", ""))
-            self._formatear_celda(row_cells[5], obligacion.get("anexo", ""))
-        
-        print(f"[INFO] Tabla actualizada: {len(tabla_existente.rows)} filas totales (1 encabezado + {len(self.obligaciones_especificas_raw)} datos)")
-    
-    def _formatear_celda(self, cell, text, bold=False, center=False):
-        """Formatea el texto de una celda"""
-        cell.text = text
-        paragraph = cell.paragraphs[0]
-        if center:
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        for run in paragraph.runs:
-            run.font.bold = bold
-            run.font.size = Pt(10)  # Tamaño de fuente consistente
-    
-    def _limpiar_texto_celda(self, text: str) -> str:
-        """Limpia el texto de una celda para comparación (elimina saltos de línea y espacios extra)"""
-        return ' '.join(text.replace('\n', ' ').split()).upper()
-
-
+        Args:
+            tabla: Tabla de obligaciones del template
+            obligaciones: Obligaciones a escribir
+            columnas: Formato por columna (alineacion, tamano, fuente)
+        """
+        num_cols = len(tabla._tbl.tblGrid.gridCol_lst)
+        if num_cols < len(self.COLUMNAS_OBLIGACIONES):
+            # Sin estas columnas la fila prototipo descartaría observaciones y anexo
+            logger.warning("La tabla tiene solo %s columnas, se agregan las %s faltantes",
+                           num_cols, len(self.COLUMNAS_OBLIGACIONES) - num_cols)
+            for titulo in self.TITULOS_OBLIGACIONES[num_cols:]:
+                encabezado = tabla.add_column(Inches(1.5)).cells[0]
+                encabezado.text = titulo
+                for run in encabezado.paragraphs[0].runs:
+                    run.font.bold = True
+                    run.font.size = Pt(10)
+        
+        filas = [
+            [obligacion.get(campo, '') for campo in self.COLUMNAS_OBLIGACIONES]
+            for obligacion in obligaciones
+        ]
+        llenar_tabla_desde_prototipo(tabla, filas, filas_encabezado=1, columnas=columnas)
+        logger.debug("Tabla actualizada: %s obligaciones", len(obligaciones))
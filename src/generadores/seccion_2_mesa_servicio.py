@@ -14,21 +14,22 @@ Subsecciones:
 from docx import Document
 from docx.shared import Inches, Pt, Cm, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import json
 from .base import GeneradorSeccion
 import config
 from src.extractores.glpi_extractor import get_glpi_extractor
+from src.extractores.fuentes import leer_fuente_json
+from src.utils.tabla_utils import agregar_tabla_xml
 
 
 class GeneradorSeccion2(GeneradorSeccion):
     """Genera la Sección 2: Informe de Mesa de Servicio"""
     
+    # Estado que se guarda en el snapshot de --solo-datos
+    ATRIBUTOS_DATOS = ("datos",)
+    
     # Colores ETB
     COLOR_AZUL_OSCURO = RGBColor(31, 78, 121)
     COLOR_AZUL_MEDIO = RGBColor(46, 117, 182)
@@ -75,51 +76,17 @@ class GeneradorSeccion2(GeneradorSeccion):
         h3.font.bold = True
         h3.font.color.rgb = self.COLOR_GRIS
     
-    def _set_cell_shading(self, cell, color_hex: str):
-        """Establece el color de fondo de una celda"""
-        shading = OxmlElement('w:shd')
-        shading.set(qn('w:fill'), color_hex)
-        cell._tc.get_or_add_tcPr().append(shading)
-    
     def _agregar_tabla(self, encabezados: list, filas: list, anchos: list = None, 
                        colores_fila: list = None):
         """Agrega una tabla con formato profesional"""
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(10)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._set_cell_shading(hdr_cells[i], "1F4E79")
-        
-        # Filas de datos
-        for idx, fila_datos in enumerate(filas):
-            row_cells = tabla.add_row().cells
-            for i, texto in enumerate(fila_datos):
-                row_cells[i].text = str(texto) if texto is not None else ""
-                for paragraph in row_cells[i].paragraphs:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    for run in paragraph.runs:
-                        run.font.size = Pt(10)
-            
-            # Aplicar color de fila si se especifica
-            if colores_fila and idx < len(colores_fila) and colores_fila[idx]:
-                for cell in row_cells:
-                    self._set_cell_shading(cell, colores_fila[idx])
-        
-        # Ajustar anchos
-        if anchos:
-            for i, ancho in enumerate(anchos):
-                for cell in tabla.columns[i].cells:
-                    cell.width = Inches(ancho)
+        columnas = [{"ancho": Inches(ancho)} for ancho in anchos] if anchos else None
+        tabla = agregar_tabla_xml(
+            self.doc, encabezados, filas,
+            columnas=columnas,
+            tamano_fuente=10,
+            centrar_vertical=False,
+            colores_fila=colores_fila
+        )
         
         self.doc.add_paragraph()
         return tabla
@@ -409,12 +376,10 @@ class GeneradorSeccion2(GeneradorSeccion):
         archivo = config.FUENTES_DIR / f"mesa_servicio_{self.mes}_{self.anio}.json"
         
         if archivo.exists():
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    self.datos = json.load(f)
-            except Exception as e:
-                print(f"[WARNING] Error al cargar datos desde {archivo}: {e}")
-                self.datos = {}
+            # Caché compartida con GLPIExtractor: el archivo se parsea una sola vez.
+            # Copia del primer nivel porque aquí se agregan/reemplazan campos
+            datos = leer_fuente_json(archivo)
+            self.datos = dict(datos) if isinstance(datos, dict) else {}
         else:
             print(f"[WARNING] Archivo de datos no encontrado: {archivo}")
             self.datos = {}
@@ -470,33 +435,35 @@ class GeneradorSeccion2(GeneradorSeccion):
         """
         # Cargar datos si no se han cargado
         if not self.datos:
-            self.cargar_datos()
-        
-        # Crear documento
-        self.doc = Document()
-        self._configurar_estilos()
-        
-        # Título principal
-        self.doc.add_heading("2. INFORME DE MESA DE SERVICIO", level=1)
-        
-        # Generar cada subsección
-        self._seccion_2_1_mesa_servicio()
-        self._seccion_2_2_herramientas()
-        self._seccion_2_3_visitas_diagnostico()
-        self._seccion_2_4_tickets()
-        self._seccion_2_5_escalamientos()
-        self._seccion_2_6_hojas_vida()
-        self._seccion_2_7_estado_sistema()
-        
-        # Separador fin de sección
-        self.doc.add_paragraph()
-        p = self.doc.add_paragraph("═" * 60)
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        p = self.doc.add_paragraph("Fin Sección 2 - Informe de Mesa de Servicio")
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.runs[0].italic = True
-        p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
+            with self._medir("cargar_datos"):
+                self.cargar_datos()
+        
+        with self._medir("render"):
+            # Crear documento
+            self.doc = Document()
+            self._configurar_estilos()
+        
+            # Título principal
+            self.doc.add_heading("2. INFORME DE MESA DE SERVICIO", level=1)
+        
+            # Generar cada subsección
+            self._seccion_2_1_mesa_servicio()
+            self._seccion_2_2_herramientas()
+            self._seccion_2_3_visitas_diagnostico()
+            self._seccion_2_4_tickets()
+            self._seccion_2_5_escalamientos()
+            self._seccion_2_6_hojas_vida()
+            self._seccion_2_7_estado_sistema()
+        
+            # Separador fin de sección
+            self.doc.add_paragraph()
+            p = self.doc.add_paragraph("═" * 60)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+            p = self.doc.add_paragraph("Fin Sección 2 - Informe de Mesa de Servicio")
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.runs[0].italic = True
+            p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
         
         return self.doc
     
@@ -508,7 +475,8 @@ class GeneradorSeccion2(GeneradorSeccion):
         if self.doc is None:
             self.generar()
         
-        self.doc.save(str(output_path))
+        with self._medir("guardar"):
+            self.guardar_documento(self.doc, output_path)
         print(f"[OK] {self.nombre_seccion} guardada en: {output_path}")
 
 
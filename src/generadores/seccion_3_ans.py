@@ -19,15 +19,19 @@ from docx.oxml import OxmlElement
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import json
 import calendar
 from .base import GeneradorSeccion
 import config
+from src.utils.tabla_utils import agregar_tabla_xml
+from src.extractores.fuentes import leer_fuente_json
 
 
 class GeneradorSeccion3(GeneradorSeccion):
     """Genera la Sección 3: Informes de Medición de Niveles de Servicio (ANS)"""
     
+    # Estado que se guarda en el snapshot de --solo-datos
+    ATRIBUTOS_DATOS = ("datos", "disponibilidad", "cumple_ans")
+    
     # Umbrales contractuales
     UMBRAL_ANS = 98.9           # Porcentaje mínimo requerido
     UMBRAL_AMARILLO = 97.9      # Zona de alerta
@@ -140,6 +144,14 @@ class GeneradorSeccion3(GeneradorSeccion):
                     run.font.color.rgb = self.COLOR_ROJO
             self._aplicar_sombreado_celda(cell, self.COLOR_ROJO_CLARO)
     
+    def _estilo_semaforo(self, porcentaje: float) -> Dict[str, RGBColor]:
+        """Colores de texto y fondo del semáforo de disponibilidad (para tablas XML)"""
+        if porcentaje >= self.UMBRAL_ANS:
+            return {"color_texto": self.COLOR_VERDE, "color_fondo": self.COLOR_VERDE_CLARO}
+        elif porcentaje >= self.UMBRAL_AMARILLO:
+            return {"color_texto": self.COLOR_AMARILLO, "color_fondo": self.COLOR_AMARILLO_CLARO}
+        return {"color_texto": self.COLOR_ROJO, "color_fondo": self.COLOR_ROJO_CLARO}
+    
     def _agregar_parrafo(self, texto: str, justificado: bool = True, 
                         negrita: bool = False, color: RGBColor = None, tamano: int = 11):
         """Agrega un párrafo de texto"""
@@ -158,40 +170,25 @@ class GeneradorSeccion3(GeneradorSeccion):
     def _calcular_penalidad(self) -> Dict[str, Any]:
         """
         Calcula la penalidad por incumplimiento de ANS
-        Escala contractual:
+        Escala contractual (ans_config.ESCALA_PENALIDAD):
         - Déficit ≤ 0.5%: 0.5% del contrato
         - Déficit ≤ 1.0%: 1.0% del contrato
         - Déficit ≤ 1.5%: 1.5% del contrato
         - Déficit > 1.5%: 2.0% del contrato
         """
-        if self.disponibilidad >= self.UMBRAL_ANS:
-            return {
-                'aplica': False,
-                'deficit': 0.0,
-                'porcentaje_penalidad': 0.0,
-                'valor_penalidad': 0.0
-            }
-        
-        deficit = self.UMBRAL_ANS - self.disponibilidad
-        valor_mensual = self.datos.get('valor_mensual_contrato', 500000000)
-        
-        # Escala de penalidad según especificaciones
-        if deficit <= 0.5:
-            porcentaje_penalidad = 0.5
-        elif deficit <= 1.0:
-            porcentaje_penalidad = 1.0
-        elif deficit <= 1.5:
-            porcentaje_penalidad = 1.5
-        else:
-            porcentaje_penalidad = 2.0
-        
-        valor_penalidad = valor_mensual * (porcentaje_penalidad / 100)
+        from src.utils.penalidades import calcular_penalidades, MODO_ESCALONADA
         
+        resultado = calcular_penalidades(
+            self.disponibilidad,
+            self.datos.get('valor_mensual_contrato', 500000000),
+            umbral=self.UMBRAL_ANS,
+            modo=MODO_ESCALONADA
+        )
         return {
-            'aplica': True,
-            'deficit': deficit,
-            'porcentaje_penalidad': porcentaje_penalidad,
-            'valor_penalidad': valor_penalidad
+            'aplica': bool(resultado['aplica']),
+            'deficit': float(resultado['deficit']),
+            'porcentaje_penalidad': float(resultado['porcentaje_penalidad']),
+            'valor_penalidad': float(resultado['valor_penalidad'])
         }
     
     def _agregar_titulo_seccion(self):
@@ -376,56 +373,37 @@ class GeneradorSeccion3(GeneradorSeccion):
             self._agregar_parrafo("No se registraron datos de disponibilidad por localidad durante este periodo.")
             return
         
-        # Crear tabla
-        tabla = self.doc.add_table(rows=1, cols=5)
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
         encabezados = ["Localidad", "Cámaras", "Hrs Operativas", "Hrs No Operativas", "Disponibilidad (%)"]
-        hdr_cells = tabla.rows[0].cells
-        
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_AZUL_OSCURO)
-            self._centrar_celda_vertical(hdr_cells[i])
+        anchos = [Cm(4.5), Cm(2.5), Cm(3.0), Cm(3.5), Cm(3.5)]
+        columnas = [
+            {"ancho": ancho, "alineacion": WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT}
+            for i, ancho in enumerate(anchos)
+        ]
         
         # Filas de datos
-        for loc in localidades:
-            row_cells = tabla.add_row().cells
+        filas = []
+        estilos_celda = {}
+        for idx, loc in enumerate(localidades):
             disponibilidad = loc.get('disponibilidad', loc.get('disponibilidad_porcentaje', 0))
             
-            fila = [
+            filas.append([
                 loc.get('nombre', loc.get('localidad', '')),
                 str(loc.get('camaras', loc.get('total_camaras', 0))),
                 f"{loc.get('horas_operativas', 0):,}",
                 f"{loc.get('horas_no_operativas', 0):,}",
                 f"{disponibilidad:.2f}%"
-            ]
+            ])
             
-            for i, texto in enumerate(fila):
-                row_cells[i].text = texto
-                for paragraph in row_cells[i].paragraphs:
-                    alineacion = WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                    paragraph.alignment = alineacion
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
-        
             # Aplicar semáforo a la columna de disponibilidad
-            self._aplicar_color_disponibilidad(row_cells[4], disponibilidad)
-        
-        # Ajustar anchos
-        anchos = [Cm(4.5), Cm(2.5), Cm(3.0), Cm(3.5), Cm(3.5)]
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+            estilos_celda[(idx, 4)] = self._estilo_semaforo(disponibilidad)
+        
+        agregar_tabla_xml(
+            self.doc, encabezados, filas,
+            columnas=columnas,
+            color_encabezado=self.COLOR_AZUL_OSCURO,
+            tamano_fuente=9,
+            estilos_celda=estilos_celda
+        )
         
         self.doc.add_paragraph()
     
@@ -530,66 +508,41 @@ class GeneradorSeccion3(GeneradorSeccion):
             self._agregar_parrafo("No se cuenta con histórico de ANS para este periodo.")
             return
         
-        # Crear tabla
-        tabla = self.doc.add_table(rows=1, cols=5)
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
         encabezados = ["Mes", "Disponibilidad (%)", "Umbral (%)", "Estado", "Observaciones"]
-        hdr_cells = tabla.rows[0].cells
-        
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_AZUL_MEDIO)
-            self._centrar_celda_vertical(hdr_cells[i])
+        anchos = [Cm(3.0), Cm(3.0), Cm(2.5), Cm(2.5), Cm(6.0)]
+        columnas = [
+            {"ancho": ancho, "alineacion": WD_ALIGN_PARAGRAPH.CENTER if i < 4 else WD_ALIGN_PARAGRAPH.LEFT}
+            for i, ancho in enumerate(anchos)
+        ]
         
         # Filas de datos
-        for h in historico:
-            row_cells = tabla.add_row().cells
+        filas = []
+        estilos_celda = {}
+        for idx, h in enumerate(historico):
             disponibilidad = h.get('disponibilidad', 0)
             cumple = disponibilidad >= self.UMBRAL_ANS
             
-            fila = [
+            filas.append([
                 h.get('mes', ''),
                 f"{disponibilidad:.2f}%",
                 f"{self.UMBRAL_ANS}%",
                 "✓ Cumple" if cumple else "✗ No Cumple",
                 h.get('observaciones', '-')
-            ]
-            
-            for i, texto in enumerate(fila):
-                row_cells[i].text = texto
-                for paragraph in row_cells[i].paragraphs:
-                    alineacion = WD_ALIGN_PARAGRAPH.CENTER if i < 4 else WD_ALIGN_PARAGRAPH.LEFT
-                    paragraph.alignment = alineacion
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
+            ])
             
             # Aplicar color a la columna de estado
             if cumple:
-                for paragraph in row_cells[3].paragraphs:
-                    for run in paragraph.runs:
-                        run.font.color.rgb = self.COLOR_VERDE
-                self._aplicar_sombreado_celda(row_cells[3], self.COLOR_VERDE_CLARO)
+                estilos_celda[(idx, 3)] = {"color_texto": self.COLOR_VERDE, "color_fondo": self.COLOR_VERDE_CLARO}
             else:
-                for paragraph in row_cells[3].paragraphs:
-                    for run in paragraph.runs:
-                        run.font.color.rgb = self.COLOR_ROJO
-                self._aplicar_sombreado_celda(row_cells[3], self.COLOR_ROJO_CLARO)
-        
-        # Ajustar anchos
-        anchos = [Cm(3.0), Cm(3.0), Cm(2.5), Cm(2.5), Cm(6.0)]
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+                estilos_celda[(idx, 3)] = {"color_texto": self.COLOR_ROJO, "color_fondo": self.COLOR_ROJO_CLARO}
+        
+        agregar_tabla_xml(
+            self.doc, encabezados, filas,
+            columnas=columnas,
+            color_encabezado=self.COLOR_AZUL_MEDIO,
+            tamano_fuente=9,
+            estilos_celda=estilos_celda
+        )
         
         self.doc.add_paragraph()
     
@@ -603,9 +556,16 @@ class GeneradorSeccion3(GeneradorSeccion):
             self._agregar_parrafo("No se cuenta con datos suficientes para el resumen acumulado.")
             return
         
-        meses_cumplidos = sum(1 for h in historico if h.get('disponibilidad', 0) >= self.UMBRAL_ANS)
-        total_meses = len(historico)
-        promedio_disponibilidad = sum(h.get('disponibilidad', 0) for h in historico) / total_meses if total_meses > 0 else 0
+        acumulado = self.datos.get('ans_acumulado')
+        if acumulado:
+            # Agregados precalculados de la serie del ANS (todo el periodo del contrato)
+            meses_cumplidos = acumulado['meses_cumplidos']
+            total_meses = acumulado['meses']
+            promedio_disponibilidad = acumulado['promedio']
+        else:
+            meses_cumplidos = sum(1 for h in historico if h.get('disponibilidad', 0) >= self.UMBRAL_ANS)
+            total_meses = len(historico)
+            promedio_disponibilidad = sum(h.get('disponibilidad', 0) for h in historico) / total_meses if total_meses > 0 else 0
         
         # Crear tabla
         tabla = self.doc.add_table(rows=1, cols=2)
@@ -635,6 +595,8 @@ class GeneradorSeccion3(GeneradorSeccion):
             ["Porcentaje de cumplimiento", f"{(meses_cumplidos/total_meses*100):.1f}%" if total_meses > 0 else "N/A"],
             ["Disponibilidad promedio", f"{promedio_disponibilidad:.2f}%"]
         ]
+        if acumulado and acumulado.get('movil_3') is not None:
+            filas.append(["Promedio móvil últimos 3 meses", f"{acumulado['movil_3']:.2f}%"])
         
         for fila in filas:
             row_cells = tabla.add_row().cells
@@ -662,16 +624,17 @@ class GeneradorSeccion3(GeneradorSeccion):
         archivo = config.FUENTES_DIR / f"ans_{self.mes}_{self.anio}.json"
         
         if archivo.exists():
-            try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    self.datos = json.load(f)
-            except Exception as e:
-                print(f"[WARNING] Error al cargar datos desde {archivo}: {e}")
-                self.datos = self._datos_ejemplo()
+            # Caché compartida con MySQLExtractor: el archivo se parsea una sola vez.
+            # Copia del primer nivel porque aquí se agregan campos calculados
+            datos = leer_fuente_json(archivo)
+            self.datos = dict(datos) if isinstance(datos, dict) else self._datos_ejemplo()
         else:
             print(f"[WARNING] Archivo de datos no encontrado: {archivo}")
             self.datos = self._datos_ejemplo()
         
+        # Si hay eventos crudos de caídas/mantenimientos, recalcular la disponibilidad desde ellos
+        recalculado = self._recalcular_desde_eventos()
+        
         # Calcular disponibilidad si no está en los datos
         if 'disponibilidad_porcentaje' not in self.datos:
             horas_totales = self.datos.get('horas_totales', 0)
@@ -688,6 +651,110 @@ class GeneradorSeccion3(GeneradorSeccion):
             self.datos['mes'] = config.MESES[self.mes]
         if 'anio' not in self.datos:
             self.datos['anio'] = self.anio
+        
+        # Histórico y acumulados desde la serie del ANS (el mes se cierra solo al generar el informe)
+        self._actualizar_serie_ans(datos_reales=archivo.exists() or recalculado)
+    
+    def _actualizar_serie_ans(self, datos_reales: bool) -> None:
+        """
+        Toma de la serie del ANS el histórico y el acumulado del mes
+        
+        Con registrar_resultados (generación del informe) primero se cierra el
+        mes en la serie, si sus datos son reales, y se importan los meses del
+        histórico del JSON que no estén en ella, de modo que la serie se
+        completa aunque los meses anteriores no se hayan generado con esta
+        herramienta. Sin registrar_resultados la serie solo se lee, y se usa
+        únicamente si el mes ya fue cerrado; si no, queda el histórico del JSON.
+        
+        Args:
+            datos_reales: True si los datos del mes son reales (no de ejemplo)
+        """
+        try:
+            from src.extractores.ans_serie import get_serie_ans
+            
+            if not self.registrar_resultados and not Path(config.ANS_SERIE_DB_PATH).exists():
+                return
+            serie = get_serie_ans()
+            historico_json = self.datos.get('historico_ans', [])
+            mes_texto = f"{config.MESES[self.mes]} {self.anio}"
+            if self.registrar_resultados and datos_reales:
+                observaciones = next(
+                    (h.get('observaciones', '-') for h in historico_json if h.get('mes') == mes_texto), "-"
+                )
+                serie.cerrar_mes(
+                    self.anio, self.mes, self.disponibilidad,
+                    horas_totales=self.datos.get('horas_totales'),
+                    horas_operativas=self.datos.get('horas_operativas'),
+                    total_camaras=self.datos.get('total_camaras'),
+                    por_localidad=self.datos.get('disponibilidad_por_localidad', []),
+                    por_subsistema=self.datos.get('disponibilidad_por_subsistema', []),
+                    observaciones=observaciones,
+                    umbral=self.UMBRAL_ANS
+                )
+            if self.registrar_resultados:
+                serie.importar_historico(historico_json, umbral=self.UMBRAL_ANS)
+            
+            historico = serie.historico(self.anio, self.mes, meses_atras=12)
+            if not self.registrar_resultados and not (historico and historico[-1]['mes'] == mes_texto):
+                return
+            if historico:
+                self.datos['historico_ans'] = historico
+            self.datos['ans_acumulado'] = serie.acumulado(self.anio, self.mes)
+        except Exception as e:
+            print(f"[WARNING] No se pudo actualizar la serie del ANS: {e}")
+    
+    def _recalcular_desde_eventos(self) -> bool:
+        """
+        Recalcula la disponibilidad desde eventos_camaras_{mes}_{anio}.csv
+        
+        El CSV trae un intervalo por fila (id_camara, inicio, fin, estado); el
+        inventario opcional inventario_camaras.csv (id_camara, localidad,
+        subsistema) incluye las cámaras sin eventos. Los valores calculados
+        reemplazan los agregados del JSON.
+        
+        Returns:
+            True si se recalculó la disponibilidad
+        """
+        archivo_eventos = config.FUENTES_DIR / f"eventos_camaras_{self.mes}_{self.anio}.csv"
+        if not archivo_eventos.exists():
+            return False
+        
+        try:
+            from src.extractores.fuentes_tabulares import leer_fuente_tabla
+            from src.utils.disponibilidad import calcular_disponibilidad
+            
+            eventos = leer_fuente_tabla(
+                archivo_eventos, columnas=["id_camara", "inicio", "fin", "estado"],
+                parse_dates=["inicio", "fin"], dtype={"id_camara": str}
+            )
+            archivo_inventario = config.FUENTES_DIR / "inventario_camaras.csv"
+            camaras = None
+            if archivo_inventario.exists():
+                camaras = leer_fuente_tabla(
+                    archivo_inventario, columnas=["id_camara", "localidad", "subsistema"], dtype={"id_camara": str}
+                )
+            resultado = calcular_disponibilidad(eventos, self.anio, self.mes, camaras)
+        except Exception as e:
+            print(f"[WARNING] No se pudo calcular la disponibilidad desde {archivo_eventos}: {e}")
+            return False
+        
+        resumen = resultado["resumen"]
+        self.datos.update({
+            "total_camaras": resumen["total_camaras"],
+            "dias_mes": resumen["dias_mes"],
+            "horas_totales": round(resumen["horas_totales"], 2),
+            "horas_operativas": round(resumen["horas_operativas"], 2),
+            "horas_no_operativas": round(resumen["horas_no_operativas"], 2),
+            "horas_mantenimiento": round(resumen["horas_mantenimiento"], 2),
+            "disponibilidad_porcentaje": resumen["disponibilidad_porcentaje"],
+        })
+        columnas = ["total_camaras", "horas_operativas", "horas_no_operativas", "disponibilidad"]
+        for clave, tabla, columna in (("disponibilidad_por_localidad", resultado["por_localidad"], "localidad"),
+                                      ("disponibilidad_por_subsistema", resultado["por_subsistema"], "subsistema")):
+            self.datos[clave] = tabla[[columna] + columnas].round(2).to_dict("records")
+        print(f"[INFO] Disponibilidad calculada desde {len(eventos)} eventos: "
+              f"{resumen['disponibilidad_porcentaje']:.2f}%")
+        return True
     
     def _datos_ejemplo(self) -> Dict[str, Any]:
         """Retorna datos de ejemplo para desarrollo"""
@@ -727,27 +794,29 @@ class GeneradorSeccion3(GeneradorSeccion):
         """
         # Cargar datos si no se han cargado
         if not self.datos:
-            self.cargar_datos()
-        
-        # Crear documento
-        self.doc = Document()
-        self._configurar_estilos()
-        
-        # Generar contenido
-        self._agregar_titulo_seccion()
-        self._agregar_introduccion()
-        self._agregar_3_1_penalidad_ans()
-        self._agregar_3_2_consolidado_ans()
-        
-        # Separador fin de sección
-        self.doc.add_paragraph()
-        p = self.doc.add_paragraph("═" * 60)
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        p = self.doc.add_paragraph("Fin Sección 3 - Informes de Medición de Niveles de Servicio (ANS)")
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.runs[0].italic = True
-        p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
+            with self._medir("cargar_datos"):
+                self.cargar_datos()
+        
+        with self._medir("render"):
+            # Crear documento
+            self.doc = Document()
+            self._configurar_estilos()
+        
+            # Generar contenido
+            self._agregar_titulo_seccion()
+            self._agregar_introduccion()
+            self._agregar_3_1_penalidad_ans()
+            self._agregar_3_2_consolidado_ans()
+        
+            # Separador fin de sección
+            self.doc.add_paragraph()
+            p = self.doc.add_paragraph("═" * 60)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+            p = self.doc.add_paragraph("Fin Sección 3 - Informes de Medición de Niveles de Servicio (ANS)")
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.runs[0].italic = True
+            p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
         
         return self.doc
     
@@ -759,5 +828,6 @@ class GeneradorSeccion3(GeneradorSeccion):
         if self.doc is None:
             self.generar()
         
-        self.doc.save(str(output_path))
+        with self._medir("guardar"):
+            self.guardar_documento(self.doc, output_path)
         print(f"[OK] {self.nombre_seccion} guardada en: {output_path}")
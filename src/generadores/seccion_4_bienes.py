@@ -16,22 +16,23 @@ Características especiales:
 from docx import Document
 from docx.shared import Inches, Pt, Cm, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
 from .base import GeneradorSeccion
 import config
-from src.utils.formato_moneda import numero_a_letras, formato_moneda_cop
+from src.utils.formato_moneda import numero_a_letras, formato_moneda_cop, formato_moneda_serie
 from src.extractores.excel_extractor import get_excel_extractor
+from src.utils.tabla_utils import agregar_tabla_xml
 
 
 class GeneradorSeccion4(GeneradorSeccion):
     """Genera la Sección 4: Informe de Bienes y Servicios"""
     
+    # Estado que se guarda en el snapshot de --solo-datos
+    ATRIBUTOS_DATOS = ("datos",)
+    
     # Colores
     COLOR_AZUL_OSCURO = RGBColor(31, 78, 121)
     COLOR_AZUL_MEDIO = RGBColor(46, 117, 182)
@@ -91,83 +92,25 @@ class GeneradorSeccion4(GeneradorSeccion):
         h3.font.bold = True
         h3.font.color.rgb = self.COLOR_GRIS
     
-    def _set_cell_shading(self, cell, color_hex: str):
-        """Establece el color de fondo de una celda"""
-        shading = OxmlElement('w:shd')
-        shading.set(qn('w:fill'), color_hex)
-        cell._tc.get_or_add_tcPr().append(shading)
-    
-    def _centrar_celda_vertical(self, cell):
-        """Centra verticalmente el contenido de una celda"""
-        tc = cell._element
-        tcPr = tc.get_or_add_tcPr()
-        vAlign = OxmlElement('w:vAlign')
-        vAlign.set(qn('w:val'), 'center')
-        tcPr.append(vAlign)
-    
-    def _numero_a_letras(self, numero: float, incluir_moneda: bool = True) -> str:
-        """
-        Convierte un número a su representación en letras en español
-        Usa la utilidad centralizada
-        """
-        return numero_a_letras(numero, incluir_moneda)
-    
-    def _formato_moneda(self, numero: float) -> str:
-        """Formatea número como moneda colombiana: $245.678.910"""
-        return formato_moneda_cop(numero)
-    
     def _agregar_tabla(self, encabezados: list, filas: list, anchos: list = None,
                        alineaciones: list = None, fila_total: list = None):
         """Agrega una tabla con formato profesional"""
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(10)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._set_cell_shading(hdr_cells[i], "1F4E79")
-            self._centrar_celda_vertical(hdr_cells[i])
-        
-        # Filas de datos
-        for fila_datos in filas:
-            row_cells = tabla.add_row().cells
-            for i, texto in enumerate(fila_datos):
-                row_cells[i].text = str(texto) if texto is not None else ""
-                for paragraph in row_cells[i].paragraphs:
-                    if alineaciones and i < len(alineaciones):
-                        paragraph.alignment = alineaciones[i]
-                    else:
-                        paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    for run in paragraph.runs:
-                        run.font.size = Pt(10)
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Fila de total (si se proporciona)
-        if fila_total:
-            row_cells = tabla.add_row().cells
-            for i, texto in enumerate(fila_total):
-                row_cells[i].text = str(texto) if texto is not None else ""
-                for paragraph in row_cells[i].paragraphs:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.bold = True
-                        run.font.size = Pt(10)
-                self._set_cell_shading(row_cells[i], "D9E1F2")  # Azul claro
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Ajustar anchos
-        if anchos:
-            for i, ancho in enumerate(anchos):
-                for cell in tabla.columns[i].cells:
-                    cell.width = Inches(ancho)
+        columnas = []
+        for i in range(len(encabezados)):
+            columna = {}
+            if anchos and i < len(anchos):
+                columna["ancho"] = Inches(anchos[i])
+            if alineaciones and i < len(alineaciones):
+                columna["alineacion"] = alineaciones[i]
+            columnas.append(columna)
+        
+        tabla = agregar_tabla_xml(
+            self.doc, encabezados, filas,
+            columnas=columnas,
+            tamano_fuente=10,
+            fila_total=fila_total,
+            color_fila_total="D9E1F2"  # Azul claro
+        )
         
         self.doc.add_paragraph()
         return tabla
@@ -235,16 +178,21 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         if items:
             self._agregar_parrafo("Elementos ingresados al almacén:", negrita=True)
             
-            filas = []
-            for idx, item in enumerate(items, 1):
-                filas.append([
+            # Columnas de valor formateadas en bloque
+            valores_unitarios = formato_moneda_serie([item.get('valor_unitario', 0) for item in items])
+            valores_totales = formato_moneda_serie([item.get('valor_total', 0) for item in items])
+            filas = [
+                [
                     idx,
                     item.get('descripcion', ''),
                     item.get('cantidad', 0),
                     item.get('unidad', 'UN'),
-                    self._formato_moneda(item.get('valor_unitario', 0)),
-                    self._formato_moneda(item.get('valor_total', 0))
-                ])
+                    valor_unitario,
+                    valor_total_item
+                ]
+                for idx, (item, valor_unitario, valor_total_item)
+                in enumerate(zip(items, valores_unitarios, valores_totales), 1)
+            ]
             
             # Alineaciones: No., Descripción, Cant, Unidad, V.Unit, V.Total
             alineaciones = [
@@ -257,7 +205,7 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
             ]
             
             # Fila de total
-            fila_total = ["", "TOTAL", "", "", "", self._formato_moneda(valor_total)]
+            fila_total = ["", "TOTAL", "", "", "", formato_moneda_cop(valor_total)]
             
             self._agregar_tabla(
                 encabezados=["No.", "DESCRIPCIÓN", "CANT.", "UND", "VALOR UNIT.", "VALOR TOTAL"],
@@ -269,8 +217,8 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         
         # Valor en letras según template del prompt
         if valor_total > 0:
-            valor_letras = self._numero_a_letras(valor_total)
-            valor_numerico = self._formato_moneda(valor_total)
+            valor_letras = numero_a_letras(valor_total)
+            valor_numerico = formato_moneda_cop(valor_total)
             self._agregar_parrafo(
                 f"El valor total de los elementos ingresados asciende a {valor_letras} ({valor_numerico}).",
                 negrita=True
@@ -304,16 +252,18 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         if equipos:
             self._agregar_parrafo("Equipos entregados:", negrita=True)
             
-            filas = []
-            for idx, eq in enumerate(equipos, 1):
-                filas.append([
+            valores = formato_moneda_serie([eq.get('valor', 0) for eq in equipos])
+            filas = [
+                [
                     idx,
                     eq.get('descripcion', ''),
                     eq.get('serial', 'N/A'),
                     eq.get('cantidad', 1),
                     eq.get('motivo', ''),
-                    self._formato_moneda(eq.get('valor', 0))
-                ])
+                    valor
+                ]
+                for idx, (eq, valor) in enumerate(zip(equipos, valores), 1)
+            ]
             
             alineaciones = [
                 WD_ALIGN_PARAGRAPH.CENTER,  # No.
@@ -324,7 +274,7 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
                 WD_ALIGN_PARAGRAPH.RIGHT,   # Valor
             ]
             
-            fila_total = ["", "TOTAL", "", "", "", self._formato_moneda(valor_total)]
+            fila_total = ["", "TOTAL", "", "", "", formato_moneda_cop(valor_total)]
             
             self._agregar_tabla(
                 encabezados=["No.", "DESCRIPCIÓN", "SERIAL", "CANT.", "MOTIVO", "VALOR"],
@@ -336,8 +286,8 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         
         # Valor en letras (agregar según especificaciones)
         if valor_total > 0:
-            valor_letras = self._numero_a_letras(valor_total)
-            valor_numerico = self._formato_moneda(valor_total)
+            valor_letras = numero_a_letras(valor_total)
+            valor_numerico = formato_moneda_cop(valor_total)
             self._agregar_parrafo(
                 f"El valor total de los equipos entregados asciende a {valor_letras} ({valor_numerico}).",
                 negrita=True
@@ -375,17 +325,21 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         if items:
             self._agregar_parrafo("Elementos solicitados para inclusión:", negrita=True)
             
-            filas = []
-            for idx, item in enumerate(items, 1):
-                filas.append([
+            valores_unitarios = formato_moneda_serie([item.get('valor_unitario', 0) for item in items])
+            valores_totales = formato_moneda_serie([item.get('valor_total', 0) for item in items])
+            filas = [
+                [
                     idx,
                     item.get('descripcion', ''),
                     item.get('cantidad', 0),
                     item.get('unidad', 'UN'),
-                    self._formato_moneda(item.get('valor_unitario', 0)),
-                    self._formato_moneda(item.get('valor_total', 0)),
+                    valor_unitario,
+                    valor_total_item,
                     item.get('justificacion', '')
-                ])
+                ]
+                for idx, (item, valor_unitario, valor_total_item)
+                in enumerate(zip(items, valores_unitarios, valores_totales), 1)
+            ]
             
             alineaciones = [
                 WD_ALIGN_PARAGRAPH.CENTER,  # No.
@@ -397,7 +351,7 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
                 WD_ALIGN_PARAGRAPH.LEFT,    # Justificación
             ]
             
-            fila_total = ["", "TOTAL", "", "", "", self._formato_moneda(valor_total), ""]
+            fila_total = ["", "TOTAL", "", "", "", formato_moneda_cop(valor_total), ""]
             
             self._agregar_tabla(
                 encabezados=["No.", "DESCRIPCIÓN", "CANT.", "UND", "VALOR UNIT.", "VALOR TOTAL", "JUSTIFICACIÓN"],
@@ -409,9 +363,9 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         
         # Valor en letras
         if valor_total > 0:
-            valor_letras = self._numero_a_letras(valor_total)
+            valor_letras = numero_a_letras(valor_total)
             self._agregar_parrafo(
-                f"El valor total de la solicitud de inclusión asciende a {valor_letras} ({self._formato_moneda(valor_total)}).",
+                f"El valor total de la solicitud de inclusión asciende a {valor_letras} ({formato_moneda_cop(valor_total)}).",
                 negrita=True
             )
         
@@ -470,30 +424,32 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         """
         # Cargar datos si no se han cargado
         if not self.datos:
-            self.cargar_datos()
+            with self._medir("cargar_datos"):
+                self.cargar_datos()
         
-        # Crear documento
-        self.doc = Document()
-        self._configurar_estilos()
+        with self._medir("render"):
+            # Crear documento
+            self.doc = Document()
+            self._configurar_estilos()
         
-        # Título principal
-        self.doc.add_heading("4. INFORME DE BIENES Y SERVICIOS", level=1)
+            # Título principal
+            self.doc.add_heading("4. INFORME DE BIENES Y SERVICIOS", level=1)
         
-        # Generar subsecciones
-        self._seccion_4_1_gestion_inventario()
-        self._seccion_4_2_entradas_almacen()
-        self._seccion_4_3_equipos_no_operativos()
-        self._seccion_4_4_inclusiones_bolsa()
+            # Generar subsecciones
+            self._seccion_4_1_gestion_inventario()
+            self._seccion_4_2_entradas_almacen()
+            self._seccion_4_3_equipos_no_operativos()
+            self._seccion_4_4_inclusiones_bolsa()
         
-        # Separador fin de sección
-        self.doc.add_paragraph()
-        p = self.doc.add_paragraph("═" * 60)
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            # Separador fin de sección
+            self.doc.add_paragraph()
+            p = self.doc.add_paragraph("═" * 60)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        p = self.doc.add_paragraph("Fin Sección 4 - Informe de Bienes y Servicios")
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.runs[0].italic = True
-        p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
+            p = self.doc.add_paragraph("Fin Sección 4 - Informe de Bienes y Servicios")
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.runs[0].italic = True
+            p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
         
         return self.doc
     
@@ -505,6 +461,7 @@ A continuación se presenta el detalle de cada una de las gestiones realizadas d
         if self.doc is None:
             self.generar()
         
-        self.doc.save(str(output_path))
+        with self._medir("guardar"):
+            self.guardar_documento(self.doc, output_path)
         print(f"[OK] {self.nombre_seccion} guardada en: {output_path}")
 
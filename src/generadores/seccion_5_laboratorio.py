@@ -12,20 +12,23 @@ Subsecciones:
 from docx import Document
 from docx.shared import Inches, Pt, Cm, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT, WD_CELL_VERTICAL_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, List, Any, Optional
 from datetime import datetime
 import json
+import pandas as pd
 from .base import GeneradorSeccion
 import config
+from src.utils.docx_streaming import TablasDiferidas
+from src.utils.tabla_utils import agregar_tabla_xml
 
 
 class GeneradorSeccion5(GeneradorSeccion):
     """Genera la Sección 5: Informe de Laboratorio usando python-docx"""
     
+    # Estado que se guarda en el snapshot de --solo-datos
+    ATRIBUTOS_DATOS = ("datos",)
+    
     # Colores corporativos
     COLOR_AZUL_OSCURO = RGBColor(31, 78, 121)   # Encabezados tabla equipos reparados
     COLOR_AZUL_MEDIO = RGBColor(46, 117, 182)   # Títulos de subsecciones
@@ -33,6 +36,9 @@ class GeneradorSeccion5(GeneradorSeccion):
     COLOR_ROJO = RGBColor(192, 0, 0)            # Tabla equipos no operativos
     COLOR_AMARILLO = RGBColor(255, 165, 0)       # Tabla equipos en RMA
     
+    # Tablas con más filas que este umbral se escriben en streaming al guardar
+    UMBRAL_FILAS_STREAMING = 1000
+    
     @property
     def nombre_seccion(self) -> str:
         return "5. INFORME DE LABORATORIO"
@@ -41,10 +47,19 @@ class GeneradorSeccion5(GeneradorSeccion):
     def template_file(self) -> str:
         return "seccion_5_laboratorio.docx"  # No se usa, pero debe existir para compatibilidad
     
-    def __init__(self, anio: int, mes: int):
+    def __init__(self, anio: int, mes: int, streaming: Optional[bool] = None):
+        """
+        Args:
+            anio: Año del informe
+            mes: Mes del informe
+            streaming: True escribe todas las tablas de equipos en streaming al
+                       guardar, False nunca; None (default) solo las que superan
+                       UMBRAL_FILAS_STREAMING filas
+        """
         super().__init__(anio, mes)
         self.datos: Dict[str, Any] = {}
         self.doc: Optional[Document] = None
+        self.streaming = streaming
     
     def cargar_datos(self) -> None:
         """Carga los datos de la sección 5 desde JSON"""
@@ -172,29 +187,6 @@ class GeneradorSeccion5(GeneradorSeccion):
         h3.font.bold = True
         h3.font.color.rgb = self.COLOR_GRIS
     
-    def _aplicar_sombreado_celda(self, cell, color: RGBColor):
-        """
-        Aplica color de fondo a celda de tabla
-        RGBColor es una tupla (r, g, b) que se puede acceder con índices
-        """
-        shading_elm = OxmlElement('w:shd')
-        # RGBColor es una tupla, acceder con índices
-        r = color[0]
-        g = color[1]
-        b = color[2]
-        
-        hex_color = f'{r:02X}{g:02X}{b:02X}'
-        shading_elm.set(qn('w:fill'), hex_color)
-        cell._element.get_or_add_tcPr().append(shading_elm)
-    
-    def _centrar_celda_vertical(self, cell):
-        """Centra verticalmente el contenido de una celda"""
-        tc = cell._element
-        tcPr = tc.get_or_add_tcPr()
-        vAlign = OxmlElement('w:vAlign')
-        vAlign.set(qn('w:val'), 'center')
-        tcPr.append(vAlign)
-    
     def _agregar_parrafo(self, texto: str, justificado: bool = True, negrita: bool = False, 
                         tamano: int = 11):
         """Agrega un párrafo de texto"""
@@ -335,13 +327,67 @@ class GeneradorSeccion5(GeneradorSeccion):
         
         self._crear_tabla_pendientes_parte(equipos)
         
-        # Tabla resumen de partes
-        resumen = self.datos.get('resumen_partes_requeridas', [])
+        # Tabla resumen de partes (se calcula de los equipos si la fuente no la trae)
+        resumen = self.datos.get('resumen_partes_requeridas') or self._calcular_resumen_partes_requeridas(equipos)
         if resumen:
             self.doc.add_paragraph()  # Espacio
             self._agregar_parrafo("Resumen de partes requeridas:", negrita=True)
             self._crear_resumen_partes_requeridas(resumen)
     
+    def _usar_streaming(self, num_filas: int) -> bool:
+        """Decide si una tabla de num_filas filas se escribe en streaming"""
+        if self.streaming is None:
+            return num_filas > self.UMBRAL_FILAS_STREAMING
+        return self.streaming
+    
+    def _agregar_tabla_equipos(self, encabezados: List[str], filas: Callable[[], Iterable[List[Any]]],
+                               num_filas: int, anchos: List, columnas_centradas: set,
+                               color_encabezado: RGBColor,
+                               color_texto_encabezado: RGBColor = RGBColor(255, 255, 255)):
+        """
+        Agrega una tabla de equipos (9 pt, encabezado sombreado, celdas centradas verticalmente)
+        
+        Las tablas grandes no se construyen en el documento: se reserva su
+        lugar y sus filas se generan y escriben por bloques en guardar().
+        
+        Args:
+            encabezados: Textos del encabezado
+            filas: Función que genera las filas de datos
+            num_filas: Número de filas (decide si se escribe en streaming)
+            anchos: Ancho de cada columna (Cm)
+            columnas_centradas: Índices de las columnas con texto centrado
+            color_encabezado: Color de fondo del encabezado
+            color_texto_encabezado: Color del texto del encabezado
+        """
+        columnas = [
+            {
+                "ancho": ancho,
+                "alineacion": WD_ALIGN_PARAGRAPH.CENTER if i in columnas_centradas else WD_ALIGN_PARAGRAPH.LEFT
+            }
+            for i, ancho in enumerate(anchos)
+        ]
+        formato = {
+            "columnas": columnas,
+            "color_encabezado": color_encabezado,
+            "color_texto_encabezado": color_texto_encabezado,
+            "tamano_fuente": 9,
+        }
+        
+        if self._usar_streaming(num_filas):
+            self.tablas_diferidas.reservar(self.doc, encabezados, filas, **formato)
+        else:
+            agregar_tabla_xml(self.doc, encabezados, list(filas()), **formato)
+        
+        self.doc.add_paragraph()
+    
+    @staticmethod
+    def _filas_equipos(equipos: List[Dict], campos: List[str]) -> Callable[[], Iterable[List[str]]]:
+        """Generador perezoso de las filas de una tabla de equipos (valores vacíos como "")"""
+        def filas():
+            for equipo in equipos:
+                yield ["" if valor is None else str(valor) for valor in (equipo.get(campo) for campo in campos)]
+        return filas
+    
     def _crear_tabla_equipos_reparados(self, equipos: List[Dict]):
         """Tabla 5.1.1 - Equipos Reintegrados"""
         encabezados = [
@@ -350,50 +396,11 @@ class GeneradorSeccion5(GeneradorSeccion):
         ]
         anchos = [Cm(3.5), Cm(3.0), Cm(4.0), Cm(4.0), Cm(2.5), Cm(2.5)]
         
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_AZUL_OSCURO)
-            self._centrar_celda_vertical(hdr_cells[i])
-        
-        # Filas de datos
-        for equipo in equipos:
-            row_cells = tabla.add_row().cells
-            fila = [
-                equipo.get('tipo_equipo', ''),
-                equipo.get('serial', ''),
-                equipo.get('diagnostico', ''),
-                equipo.get('reparacion', ''),
-                equipo.get('fecha_ingreso', ''),
-                equipo.get('fecha_salida', '')
-            ]
-            
-            for i, texto in enumerate(fila):
-                row_cells[i].text = str(texto) if texto else ""
-                for paragraph in row_cells[i].paragraphs:
-                    alineacion = WD_ALIGN_PARAGRAPH.CENTER if i >= 4 else WD_ALIGN_PARAGRAPH.LEFT
-                    paragraph.alignment = alineacion
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Ajustar anchos
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+        filas = self._filas_equipos(equipos, [
+            'tipo_equipo', 'serial', 'diagnostico', 'reparacion', 'fecha_ingreso', 'fecha_salida'
+        ])
         
-        self.doc.add_paragraph()
+        self._agregar_tabla_equipos(encabezados, filas, len(equipos), anchos, {4, 5}, self.COLOR_AZUL_OSCURO)
     
     def _crear_tabla_equipos_no_operativos(self, equipos: List[Dict]):
         """Tabla 5.1.2 - Equipos No Operativos"""
@@ -403,49 +410,11 @@ class GeneradorSeccion5(GeneradorSeccion):
         ]
         anchos = [Cm(3.0), Cm(3.0), Cm(4.5), Cm(5.0), Cm(2.5)]
         
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_ROJO)
-            self._centrar_celda_vertical(hdr_cells[i])
-        
-        # Filas de datos
-        for equipo in equipos:
-            row_cells = tabla.add_row().cells
-            fila = [
-                equipo.get('tipo_equipo', ''),
-                equipo.get('serial', ''),
-                equipo.get('diagnostico', ''),
-                equipo.get('justificacion', ''),
-                equipo.get('fecha_concepto', '')
-            ]
-            
-            for i, texto in enumerate(fila):
-                row_cells[i].text = str(texto) if texto else ""
-                for paragraph in row_cells[i].paragraphs:
-                    alineacion = WD_ALIGN_PARAGRAPH.CENTER if i == 4 else WD_ALIGN_PARAGRAPH.LEFT
-                    paragraph.alignment = alineacion
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Ajustar anchos
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+        filas = self._filas_equipos(equipos, [
+            'tipo_equipo', 'serial', 'diagnostico', 'justificacion', 'fecha_concepto'
+        ])
         
-        self.doc.add_paragraph()
+        self._agregar_tabla_equipos(encabezados, filas, len(equipos), anchos, {4}, self.COLOR_ROJO)
     
     def _crear_tabla_equipos_rma(self, equipos: List[Dict]):
         """Tabla 5.1.3 - Equipos en RMA"""
@@ -455,49 +424,15 @@ class GeneradorSeccion5(GeneradorSeccion):
         ]
         anchos = [Cm(3.0), Cm(2.8), Cm(2.8), Cm(2.5), Cm(3.5), Cm(2.4)]
         
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(0, 0, 0)  # Negro para fondo amarillo
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_AMARILLO)
-            self._centrar_celda_vertical(hdr_cells[i])
-        
-        # Filas de datos
-        for equipo in equipos:
-            row_cells = tabla.add_row().cells
-            fila = [
-                equipo.get('tipo_equipo', ''),
-                equipo.get('serial', ''),
-                equipo.get('fabricante', ''),
-                equipo.get('fecha_solicitud', ''),
-                equipo.get('estado_tramite', ''),
-                str(equipo.get('dias_espera', ''))
-            ]
-            
-            for i, texto in enumerate(fila):
-                row_cells[i].text = str(texto) if texto else ""
-                for paragraph in row_cells[i].paragraphs:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Ajustar anchos
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+        filas = self._filas_equipos(equipos, [
+            'tipo_equipo', 'serial', 'fabricante', 'fecha_solicitud', 'estado_tramite', 'dias_espera'
+        ])
         
-        self.doc.add_paragraph()
+        # Texto negro para el fondo amarillo
+        self._agregar_tabla_equipos(
+            encabezados, filas, len(equipos), anchos, set(range(len(encabezados))),
+            self.COLOR_AMARILLO, color_texto_encabezado=RGBColor(0, 0, 0)
+        )
     
     def _crear_tabla_pendientes_parte(self, equipos: List[Dict]):
         """Tabla 5.2 - Equipos Pendientes por Repuestos"""
@@ -507,96 +442,47 @@ class GeneradorSeccion5(GeneradorSeccion):
         ]
         anchos = [Cm(3.0), Cm(3.0), Cm(4.5), Cm(2.5), Cm(4.0)]
         
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_AZUL_MEDIO)
-            self._centrar_celda_vertical(hdr_cells[i])
-        
-        # Filas de datos
-        for equipo in equipos:
-            row_cells = tabla.add_row().cells
-            fila = [
-                equipo.get('tipo_equipo', ''),
-                equipo.get('serial', ''),
-                equipo.get('parte_requerida', ''),
-                equipo.get('fecha_solicitud', ''),
-                equipo.get('estado_gestion', '')
-            ]
-            
-            for i, texto in enumerate(fila):
-                row_cells[i].text = str(texto) if texto else ""
-                for paragraph in row_cells[i].paragraphs:
-                    alineacion = WD_ALIGN_PARAGRAPH.CENTER if i == 3 else WD_ALIGN_PARAGRAPH.LEFT
-                    paragraph.alignment = alineacion
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Ajustar anchos
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+        filas = self._filas_equipos(equipos, [
+            'tipo_equipo', 'serial', 'parte_requerida', 'fecha_solicitud', 'estado_gestion'
+        ])
         
-        self.doc.add_paragraph()
+        self._agregar_tabla_equipos(encabezados, filas, len(equipos), anchos, {3}, self.COLOR_AZUL_MEDIO)
     
     def _crear_resumen_partes_requeridas(self, resumen: List[Dict]):
         """Tabla Resumen de Partes Requeridas"""
         encabezados = ["Repuesto/Parte", "Cantidad Requerida", "Estado"]
         anchos = [Cm(6.0), Cm(3.0), Cm(5.0)]
         
-        tabla = self.doc.add_table(rows=1, cols=len(encabezados))
-        tabla.style = 'Table Grid'
-        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Encabezados
-        hdr_cells = tabla.rows[0].cells
-        for i, texto in enumerate(encabezados):
-            hdr_cells[i].text = texto
-            for paragraph in hdr_cells[i].paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-            self._aplicar_sombreado_celda(hdr_cells[i], self.COLOR_GRIS)
-            self._centrar_celda_vertical(hdr_cells[i])
-        
-        # Filas de datos
-        for parte in resumen:
-            row_cells = tabla.add_row().cells
-            fila = [
-                parte.get('parte', ''),
-                str(parte.get('cantidad', '')),
-                parte.get('estado', '')
-            ]
-            
-            for i, texto in enumerate(fila):
-                row_cells[i].text = str(texto) if texto else ""
-                for paragraph in row_cells[i].paragraphs:
-                    alineacion = WD_ALIGN_PARAGRAPH.CENTER if i == 1 else WD_ALIGN_PARAGRAPH.LEFT
-                    paragraph.alignment = alineacion
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
-                self._centrar_celda_vertical(row_cells[i])
-        
-        # Ajustar anchos
-        for i, ancho in enumerate(anchos):
-            for cell in tabla.columns[i].cells:
-                cell.width = ancho
+        filas = self._filas_equipos(resumen, ['parte', 'cantidad', 'estado'])
         
-        self.doc.add_paragraph()
+        self._agregar_tabla_equipos(encabezados, filas, len(resumen), anchos, {1}, self.COLOR_GRIS)
+    
+    def _calcular_resumen_partes_requeridas(self, equipos: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Agrupa los equipos pendientes por parte requerida y estado de gestión
+        
+        Args:
+            equipos: Equipos pendientes por repuestos
+        
+        Returns:
+            Filas {parte, cantidad, estado}, de mayor a menor cantidad
+        """
+        if not equipos:
+            return []
+        
+        df = pd.DataFrame.from_records(equipos, columns=['parte_requerida', 'estado_gestion'])
+        df = df.fillna('')
+        df = df[df['parte_requerida'] != '']
+        conteo = (
+            df.groupby(['parte_requerida', 'estado_gestion'], sort=False)
+            .size()
+            .reset_index(name='cantidad')
+            .sort_values(['cantidad', 'parte_requerida'], ascending=[False, True], kind='stable')
+        )
+        return [
+            {"parte": parte, "cantidad": int(cantidad), "estado": estado}
+            for parte, estado, cantidad in conteo.itertuples(index=False)
+        ]
     
     def procesar(self) -> Dict[str, Any]:
         """Procesa los datos y retorna el contexto (no se usa en generación programática)"""
@@ -606,30 +492,36 @@ class GeneradorSeccion5(GeneradorSeccion):
         """
         Genera el documento completo de la Sección 5
         Sobrescribe el método de la clase base para usar python-docx directamente
+        
+        Las tablas que se escriben en streaming solo tienen un marcador en el
+        documento retornado; se completan en guardar().
         """
         # Cargar datos si no se han cargado
         if not self.datos:
-            self.cargar_datos()
-        
-        # Crear documento
-        self.doc = Document()
-        self._configurar_estilos()
-        
-        # Generar contenido
-        self._agregar_titulo_seccion()
-        self._agregar_introduccion()
-        self._agregar_5_1_actividades_generales()
-        self._agregar_5_2_pendiente_por_parte()
-        
-        # Separador fin de sección
-        self.doc.add_paragraph()
-        p = self.doc.add_paragraph("═" * 60)
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        p = self.doc.add_paragraph("Fin Sección 5 - Informe de Laboratorio")
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.runs[0].italic = True
-        p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
+            with self._medir("cargar_datos"):
+                self.cargar_datos()
+        
+        with self._medir("render"):
+            # Crear documento
+            self.doc = Document()
+            self.tablas_diferidas = TablasDiferidas()
+            self._configurar_estilos()
+        
+            # Generar contenido
+            self._agregar_titulo_seccion()
+            self._agregar_introduccion()
+            self._agregar_5_1_actividades_generales()
+            self._agregar_5_2_pendiente_por_parte()
+        
+            # Separador fin de sección
+            self.doc.add_paragraph()
+            p = self.doc.add_paragraph("═" * 60)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+            p = self.doc.add_paragraph("Fin Sección 5 - Informe de Laboratorio")
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.runs[0].italic = True
+            p.runs[0].font.color.rgb = RGBColor(128, 128, 128)
         
         return self.doc
     
@@ -641,5 +533,7 @@ class GeneradorSeccion5(GeneradorSeccion):
         if self.doc is None:
             self.generar()
         
-        self.doc.save(str(output_path))
+        with self._medir("guardar"):
+            # Las tablas grandes se generan y escriben por bloques dentro del paquete
+            self.guardar_documento(self.doc, output_path)
         print(f"[OK] {self.nombre_seccion} guardada en: {output_path}")
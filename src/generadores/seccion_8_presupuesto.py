@@ -14,9 +14,15 @@ from typing import Dict, Any, List
 import json
 import pandas as pd
 from .base import GeneradorSeccion
-from src.utils.formato_moneda import formato_moneda_cop
+from src.extractores.fuentes_tabulares import leer_fuente_tabla
+from src.utils.escritura_segura import escribir_atomico
+from src.utils.formato_moneda import formato_moneda_cop, formatear_columnas_moneda
+from src.utils.presupuesto import calcular_ejecucion, porcentaje_ejecucion, get_motor_presupuestal
 import config
 
+# Columnas de ejecucion_presupuestal.csv que usa la sección
+COLUMNAS_CSV = ['categoria', 'presupuesto', 'ejecutado', 'mes', 'presupuesto_mes', 'ejecutado_mes']
+
 
 class GeneradorSeccion8(GeneradorSeccion):
     """Genera la sección 8: Ejecución Presupuestal"""
@@ -36,6 +42,8 @@ class GeneradorSeccion8(GeneradorSeccion):
         self.compras_bolsa: List[Dict] = []
         self.variaciones: List[Dict] = []
         self.grafico_ejecucion_img: str = ""
+        # Totales del libro presupuestal (mes y acumulado del contrato), si se usó
+        self.totales_libro: Dict[str, Any] = {}
     
     def cargar_datos(self) -> None:
         """Carga datos de la sección 8 desde CSV/JSON o genera datos dummy"""
@@ -46,12 +54,23 @@ class GeneradorSeccion8(GeneradorSeccion):
         if not archivo_json.exists():
             archivo_json = config.FUENTES_DIR / f"ejecucion_presupuestal_{config.MESES[self.mes].lower()}_{self.anio}.json"
         
-        datos_cargados = False
+        datos_cargados = self._cargar_libro_presupuestal()
+        if datos_cargados:
+            # El libro trae 8.1 y 8.2; compras y variaciones siguen en el JSON del mes
+            if archivo_json.exists():
+                try:
+                    with open(archivo_json, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    self.compras_bolsa = data.get("compras_bolsa", [])
+                    self.variaciones = data.get("variaciones", [])
+                    self._procesar_compras_bolsa()
+                except Exception as e:
+                    print(f"[WARNING] Error al cargar JSON {archivo_json}: {e}")
         
         # Intentar cargar desde CSV
-        if archivo_csv.exists():
+        if not datos_cargados and archivo_csv.exists():
             try:
-                df = pd.read_csv(archivo_csv, encoding='utf-8')
+                df = leer_fuente_tabla(archivo_csv, columnas=COLUMNAS_CSV)
                 self._procesar_datos_csv(df)
                 datos_cargados = True
                 print(f"[INFO] Datos cargados desde CSV: {archivo_csv}")
@@ -88,6 +107,29 @@ class GeneradorSeccion8(GeneradorSeccion):
             self._generar_datos_dummy()
             self._guardar_csv_demo()
     
+    def _cargar_libro_presupuestal(self) -> bool:
+        """
+        Toma 8.1, 8.2 y los totales del libro presupuestal del contrato
+        (FUENTES_DIR/libro_presupuestal.csv) si existe y cubre el mes
+        
+        Returns:
+            True si se usó el libro
+        """
+        try:
+            motor = get_motor_presupuestal()
+        except Exception as e:
+            print(f"[WARNING] Error al cargar el libro presupuestal: {e}")
+            return False
+        if motor is None or not motor.contiene(self.anio, self.mes):
+            return False
+        
+        self.ejecucion_mensual = motor.ejecucion_mes(self.anio, self.mes)
+        self.consolidado = motor.consolidado(self.anio, self.mes)
+        self.totales_libro = motor.totales(self.anio, self.mes)
+        print(f"[INFO] Ejecución presupuestal tomada del libro del contrato "
+              f"({len(self.consolidado)} meses consolidados)")
+        return True
+    
     def _procesar_datos_csv(self, df: pd.DataFrame) -> None:
         """Procesa datos desde CSV y los convierte al formato esperado"""
         # Asumir estructura CSV con columnas: categoria, presupuesto, ejecutado, mes, etc.
@@ -104,35 +146,18 @@ class GeneradorSeccion8(GeneradorSeccion):
     
     def _procesar_ejecucion_mensual(self) -> None:
         """Calcula porcentajes y formatea valores para ejecución mensual"""
-        for item in self.ejecucion_mensual:
-            presupuesto = item.get("presupuesto", 0)
-            ejecutado = item.get("ejecutado", 0)
-            if presupuesto > 0:
-                item["porcentaje_ejecucion"] = round((ejecutado / presupuesto) * 100, 2)
-            else:
-                item["porcentaje_ejecucion"] = 0.0
-            # Formatear valores monetarios
-            item["presupuesto_formato"] = formato_moneda_cop(presupuesto)
-            item["ejecutado_formato"] = formato_moneda_cop(ejecutado)
+        self.ejecucion_mensual = calcular_ejecucion(self.ejecucion_mensual)
     
     def _procesar_consolidado(self) -> None:
         """Calcula porcentajes y formatea valores para consolidado"""
-        for item in self.consolidado:
-            presupuesto = item.get("presupuesto_mes", 0)
-            ejecutado = item.get("ejecutado_mes", 0)
-            if presupuesto > 0:
-                item["porcentaje_ejecucion"] = round((ejecutado / presupuesto) * 100, 2)
-            else:
-                item["porcentaje_ejecucion"] = 0.0
-            # Formatear valores monetarios
-            item["presupuesto_mes_formato"] = formato_moneda_cop(presupuesto)
-            item["ejecutado_mes_formato"] = formato_moneda_cop(ejecutado)
+        self.consolidado = calcular_ejecucion(self.consolidado, "presupuesto_mes", "ejecutado_mes")
     
     def _procesar_compras_bolsa(self) -> None:
         """Formatea valores monetarios para compras bolsa"""
-        for item in self.compras_bolsa:
-            item["valor_unitario_formato"] = formato_moneda_cop(item.get("valor_unitario", 0))
-            item["valor_total_formato"] = formato_moneda_cop(item.get("valor_total", 0))
+        formatear_columnas_moneda(self.compras_bolsa, {
+            "valor_unitario": "valor_unitario_formato",
+            "valor_total": "valor_total_formato",
+        })
     
     def _generar_datos_dummy(self) -> None:
         """Genera datos dummy para pruebas cuando no hay fuentes externas"""
@@ -163,16 +188,7 @@ class GeneradorSeccion8(GeneradorSeccion):
         ]
         
         # Calcular porcentajes de ejecución y formatear valores
-        for item in self.ejecucion_mensual:
-            presupuesto = item.get("presupuesto", 0)
-            ejecutado = item.get("ejecutado", 0)
-            if presupuesto > 0:
-                item["porcentaje_ejecucion"] = round((ejecutado / presupuesto) * 100, 2)
-            else:
-                item["porcentaje_ejecucion"] = 0.0
-            # Formatear valores monetarios para el template
-            item["presupuesto_formato"] = formato_moneda_cop(presupuesto)
-            item["ejecutado_formato"] = formato_moneda_cop(ejecutado)
+        self._procesar_ejecucion_mensual()
         
         # 8.2 Consolidado presupuestal
         self.consolidado = [
@@ -194,16 +210,7 @@ class GeneradorSeccion8(GeneradorSeccion):
         ]
         
         # Calcular porcentajes de ejecución para consolidado y formatear valores
-        for item in self.consolidado:
-            presupuesto = item.get("presupuesto_mes", 0)
-            ejecutado = item.get("ejecutado_mes", 0)
-            if presupuesto > 0:
-                item["porcentaje_ejecucion"] = round((ejecutado / presupuesto) * 100, 2)
-            else:
-                item["porcentaje_ejecucion"] = 0.0
-            # Formatear valores monetarios para el template
-            item["presupuesto_mes_formato"] = formato_moneda_cop(presupuesto)
-            item["ejecutado_mes_formato"] = formato_moneda_cop(ejecutado)
+        self._procesar_consolidado()
         
         # 8.3 Compras y uso de la bolsa de repuestos
         self.compras_bolsa = [
@@ -238,9 +245,7 @@ class GeneradorSeccion8(GeneradorSeccion):
         ]
         
         # Formatear valores monetarios para compras bolsa
-        for item in self.compras_bolsa:
-            item["valor_unitario_formato"] = formato_moneda_cop(item.get("valor_unitario", 0))
-            item["valor_total_formato"] = formato_moneda_cop(item.get("valor_total", 0))
+        self._procesar_compras_bolsa()
         
         # 8.4 Variaciones presupuestales
         self.variaciones = [
@@ -269,26 +274,31 @@ class GeneradorSeccion8(GeneradorSeccion):
             
             # Guardar CSV de ejemplo
             csv_demo = config.FUENTES_DIR / "ejecucion_presupuestal_demo.csv"
-            df_ejecucion.to_csv(csv_demo, index=False, encoding='utf-8')
+            escribir_atomico(csv_demo, lambda ruta: df_ejecucion.to_csv(ruta, index=False, encoding='utf-8'))
             print(f"[INFO] CSV de ejemplo guardado en: {csv_demo}")
         except Exception as e:
             print(f"[WARNING] No se pudo guardar CSV de ejemplo: {e}")
     
     def _calcular_totales(self) -> Dict[str, Any]:
         """Calcula totales y resúmenes presupuestales"""
-        total_presupuesto = sum(item.get("presupuesto", 0) for item in self.ejecucion_mensual)
-        total_ejecutado = sum(item.get("ejecutado", 0) for item in self.ejecucion_mensual)
+        total_compras_bolsa = sum(item.get("valor_total", 0) for item in self.compras_bolsa)
         
-        porcentaje_total = 0.0
-        if total_presupuesto > 0:
-            porcentaje_total = round((total_ejecutado / total_presupuesto) * 100, 2)
+        if self.totales_libro:
+            return {**self.totales_libro, "total_compras_bolsa": total_compras_bolsa}
         
-        total_compras_bolsa = sum(item.get("valor_total", 0) for item in self.compras_bolsa)
+        # Sin libro: totales del mes desde 8.1 y acumulado desde el consolidado 8.2
+        ejecucion = pd.DataFrame(self.ejecucion_mensual, columns=["presupuesto", "ejecutado"]).fillna(0)
+        consolidado = pd.DataFrame(self.consolidado, columns=["presupuesto_mes", "ejecutado_mes"]).fillna(0)
+        total_presupuesto, total_ejecutado = ejecucion.sum().tolist()
+        presupuesto_acumulado, ejecutado_acumulado = consolidado.sum().tolist()
         
         return {
             "total_presupuesto": total_presupuesto,
             "total_ejecutado": total_ejecutado,
-            "porcentaje_total_ejecucion": porcentaje_total,
+            "porcentaje_total_ejecucion": float(porcentaje_ejecucion(total_ejecutado, total_presupuesto)),
+            "total_presupuesto_acumulado": presupuesto_acumulado,
+            "total_ejecutado_acumulado": ejecutado_acumulado,
+            "porcentaje_acumulado_ejecucion": float(porcentaje_ejecucion(ejecutado_acumulado, presupuesto_acumulado)),
             "total_compras_bolsa": total_compras_bolsa
         }
     
@@ -328,6 +338,8 @@ class GeneradorSeccion8(GeneradorSeccion):
             "total_presupuesto_formato": formato_moneda_cop(totales["total_presupuesto"]),
             "total_ejecutado_formato": formato_moneda_cop(totales["total_ejecutado"]),
             "total_compras_bolsa_formato": formato_moneda_cop(totales["total_compras_bolsa"]),
+            "total_presupuesto_acumulado_formato": formato_moneda_cop(totales["total_presupuesto_acumulado"]),
+            "total_ejecutado_acumulado_formato": formato_moneda_cop(totales["total_ejecutado_acumulado"]),
             
             # Variables adicionales
             "periodo": f"{config.MESES[self.mes]} {self.anio}",
@@ -10,28 +10,24 @@ Subsecciones:
 - 9.5 Seguimiento e indicadores
 """
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 import pandas as pd
 import numpy as np
 from .base import GeneradorSeccion
+from src.extractores.fuentes_tabulares import leer_fuente_tabla
 import config
-
-# Intentar importar matplotlib, si no está disponible se manejará en el código
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Backend sin GUI
-    import matplotlib.pyplot as plt
-    import matplotlib.patches as mpatches
-    MATPLOTLIB_DISPONIBLE = True
-except ImportError:
-    MATPLOTLIB_DISPONIBLE = False
-    print("[WARNING] matplotlib no está disponible. El gráfico heatmap no se generará.")
+from src.utils.analisis_plantilla import ContextoPerezoso, Perezoso
+from src.utils.escritura_segura import escribir_atomico
+from src.utils.graficos import generar_grafico
 
 
 class GeneradorSeccion9(GeneradorSeccion):
     """Genera la sección 9: Matriz de Riesgos"""
     
+    # El heatmap se reconstruye desde los riesgos del snapshot (ver generar)
+    ATRIBUTOS_DATOS = ("riesgos",)
+    
     @property
     def nombre_seccion(self) -> str:
         return "9. MATRIZ DE RIESGOS"
@@ -46,6 +42,13 @@ class GeneradorSeccion9(GeneradorSeccion):
         self.resumen_clasificacion: List[Dict] = []
         self.grafico_matriz_img: str = ""
     
+    def _heatmap_contexto(self) -> str:
+        """Heatmap para el contexto: se genera una vez, al resolverlo"""
+        if not self.grafico_matriz_img:
+            with self._medir("grafico"):
+                self.grafico_matriz_img = self._generar_heatmap()
+        return self.grafico_matriz_img
+    
     def _calcular_clasificacion(self, nivel_num: int) -> str:
         """
         Mapea nivel numérico a clasificación textual
@@ -101,86 +104,31 @@ class GeneradorSeccion9(GeneradorSeccion):
         orden = {"Crítico": 4, "Alto": 3, "Medio": 2, "Bajo": 1}
         self.resumen_clasificacion.sort(key=lambda x: orden.get(x["clasificacion"], 0), reverse=True)
     
-    def _generar_heatmap(self, output_dir: Path) -> str:
+    def _generar_heatmap(self, output_dir: Optional[Path] = None) -> str:
         """
         Genera gráfico heatmap de la matriz de riesgos
         
+        La imagen se toma de la caché de gráficos si la matriz no cambió.
+        
         Args:
-            output_dir: Directorio de salida
+            output_dir: Directorio donde copiar la imagen (opcional, por defecto
+                        se usa directamente la imagen en caché)
         
         Returns:
             Ruta al archivo PNG generado o cadena vacía si no se pudo generar
         """
-        if not MATPLOTLIB_DISPONIBLE:
-            return ""
-        
         if not self.riesgos:
             return ""
         
-        try:
-            # Crear matriz 5x5 (probabilidad vs impacto)
-            matriz = np.zeros((5, 5))
-            
-            for riesgo in self.riesgos:
-                prob = riesgo.get("probabilidad", 1) - 1  # Convertir 1-5 a 0-4
-                imp = riesgo.get("impacto", 1) - 1
-                if 0 <= prob < 5 and 0 <= imp < 5:
-                    matriz[imp, prob] += 1  # Impacto en filas, Probabilidad en columnas
-            
-            # Crear figura
-            fig, ax = plt.subplots(figsize=(10, 8))
-            
-            # Crear heatmap
-            im = ax.imshow(matriz, cmap='YlOrRd', aspect='auto', vmin=0, vmax=max(1, matriz.max()))
-            
-            # Etiquetas
-            ax.set_xticks(range(5))
-            ax.set_yticks(range(5))
-            ax.set_xticklabels([str(i+1) for i in range(5)])
-            ax.set_yticklabels([str(i+1) for i in range(5)])
-            ax.set_xlabel('Probabilidad (1-5)', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Impacto (1-5)', fontsize=12, fontweight='bold')
-            ax.set_title('Matriz de Riesgos - Probabilidad vs Impacto', fontsize=14, fontweight='bold')
-            
-            # Agregar valores en las celdas
-            for i in range(5):
-                for j in range(5):
-                    if matriz[i, j] > 0:
-                        text = ax.text(j, i, int(matriz[i, j]),
-                                     ha="center", va="center", color="black", fontweight='bold')
-            
-            # Agregar barra de color
-            plt.colorbar(im, ax=ax, label='Cantidad de Riesgos')
-            
-            # Agregar líneas de clasificación
-            # Línea Bajo/Medio (nivel 4)
-            ax.plot([-0.5, 4.5], [3.5, 3.5], 'b--', alpha=0.3, linewidth=1)
-            ax.plot([3.5, 3.5], [-0.5, 4.5], 'b--', alpha=0.3, linewidth=1)
-            
-            # Línea Medio/Alto (nivel 8)
-            ax.plot([-0.5, 4.5], [1.5, 1.5], 'orange', linestyle='--', alpha=0.3, linewidth=1)
-            ax.plot([1.5, 1.5], [-0.5, 4.5], 'orange', linestyle='--', alpha=0.3, linewidth=1)
-            
-            # Leyenda de clasificación
-            legend_elements = [
-                mpatches.Patch(color='lightblue', label='Bajo (1-4)'),
-                mpatches.Patch(color='yellow', label='Medio (5-8)'),
-                mpatches.Patch(color='orange', label='Alto (9-12)'),
-                mpatches.Patch(color='red', label='Crítico (13-25)')
-            ]
-            ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.15, 1))
-            
-            plt.tight_layout()
-            
-            # Guardar
-            output_path = output_dir / "matriz_riesgos_heatmap.png"
-            plt.savefig(output_path, dpi=150, bbox_inches='tight')
-            plt.close()
-            
-            return str(output_path)
-        except Exception as e:
-            print(f"[WARNING] Error al generar heatmap: {e}")
-            return ""
+        # Crear matriz 5x5 (impacto en filas, probabilidad en columnas)
+        probabilidad = np.array([r.get("probabilidad", 1) for r in self.riesgos], dtype=int) - 1
+        impacto = np.array([r.get("impacto", 1) for r in self.riesgos], dtype=int) - 1
+        validos = (probabilidad >= 0) & (probabilidad < 5) & (impacto >= 0) & (impacto < 5)
+        matriz = np.zeros((5, 5), dtype=int)
+        np.add.at(matriz, (impacto[validos], probabilidad[validos]), 1)
+        
+        destino = output_dir / "matriz_riesgos_heatmap.png" if output_dir is not None else None
+        return generar_grafico("heatmap_riesgos", {"matriz": matriz.tolist()}, destino=destino)
     
     def cargar_datos(self) -> None:
         """Carga datos de la sección 9 desde CSV o genera datos dummy"""
@@ -191,7 +139,7 @@ class GeneradorSeccion9(GeneradorSeccion):
         
         if archivo_csv.exists():
             try:
-                df = pd.read_csv(archivo_csv, encoding='utf-8')
+                df = leer_fuente_tabla(archivo_csv)
                 # Convertir DataFrame a lista de diccionarios
                 self.riesgos = df.to_dict('records')
                 datos_cargados = True
@@ -281,7 +229,7 @@ class GeneradorSeccion9(GeneradorSeccion):
         try:
             df = pd.DataFrame(self.riesgos)
             csv_demo = config.FUENTES_DIR / "matriz_riesgos_demo.csv"
-            df.to_csv(csv_demo, index=False, encoding='utf-8')
+            escribir_atomico(csv_demo, lambda ruta: df.to_csv(ruta, index=False, encoding='utf-8'))
             print(f"[INFO] CSV de ejemplo guardado en: {csv_demo}")
         except Exception as e:
             print(f"[WARNING] No se pudo guardar CSV de ejemplo: {e}")
@@ -298,7 +246,7 @@ class GeneradorSeccion9(GeneradorSeccion):
         else:
             narrativa = "No se identificaron riesgos para el periodo reportado."
         
-        return {
+        return ContextoPerezoso({
             # Narrativa
             "texto_intro": narrativa,
             
@@ -312,24 +260,22 @@ class GeneradorSeccion9(GeneradorSeccion):
             "total_resumen": len(self.resumen_clasificacion),
             "hay_resumen": len(self.resumen_clasificacion) > 0,
             
-            # Placeholder para gráfico
-            "grafico_matriz_img": self.grafico_matriz_img,
+            # Gráfico: solo se genera si el template lo usa (o al guardar el snapshot)
+            "grafico_matriz_img": Perezoso(self._heatmap_contexto),
             
             # Estadísticas adicionales
             "riesgos_criticos": riesgos_criticos,
             "riesgos_altos": riesgos_altos,
             "riesgos_medios": sum(1 for r in self.riesgos if r.get("clasificacion") == "Medio"),
             "riesgos_bajos": sum(1 for r in self.riesgos if r.get("clasificacion") == "Bajo"),
-        }
+        })
     
     def generar(self) -> Any:
         """Genera la sección completa, incluyendo el gráfico"""
-        # Generar heatmap antes de procesar
-        output_dir = config.OUTPUT_DIR / f"{self.anio}" / f"{self.mes:02d}_{config.MESES[self.mes]}"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.grafico_matriz_img = self._generar_heatmap(output_dir)
+        if self._contexto_restaurado is not None:
+            # La ruta del snapshot apunta a la caché de gráficos, que se poda:
+            # se vuelve a pedir desde los riesgos restaurados (sin consultar fuentes)
+            self._contexto_restaurado["grafico_matriz_img"] = Perezoso(self._heatmap_contexto)
         
         # Llamar al método generar de la clase base
         return super().generar()
-
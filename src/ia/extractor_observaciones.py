@@ -3,10 +3,17 @@ Extractor de observaciones desde archivos de anexos usando LLM
 """
 from typing import Dict, Optional, List
 from pathlib import Path
+import logging
 import os
 import tempfile
+import time
 import config
 from src.extractores.sharepoint_extractor import get_sharepoint_extractor
+from src.utils.log_utils import campos_log
+from src.utils.metricas import medido
+from src.utils.perfil_memoria import perfilado_memoria
+
+logger = logging.getLogger(__name__)
 
 # Cargar variables de entorno desde .env
 try:
@@ -21,7 +28,7 @@ try:
     OPENAI_DISPONIBLE = True
 except ImportError:
     OPENAI_DISPONIBLE = False
-    print("[WARNING] openai no está disponible. Las observaciones se generarán de forma estática.")
+    logger.warning("openai no está disponible. Las observaciones se generarán de forma estática.")
 
 # Intentar importar otras librerías para lectura de PDFs
 try:
@@ -69,13 +76,13 @@ class ExtractorObservaciones:
                     # Si no está en variable de entorno, pasarla explícitamente
                     self.client = OpenAI(api_key=self.api_key)
             except Exception as e:
-                print(f"[WARNING] Error al inicializar cliente OpenAI: {e}")
-                print(f"[INFO] Intentando con configuración alternativa...")
+                logger.warning("Error al inicializar cliente OpenAI: %s", e)
+                logger.info("Intentando con configuración alternativa...")
                 try:
                     # Intentar solo con variable de entorno
                     self.client = OpenAI()
                 except Exception as e2:
-                    print(f"[WARNING] Error al inicializar cliente OpenAI (fallback): {e2}")
+                    logger.warning("Error al inicializar cliente OpenAI (fallback): %s", e2)
                     self.client = None
         
         # Inicializar extractor de SharePoint
@@ -107,15 +114,15 @@ class ExtractorObservaciones:
             ruta_path = Path(ruta_archivo)
             # Si el archivo existe localmente y está en el directorio temporal, ya fue descargado
             if ruta_path.exists() and str(ruta_path.parent).startswith(str(Path(tempfile.gettempdir()))):
-                print(f"[DEBUG] Archivo ya descargado, extrayendo texto directamente...")
+                logger.debug("Archivo ya descargado, extrayendo texto directamente...")
                 # Continuar con la extracción local (no descargar nuevamente)
             # Verificar si es URL de SharePoint (solo URLs completas, no rutas relativas del servidor)
             elif self.sharepoint_extractor.es_url_sharepoint(ruta_archivo):
-                print(f"[DEBUG] Detectada URL de SharePoint, descargando...")
+                logger.debug("Detectada URL de SharePoint, descargando...")
                 return self._extraer_texto_desde_sharepoint(ruta_archivo)
             # Verificar si es ruta relativa del servidor (comienza con /sites/, /teams/, etc.)
             elif ruta_archivo.startswith('/sites/') or ruta_archivo.startswith('/teams/') or ruta_archivo.startswith('/personal/'):
-                print(f"[DEBUG] Detectada ruta relativa del servidor, descargando desde SharePoint...")
+                logger.debug("Detectada ruta relativa del servidor, descargando desde SharePoint...")
                 return self._extraer_texto_desde_sharepoint(ruta_archivo)
         
         # Convertir a Path si es string
@@ -123,35 +130,34 @@ class ExtractorObservaciones:
             ruta_archivo = Path(ruta_archivo)
         
         if not ruta_archivo.exists():
-            print(f"[WARNING] Archivo no existe: {ruta_archivo}")
+            logger.warning("Archivo no existe: %s", ruta_archivo)
             return ""
         
         extension = ruta_archivo.suffix.lower()
-        print(f"[DEBUG] Extrayendo texto de archivo local: {ruta_archivo} (extensión: {extension})")
+        logger.debug("Extrayendo texto de archivo local: %s (extensión: %s)", ruta_archivo, extension)
         
         try:
             if extension == '.pdf' and PDF_DISPONIBLE:
                 texto = self._leer_pdf(ruta_archivo)
-                print(f"[DEBUG] Texto extraído de PDF: {len(texto)} caracteres")
+                logger.debug("Texto extraído de PDF: %s caracteres", len(texto))
                 return texto
             elif extension in ['.docx', '.doc'] and DOCX_DISPONIBLE:
                 texto = self._leer_docx(ruta_archivo)
-                print(f"[DEBUG] Texto extraído de DOCX: {len(texto)} caracteres")
+                logger.debug("Texto extraído de DOCX: %s caracteres", len(texto))
                 return texto
             elif extension == '.txt':
                 with open(ruta_archivo, 'r', encoding='utf-8') as f:
                     texto = f.read()
-                print(f"[DEBUG] Texto extraído de TXT: {len(texto)} caracteres")
+                logger.debug("Texto extraído de TXT: %s caracteres", len(texto))
                 return texto
             else:
-                print(f"[WARNING] Formato no soportado: {extension}")
+                logger.warning("Formato no soportado: %s", extension)
                 return ""
         except Exception as e:
-            print(f"[WARNING] Error al leer archivo {ruta_archivo}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error al leer archivo %s: %s", ruta_archivo, e, exc_info=True)
             return ""
     
+    @medido("observaciones", operacion="sharepoint")
     def _extraer_texto_desde_sharepoint(self, url_sharepoint: str) -> str:
         """
         Extrae texto de un archivo desde SharePoint
@@ -162,31 +168,29 @@ class ExtractorObservaciones:
         Returns:
             Texto extraído del archivo
         """
-        print(f"[INFO] Descargando archivo desde SharePoint: {url_sharepoint}")
-        print(f"[DEBUG] Tipo de ruta: {'URL completa' if url_sharepoint.startswith('http') else 'Ruta relativa del servidor'}")
+        logger.debug("Descargando archivo desde SharePoint: %s", url_sharepoint)
+        logger.debug("Tipo de ruta: %s", 'URL completa' if url_sharepoint.startswith('http') else 'Ruta relativa del servidor')
         
         # Descargar archivo temporalmente
         try:
             archivo_temp = self.sharepoint_extractor.descargar_archivo(url_sharepoint)
         except Exception as e:
-            print(f"[ERROR] Error al descargar archivo desde SharePoint: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al descargar archivo desde SharePoint: %s", e)
             return ""
         
         if not archivo_temp:
-            print(f"[WARNING] No se pudo descargar archivo desde SharePoint (retornó None): {url_sharepoint}")
+            logger.warning("No se pudo descargar archivo desde SharePoint (retornó None): %s", url_sharepoint)
             return ""
         
         if not archivo_temp.exists():
-            print(f"[WARNING] Archivo descargado no existe: {archivo_temp}")
+            logger.warning("Archivo descargado no existe: %s", archivo_temp)
             return ""
         
         tamaño = archivo_temp.stat().st_size
-        print(f"[INFO] Archivo descargado exitosamente: {archivo_temp} (tamaño: {tamaño} bytes)")
+        logger.info("Archivo descargado exitosamente: %s (tamaño: %s bytes)", archivo_temp, tamaño)
         
         if tamaño == 0:
-            print(f"[WARNING] El archivo descargado está vacío (0 bytes)")
+            logger.warning("El archivo descargado está vacío (0 bytes)")
             return ""
         
         # Guardar referencia para limpiar después
@@ -196,18 +200,17 @@ class ExtractorObservaciones:
         try:
             # Pasar como Path, no como string, para que se lea como archivo local
             texto = self.extraer_texto_archivo(str(archivo_temp))
-            print(f"[INFO] Texto extraído del archivo: {len(texto)} caracteres")
+            logger.debug("Texto extraído del archivo: %s caracteres", len(texto))
             if len(texto) > 0:
-                print(f"[DEBUG] Primeros 200 caracteres del texto: {texto[:200]}...")
+                logger.debug("Primeros 200 caracteres del texto: %s...", texto[:200])
             else:
-                print(f"[WARNING] No se pudo extraer texto del archivo (archivo puede estar corrupto o ser imagen)")
+                logger.warning("No se pudo extraer texto del archivo (archivo puede estar corrupto o ser imagen)")
             return texto
         except Exception as e:
-            print(f"[ERROR] Error al extraer texto del archivo: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al extraer texto del archivo: %s", e)
             return ""
     
+    @medido("observaciones", operacion="leer_pdf")
     def _leer_pdf(self, ruta: Path) -> str:
         """Lee texto de un archivo PDF"""
         texto = ""
@@ -217,9 +220,10 @@ class ExtractorObservaciones:
                 for page in pdf_reader.pages:
                     texto += page.extract_text() + "\n"
         except Exception as e:
-            print(f"[WARNING] Error al leer PDF {ruta}: {e}")
+            logger.warning("Error al leer PDF %s: %s", ruta, e)
         return texto
     
+    @medido("observaciones", operacion="leer_docx")
     def _leer_docx(self, ruta: Path) -> str:
         """Lee texto de un archivo DOCX"""
         texto = ""
@@ -228,9 +232,10 @@ class ExtractorObservaciones:
             for para in doc.paragraphs:
                 texto += para.text + "\n"
         except Exception as e:
-            print(f"[WARNING] Error al leer DOCX {ruta}: {e}")
+            logger.warning("Error al leer DOCX %s: %s", ruta, e)
         return texto
     
+    @medido("observaciones", operacion="llm")
     def generar_observacion_llm(self, texto_anexo: str, obligacion: str, 
                                 periodicidad: str, cumplio: str,
                                 informes_aprobados_contexto: Optional[List[str]] = None) -> str:
@@ -291,6 +296,7 @@ Formato: Texto corrido, sin viñetas ni listas.
 
 OBSERVACIÓN:"""
 
+            inicio = time.perf_counter()
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -302,10 +308,12 @@ OBSERVACIÓN:"""
             )
             
             observacion = response.choices[0].message.content.strip()
+            logger.info("Observación generada con LLM (%s caracteres)", len(observacion),
+                        extra={"operacion": "llm", "duracion_s": time.perf_counter() - inicio})
             return observacion
             
         except Exception as e:
-            print(f"[WARNING] Error al generar observación con LLM: {e}")
+            logger.warning("Error al generar observación con LLM: %s", e)
             return self._generar_observacion_fallback(obligacion, cumplio)
     
     def _generar_observacion_fallback(self, obligacion: str, cumplio: str) -> str:
@@ -332,6 +340,8 @@ OBSERVACIÓN:"""
         else:
             return f"No se cumplió la obligación: {obligacion[:100]}..."
     
+    @medido("observaciones", operacion="procesar_obligacion")
+    @perfilado_memoria("obligacion", detalle=lambda self, obligacion, *args, **kwargs: obligacion.get("item"))
     def procesar_obligacion(self, obligacion: Dict, informes_aprobados_contexto: Optional[List[str]] = None) -> Dict:
         """
         Procesa una obligación y genera observación dinámica desde el anexo
@@ -346,6 +356,12 @@ OBSERVACIÓN:"""
         Returns:
             Obligación con observación actualizada
         """
+        # Todos los registros de log de la obligación (anexo, SharePoint, LLM) llevan su ítem
+        with campos_log(item=obligacion.get("item")):
+            return self._procesar_obligacion(obligacion, informes_aprobados_contexto)
+    
+    def _procesar_obligacion(self, obligacion: Dict, informes_aprobados_contexto: Optional[List[str]]) -> Dict:
+        """Implementación de procesar_obligacion()"""
         ruta_anexo = obligacion.get("anexo", "")
         
         # Si ya tiene observación y no queremos regenerarla, retornar tal cual
@@ -359,13 +375,14 @@ OBSERVACIÓN:"""
             # Si no debe revisar anexo, usar observación por defecto
             default_observaciones = obligacion.get("defaultobservaciones", "")
             if default_observaciones:
-                print(f"[INFO] Obligación {obligacion.get('item', 'N/A')}: Usando observación por defecto (revisaranexo=false)")
+                logger.info("Obligación %s: Usando observación por defecto (revisaranexo=false)", obligacion.get('item', 'N/A'))
                 obligacion_actualizada = obligacion.copy()
                 obligacion_actualizada["observaciones"] = default_observaciones
                 obligacion_actualizada["observacion_generada_llm"] = False
                 return obligacion_actualizada
             else:
-                print(f"[WARNING] Obligación {obligacion.get('item', 'N/A')}: revisaranexo=false pero no hay defaultobservaciones, usando fallback")
+                logger.warning("Obligación %s: revisaranexo=false pero no hay defaultobservaciones, usando fallback",
+                               obligacion.get('item', 'N/A'))
                 # Continuar con el proceso normal si no hay defaultobservaciones
         
         # Intentar extraer texto del anexo
@@ -373,10 +390,10 @@ OBSERVACIÓN:"""
         if ruta_anexo and ruta_anexo != "-" and ruta_anexo.lower() != "no aplica":
             # Convertir ruta relativa a Path absoluto
             # Las rutas vienen como: "01SEP - 30SEP / 01 OBLIGACIONES GENERALES/ OBLIGACIÓN 1,7,8,9,10,11,13,14 y 15/ Oficio Obli SEPTIEMBRE 2025.pdf"
-            print(f"[INFO] Procesando anexo para obligación {obligacion.get('item', 'N/A')}: {ruta_anexo}")
+            logger.info("Procesando anexo para obligación %s: %s", obligacion.get('item', 'N/A'), ruta_anexo)
             ruta_completa = self._resolver_ruta_anexo(ruta_anexo)
             if ruta_completa:
-                print(f"[INFO] Ruta resuelta: {ruta_completa}")
+                logger.debug("Ruta resuelta: %s", ruta_completa)
                 
                 # Verificar existencia del archivo antes de intentar extraer
                 archivo_existe = False
@@ -388,18 +405,18 @@ OBSERVACIÓN:"""
                     if self.sharepoint_extractor.es_url_sharepoint(ruta_completa) or ruta_completa.startswith('/sites/') or ruta_completa.startswith('/teams/'):
                         es_sharepoint = True
                         # Para SharePoint, verificar existencia sin descargar primero
-                        print(f"[INFO] Verificando existencia del archivo en SharePoint...")
+                        logger.debug("Verificando existencia del archivo en SharePoint...")
                         # Intentar verificar con el método optimizado
                         try:
                             archivo_existe = self.sharepoint_extractor.verificar_archivo_existe(ruta_anexo)
                         except Exception as e:
-                            print(f"[WARNING] Error al verificar archivo en SharePoint: {e}")
+                            logger.warning("Error al verificar archivo en SharePoint: %s", e)
                             # Fallback: intentar descargar para verificar
                             archivo_temp_descargado = self.sharepoint_extractor.descargar_archivo(ruta_completa)
                             archivo_existe = archivo_temp_descargado is not None and archivo_temp_descargado.exists()
                         
                         if archivo_existe:
-                            print(f"[INFO] Archivo existe en SharePoint, descargando...")
+                            logger.debug("Archivo existe en SharePoint, descargando...")
                             # Descargar el archivo para extraer texto
                             archivo_temp_descargado = self.sharepoint_extractor.descargar_archivo(ruta_completa)
                             if archivo_temp_descargado and archivo_temp_descargado.exists():
@@ -408,37 +425,37 @@ OBSERVACIÓN:"""
                                 # Usar el archivo descargado para extraer texto
                                 ruta_completa = str(archivo_temp_descargado)
                             else:
-                                print(f"[WARNING] No se pudo descargar el archivo aunque existe")
+                                logger.warning("No se pudo descargar el archivo aunque existe")
                                 archivo_existe = False
                         else:
-                            print(f"[WARNING] El archivo no existe en SharePoint: {ruta_anexo}")
+                            logger.warning("El archivo no existe en SharePoint: %s", ruta_anexo)
                     else:
                         # Archivo local
                         ruta_path = Path(ruta_completa)
                         archivo_existe = ruta_path.exists()
                         if not archivo_existe:
-                            print(f"[WARNING] El archivo no existe localmente: {ruta_completa}")
+                            logger.warning("El archivo no existe localmente: %s", ruta_completa)
                 else:
                     # Ya es un Path
                     archivo_existe = ruta_completa.exists() if hasattr(ruta_completa, 'exists') else Path(ruta_completa).exists()
                     if not archivo_existe:
-                        print(f"[WARNING] El archivo no existe: {ruta_completa}")
+                        logger.warning("El archivo no existe: %s", ruta_completa)
                 
                 if archivo_existe:
-                    print(f"[INFO] Archivo encontrado, extrayendo texto del anexo...")
+                    logger.debug("Archivo encontrado, extrayendo texto del anexo...")
                     # Si ya descargamos el archivo, usar directamente extraer_texto_archivo con la ruta local
                     # Si no, extraer_texto_archivo manejará la descarga si es necesario
                     texto_anexo = self.extraer_texto_archivo(ruta_completa)
-                    print(f"[INFO] Texto extraído: {len(texto_anexo)} caracteres")
+                    logger.debug("Texto extraído: %s caracteres", len(texto_anexo))
                     if len(texto_anexo) == 0:
-                        print(f"[WARNING] No se pudo extraer texto del anexo (archivo puede estar vacío o corrupto)")
+                        logger.warning("No se pudo extraer texto del anexo (archivo puede estar vacío o corrupto)")
                 else:
                     # Archivo no existe: si revisaranexo=true, generar observación indicando que no existe
-                    print(f"[WARNING] El archivo de anexo no existe: {ruta_anexo}")
+                    logger.warning("El archivo de anexo no existe: %s", ruta_anexo)
                     if revisar_anexo:
                         # Si debe revisar anexo y no existe, generar observación indicando que no existe
                         observacion_archivo_no_existe = f"El archivo de anexo no existe: {ruta_anexo}"
-                        print(f"[INFO] Generando observación indicando que el archivo no existe")
+                        logger.info("Generando observación indicando que el archivo no existe")
                         obligacion_actualizada = obligacion.copy()
                         obligacion_actualizada["observaciones"] = observacion_archivo_no_existe
                         obligacion_actualizada["observacion_generada_llm"] = False
@@ -447,20 +464,20 @@ OBSERVACIÓN:"""
                         # Si no debe revisar anexo, usar defaultobservaciones
                         default_observaciones = obligacion.get("defaultobservaciones", "")
                         if default_observaciones:
-                            print(f"[INFO] Usando observación por defecto ya que el archivo no existe")
+                            logger.info("Usando observación por defecto ya que el archivo no existe")
                             obligacion_actualizada = obligacion.copy()
                             obligacion_actualizada["observaciones"] = default_observaciones
                             obligacion_actualizada["observacion_generada_llm"] = False
                             return obligacion_actualizada
                         else:
-                            print(f"[INFO] Continuando con revisión usando fallback (no hay defaultobservaciones)")
+                            logger.info("Continuando con revisión usando fallback (no hay defaultobservaciones)")
             else:
                 # No se pudo resolver la ruta: si revisaranexo=true, generar observación indicando que no existe
-                print(f"[WARNING] No se pudo resolver ruta del anexo: {ruta_anexo}")
+                logger.warning("No se pudo resolver ruta del anexo: %s", ruta_anexo)
                 if revisar_anexo:
                     # Si debe revisar anexo y no se pudo resolver, generar observación indicando que no existe
                     observacion_archivo_no_existe = f"El archivo de anexo no existe: {ruta_anexo}"
-                    print(f"[INFO] Generando observación indicando que el archivo no existe (ruta no resuelta)")
+                    logger.info("Generando observación indicando que el archivo no existe (ruta no resuelta)")
                     obligacion_actualizada = obligacion.copy()
                     obligacion_actualizada["observaciones"] = observacion_archivo_no_existe
                     obligacion_actualizada["observacion_generada_llm"] = False
@@ -469,26 +486,27 @@ OBSERVACIÓN:"""
                     # Si no debe revisar anexo, usar defaultobservaciones
                     default_observaciones = obligacion.get("defaultobservaciones", "")
                     if default_observaciones:
-                        print(f"[INFO] Usando observación por defecto ya que no se pudo resolver la ruta")
+                        logger.info("Usando observación por defecto ya que no se pudo resolver la ruta")
                         obligacion_actualizada = obligacion.copy()
                         obligacion_actualizada["observaciones"] = default_observaciones
                         obligacion_actualizada["observacion_generada_llm"] = False
                         return obligacion_actualizada
                     else:
-                        print(f"[INFO] Continuando con revisión usando fallback (no hay defaultobservaciones)")
+                        logger.info("Continuando con revisión usando fallback (no hay defaultobservaciones)")
         else:
-            print(f"[INFO] No hay anexo para la obligación {obligacion.get('item', 'N/A')} (ruta: '{ruta_anexo}')")
+            logger.info("No hay anexo para la obligación %s (ruta: '%s')", obligacion.get('item', 'N/A'), ruta_anexo)
             # Si no hay anexo pero hay defaultobservaciones, usarlas
             default_observaciones = obligacion.get("defaultobservaciones", "")
             if default_observaciones:
-                print(f"[INFO] Usando observación por defecto ya que no hay anexo")
+                logger.info("Usando observación por defecto ya que no hay anexo")
                 obligacion_actualizada = obligacion.copy()
                 obligacion_actualizada["observaciones"] = default_observaciones
                 obligacion_actualizada["observacion_generada_llm"] = False
                 return obligacion_actualizada
         
         # Generar observación
-        print(f"[INFO] Generando observación con LLM (cliente disponible: {bool(self.client)}, texto disponible: {len(texto_anexo) > 50})")
+        logger.debug("Generando observación con LLM (cliente disponible: %s, texto disponible: %s)",
+                     bool(self.client), len(texto_anexo) > 50)
         observacion = self.generar_observacion_llm(
             texto_anexo=texto_anexo,
             obligacion=obligacion.get("obligacion", ""),
@@ -563,12 +581,16 @@ OBSERVACIÓN:"""
             sitio_parsed = urlparse(self.sharepoint_extractor.site_url)
             sitio_path_parts = [p for p in sitio_parsed.path.split('/') if p]
             
-            print(f"[DEBUG] Resolviendo ruta de SharePoint:")
-            print(f"  - Ruta original: {ruta_relativa}")
-            print(f"  - Ruta normalizada: {ruta_normalizada}")
-            print(f"  - Site URL: {self.sharepoint_extractor.site_url}")
-            print(f"  - Site path parts: {sitio_path_parts}")
-            print(f"  - Base path: {self.sharepoint_extractor.base_path}")
+            logger.debug(
+                "Resolviendo ruta de SharePoint:\n"
+                "  - Ruta original: %s\n"
+                "  - Ruta normalizada: %s\n"
+                "  - Site URL: %s\n"
+                "  - Site path parts: %s\n"
+                "  - Base path: %s",
+                ruta_relativa, ruta_normalizada, self.sharepoint_extractor.site_url,
+                sitio_path_parts, self.sharepoint_extractor.base_path
+            )
             
             # Construir ruta relativa del servidor
             if sitio_path_parts:
@@ -584,23 +606,23 @@ OBSERVACIÓN:"""
                     if base_path_clean:
                         # Dividir base_path en partes y agregar cada una
                         base_path_parts = [p for p in base_path_clean.split('/') if p]
-                        print(f"  - Base path parts: {base_path_parts}")
+                        logger.debug("Base path parts: %s", base_path_parts)
                         path_parts.extend(base_path_parts)
                 
                 # Agregar la ruta del archivo
                 ruta_archivo_clean = ruta_normalizada.lstrip('/')
                 server_relative_url = '/' + '/'.join(path_parts) + '/' + ruta_archivo_clean
-                print(f"[INFO] Intentando buscar en SharePoint con ruta relativa: {server_relative_url}")
+                logger.debug("Intentando buscar en SharePoint con ruta relativa: %s", server_relative_url)
                 # Retornar la ruta relativa para que SharePoint la use directamente
                 return server_relative_url
             else:
                 # Fallback: construir URL completa
                 ruta_sharepoint = ruta_normalizada.lstrip("/")
                 url_sharepoint = f"{self.sharepoint_extractor.site_url.rstrip('/')}/{ruta_sharepoint}"
-                print(f"[INFO] Intentando buscar en SharePoint: {url_sharepoint}")
+                logger.debug("Intentando buscar en SharePoint: %s", url_sharepoint)
                 return url_sharepoint
         
-        print(f"[WARNING] No se encontró archivo de anexo: {ruta_relativa}")
+        logger.warning("No se encontró archivo de anexo: %s", ruta_relativa)
         return None
     
     def limpiar_archivos_temporales(self):
@@ -610,7 +632,7 @@ OBSERVACIÓN:"""
                 if archivo.exists():
                     archivo.unlink()
             except Exception as e:
-                print(f"[WARNING] Error al eliminar archivo temporal {archivo}: {e}")
+                logger.warning("Error al eliminar archivo temporal %s: %s", archivo, e)
         self.archivos_temporales.clear()
 
 
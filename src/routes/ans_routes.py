@@ -0,0 +1,47 @@
+"""
+Rutas para simular escenarios de penalidad del ANS (Sección 3)
+"""
+from typing import Dict, Any
+from fastapi import APIRouter, status, Body
+from ..controllers.ans_controller import AnsController
+
+router = APIRouter(prefix="/ans", tags=["ANS - Sección 3"])
+
+ans_controller = AnsController()
+
+
+@router.post("/simulacion", status_code=status.HTTP_200_OK)
+async def simular_penalidades(
+    data: Dict[str, Any] = Body(...),
+) -> Dict[str, Any]:
+    """
+    Evalúa la exposición a penalidades para muchos escenarios en una llamada
+
+    Body:
+    {
+        "modo": "lineal",          # "lineal" (PENALIDAD_CONFIG) o "escalonada" (escala del informe)
+        "umbral": 98.9,            # Opcional
+        "valor_mensual": 150000000,  # Opcional: valor por defecto de cada escenario
+        "escenarios": [            # Opcional: por localidad, por mes, etc.
+            {"etiqueta": "KENNEDY", "disponibilidad": 98.4},
+            {"etiqueta": "Octubre 2025", "disponibilidad": 98.1, "valor_mensual": 120000000}
+        ],
+        "barrido": {               # Opcional: malla de disponibilidad x valor mensual
+            "desde": 97.0, "hasta": 100.0, "paso": 0.01,
+            "valores_mensuales": [100000000, 150000000]
+        }
+    }
+
+    Respuesta:
+    {
+        "modo": "lineal",
+        "umbral": 98.9,
+        "escenarios": [{"etiqueta", "disponibilidad", "valor_mensual", "aplica", "deficit",
+                        "porcentaje_penalidad", "valor_penalidad"}, ...],
+        "barrido": {"disponibilidad": [...], "valores_mensuales": [...],
+                    "porcentaje_penalidad": [...], "valor_penalidad": [[...], ...]},
+        "resumen": {"escenarios", "escenarios_con_penalidad", "valor_total",
+                    "valor_maximo", "porcentaje_maximo"}
+    }
+    """
+    return await ans_controller.simular(data)
@@ -0,0 +1,128 @@
+"""
+Rutas para generar y descargar el informe mensual consolidado
+"""
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Request, Response, status, Query
+from fastapi.responses import HTMLResponse
+from ..controllers.informes_controller import InformesController
+
+router = APIRouter(prefix="/informes", tags=["Informes"])
+
+informes_controller = InformesController()
+
+
+@router.post("/{anio}/{mes}", status_code=status.HTTP_202_ACCEPTED)
+async def generar_informe(
+    anio: int,
+    mes: int,
+    version: int = Query(1, ge=1, description="Versión del documento"),
+    perfil_memoria: bool = Query(False, description="Registrar memoria por sección y por obligación"),
+) -> Dict[str, Any]:
+    """
+    Encola la generación del informe mensual completo
+
+    La generación se ejecuta en un pool de procesos, fuera del event loop.
+    Si ya hay una generación en curso para el mismo periodo y versión se
+    retorna su estado en lugar de encolar otra.
+
+    Con perfil_memoria=true el worker registra la memoria (tracemalloc + RSS)
+    de cada sección y obligación; el perfil queda disponible en
+    /api/informes/{anio}/{mes}/{version}/memoria.
+
+    Respuesta:
+    {
+        "anio": 2025,
+        "mes": 9,
+        "version": 1,
+        "estado": "en_cola",
+        "perfil_memoria": false,
+        "archivo": "INFORME_MENSUAL_SEPTIEMBRE_2025_V1.docx",
+        "url": "/api/informes/2025/9/1"
+    }
+    """
+    return await informes_controller.generar_informe(anio, mes, version, perfil_memoria)
+
+
+@router.get("/{anio}/{mes}/datos")
+async def obtener_datos(
+    anio: int,
+    mes: int,
+    secciones: Optional[str] = Query(None, description="Secciones separadas por coma, ej: 1,8 (default: todas)"),
+) -> Response:
+    """
+    Contexto de cada sección sin renderizar templates (vista previa de datos)
+
+    Ejecuta cargar_datos + procesar de las secciones en paralelo en un
+    proceso worker y guarda cada snapshot en <salida>/datos/, desde donde
+    main.py --desde-datos puede renderizar el informe sin consultar las fuentes.
+
+    Respuesta:
+    {
+        "anio": 2025,
+        "mes": 9,
+        "secciones": {
+            "8": {"seccion": 8, "nombre": "8. EJECUCIÓN PRESUPUESTAL", "anio": 2025, "mes": 9,
+                  "generado_en": "2025-10-01T08:00:00", "contexto": {...}}
+        }
+    }
+
+    - 400: periodo o sección inválidos
+    """
+    return await informes_controller.obtener_datos(anio, mes, secciones)
+
+
+@router.get("/{anio}/{mes}/secciones/{numero}/preview", response_class=HTMLResponse)
+async def preview_seccion(
+    anio: int,
+    mes: int,
+    numero: int,
+    desde_datos: bool = Query(True, description="Usar el snapshot de --solo-datos si existe"),
+) -> HTMLResponse:
+    """
+    Vista previa HTML de una sección para el front-end
+
+    La sección se renderiza igual que en el .docx y su cuerpo se convierte a
+    HTML liviano (títulos, párrafos y tablas). El resultado se cachea por
+    sección, template y contexto: mientras los datos no cambien la respuesta
+    sale de la caché sin renderizar.
+
+    - 200: fragmento <article class="preview-seccion">...</article>
+    - 400: periodo o sección inválidos
+    """
+    return await informes_controller.preview_seccion(anio, mes, numero, desde_datos)
+
+
+@router.get("/{anio}/{mes}/{version}/memoria")
+async def obtener_perfil_memoria(
+    anio: int,
+    mes: int,
+    version: int,
+) -> Dict[str, Any]:
+    """
+    Perfil de memoria de la última generación encolada con perfil_memoria=true
+
+    Incluye, por sección y por obligación, la memoria de Python al inicio y
+    al final, los picos de tracemalloc y RSS y los principales sitios de
+    asignación.
+
+    - 404: no hay perfil de memoria para ese informe
+    """
+    return await informes_controller.obtener_perfil_memoria(anio, mes, version)
+
+
+@router.get("/{anio}/{mes}/{version}")
+async def descargar_informe(
+    request: Request,
+    anio: int,
+    mes: int,
+    version: int,
+) -> Response:
+    """
+    Descarga el informe generado (.docx) en streaming
+
+    - 200: contenido del informe con ETag y Last-Modified
+    - 304: el cliente ya tiene la versión actual (If-None-Match / If-Modified-Since)
+    - 202: la generación sigue en curso (retorna el estado)
+    - 404: el informe no ha sido generado
+    """
+    return await informes_controller.descargar_informe(request, anio, mes, version)
@@ -0,0 +1,154 @@
+"""
+Service para simular escenarios de penalidad del ANS
+"""
+from typing import Dict, Any, List
+import logging
+import math
+from ans_config import UMBRAL_ANS, PENALIDAD_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Límite de escenarios por petición (escenarios + celdas del barrido)
+MAX_ESCENARIOS = 1_000_000
+
+
+class AnsService:
+    """Service de simulación de penalidades del ANS"""
+
+    def simular(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Evalúa escenarios de penalidad en una sola pasada vectorizada
+
+        Body:
+        {
+            "modo": "lineal" | "escalonada",   # Opcional, default "lineal"
+            "umbral": 98.9,                    # Opcional, default UMBRAL_ANS
+            "valor_mensual": 150000000,        # Opcional, default de PENALIDAD_CONFIG
+            "escenarios": [                    # Opcional: por localidad, por mes...
+                {"etiqueta": "KENNEDY", "disponibilidad": 98.4, "valor_mensual": 120000000},
+                ...
+            ],
+            "barrido": {                       # Opcional: malla disponibilidad x valor mensual
+                "desde": 97.0, "hasta": 100.0, "paso": 0.01,
+                "valores_mensuales": [100000000, 150000000]
+            }
+        }
+
+        Returns:
+            {"modo", "umbral", "escenarios": [...], "barrido": {...}, "resumen": {...}}
+
+        Raises:
+            ValueError: Si el body es inválido (valores no finitos incluidos)
+                        o excede MAX_ESCENARIOS
+        """
+        # NumPy y el motor se importan al simular, no al arrancar el API
+        import numpy as np
+        from ..utils.penalidades import calcular_penalidades, resumir_penalidades, MODO_LINEAL, MODOS
+
+        modo = data.get("modo", MODO_LINEAL)
+        if modo not in MODOS:
+            raise ValueError(f"modo debe ser uno de: {', '.join(MODOS)}")
+        try:
+            umbral = float(data.get("umbral", UMBRAL_ANS))
+            valor_defecto = float(data.get("valor_mensual", PENALIDAD_CONFIG["valor_mensual_contrato"]))
+        except (TypeError, ValueError):
+            raise ValueError("'umbral' y 'valor_mensual' deben ser numéricos")
+        if not (math.isfinite(umbral) and math.isfinite(valor_defecto)):
+            raise ValueError("'umbral' y 'valor_mensual' deben ser números finitos")
+        escenarios = data.get("escenarios") or []
+        barrido = data.get("barrido")
+        if not escenarios and not barrido:
+            raise ValueError("Debe indicar 'escenarios' y/o 'barrido'")
+
+        disponibilidades_barrido, valores_barrido = self._malla_barrido(barrido, valor_defecto)
+        total = len(escenarios) + disponibilidades_barrido.size * valores_barrido.size
+        if total > MAX_ESCENARIOS:
+            raise ValueError(f"Se solicitaron {total} escenarios; el máximo por petición es {MAX_ESCENARIOS}")
+
+        respuesta: Dict[str, Any] = {"modo": modo, "umbral": umbral}
+        totales: List[Dict[str, Any]] = []
+
+        if escenarios:
+            try:
+                disponibilidad = np.array([float(e["disponibilidad"]) for e in escenarios])
+                valor = np.array([float(e.get("valor_mensual", valor_defecto)) for e in escenarios])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Cada escenario requiere 'disponibilidad' numérica (y 'valor_mensual' opcional)")
+            if not (np.isfinite(disponibilidad).all() and np.isfinite(valor).all()):
+                raise ValueError("'disponibilidad' y 'valor_mensual' de los escenarios deben ser números finitos")
+            resultado = calcular_penalidades(disponibilidad, valor, umbral, modo)
+            respuesta["escenarios"] = [
+                {
+                    "etiqueta": e.get("etiqueta", str(i + 1)),
+                    "disponibilidad": d,
+                    "valor_mensual": v,
+                    "aplica": a,
+                    "deficit": round(df, 4),
+                    "porcentaje_penalidad": round(p, 4),
+                    "valor_penalidad": round(vp, 2),
+                }
+                for i, (e, d, v, a, df, p, vp) in enumerate(zip(
+                    escenarios, disponibilidad.tolist(), valor.tolist(), resultado["aplica"].tolist(),
+                    resultado["deficit"].tolist(), resultado["porcentaje_penalidad"].tolist(),
+                    resultado["valor_penalidad"].tolist()
+                ))
+            ]
+            totales.append(resumir_penalidades(resultado))
+
+        if barrido:
+            # Malla (disponibilidad x valor mensual) en formato columnar
+            resultado = calcular_penalidades(disponibilidades_barrido[:, None], valores_barrido[None, :], umbral, modo)
+            respuesta["barrido"] = {
+                "disponibilidad": disponibilidades_barrido.round(4).tolist(),
+                "valores_mensuales": valores_barrido.tolist(),
+                "porcentaje_penalidad": resultado["porcentaje_penalidad"][:, 0].round(4).tolist(),
+                "valor_penalidad": resultado["valor_penalidad"].round(2).tolist(),
+            }
+            totales.append(resumir_penalidades(resultado))
+
+        respuesta["resumen"] = {
+            "escenarios": sum(t["escenarios"] for t in totales),
+            "escenarios_con_penalidad": sum(t["escenarios_con_penalidad"] for t in totales),
+            "valor_total": sum(t["valor_total"] for t in totales),
+            "valor_maximo": max(t["valor_maximo"] for t in totales),
+            "porcentaje_maximo": max(t["porcentaje_maximo"] for t in totales),
+        }
+        return respuesta
+
+    @staticmethod
+    def _malla_barrido(barrido: Dict[str, Any], valor_defecto: float):
+        """Disponibilidades y valores mensuales del barrido (arreglos vacíos si no hay)"""
+        import numpy as np
+
+        if not barrido:
+            return np.empty(0), np.empty(0)
+        try:
+            desde = float(barrido["desde"])
+            hasta = float(barrido["hasta"])
+            paso = float(barrido.get("paso", 0.01))
+            valores = np.array([float(v) for v in barrido.get("valores_mensuales", [valor_defecto])])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("barrido requiere 'desde' y 'hasta' numéricos (y 'paso', 'valores_mensuales' opcionales)")
+        if not valores.size:
+            raise ValueError("barrido requiere al menos un valor en 'valores_mensuales'")
+        if not (math.isfinite(desde) and math.isfinite(hasta) and math.isfinite(paso)
+                and np.isfinite(valores).all()):
+            raise ValueError("barrido requiere 'desde', 'hasta', 'paso' y 'valores_mensuales' finitos")
+        if paso <= 0 or hasta < desde:
+            raise ValueError("barrido requiere paso > 0 y hasta >= desde")
+        if (hasta - desde) / paso + 1 > MAX_ESCENARIOS:
+            raise ValueError(f"El barrido excede el máximo de {MAX_ESCENARIOS} escenarios")
+        # Pasos enteros para evitar acumular error de punto flotante
+        pasos = int(np.floor((hasta - desde) / paso + 1e-9)) + 1
+        return desde + np.arange(pasos) * paso, valores
+
+
+# Singleton
+_ans_service = None
+
+def get_ans_service() -> AnsService:
+    """Obtiene instancia singleton del service del ANS"""
+    global _ans_service
+    if _ans_service is None:
+        _ans_service = AnsService()
+    return _ans_service
@@ -0,0 +1,338 @@
+"""
+Service para generar y entregar el informe mensual consolidado
+"""
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import config
+from src.utils.metricas import get_registro_metricas
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de bloque usado al transmitir el .docx
+CHUNK_SIZE = 64 * 1024
+
+# Estados posibles de una generación
+ESTADO_EN_COLA = "en_cola"
+ESTADO_GENERANDO = "generando"
+ESTADO_COMPLETADO = "completado"
+ESTADO_ERROR = "error"
+
+
+def _generar_informe_worker(anio: int, mes: int, version: int,
+                            perfil_memoria: bool = False) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    Ejecuta la generación completa en el proceso worker
+
+    Se importa main dentro del worker para no cargar los generadores
+    (python-docx, pandas, matplotlib, LLM) en el proceso del API.
+
+    Returns:
+        (ruta del informe o None, histogramas de tiempos de esta generación)
+    """
+    from main import generar_informe
+    from src.utils.log_utils import configurar_logging
+    from src.utils.metricas import get_registro_metricas
+    # Con fork el worker hereda el logging del API; con spawn hay que configurarlo
+    if not logging.getLogger().handlers:
+        configurar_logging()
+    # El worker se reutiliza entre trabajos: solo se reportan los tiempos de este
+    registro = get_registro_metricas()
+    registro.limpiar()
+    ruta = generar_informe(anio, mes, version, perfil_memoria=perfil_memoria)
+    return (str(ruta) if ruta else None), registro.exportar()
+
+
+def _generar_datos_worker(anio: int, mes: int,
+                          secciones: Optional[List[int]] = None) -> Tuple[Dict[int, str], List[Dict[str, Any]]]:
+    """
+    Carga y procesa los datos de las secciones en el proceso worker, sin renderizar
+
+    Returns:
+        (snapshot JSON por sección, histogramas de tiempos de esta ejecución)
+    """
+    from main import generar_datos
+    from src.utils.log_utils import configurar_logging
+    from src.utils.metricas import get_registro_metricas
+    if not logging.getLogger().handlers:
+        configurar_logging()
+    registro = get_registro_metricas()
+    registro.limpiar()
+    snapshots = generar_datos(anio, mes, secciones)
+    return snapshots, registro.exportar()
+
+
+def _preview_worker(anio: int, mes: int, numero: int, desde_datos: bool = True) -> str:
+    """Vista previa HTML de una sección en el proceso worker (ver src/utils/preview_html.py)"""
+    from src.utils.log_utils import configurar_logging
+    from src.utils.preview_html import preview_seccion
+    if not logging.getLogger().handlers:
+        configurar_logging()
+    return preview_seccion(anio, mes, numero, desde_datos)
+
+
+class InformesService:
+    """Service para encolar la generación del informe y servir el resultado"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("INFORMES_MAX_WORKERS", "2"))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._trabajos: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos en el primer uso"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def validar_periodo(self, anio: int, mes: int, version: int = 1) -> None:
+        """
+        Valida el periodo solicitado
+
+        Raises:
+            ValueError: Si el mes, la versión o el periodo no son válidos
+        """
+        if not 1 <= mes <= 12:
+            raise ValueError("El mes debe estar entre 1 y 12")
+        if version < 1:
+            raise ValueError("La versión debe ser mayor o igual a 1")
+        if not config.periodo_en_contrato(anio, mes):
+            raise ValueError(f"Periodo fuera del rango del contrato ({config.get_rango_periodos_texto()})")
+
+    def parsear_secciones(self, texto: Optional[str]) -> Optional[List[int]]:
+        """
+        Convierte "1,8" en [1, 8] validando contra el registro de generadores
+
+        Returns:
+            Lista de secciones o None (todas) si no se indicaron
+
+        Raises:
+            ValueError: Si alguna sección no existe (mismas reglas que main.py --secciones)
+        """
+        if not texto:
+            return None
+        from src.generadores import parsear_secciones
+        return parsear_secciones(texto)
+
+    def validar_seccion(self, numero: Any) -> None:
+        """
+        Valida el número de sección contra el registro de generadores
+
+        Raises:
+            ValueError: Si la sección no existe
+        """
+        from src.generadores import secciones_disponibles
+        if numero not in secciones_disponibles():
+            raise ValueError(f"Sección inválida: '{numero}'. Disponibles: {secciones_disponibles()}")
+
+    def generar_datos(self, anio: int, mes: int, secciones: Optional[List[int]] = None) -> Future:
+        """
+        Envía al pool de procesos la carga de datos de las secciones (sin render)
+
+        Args:
+            anio: Año del informe
+            mes: Mes del informe (1-12)
+            secciones: Números de sección (default: todas)
+
+        Returns:
+            Future con (snapshots, métricas); ver respuesta_datos
+        """
+        self.validar_periodo(anio, mes)
+        return self._get_executor().submit(_generar_datos_worker, anio, mes, secciones)
+
+    def preview_seccion(self, anio: int, mes: int, numero: int, desde_datos: bool = True) -> Future:
+        """
+        Envía al pool de procesos la vista previa HTML de una sección
+
+        Args:
+            anio: Año del informe
+            mes: Mes del informe (1-12)
+            numero: Número de la sección
+            desde_datos: Usar el snapshot de --solo-datos si existe
+
+        Returns:
+            Future con el fragmento HTML
+
+        Raises:
+            ValueError: Si el periodo o la sección no son válidos
+        """
+        self.validar_periodo(anio, mes)
+        self.validar_seccion(numero)
+        return self._get_executor().submit(_preview_worker, anio, mes, numero, desde_datos)
+
+    def respuesta_datos(self, anio: int, mes: int,
+                        resultado: Tuple[Dict[int, str], List[Dict[str, Any]]]) -> str:
+        """
+        Arma el JSON de respuesta con los snapshots ya serializados por el worker
+
+        Returns:
+            {"anio": ..., "mes": ..., "secciones": {"1": snapshot, ...}}
+        """
+        snapshots, metricas = resultado
+        get_registro_metricas().fusionar(metricas)
+        secciones = ",".join(f'"{numero}":{texto}' for numero, texto in sorted(snapshots.items()))
+        return f'{{"anio":{int(anio)},"mes":{int(mes)},"secciones":{{{secciones}}}}}'
+
+    def get_ruta_informe(self, anio: int, mes: int, version: int) -> Path:
+        """Retorna la ruta esperada del informe consolidado"""
+        return config.get_directorio_salida(anio, mes) / config.get_nombre_informe(anio, mes, version)
+
+    def get_ruta_perfil_memoria(self, anio: int, mes: int, version: int) -> Path:
+        """Retorna la ruta del perfil de memoria que acompaña al informe"""
+        return config.get_directorio_salida(anio, mes) / config.get_nombre_reporte_memoria(anio, mes, version)
+
+    def leer_perfil_memoria(self, anio: int, mes: int, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Lee el perfil de memoria guardado por una generación con perfil_memoria
+
+        Returns:
+            Perfil de memoria o None si no existe
+        """
+        self.validar_periodo(anio, mes, version)
+        ruta = self.get_ruta_perfil_memoria(anio, mes, version)
+        if not ruta.exists():
+            return None
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def encolar_generacion(self, anio: int, mes: int, version: int = 1,
+                           perfil_memoria: bool = False) -> Dict[str, Any]:
+        """
+        Encola la generación del informe en el pool de procesos
+
+        Si ya hay una generación en curso para el mismo periodo y versión,
+        no se encola otra y se retorna el estado de la existente. Entre
+        procesos del API (varios workers de uvicorn) coordina el bloqueo por
+        periodo de main.generar_informe: la segunda generación espera y
+        reutiliza el informe que terminó la primera.
+
+        Args:
+            anio: Año del informe
+            mes: Mes del informe (1-12)
+            version: Versión del documento
+            perfil_memoria: Registrar memoria por sección y por obligación
+                            (más lento; ver leer_perfil_memoria)
+
+        Returns:
+            Estado del trabajo
+        """
+        self.validar_periodo(anio, mes, version)
+        clave = (anio, mes, version)
+
+        with self._lock:
+            trabajo = self._trabajos.get(clave)
+            if trabajo and trabajo["estado"] in (ESTADO_EN_COLA, ESTADO_GENERANDO):
+                return self._resumen_trabajo(clave, trabajo)
+
+            trabajo = {
+                "estado": ESTADO_EN_COLA,
+                "encolado_en": datetime.now().isoformat(),
+                "error": None,
+                "perfil_memoria": perfil_memoria,
+            }
+            self._trabajos[clave] = trabajo
+            future = self._get_executor().submit(_generar_informe_worker, anio, mes, version, perfil_memoria)
+            trabajo["future"] = future
+
+        future.add_done_callback(lambda f, clave=clave: self._finalizar_trabajo(clave, f))
+        logger.info(f"Generación encolada para {anio}-{mes:02d} V{version}")
+        return self._resumen_trabajo(clave, trabajo)
+
+    def _finalizar_trabajo(self, clave: Tuple[int, int, int], future: Future) -> None:
+        """Actualiza el estado del trabajo cuando el worker termina"""
+        with self._lock:
+            trabajo = self._trabajos.get(clave)
+            if trabajo is None or trabajo.get("future") is not future:
+                return
+            try:
+                ruta, metricas = future.result()
+                # Los tiempos medidos en el worker se suman a /metrics del API
+                get_registro_metricas().fusionar(metricas)
+                if ruta:
+                    trabajo["estado"] = ESTADO_COMPLETADO
+                else:
+                    trabajo["estado"] = ESTADO_ERROR
+                    trabajo["error"] = "No se generó ninguna sección del informe"
+            except Exception as e:
+                logger.error(f"Error generando informe {clave}: {e}", exc_info=True)
+                trabajo["estado"] = ESTADO_ERROR
+                trabajo["error"] = str(e)
+            trabajo["finalizado_en"] = datetime.now().isoformat()
+
+    def obtener_estado(self, anio: int, mes: int, version: int) -> Optional[Dict[str, Any]]:
+        """Retorna el estado del trabajo de generación o None si no se ha encolado"""
+        clave = (anio, mes, version)
+        with self._lock:
+            trabajo = self._trabajos.get(clave)
+            if trabajo is None:
+                return None
+            if trabajo["estado"] == ESTADO_EN_COLA and trabajo["future"].running():
+                trabajo["estado"] = ESTADO_GENERANDO
+            return self._resumen_trabajo(clave, trabajo)
+
+    def _resumen_trabajo(self, clave: Tuple[int, int, int], trabajo: Dict[str, Any]) -> Dict[str, Any]:
+        """Construye la respuesta pública del trabajo (sin el future)"""
+        anio, mes, version = clave
+        resumen = {k: v for k, v in trabajo.items() if k != "future"}
+        resumen.update({
+            "anio": anio,
+            "mes": mes,
+            "version": version,
+            "archivo": config.get_nombre_informe(anio, mes, version),
+            "url": f"/api/informes/{anio}/{mes}/{version}",
+        })
+        if trabajo.get("perfil_memoria"):
+            resumen["url_perfil_memoria"] = f"/api/informes/{anio}/{mes}/{version}/memoria"
+        return resumen
+
+    def get_metadatos_archivo(self, ruta: Path) -> Dict[str, Any]:
+        """
+        Calcula los metadatos de caché HTTP del informe
+
+        El ETag se deriva de mtime y tamaño, de modo que cambia cada vez
+        que el informe se regenera sin tener que leer el archivo.
+
+        Returns:
+            Diccionario con etag, last_modified (texto HTTP), mtime y tamaño
+        """
+        stat = ruta.stat()
+        mtime = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+        return {
+            "etag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+            "last_modified": format_datetime(mtime, usegmt=True),
+            "mtime": mtime,
+            "tamano": stat.st_size,
+        }
+
+    def iterar_archivo(self, ruta: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Lee el archivo en bloques para StreamingResponse"""
+        with open(ruta, "rb") as f:
+            while True:
+                bloque = f.read(chunk_size)
+                if not bloque:
+                    break
+                yield bloque
+
+    def cerrar(self) -> None:
+        """Cierra el pool de procesos sin esperar trabajos pendientes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton
+_informes_service = None
+
+def get_informes_service() -> InformesService:
+    """Obtiene instancia singleton del service de informes"""
+    global _informes_service
+    if _informes_service is None:
+        _informes_service = InformesService()
+    return _informes_service
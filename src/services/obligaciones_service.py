@@ -7,6 +7,8 @@ from pathlib import Path
 import config
 from src.ia.extractor_observaciones import get_extractor_observaciones
 from src.repositories.obligaciones_repository import ObligacionesRepository
+from src.utils.escritura_segura import escribir_texto_atomico
+from src.utils.metricas import medido, medir
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,6 +40,7 @@ class ObligacionesService:
             logger.warning(f"No se pudo inicializar extractor de observaciones: {e}")
             self.extractor_observaciones = None
     
+    @medido("obligaciones", operacion="cargar_json")
     def cargar_obligaciones_desde_json(self, anio: int, mes: int) -> Dict[str, List[Dict]]:
         """
         Carga obligaciones desde archivo JSON
@@ -101,31 +104,33 @@ class ObligacionesService:
         obligaciones_procesadas = []
         total = len(obligaciones)
         
-        for idx, obligacion in enumerate(obligaciones, 1):
-            item = obligacion.get("item", idx)
-            logger.info(f"[{idx}/{total}] Procesando obligación {tipo} - Item {item}")
+        with medir("obligaciones", operacion="procesar", tipo=tipo):
+            for idx, obligacion in enumerate(obligaciones, 1):
+                item = obligacion.get("item", idx)
+                logger.info(f"[{idx}/{total}] Procesando obligación {tipo} - Item {item}")
             
-            # Si regenerar_todas es True, forzar regeneración
-            if regenerar_todas:
-                obligacion["regenerar_observacion"] = True
+                # Si regenerar_todas es True, forzar regeneración
+                if regenerar_todas:
+                    obligacion["regenerar_observacion"] = True
             
-            try:
-                obligacion_procesada = self.extractor_observaciones.procesar_obligacion(obligacion)
-                obligaciones_procesadas.append(obligacion_procesada)
+                try:
+                    obligacion_procesada = self.extractor_observaciones.procesar_obligacion(obligacion)
+                    obligaciones_procesadas.append(obligacion_procesada)
                 
-                # Log del resultado
-                if obligacion_procesada.get("observaciones"):
-                    logger.info(f"  ✓ Observación generada ({len(obligacion_procesada['observaciones'])} caracteres)")
-                else:
-                    logger.warning(f"  ⚠ No se generó observación para item {item}")
+                    # Log del resultado
+                    if obligacion_procesada.get("observaciones"):
+                        logger.info(f"  ✓ Observación generada ({len(obligacion_procesada['observaciones'])} caracteres)")
+                    else:
+                        logger.warning(f"  ⚠ No se generó observación para item {item}")
             
-            except Exception as e:
-                logger.error(f"  ✗ Error al procesar obligación {item}: {e}")
-                # Agregar obligación sin procesar en caso de error
-                obligaciones_procesadas.append(obligacion)
+                except Exception as e:
+                    logger.error(f"  ✗ Error al procesar obligación {item}: {e}")
+                    # Agregar obligación sin procesar en caso de error
+                    obligaciones_procesadas.append(obligacion)
         
         return obligaciones_procesadas
     
+    @medido("obligaciones", operacion="procesar_todas")
     def procesar_todas_las_obligaciones(
         self,
         anio: int,
@@ -258,6 +263,7 @@ class ObligacionesService:
             tipo_obligacion: obligaciones_procesadas
         }
     
+    @medido("obligaciones", operacion="verificar_anexos")
     def _procesar_obligaciones_anexos(self, obligaciones: List[Dict]) -> Dict[str, Any]:
         """
         Procesa obligaciones de anexos verificando existencia de archivos en SharePoint
@@ -297,6 +303,7 @@ class ObligacionesService:
             "obligaciones_anexos": resultado
         }
     
+    @medido("obligaciones", operacion="guardar_json")
     def guardar_obligaciones_procesadas(
         self,
         obligaciones: Dict[str, List[Dict]],
@@ -330,8 +337,7 @@ class ObligacionesService:
         
         # Guardar obligaciones procesadas
         try:
-            with open(archivo, 'w', encoding='utf-8') as f:
-                json.dump(obligaciones, f, ensure_ascii=False, indent=2)
+            escribir_texto_atomico(archivo, json.dumps(obligaciones, ensure_ascii=False, indent=2))
             logger.info(f"Obligaciones procesadas guardadas en: {archivo}")
             return archivo
         except Exception as e:
@@ -361,22 +367,23 @@ class ObligacionesService:
         Returns:
             Documento guardado en MongoDB
         """
-        try:
-            documento_guardado = await self.repository.guardar_obligaciones(
-                anio=anio,
-                mes=mes,
-                seccion=seccion,
-                subseccion=subseccion,
-                obligaciones_data=obligaciones,
-                user_id=user_id
-            )
-            if documento_guardado:
-                logger.info(f"Obligaciones guardadas en MongoDB para {anio}-{mes}, sección {seccion}, subsección {subseccion}")
-            else:
-                logger.info(f"MongoDB no está disponible. Obligaciones procesadas correctamente pero no guardadas en MongoDB.")
-            return documento_guardado
-        except Exception as e:
-            logger.warning(f"Error al guardar obligaciones en MongoDB: {e}")
-            # No lanzar excepción, solo registrar warning
-            return None
+        with medir("obligaciones", operacion="guardar_mongodb"):
+            try:
+                documento_guardado = await self.repository.guardar_obligaciones(
+                    anio=anio,
+                    mes=mes,
+                    seccion=seccion,
+                    subseccion=subseccion,
+                    obligaciones_data=obligaciones,
+                    user_id=user_id
+                )
+                if documento_guardado:
+                    logger.info(f"Obligaciones guardadas en MongoDB para {anio}-{mes}, sección {seccion}, subsección {subseccion}")
+                else:
+                    logger.info(f"MongoDB no está disponible. Obligaciones procesadas correctamente pero no guardadas en MongoDB.")
+                return documento_guardado
+            except Exception as e:
+                logger.warning(f"Error al guardar obligaciones en MongoDB: {e}")
+                # No lanzar excepción, solo registrar warning
+                return None
 
@@ -0,0 +1,130 @@
+"""
+Análisis de variables de templates Word y contexto perezoso
+
+`variables_plantilla` extrae las variables Jinja que referencia un template
+.docx (cuerpo, encabezados y pies de página), cacheadas por el hash del
+archivo en memoria y en config.CACHE_DIR / "plantillas". `ContextoPerezoso` guarda valores `Perezoso` que solo se calculan
+cuando se leen, de modo que al renderizar se evalúan únicamente las claves
+que el template usa.
+"""
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Optional
+import hashlib
+import json
+import logging
+import threading
+from docxtpl import DocxTemplate
+import config
+from src.utils.escritura_segura import escribir_texto_atomico
+from src.utils.formato_moneda import get_entorno_jinja
+
+logger = logging.getLogger(__name__)
+
+CACHE_PLANTILLAS_DIR = config.CACHE_DIR / "plantillas"
+
+_variables_por_hash: Dict[str, Optional[FrozenSet[str]]] = {}
+_lock = threading.Lock()
+
+_SIN_CALCULAR = object()
+
+
+def hash_plantilla(ruta: Path) -> str:
+    """SHA-256 del contenido del template"""
+    return hashlib.sha256(Path(ruta).read_bytes()).hexdigest()
+
+
+def variables_plantilla(ruta: Path) -> Optional[FrozenSet[str]]:
+    """
+    Variables Jinja referenciadas por un template .docx
+
+    Args:
+        ruta: Ruta al template
+
+    Returns:
+        Conjunto de nombres de variables, o None si el template no se pudo
+        analizar (en ese caso se deben calcular todas las claves)
+    """
+    clave = hash_plantilla(ruta)
+    with _lock:
+        if clave in _variables_por_hash:
+            return _variables_por_hash[clave]
+
+    ruta_cache = CACHE_PLANTILLAS_DIR / f"{clave[:20]}.json"
+    if ruta_cache.exists():
+        with open(ruta_cache, "r", encoding="utf-8") as f:
+            variables = frozenset(json.load(f))
+    else:
+        try:
+            variables = frozenset(DocxTemplate(ruta).get_undeclared_template_variables(get_entorno_jinja()))
+        except Exception as e:
+            logger.warning(f"No se pudieron analizar las variables de {Path(ruta).name}: {e}")
+            variables = None
+        else:
+            escribir_texto_atomico(ruta_cache, json.dumps(sorted(variables)))
+
+    with _lock:
+        _variables_por_hash[clave] = variables
+    return variables
+
+
+class Perezoso:
+    """Valor del contexto que se calcula la primera vez que se solicita"""
+
+    __slots__ = ("funcion", "_valor")
+
+    def __init__(self, funcion: Callable[[], Any]):
+        self.funcion = funcion
+        self._valor = _SIN_CALCULAR
+
+    def __call__(self) -> Any:
+        if self._valor is _SIN_CALCULAR:
+            self._valor = self.funcion()
+        return self._valor
+
+
+class ContextoPerezoso(dict):
+    """
+    Contexto de template cuyos valores Perezoso se calculan al leerlos
+
+    El acceso por clave, get(), values() e items() retornan valores ya
+    calculados. Para renderizar se usa resolver(), porque copiar el dict
+    (dict(contexto), Jinja) conserva los Perezoso sin evaluar.
+    """
+
+    def __getitem__(self, clave: str) -> Any:
+        valor = super().__getitem__(clave)
+        if isinstance(valor, Perezoso):
+            valor = valor()
+            super().__setitem__(clave, valor)
+        return valor
+
+    def get(self, clave: str, defecto: Any = None) -> Any:
+        return self[clave] if clave in self else defecto
+
+    def values(self):
+        return [self[clave] for clave in self]
+
+    def items(self):
+        return [(clave, self[clave]) for clave in self]
+
+    def pendientes(self) -> FrozenSet[str]:
+        """Claves cuyo valor aún no se ha calculado"""
+        return frozenset(clave for clave, valor in super().items() if isinstance(valor, Perezoso))
+
+    def resolver(self, variables: Optional[AbstractSet[str]] = None) -> Dict[str, Any]:
+        """
+        Contexto plano para el render
+
+        Args:
+            variables: Variables que referencia el template (None: todas)
+
+        Returns:
+            dict con los valores ya calculados; las claves Perezoso que el
+            template no referencia se omiten sin calcularse
+        """
+        pendientes = self.pendientes()
+        return {
+            clave: self[clave]
+            for clave in self
+            if variables is None or clave in variables or clave not in pendientes
+        }
@@ -0,0 +1,231 @@
+"""
+Motor de disponibilidad (ANS) a partir de intervalos de caída y mantenimiento
+
+Recibe los eventos crudos por cámara (inicio, fin, estado) y calcula las
+horas operativas por cámara, localidad y subsistema del mes:
+
+- Los intervalos se recortan al mes.
+- Los intervalos solapados de una misma cámara se fusionan (una hora caída
+  reportada por dos eventos cuenta una sola vez).
+- El tiempo en ESTADOS_MANTENIMIENTO (ans_config) se excluye de la base del
+  cálculo y no cuenta como caída aunque se solape con una.
+
+Todo el cálculo es vectorizado (barrido de eventos con NumPy: lexsort +
+cumsum + bincount), sin ciclos por cámara ni por evento, para soportar
+millones de intervalos.
+
+Disponibilidad (%) = Horas operativas / (Horas del mes - Horas de mantenimiento) × 100
+"""
+import calendar
+from datetime import datetime
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+from ans_config import ESTADOS_OPERATIVOS, ESTADOS_MANTENIMIENTO
+
+SEGUNDOS_HORA = 3600.0
+
+# Tipos de intervalo
+CAIDA = 0
+MANTENIMIENTO = 1
+
+
+def _normalizar_estado(serie: pd.Series) -> pd.Series:
+    return serie.astype(str).str.strip().str.lower()
+
+
+def clasificar_eventos(eventos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega la columna 'tipo' (CAIDA / MANTENIMIENTO) según el estado del evento
+
+    Los eventos en ESTADOS_OPERATIVOS se descartan; los de ESTADOS_MANTENIMIENTO
+    son mantenimiento y cualquier otro estado (ESTADOS_NO_OPERATIVOS o sin
+    columna 'estado') cuenta como caída.
+
+    Args:
+        eventos: DataFrame con id_camara, inicio, fin y opcionalmente estado
+
+    Returns:
+        DataFrame con id_camara, inicio, fin, tipo
+    """
+    resultado = eventos[["id_camara", "inicio", "fin"]].copy()
+    if "estado" in eventos.columns:
+        estado = _normalizar_estado(eventos["estado"])
+        operativo = estado.isin([e.lower() for e in ESTADOS_OPERATIVOS])
+        mantenimiento = estado.isin([e.lower() for e in ESTADOS_MANTENIMIENTO])
+        resultado["tipo"] = np.where(mantenimiento, MANTENIMIENTO, CAIDA).astype(np.int8)
+        resultado = resultado[~operativo.to_numpy()]
+    else:
+        resultado["tipo"] = np.int8(CAIDA)
+    return resultado
+
+
+def _segundos_desde(fechas: pd.Series, origen: pd.Timestamp) -> np.ndarray:
+    """Segundos (float) desde el origen para una serie de fechas"""
+    return (pd.to_datetime(fechas) - origen).dt.total_seconds().to_numpy(dtype=float)
+
+
+def fusionar_intervalos(intervalos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fusiona intervalos solapados o contiguos por cámara y tipo
+
+    Args:
+        intervalos: DataFrame con id_camara, inicio, fin y opcionalmente tipo
+
+    Returns:
+        DataFrame con un intervalo por bloque continuo (id_camara, tipo, inicio, fin)
+    """
+    claves = ["id_camara", "tipo"] if "tipo" in intervalos.columns else ["id_camara"]
+    if intervalos.empty:
+        return intervalos[claves + ["inicio", "fin"]].copy()
+
+    datos = intervalos.sort_values(claves + ["inicio"], kind="mergesort").reset_index(drop=True)
+    # Fin máximo visto hasta la fila anterior dentro de cada grupo
+    fin_acumulado = datos.groupby(claves, sort=False)["fin"].cummax()
+    fin_previo = fin_acumulado.groupby([datos[c] for c in claves], sort=False).shift()
+    nuevo_bloque = fin_previo.isna() | (datos["inicio"] > fin_previo)
+    bloque = nuevo_bloque.cumsum()
+
+    return (
+        datos.groupby(bloque, sort=False)
+        .agg(**{c: (c, "first") for c in claves}, inicio=("inicio", "min"), fin=("fin", "max"))
+        .reset_index(drop=True)
+    )
+
+
+def _barrido(codigos: np.ndarray, inicio: np.ndarray, fin: np.ndarray, tipo: np.ndarray,
+             n_camaras: int) -> Dict[str, np.ndarray]:
+    """
+    Barrido de eventos: suma por cámara los segundos en caída y en mantenimiento
+
+    Cada intervalo aporta un +1 al inicio y un -1 al fin en el contador de su
+    tipo. Ordenando todos los puntos por (cámara, instante), la suma acumulada
+    de cada contador indica si el tramo hasta el siguiente punto está cubierto
+    (> 0), lo que fusiona implícitamente los solapes. Los contadores vuelven a
+    cero al final de cada cámara, por lo que una sola cumsum sirve para todas.
+    """
+    n = len(codigos)
+    camara = np.concatenate([codigos, codigos])
+    instante = np.concatenate([inicio, fin])
+    delta = np.concatenate([np.ones(n, dtype=np.int32), -np.ones(n, dtype=np.int32)])
+    es_mantenimiento = np.concatenate([tipo, tipo]) == MANTENIMIENTO
+
+    orden = np.lexsort((instante, camara))
+    camara = camara[orden]
+    instante = instante[orden]
+    delta = delta[orden]
+    es_mantenimiento = es_mantenimiento[orden]
+
+    en_mantenimiento = np.cumsum(np.where(es_mantenimiento, delta, 0))[:-1] > 0
+    en_caida = np.cumsum(np.where(es_mantenimiento, 0, delta))[:-1] > 0
+
+    duracion = np.diff(instante)
+    duracion[camara[1:] != camara[:-1]] = 0.0
+    camara_tramo = camara[:-1]
+
+    return {
+        "mantenimiento": np.bincount(camara_tramo, weights=duracion * en_mantenimiento, minlength=n_camaras),
+        "caida": np.bincount(camara_tramo, weights=duracion * (en_caida & ~en_mantenimiento), minlength=n_camaras),
+    }
+
+
+def _agrupar(por_camara: pd.DataFrame, columna: str) -> pd.DataFrame:
+    """Totales y disponibilidad por localidad / subsistema"""
+    grupos = por_camara.groupby(columna, sort=False).agg(
+        total_camaras=("id_camara", "size"),
+        horas_totales=("horas_totales", "sum"),
+        horas_operativas=("horas_operativas", "sum"),
+        horas_no_operativas=("horas_no_operativas", "sum"),
+        horas_mantenimiento=("horas_mantenimiento", "sum"),
+    ).reset_index()
+    grupos["disponibilidad"] = np.where(
+        grupos["horas_totales"] > 0, grupos["horas_operativas"] / grupos["horas_totales"] * 100, 100.0
+    )
+    return grupos.sort_values("disponibilidad", ascending=False, kind="mergesort").reset_index(drop=True)
+
+
+def calcular_disponibilidad(eventos: pd.DataFrame, anio: int, mes: int,
+                            camaras: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """
+    Calcula la disponibilidad del mes a partir de intervalos crudos
+
+    Args:
+        eventos: DataFrame con id_camara, inicio, fin (datetime) y opcionalmente estado.
+            Un fin vacío (NaT) es un evento aún abierto: cuenta hasta el fin del mes
+        anio: Año del periodo
+        mes: Mes del periodo (1-12)
+        camaras: Inventario con id_camara, localidad, subsistema. Las cámaras sin
+            eventos cuentan como 100% operativas. Si no se indica se usan las
+            cámaras presentes en los eventos (y sus columnas localidad/subsistema)
+
+    Returns:
+        {
+            "resumen": {total_camaras, dias_mes, horas_totales, horas_operativas,
+                        horas_no_operativas, horas_mantenimiento, disponibilidad_porcentaje},
+            "por_camara": DataFrame,
+            "por_localidad": DataFrame,
+            "por_subsistema": DataFrame
+        }
+    """
+    dias_mes = calendar.monthrange(anio, mes)[1]
+    origen = pd.Timestamp(datetime(anio, mes, 1))
+    segundos_mes = dias_mes * 24 * SEGUNDOS_HORA
+
+    if camaras is None:
+        columnas = [c for c in ("id_camara", "localidad", "subsistema") if c in eventos.columns]
+        camaras = eventos[columnas].drop_duplicates("id_camara")
+    duplicadas = int(camaras["id_camara"].duplicated().sum())
+    if duplicadas:
+        print(f"[WARNING] {duplicadas} cámaras repetidas en el inventario; se usa la primera aparición")
+    por_camara = camaras.drop_duplicates("id_camara").reset_index(drop=True)
+    for columna in ("localidad", "subsistema"):
+        if columna not in por_camara.columns:
+            por_camara[columna] = "SIN DATO"
+
+    clasificados = clasificar_eventos(eventos)
+    codigos = pd.Index(por_camara["id_camara"]).get_indexer(clasificados["id_camara"])
+    inicio = np.clip(_segundos_desde(clasificados["inicio"], origen), 0, segundos_mes)
+    # Eventos abiertos (fin NaT): la cámara sigue caída al cierre del mes
+    fin = np.clip(np.nan_to_num(_segundos_desde(clasificados["fin"], origen), nan=segundos_mes),
+                  0, segundos_mes)
+
+    # Solo intervalos de cámaras del inventario con duración dentro del mes
+    validos = (codigos >= 0) & (fin > inicio)
+    sin_inventario = int((codigos < 0).sum())
+    if sin_inventario:
+        print(f"[WARNING] {sin_inventario} eventos de cámaras que no están en el inventario fueron ignorados")
+
+    segundos = _barrido(
+        codigos[validos], inicio[validos], fin[validos],
+        clasificados["tipo"].to_numpy()[validos], len(por_camara)
+    )
+
+    horas_mes = segundos_mes / SEGUNDOS_HORA
+    por_camara["horas_mantenimiento"] = segundos["mantenimiento"] / SEGUNDOS_HORA
+    por_camara["horas_no_operativas"] = segundos["caida"] / SEGUNDOS_HORA
+    por_camara["horas_totales"] = horas_mes - por_camara["horas_mantenimiento"]
+    por_camara["horas_operativas"] = por_camara["horas_totales"] - por_camara["horas_no_operativas"]
+    por_camara["disponibilidad"] = np.where(
+        por_camara["horas_totales"] > 0,
+        por_camara["horas_operativas"] / por_camara["horas_totales"] * 100,
+        100.0
+    )
+
+    horas_totales = float(por_camara["horas_totales"].sum())
+    horas_operativas = float(por_camara["horas_operativas"].sum())
+    resumen = {
+        "total_camaras": len(por_camara),
+        "dias_mes": dias_mes,
+        "horas_totales": horas_totales,
+        "horas_operativas": horas_operativas,
+        "horas_no_operativas": float(por_camara["horas_no_operativas"].sum()),
+        "horas_mantenimiento": float(por_camara["horas_mantenimiento"].sum()),
+        "disponibilidad_porcentaje": horas_operativas / horas_totales * 100 if horas_totales > 0 else 100.0,
+    }
+
+    return {
+        "resumen": resumen,
+        "por_camara": por_camara,
+        "por_localidad": _agrupar(por_camara, "localidad"),
+        "por_subsistema": _agrupar(por_camara, "subsistema"),
+    }
@@ -2,25 +2,39 @@
 Utilidades para manipulación de documentos Word
 """
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Optional, Union
 from docx import Document
+from docx.document import Document as DocumentoWord
+from src.utils.docx_streaming import TablasDiferidas
+from src.utils.escritura_segura import escribir_atomico
 
-def combinar_documentos(archivos: List[Path], archivo_salida: Path) -> None:
+def combinar_documentos(archivos: List[Union[Path, DocumentoWord]], archivo_salida: Path,
+                        tablas_diferidas: Optional[Iterable[TablasDiferidas]] = None) -> None:
     """
     Combina múltiples documentos Word en uno solo
     
+    Los documentos ya generados en memoria (GeneradorSeccion.documento()) se
+    anexan directamente: el informe se escribe una sola vez, sin guardar ni
+    volver a leer cada sección.
+    
     Args:
-        archivos: Lista de rutas a los documentos a combinar
+        archivos: Rutas o documentos python-docx a combinar, en orden (el
+                  contenido de los documentos en memoria se mueve al informe)
         archivo_salida: Ruta del archivo de salida
+        tablas_diferidas: Tablas reservadas en esos documentos, que se
+                          escriben en streaming al guardar el informe
     """
     if not archivos:
         raise ValueError("No hay documentos para combinar")
     
-    documento_final = Document(archivos[0])
+    def abrir(documento):
+        return documento if isinstance(documento, DocumentoWord) else Document(documento)
+    
+    documento_final = abrir(archivos[0])
     
     # Agregar cada documento subsecuente
     for archivo in archivos[1:]:
-        doc_temp = Document(archivo)
+        doc_temp = abrir(archivo)
         
         # Agregar salto de página antes de cada nuevo documento (excepto el primero)
         documento_final.add_page_break()
@@ -29,7 +43,13 @@ def combinar_documentos(archivos: List[Path], archivo_salida: Path) -> None:
         for elemento in doc_temp.element.body:
             documento_final.element.body.append(elemento)
     
-    documento_final.save(str(archivo_salida))
+    diferidas = TablasDiferidas()
+    for tablas in tablas_diferidas or []:
+        diferidas.incorporar(tablas)
+    if diferidas:
+        escribir_atomico(archivo_salida, lambda ruta: diferidas.guardar(documento_final, ruta))
+    else:
+        escribir_atomico(archivo_salida, lambda ruta: documento_final.save(str(ruta)))
 
 def agregar_pagina_nueva(doc: Document) -> None:
     """
@@ -0,0 +1,122 @@
+"""
+Escritura en streaming de tablas grandes dentro del paquete .docx
+
+python-docx mantiene todo el documento como árbol lxml: una tabla de miles de
+filas ocupa cientos de MB antes de guardarse. Con TablasDiferidas el
+documento se construye con un párrafo marcador en el lugar de cada tabla
+grande y, al guardar, word/document.xml se reescribe en streaming
+reemplazando cada marcador por el XML de la tabla, generado y comprimido por
+bloques de filas. La memoria queda constante al crecer el número de filas.
+"""
+from io import BytesIO
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Union
+import re
+import secrets
+import zipfile
+from docx import Document
+from src.utils.tabla_utils import estilo_tabla_id, iterar_tabla_xml
+
+# Parte del paquete que contiene el cuerpo del documento
+PARTE_DOCUMENTO = "word/document.xml"
+
+# Filas de datos por bloque escrito en el paquete
+FILAS_POR_BLOQUE = 500
+
+_INICIO_PARRAFO = re.compile(r"<w:p[ >]")
+
+
+class TablasDiferidas:
+    """Tablas reservadas en un documento que se escriben al guardarlo"""
+
+    def __init__(self, filas_por_bloque: int = FILAS_POR_BLOQUE):
+        self.filas_por_bloque = filas_por_bloque
+        self._tablas: Dict[str, Callable[[], Iterator[str]]] = {}
+        # Prefijo propio: los marcadores de varias secciones conviven en el informe consolidado
+        self._prefijo = f"__TABLA_DIFERIDA_{secrets.token_hex(4)}"
+
+    def __len__(self) -> int:
+        return len(self._tablas)
+
+    def reservar(self, doc: Document, encabezados: List[str], filas: Callable[[], Iterable[List[Any]]],
+                 estilo_tabla: str = "Table Grid", **formato: Any) -> str:
+        """
+        Agrega al final del documento el marcador de una tabla
+
+        Args:
+            doc: Documento Word
+            encabezados: Textos del encabezado
+            filas: Función que retorna las filas (se llama al guardar; puede
+                   retornar un generador)
+            estilo_tabla: Nombre del estilo de tabla del documento
+            **formato: Argumentos de formato de iterar_tabla_xml (columnas,
+                       color_encabezado, tamano_fuente...)
+
+        Returns:
+            Texto del marcador
+        """
+        marcador = f"{self._prefijo}_{len(self._tablas)}__"
+        ancho_bloque = int(doc._block_width) // 635
+        estilo_id = estilo_tabla_id(doc, estilo_tabla)
+        self._tablas[marcador] = lambda: iterar_tabla_xml(
+            encabezados, filas(), ancho_bloque=ancho_bloque, estilo_id=estilo_id,
+            filas_por_bloque=self.filas_por_bloque, **formato
+        )
+        doc.add_paragraph(marcador)
+        return marcador
+
+    def incorporar(self, otras: "TablasDiferidas") -> None:
+        """
+        Agrega las tablas reservadas en otro documento cuyo cuerpo se anexó
+        a este (en el orden en que se anexan los documentos)
+
+        Args:
+            otras: Tablas diferidas del documento anexado
+        """
+        self._tablas.update(otras._tablas)
+
+    def _fragmentos_documento(self, xml: str) -> Iterator[str]:
+        """Cuerpo del documento con cada párrafo marcador reemplazado por su tabla"""
+        posicion = 0
+        for marcador, generar_tabla in self._tablas.items():
+            indice = xml.find(marcador, posicion)
+            if indice < 0:
+                raise ValueError(f"No se encontró el marcador {marcador} en el documento")
+            inicio_parrafo = [m.start() for m in _INICIO_PARRAFO.finditer(xml, posicion, indice)][-1]
+            fin_parrafo = xml.index("</w:p>", indice) + len("</w:p>")
+            yield xml[posicion:inicio_parrafo]
+            yield from generar_tabla()
+            posicion = fin_parrafo
+        yield xml[posicion:]
+
+    def guardar(self, doc: Document, ruta: Union[Path, IO[bytes]]) -> Union[Path, IO[bytes]]:
+        """
+        Guarda el documento escribiendo las tablas reservadas en streaming
+
+        Args:
+            doc: Documento con los marcadores de reservar()
+            ruta: Ruta del .docx de salida o archivo binario abierto (ej: BytesIO)
+
+        Returns:
+            Ruta (o archivo) del documento guardado
+        """
+        # El esqueleto (sin las tablas grandes) es pequeño: se serializa en memoria
+        esqueleto = BytesIO()
+        doc.save(esqueleto)
+        esqueleto.seek(0)
+
+        if not hasattr(ruta, "write"):
+            ruta = Path(ruta)
+        with zipfile.ZipFile(esqueleto) as origen, \
+                zipfile.ZipFile(ruta, "w", zipfile.ZIP_DEFLATED) as destino:
+            for info in origen.infolist():
+                if info.filename != PARTE_DOCUMENTO:
+                    destino.writestr(info, origen.read(info))
+                    continue
+                xml = origen.read(info).decode("utf-8")
+                parte = zipfile.ZipInfo(PARTE_DOCUMENTO, date_time=info.date_time)
+                parte.compress_type = zipfile.ZIP_DEFLATED
+                with destino.open(parte, "w", force_zip64=True) as salida:
+                    for fragmento in self._fragmentos_documento(xml):
+                        salida.write(fragmento.encode("utf-8"))
+        return ruta
@@ -0,0 +1,131 @@
+"""
+Escritura atómica de archivos y bloqueos entre procesos
+
+Varios workers de la API (o ejecuciones por lotes) pueden generar el mismo
+mes a la vez. Para que nunca quede un archivo a medio escribir:
+
+- escribir_atomico: escribe a un temporal oculto en el mismo directorio y lo
+  renombra con os.replace (atómico en POSIX y Windows); quien lee ve el
+  archivo anterior completo o el nuevo completo.
+- bloqueo_archivo: bloqueo exclusivo advisory (fcntl.flock / msvcrt.locking)
+  sobre un archivo .lock, compartido entre hilos y procesos. main.py lo usa
+  por (anio, mes, version) para que dos generaciones del mismo informe no se
+  pisen y la segunda reutilice el resultado de la primera; con timeout la
+  espera falla con BloqueoOcupado en lugar de quedar colgada.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class BloqueoOcupado(TimeoutError):
+    """Otro hilo o proceso mantuvo el bloqueo más allá del timeout"""
+
+
+def ruta_temporal(destino: Path) -> Path:
+    """
+    Ruta temporal única (proceso e hilo) junto al destino
+
+    Conserva la extensión al final para las librerías que infieren el
+    formato del nombre, y empieza con punto para no coincidir con los
+    patrones de búsqueda de los archivos definitivos.
+    """
+    return destino.with_name(f".{destino.stem}.{os.getpid()}.{threading.get_ident()}.tmp{destino.suffix}")
+
+
+def escribir_atomico(destino: Union[str, Path], escribir: Callable[[Path], object]) -> Path:
+    """
+    Escribe un archivo a través de un temporal y lo renombra al destino
+
+    Quien lee el destino (otro hilo, worker o proceso) ve el archivo anterior
+    completo o el nuevo completo, nunca uno a medio escribir; si la escritura
+    falla, el temporal se elimina y el destino no cambia.
+
+    Args:
+        destino: Ruta final del archivo
+        escribir: Función que escribe el contenido en la ruta temporal recibida
+
+    Returns:
+        Ruta final del archivo
+    """
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta_temporal(destino)
+    try:
+        escribir(temporal)
+        os.replace(temporal, destino)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+    return destino
+
+
+def escribir_texto_atomico(destino: Union[str, Path], texto: str) -> Path:
+    """Escribe un texto UTF-8 de forma atómica (ver escribir_atomico)"""
+    return escribir_atomico(destino, lambda ruta: ruta.write_text(texto, encoding="utf-8"))
+
+
+def _intentar_bloqueo(archivo) -> bool:
+    """Toma el bloqueo exclusivo sin esperar; False si otro lo tiene"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _liberar_bloqueo(archivo) -> None:
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+    else:
+        archivo.seek(0)
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def bloqueo_archivo(ruta: Union[str, Path], intervalo: float = 0.1,
+                    timeout: Optional[float] = None) -> Iterator[bool]:
+    """
+    Bloqueo exclusivo advisory entre hilos y procesos
+
+    El archivo de bloqueo no se elimina al liberar: borrarlo permitiría que
+    dos procesos bloqueen archivos distintos con el mismo nombre.
+
+    Args:
+        ruta: Archivo .lock (se crea si no existe)
+        intervalo: Segundos entre intentos mientras otro tiene el bloqueo
+        timeout: Segundos máximos de espera (None: sin límite)
+
+    Yields:
+        True si hubo que esperar a que otro hilo o proceso lo liberara
+
+    Raises:
+        BloqueoOcupado: Si otro sigue teniendo el bloqueo al vencer el timeout
+    """
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with open(ruta, "a+b") as archivo:
+        espero = False
+        limite = None if timeout is None else time.monotonic() + timeout
+        while not _intentar_bloqueo(archivo):
+            if limite is not None and time.monotonic() >= limite:
+                raise BloqueoOcupado(f"Bloqueo ocupado tras {timeout} s: {ruta}")
+            espero = True
+            time.sleep(intervalo)
+        try:
+            yield espero
+        finally:
+            _liberar_bloqueo(archivo)
@@ -1,72 +1,194 @@
 """
-Utilidades para formateo de valores monetarios
+Utilidades para formateo de valores monetarios (formato colombiano)
+
+Motor único de formato: conversión a letras memoizada, formato de valores
+individuales y de columnas completas (pandas), y filtros Jinja para los
+templates:
+
+    {{ valor_total|moneda }}       -> $56.909.324
+    {{ cantidad|cantidad }}        -> 1.234
+    {{ porcentaje|porcentaje }}    -> 98,75%
+    {{ valor_total|letras }}       -> CINCUENTA Y SEIS MILLONES ... PESOS M/CTE
 """
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import jinja2
+import pandas as pd
 from num2words import num2words
-from typing import Union
 
+# Python usa coma como separador de miles y punto decimal; Colombia al revés
+_SEPARADORES_CO = str.maketrans(",.", ".,")
+
+Numero = Union[int, float]
+
+
+@lru_cache(maxsize=4096)
+def _entero_a_letras(numero: int) -> str:
+    """Texto en mayúsculas de un entero (memoizado: los totales se repiten entre tablas)"""
+    return num2words(numero, lang='es').upper()
 
-def numero_a_letras(numero: Union[int, float], incluir_moneda: bool = True) -> str:
+
+def numero_a_letras(numero: Numero, incluir_moneda: bool = True) -> str:
     """
     Convierte un número a su representación en letras en español
-    
+
     Args:
         numero: Valor numérico
-        incluir_moneda: Si True, agrega "PESOS M/CTE"
-    
+        incluir_moneda: Si True, agrega "PESOS M/CTE" (y los centavos si los hay)
+
     Returns:
         Texto en mayúsculas
         Ejemplo: "CINCUENTA Y SEIS MILLONES NOVECIENTOS NUEVE MIL PESOS M/CTE"
     """
     try:
         parte_entera = int(numero)
-        texto = num2words(parte_entera, lang='es')
-        texto = texto.upper()
-        
-        # Limpiar texto
-        texto = texto.replace(" Y ", " Y ")
-        
-        if incluir_moneda:
+        parte_decimal = int(round((numero - parte_entera) * 100))
+        texto = _entero_a_letras(parte_entera)
+    except Exception:
+        return formato_cantidad(numero)
+
+    if incluir_moneda:
+        if parte_decimal > 0:
+            texto += f" PESOS CON {parte_decimal}/100 M/CTE"
+        else:
             texto += " PESOS M/CTE"
-        
-        return texto
-    except Exception as e:
-        return f"{numero:,.0f}".replace(",", ".")
 
+    return texto
 
-def formato_moneda_cop(numero: Union[int, float]) -> str:
+
+def formato_moneda_cop(numero: Numero) -> str:
     """
     Formatea número como moneda colombiana
-    
+
     Args:
         numero: Valor numérico
-    
+
     Returns:
         String formateado: "$56.909.324"
     """
-    # Formatear con separadores de miles
-    # Python usa coma como separador, Colombia usa punto
-    texto = f"{numero:,.0f}"
-    # Reemplazar: coma -> temporal, punto -> coma, temporal -> punto
-    texto = texto.replace(",", "X").replace(".", ",").replace("X", ".")
-    return f"${texto}"
+    return f"${formato_cantidad(numero)}"
 
 
-def formato_cantidad(numero: Union[int, float], decimales: int = 0) -> str:
+def formato_cantidad(numero: Numero, decimales: int = 0) -> str:
     """
     Formatea cantidad con separadores de miles
-    
+
     Args:
         numero: Valor numérico
         decimales: Cantidad de decimales
-    
+
     Returns:
         String formateado: "1.234" o "1.234,56"
     """
-    if decimales > 0:
-        formato = f"{{:,.{decimales}f}}"
-        texto = formato.format(numero)
-    else:
-        texto = f"{numero:,.0f}"
-    
-    return texto.replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{numero:,.{decimales}f}".translate(_SEPARADORES_CO)
+
+
+def formato_porcentaje(numero: Numero, decimales: int = 2) -> str:
+    """
+    Formatea un porcentaje (ya multiplicado por 100)
+
+    Args:
+        numero: Valor numérico (ej: 98.75)
+        decimales: Cantidad de decimales
+
+    Returns:
+        String formateado: "98,75%"
+    """
+    return f"{formato_cantidad(numero, decimales)}%"
+
+
+def _formatear_serie(valores: Iterable[Any], formatear: Callable[[Numero], str]) -> pd.Series:
+    """Formatea cada valor distinto una sola vez; los vacíos o no numéricos quedan como "" """
+    numeros = pd.to_numeric(pd.Series(valores), errors="coerce")
+    unicos = numeros.dropna().unique()
+    return numeros.map(dict(zip(unicos, map(formatear, unicos)))).fillna("")
+
+
+def formato_moneda_serie(valores: Iterable[Any]) -> pd.Series:
+    """
+    Formatea una columna completa como moneda colombiana
+
+    Args:
+        valores: Serie o iterable de valores numéricos
+
+    Returns:
+        Serie de textos ("$1.250.000"), con el índice de la serie original
+    """
+    return _formatear_serie(valores, formato_moneda_cop)
+
+
+def formato_cantidad_serie(valores: Iterable[Any], decimales: int = 0) -> pd.Series:
+    """
+    Formatea una columna completa con separadores de miles
+
+    Args:
+        valores: Serie o iterable de valores numéricos
+        decimales: Cantidad de decimales
+
+    Returns:
+        Serie de textos ("1.234")
+    """
+    return _formatear_serie(valores, lambda numero: formato_cantidad(numero, decimales))
+
+
+def formato_porcentaje_serie(valores: Iterable[Any], decimales: int = 2) -> pd.Series:
+    """
+    Formatea una columna completa de porcentajes
+
+    Args:
+        valores: Serie o iterable de porcentajes (ya multiplicados por 100)
+        decimales: Cantidad de decimales
+
+    Returns:
+        Serie de textos ("98,75%")
+    """
+    return _formatear_serie(valores, lambda numero: formato_porcentaje(numero, decimales))
+
+
+def formatear_columnas_moneda(registros: List[Dict[str, Any]], columnas: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Agrega a cada registro el texto en moneda de las columnas indicadas
+
+    Args:
+        registros: Filas de una tabla (se modifican en el lugar)
+        columnas: Columna numérica -> columna de texto (ej: {"valor_total": "valor_total_formato"})
+
+    Returns:
+        Los mismos registros
+    """
+    if not registros:
+        return registros
+
+    for columna, destino in columnas.items():
+        textos = formato_moneda_serie([registro.get(columna, 0) for registro in registros])
+        for registro, texto in zip(registros, textos):
+            registro[destino] = texto
+    return registros
+
+
+def _filtro(formatear: Callable[..., str]) -> Callable[..., str]:
+    """Filtro Jinja que deja vacíos los valores ausentes"""
+    def filtro(valor: Any, *args: Any) -> str:
+        if valor is None or valor == "" or isinstance(valor, jinja2.Undefined):
+            return ""
+        return formatear(valor, *args)
+    return filtro
+
+
+FILTROS_JINJA: Dict[str, Callable[..., str]] = {
+    "moneda": _filtro(formato_moneda_cop),
+    "cantidad": _filtro(formato_cantidad),
+    "porcentaje": _filtro(formato_porcentaje),
+    "letras": _filtro(numero_a_letras),
+}
+
+_entorno_jinja: Optional[jinja2.Environment] = None
+
 
+def get_entorno_jinja() -> jinja2.Environment:
+    """Entorno Jinja con los filtros de formato (para DocxTemplate.render)"""
+    global _entorno_jinja
+    if _entorno_jinja is None:
+        _entorno_jinja = jinja2.Environment()
+        _entorno_jinja.filters.update(FILTROS_JINJA)
+    return _entorno_jinja
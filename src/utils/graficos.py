@@ -0,0 +1,326 @@
+"""
+Servicio de gráficos del informe con caché de imágenes PNG
+
+Los gráficos se identifican por tipo + datos graficados + estilo. La imagen se
+guarda en config.CACHE_DIR / "graficos" con el hash de esos valores en el
+nombre, de modo que solo se vuelve a renderizar cuando cambian los datos.
+Cada acierto renueva la fecha de modificación de la imagen y, al guardar una
+nueva, se podan las de uso más antiguo por edad y por tamaño total
+(config.GRAFICOS_CACHE_MAX_DIAS, config.GRAFICOS_CACHE_MAX_MB).
+
+matplotlib se importa únicamente dentro de las funciones de renderizado, que
+se ejecutan en un proceso worker; importar este módulo no carga matplotlib.
+
+Uso:
+    ruta = generar_grafico("barras", {"etiquetas": [...], "valores": [...]},
+                           estilo={"titulo": "Tickets por estado"})
+"""
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import config
+from src.utils.escritura_segura import escribir_atomico
+
+# Cambiar al modificar cualquier función de renderizado para invalidar la caché
+VERSION_GRAFICOS = 1
+
+CACHE_GRAFICOS_DIR = config.CACHE_DIR / "graficos"
+
+MATPLOTLIB_DISPONIBLE = importlib.util.find_spec("matplotlib") is not None
+
+# Registro tipo de gráfico -> función de renderizado
+_RENDERIZADORES: Dict[str, Callable[[Dict[str, Any], Dict[str, Any], str], None]] = {}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def registrar_grafico(tipo: str):
+    """
+    Decorador para registrar una función de renderizado
+
+    La función recibe (datos, estilo, ruta_png) y debe guardar la imagen en
+    ruta_png. Debe estar definida a nivel de módulo para poder ejecutarse en
+    el proceso worker.
+    """
+    def decorador(funcion):
+        _RENDERIZADORES[tipo] = funcion
+        return funcion
+    return decorador
+
+
+def _pyplot():
+    """Importa matplotlib con backend sin GUI (solo en el proceso que renderiza)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def clave_grafico(tipo: str, datos: Dict[str, Any], estilo: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Calcula la clave de caché de un gráfico
+
+    Args:
+        tipo: Tipo de gráfico registrado
+        datos: Datos graficados
+        estilo: Opciones de estilo (títulos, colores, tamaño)
+
+    Returns:
+        Hash SHA-256 (hex) del tipo, datos, estilo y versión de los renderizadores
+    """
+    contenido = json.dumps(
+        {"tipo": tipo, "datos": datos, "estilo": estilo or {}, "version": VERSION_GRAFICOS},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def _renderizar(tipo: str, datos: Dict[str, Any], estilo: Dict[str, Any], ruta_png: str) -> str:
+    """Renderiza el gráfico (se ejecuta en el proceso worker)"""
+    _RENDERIZADORES[tipo](datos, estilo, ruta_png)
+    return ruta_png
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Crea el proceso worker de renderizado en el primer uso"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=1)
+        return _executor
+
+
+def generar_grafico(tipo: str, datos: Dict[str, Any], estilo: Optional[Dict[str, Any]] = None,
+                    destino: Optional[Path] = None) -> str:
+    """
+    Retorna la ruta PNG del gráfico, renderizándolo solo si no está en caché
+
+    Args:
+        tipo: Tipo de gráfico registrado ("heatmap_riesgos", "barras", "lineas")
+        datos: Datos graficados (deben ser serializables a JSON)
+        estilo: Opciones de estilo del gráfico
+        destino: Si se indica, se copia la imagen a esta ruta y se retorna esa ruta
+
+    Returns:
+        Ruta al PNG o cadena vacía si no se pudo generar
+    """
+    if not MATPLOTLIB_DISPONIBLE:
+        print("[WARNING] matplotlib no está disponible. El gráfico no se generará.")
+        return ""
+    if tipo not in _RENDERIZADORES:
+        raise ValueError(f"Tipo de gráfico no registrado: {tipo}")
+
+    estilo = estilo or {}
+    clave = clave_grafico(tipo, datos, estilo)
+    ruta_cache = CACHE_GRAFICOS_DIR / f"{tipo}_{clave[:20]}.png"
+
+    try:
+        # La poda ordena por mtime: un acierto cuenta como último uso
+        os.utime(ruta_cache)
+        en_cache = True
+    except FileNotFoundError:  # No generada aún, o podada por otro proceso
+        en_cache = False
+
+    if not en_cache:
+        def renderizar(ruta_tmp: Path) -> None:
+            if multiprocessing.parent_process() is not None:
+                # Ya estamos en un proceso worker (ej: generación desde la API):
+                # no se anida otro pool de procesos
+                _renderizar(tipo, datos, estilo, str(ruta_tmp))
+                return
+            try:
+                _get_executor().submit(_renderizar, tipo, datos, estilo, str(ruta_tmp)).result()
+            except (OSError, RuntimeError) as e:
+                # Sin soporte de procesos (o pool caído): renderizar en el proceso actual
+                print(f"[WARNING] No se pudo renderizar en proceso worker ({e}), renderizando localmente")
+                _renderizar(tipo, datos, estilo, str(ruta_tmp))
+
+        try:
+            escribir_atomico(ruta_cache, renderizar)
+        except Exception as e:
+            print(f"[WARNING] Error al generar gráfico {tipo}: {e}")
+            return ""
+        # Cada imagen nueva puede desplazar a las más antiguas
+        podar_cache(conservar=ruta_cache)
+
+    if destino is not None:
+        escribir_atomico(destino, lambda ruta: shutil.copyfile(ruta_cache, ruta))
+        return str(destino)
+
+    return str(ruta_cache)
+
+
+def podar_cache(max_dias: Optional[float] = None, max_mb: Optional[float] = None,
+                conservar: Optional[Path] = None) -> int:
+    """
+    Elimina de la caché los PNG sin usar hace más de max_dias y, si la caché
+    sigue superando max_mb, los de uso más antiguo hasta quedar por debajo
+
+    generar_grafico actualiza el mtime en cada acierto, así que el orden es
+    por último uso y no por fecha de creación.
+
+    Args:
+        max_dias: Edad máxima en días (default: config.GRAFICOS_CACHE_MAX_DIAS)
+        max_mb: Tamaño máximo de la caché en MB (default: config.GRAFICOS_CACHE_MAX_MB)
+        conservar: Imagen que no se elimina (la que se acaba de generar)
+
+    Returns:
+        Número de imágenes eliminadas
+    """
+    max_dias = config.GRAFICOS_CACHE_MAX_DIAS if max_dias is None else max_dias
+    max_bytes = (config.GRAFICOS_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+    if not CACHE_GRAFICOS_DIR.exists():
+        return 0
+
+    imagenes: List[Tuple[float, int, Path]] = []
+    for ruta in CACHE_GRAFICOS_DIR.glob("*.png"):
+        try:
+            estado = ruta.stat()
+        except FileNotFoundError:  # Podada por otro proceso
+            continue
+        imagenes.append((estado.st_mtime, estado.st_size, ruta))
+    imagenes.sort(key=lambda imagen: imagen[0])
+
+    limite_edad = time.time() - max_dias * 86400
+    total = sum(tamano for _, tamano, _ in imagenes)
+    eliminadas = 0
+    for mtime, tamano, ruta in imagenes:
+        if mtime >= limite_edad and total <= max_bytes:
+            break
+        if ruta == conservar:
+            continue
+        ruta.unlink(missing_ok=True)
+        total -= tamano
+        eliminadas += 1
+    return eliminadas
+
+
+def cerrar() -> None:
+    """Cierra el proceso worker de renderizado"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# ---------------------------------------------------------------------------
+# Renderizadores
+# ---------------------------------------------------------------------------
+
+@registrar_grafico("heatmap_riesgos")
+def _heatmap_riesgos(datos: Dict[str, Any], estilo: Dict[str, Any], ruta_png: str) -> None:
+    """
+    Heatmap 5x5 de la matriz de riesgos (Sección 9)
+
+    datos: {"matriz": [[...5 valores...] x 5]} con impacto en filas y probabilidad en columnas
+    """
+    import numpy as np
+    import matplotlib.patches as mpatches
+    plt = _pyplot()
+
+    matriz = np.array(datos["matriz"], dtype=float)
+
+    # Crear figura
+    fig, ax = plt.subplots(figsize=tuple(estilo.get("tamano", (10, 8))))
+
+    # Crear heatmap
+    im = ax.imshow(matriz, cmap=estilo.get("cmap", 'YlOrRd'), aspect='auto', vmin=0, vmax=max(1, matriz.max()))
+
+    # Etiquetas
+    ax.set_xticks(range(5))
+    ax.set_yticks(range(5))
+    ax.set_xticklabels([str(i+1) for i in range(5)])
+    ax.set_yticklabels([str(i+1) for i in range(5)])
+    ax.set_xlabel('Probabilidad (1-5)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Impacto (1-5)', fontsize=12, fontweight='bold')
+    ax.set_title(estilo.get("titulo", 'Matriz de Riesgos - Probabilidad vs Impacto'), fontsize=14, fontweight='bold')
+
+    # Agregar valores en las celdas
+    for i in range(5):
+        for j in range(5):
+            if matriz[i, j] > 0:
+                ax.text(j, i, int(matriz[i, j]), ha="center", va="center", color="black", fontweight='bold')
+
+    # Agregar barra de color
+    plt.colorbar(im, ax=ax, label='Cantidad de Riesgos')
+
+    # Líneas de clasificación: Bajo/Medio (nivel 4) y Medio/Alto (nivel 8)
+    ax.plot([-0.5, 4.5], [3.5, 3.5], 'b--', alpha=0.3, linewidth=1)
+    ax.plot([3.5, 3.5], [-0.5, 4.5], 'b--', alpha=0.3, linewidth=1)
+    ax.plot([-0.5, 4.5], [1.5, 1.5], 'orange', linestyle='--', alpha=0.3, linewidth=1)
+    ax.plot([1.5, 1.5], [-0.5, 4.5], 'orange', linestyle='--', alpha=0.3, linewidth=1)
+
+    # Leyenda de clasificación
+    legend_elements = [
+        mpatches.Patch(color='lightblue', label='Bajo (1-4)'),
+        mpatches.Patch(color='yellow', label='Medio (5-8)'),
+        mpatches.Patch(color='orange', label='Alto (9-12)'),
+        mpatches.Patch(color='red', label='Crítico (13-25)')
+    ]
+    ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.15, 1))
+
+    plt.tight_layout()
+    fig.savefig(ruta_png, dpi=estilo.get("dpi", 150), bbox_inches='tight', format='png')
+    plt.close(fig)
+
+
+@registrar_grafico("barras")
+def _barras(datos: Dict[str, Any], estilo: Dict[str, Any], ruta_png: str) -> None:
+    """
+    Gráfico de barras (ej: distribución de tickets por estado o subsistema)
+
+    datos: {"etiquetas": [...], "valores": [...]}
+    """
+    plt = _pyplot()
+
+    fig, ax = plt.subplots(figsize=tuple(estilo.get("tamano", (10, 6))))
+    barras = ax.bar(datos["etiquetas"], datos["valores"], color=estilo.get("color", "#1F4E79"))
+    if estilo.get("mostrar_valores", True):
+        ax.bar_label(barras, fmt=estilo.get("formato_valor", "%g"))
+    ax.set_title(estilo.get("titulo", ""), fontsize=14, fontweight='bold')
+    ax.set_xlabel(estilo.get("eje_x", ""))
+    ax.set_ylabel(estilo.get("eje_y", ""))
+    if estilo.get("rotar_etiquetas"):
+        plt.setp(ax.get_xticklabels(), rotation=estilo["rotar_etiquetas"], ha='right')
+
+    plt.tight_layout()
+    fig.savefig(ruta_png, dpi=estilo.get("dpi", 150), bbox_inches='tight', format='png')
+    plt.close(fig)
+
+
+@registrar_grafico("lineas")
+def _lineas(datos: Dict[str, Any], estilo: Dict[str, Any], ruta_png: str) -> None:
+    """
+    Gráfico de líneas (ej: tendencia mensual de disponibilidad ANS)
+
+    datos: {"etiquetas": [...], "series": {"nombre": [...valores...]}, "umbral": 98.9 (opcional)}
+    """
+    plt = _pyplot()
+
+    fig, ax = plt.subplots(figsize=tuple(estilo.get("tamano", (10, 5))))
+    for nombre, valores in datos["series"].items():
+        ax.plot(datos["etiquetas"], valores, marker='o', label=nombre)
+    if datos.get("umbral") is not None:
+        ax.axhline(datos["umbral"], color='red', linestyle='--', linewidth=1,
+                   label=estilo.get("etiqueta_umbral", f"Umbral {datos['umbral']}"))
+    ax.set_title(estilo.get("titulo", ""), fontsize=14, fontweight='bold')
+    ax.set_xlabel(estilo.get("eje_x", ""))
+    ax.set_ylabel(estilo.get("eje_y", ""))
+    ax.grid(alpha=0.3)
+    ax.legend()
+    if estilo.get("rotar_etiquetas"):
+        plt.setp(ax.get_xticklabels(), rotation=estilo["rotar_etiquetas"], ha='right')
+
+    plt.tight_layout()
+    fig.savefig(ruta_png, dpi=estilo.get("dpi", 150), bbox_inches='tight', format='png')
+    plt.close(fig)
@@ -4,7 +4,9 @@ Utilidades para trabajar con informes aprobados
 from pathlib import Path
 from typing import List, Optional
 import config
+import logging
 import re
+import time
 
 try:
     import PyPDF2
@@ -18,6 +20,8 @@ try:
 except ImportError:
     DOCX_DISPONIBLE = False
 
+logger = logging.getLogger(__name__)
+
 
 def obtener_ultimos_informes_aprobados(cantidad: int = 3) -> List[Path]:
     """
@@ -30,7 +34,7 @@ def obtener_ultimos_informes_aprobados(cantidad: int = 3) -> List[Path]:
         Lista de Paths a los archivos de informes aprobados
     """
     if not config.INFORMES_APROBADOS_DIR.exists():
-        print(f"[WARNING] Directorio de informes aprobados no existe: {config.INFORMES_APROBADOS_DIR}")
+        logger.warning("Directorio de informes aprobados no existe: %s", config.INFORMES_APROBADOS_DIR)
         return []
     
     # Obtener todos los archivos PDF y DOCX
@@ -39,7 +43,7 @@ def obtener_ultimos_informes_aprobados(cantidad: int = 3) -> List[Path]:
         archivos.extend(config.INFORMES_APROBADOS_DIR.glob(ext))
     
     if not archivos:
-        print(f"[WARNING] No se encontraron informes aprobados en {config.INFORMES_APROBADOS_DIR}")
+        logger.warning("No se encontraron informes aprobados en %s", config.INFORMES_APROBADOS_DIR)
         return []
     
     # Ordenar por fecha de modificación (más reciente primero)
@@ -64,6 +68,7 @@ def extraer_seccion_obligaciones_generales(ruta_informe: Path) -> Optional[str]:
     
     extension = ruta_informe.suffix.lower()
     texto_completo = ""
+    inicio = time.perf_counter()
     
     try:
         if extension == '.pdf' and PDF_DISPONIBLE:
@@ -76,7 +81,7 @@ def extraer_seccion_obligaciones_generales(ruta_informe: Path) -> Optional[str]:
             for para in doc.paragraphs:
                 texto_completo += para.text + "\n"
         else:
-            print(f"[WARNING] Formato no soportado para extracción: {extension}")
+            logger.warning("Formato no soportado para extracción: %s", extension)
             return None
         
         # Buscar la sección 1.5.1 OBLIGACIONES GENERALES
@@ -99,7 +104,7 @@ def extraer_seccion_obligaciones_generales(ruta_informe: Path) -> Optional[str]:
                 break
         
         if inicio_seccion is None:
-            print(f"[WARNING] No se encontró la sección 1.5.1 en {ruta_informe.name}")
+            logger.warning("No se encontró la sección 1.5.1 en %s", ruta_informe.name)
             return None
         
         # Extraer desde el inicio de la sección hasta la siguiente sección (1.5.2 o 1.6)
@@ -122,14 +127,15 @@ def extraer_seccion_obligaciones_generales(ruta_informe: Path) -> Optional[str]:
         seccion_texto = texto_desde_seccion[:fin_seccion].strip()
         
         if len(seccion_texto) < 100:
-            print(f"[WARNING] Sección 1.5.1 extraída es muy corta ({len(seccion_texto)} caracteres) en {ruta_informe.name}")
+            logger.warning("Sección 1.5.1 extraída es muy corta (%s caracteres) en %s", len(seccion_texto), ruta_informe.name)
             return None
         
-        print(f"[INFO] Sección 1.5.1 extraída de {ruta_informe.name}: {len(seccion_texto)} caracteres")
+        logger.info("Sección 1.5.1 extraída de %s: %s caracteres", ruta_informe.name, len(seccion_texto),
+                    extra={"archivo": ruta_informe.name, "duracion_s": time.perf_counter() - inicio})
         return seccion_texto
         
     except Exception as e:
-        print(f"[WARNING] Error al extraer sección de {ruta_informe.name}: {e}")
+        logger.warning("Error al extraer sección de %s: %s", ruta_informe.name, e)
         return None
 
 
@@ -151,6 +157,6 @@ def obtener_contexto_informes_aprobados(cantidad: int = 3) -> List[str]:
         if texto_seccion:
             contextos.append(texto_seccion)
     
-    print(f"[INFO] Se obtuvieron {len(contextos)} contextos de informes aprobados")
+    logger.info("Se obtuvieron %s contextos de informes aprobados", len(contextos))
     return contextos
 
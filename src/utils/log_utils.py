@@ -0,0 +1,185 @@
+"""
+Logging asíncrono con campos estructurados
+
+Los módulos usan logging estándar:
+
+    logger = logging.getLogger(__name__)
+    logger.info("Archivo descargado: %s", ruta, extra={"duracion_s": 0.42})
+    logger.debug("Texto extraído: %s", texto[:200])
+
+configurar_logging() instala en el logger raíz un QueueHandler: quien llama
+solo encola el registro y un QueueListener (hilo aparte) lo formatea y lo
+escribe, de modo que las rutas calientes (una línea por obligación, tabla o
+llamada HTTP) no se bloquean en stdout. Los mensajes DEBUG deshabilitados no
+se formatean: logging descarta el registro antes de interpolar los argumentos.
+
+Los campos estructurados (seccion, item, duracion_s...) se pasan con
+extra={...} o se fijan para un bloque con campos_log(seccion=..., item=...).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+# Campos estructurados reconocidos, en el orden en que se muestran
+CAMPOS_ESTRUCTURADOS = ("seccion", "item", "operacion", "duracion_s", "archivo", "url", "status")
+
+FORMATO_TEXTO = "[%(levelname)s] %(message)s"
+FORMATO_API = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_campos_contexto: ContextVar[Dict[str, Any]] = ContextVar("campos_log", default={})
+
+
+class FiltroCamposContexto(logging.Filter):
+    """Agrega al registro los campos fijados con campos_log() (sin pisar extra=)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for campo, valor in _campos_contexto.get().items():
+            if not hasattr(record, campo):
+                setattr(record, campo, valor)
+        return True
+
+
+class FormateadorEstructurado(logging.Formatter):
+    """Formato de texto con los campos estructurados al final: ... | seccion=1 item=7"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        texto = super().format(record)
+        campos = _campos_registro(record)
+        if not campos:
+            return texto
+        return f"{texto} | " + " ".join(f"{k}={v}" for k, v in campos.items())
+
+
+class FormateadorJSON(logging.Formatter):
+    """Una línea JSON por registro (LOG_FORMATO=json)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "fecha": self.formatTime(record),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+            **_campos_registro(record),
+        }
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def _campos_registro(record: logging.LogRecord) -> Dict[str, Any]:
+    campos = {}
+    for campo in CAMPOS_ESTRUCTURADOS:
+        valor = getattr(record, campo, None)
+        if valor is not None:
+            campos[campo] = round(valor, 4) if isinstance(valor, float) else valor
+    return campos
+
+
+class _ColaLogging:
+    """QueueHandler del logger raíz y su QueueListener"""
+
+    def __init__(self):
+        self.cola: Optional[queue.SimpleQueue] = None
+        self.handler: Optional[logging.handlers.QueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.destino: Optional[logging.Handler] = None
+        self.pid: Optional[int] = None
+
+    def iniciar(self, destino: logging.Handler) -> logging.Handler:
+        self.detener()
+        self.destino = destino
+        self.cola = queue.SimpleQueue()
+        self.handler = logging.handlers.QueueHandler(self.cola)
+        self.handler.addFilter(FiltroCamposContexto())
+        self.listener = logging.handlers.QueueListener(self.cola, destino, respect_handler_level=True)
+        self.listener.start()
+        self.pid = os.getpid()
+        return self.handler
+
+    def detener(self) -> None:
+        """Vacía la cola y detiene el hilo del listener"""
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+        self.listener = None
+
+    def reiniciar_en_hijo(self) -> None:
+        """Tras fork el hilo del listener no existe: se crea uno nuevo con la misma cola"""
+        if self.listener is None or self.pid == os.getpid():
+            return
+        self.listener = logging.handlers.QueueListener(self.cola, self.destino, respect_handler_level=True)
+        self.listener.start()
+        self.pid = os.getpid()
+
+
+_cola = _ColaLogging()
+_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_cola.reiniciar_en_hijo)
+atexit.register(_cola.detener)
+
+
+def configurar_logging(nivel: Optional[str] = None, formato: Optional[str] = None,
+                       asincrono: bool = True, stream=None) -> None:
+    """
+    Configura el logger raíz (reemplaza la configuración anterior)
+
+    Args:
+        nivel: DEBUG, INFO, WARNING... (default: variable LOG_LEVEL o INFO)
+        formato: Formato de texto de logging (default: "[NIVEL] mensaje");
+                 con LOG_FORMATO=json se emite una línea JSON por registro
+        asincrono: Escribir desde un QueueListener en lugar del hilo que registra
+        stream: Destino (default: sys.stdout)
+    """
+    nivel = (nivel or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if os.getenv("LOG_FORMATO", "").lower() == "json":
+        formateador: logging.Formatter = FormateadorJSON()
+    else:
+        formateador = FormateadorEstructurado(formato or FORMATO_TEXTO)
+
+    destino = logging.StreamHandler(stream or sys.stdout)
+    destino.setFormatter(formateador)
+
+    with _lock:
+        raiz = logging.getLogger()
+        for handler in list(raiz.handlers):
+            raiz.removeHandler(handler)
+        _cola.detener()
+        if asincrono:
+            raiz.addHandler(_cola.iniciar(destino))
+        else:
+            destino.addFilter(FiltroCamposContexto())
+            raiz.addHandler(destino)
+        raiz.setLevel(nivel)
+
+
+def detener_logging() -> None:
+    """Escribe los registros pendientes y detiene el listener"""
+    with _lock:
+        _cola.detener()
+        raiz = logging.getLogger()
+        if _cola.handler in raiz.handlers:
+            raiz.removeHandler(_cola.handler)
+
+
+@contextmanager
+def campos_log(**campos: Any) -> Iterator[None]:
+    """
+    Agrega campos estructurados a todos los registros emitidos dentro del bloque
+
+    Args:
+        **campos: Campos (ej: seccion=1, item="7")
+    """
+    token = _campos_contexto.set({**_campos_contexto.get(), **campos})
+    try:
+        yield
+    finally:
+        _campos_contexto.reset(token)
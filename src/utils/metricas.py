@@ -0,0 +1,305 @@
+"""
+Medición de tiempos por etapa (spans) e histogramas en proceso
+
+    with medir("generador", seccion="GeneradorSeccion3", etapa="cargar_datos"):
+        ...
+
+    @medido("sharepoint", operacion="descargar")
+    def descargar_archivo(...): ...
+
+Cada span se acumula en un histograma del proceso (por nombre y etiquetas),
+que se expone en formato Prometheus (formato_prometheus(), endpoint
+/metrics del API). Dentro de reporte_tiempos() los spans además quedan
+registrados en orden, con su anidamiento, para escribir el reporte de
+tiempos de una ejecución junto al informe generado.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import math
+import re
+import threading
+import time
+from src.utils.escritura_segura import escribir_texto_atomico
+
+# Límites superiores (segundos) de los buckets del histograma
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Prefijo de las métricas exportadas: informes_<nombre>_segundos
+PREFIJO = "informes"
+
+_Clave = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Histograma:
+    """Conteo acumulado de duraciones por bucket"""
+
+    __slots__ = ("cuentas", "suma", "total", "errores")
+
+    def __init__(self, num_buckets: int = len(BUCKETS)):
+        self.cuentas = [0] * num_buckets
+        self.suma = 0.0
+        self.total = 0
+        self.errores = 0
+
+    def observar(self, segundos: float, buckets: Tuple[float, ...] = BUCKETS, error: bool = False) -> None:
+        for i, limite in enumerate(buckets):
+            if segundos <= limite:
+                self.cuentas[i] += 1
+                break
+        self.suma += segundos
+        self.total += 1
+        if error:
+            self.errores += 1
+
+
+class RegistroMetricas:
+    """Histogramas de duración del proceso, seguros entre hilos"""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histogramas: Dict[_Clave, Histograma] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clave(nombre: str, etiquetas: Dict[str, Any]) -> _Clave:
+        return nombre, tuple(sorted((k, str(v)) for k, v in etiquetas.items()))
+
+    def observar(self, nombre: str, segundos: float, etiquetas: Optional[Dict[str, Any]] = None,
+                 error: bool = False) -> None:
+        """
+        Registra una duración
+
+        Args:
+            nombre: Nombre del span (ej: "generador")
+            segundos: Duración medida
+            etiquetas: Etiquetas del span (ej: {"etapa": "render"})
+            error: Si la operación terminó con excepción
+        """
+        clave = self._clave(nombre, etiquetas or {})
+        with self._lock:
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                histograma = self._histogramas[clave] = Histograma(len(self.buckets))
+            histograma.observar(segundos, self.buckets, error)
+
+    def exportar(self) -> List[Dict[str, Any]]:
+        """Estado serializable (JSON/pickle) de todos los histogramas"""
+        with self._lock:
+            return [
+                {"nombre": nombre, "etiquetas": dict(etiquetas), "cuentas": list(h.cuentas),
+                 "suma": h.suma, "total": h.total, "errores": h.errores}
+                for (nombre, etiquetas), h in self._histogramas.items()
+            ]
+
+    def fusionar(self, exportado: List[Dict[str, Any]]) -> None:
+        """
+        Suma histogramas exportados por otro proceso (ej: el worker que genera el informe)
+
+        Args:
+            exportado: Resultado de exportar() con los mismos buckets
+        """
+        with self._lock:
+            for registro in exportado:
+                if len(registro["cuentas"]) != len(self.buckets):
+                    continue
+                clave = self._clave(registro["nombre"], registro["etiquetas"])
+                histograma = self._histogramas.get(clave)
+                if histograma is None:
+                    histograma = self._histogramas[clave] = Histograma(len(self.buckets))
+                histograma.cuentas = [a + b for a, b in zip(histograma.cuentas, registro["cuentas"])]
+                histograma.suma += registro["suma"]
+                histograma.total += registro["total"]
+                histograma.errores += registro.get("errores", 0)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._histogramas.clear()
+
+    def formato_prometheus(self) -> str:
+        """
+        Histogramas en formato de exposición de texto de Prometheus
+
+        Returns:
+            informes_<nombre>_segundos (histogram) e informes_<nombre>_errores_total (counter)
+        """
+        with self._lock:
+            elementos = sorted(
+                ((nombre, etiquetas, list(h.cuentas), h.suma, h.total, h.errores)
+                 for (nombre, etiquetas), h in self._histogramas.items()),
+                key=lambda e: (e[0], e[1])
+            )
+
+        lineas: List[str] = []
+        familias = []
+        for nombre, *_ in elementos:
+            if nombre not in familias:
+                familias.append(nombre)
+        for familia in familias:
+            metrica = f"{PREFIJO}_{_nombre_metrica(familia)}"
+            lineas.append(f"# HELP {metrica}_segundos Duración de {familia} en segundos")
+            lineas.append(f"# TYPE {metrica}_segundos histogram")
+            for nombre, etiquetas, cuentas, suma, total, _ in elementos:
+                if nombre != familia:
+                    continue
+                acumulado = 0
+                for limite, cuenta in zip(self.buckets, cuentas):
+                    acumulado += cuenta
+                    lineas.append(f"{metrica}_segundos_bucket{_etiquetas(etiquetas, le=_numero(limite))} {acumulado}")
+                lineas.append(f'{metrica}_segundos_bucket{_etiquetas(etiquetas, le="+Inf")} {total}')
+                lineas.append(f"{metrica}_segundos_sum{_etiquetas(etiquetas)} {_numero(suma)}")
+                lineas.append(f"{metrica}_segundos_count{_etiquetas(etiquetas)} {total}")
+            lineas.append(f"# HELP {metrica}_errores_total Ejecuciones de {familia} que terminaron con error")
+            lineas.append(f"# TYPE {metrica}_errores_total counter")
+            for nombre, etiquetas, _, _, _, errores in elementos:
+                if nombre == familia:
+                    lineas.append(f"{metrica}_errores_total{_etiquetas(etiquetas)} {errores}")
+        return "\n".join(lineas) + "\n" if lineas else ""
+
+
+def _nombre_metrica(nombre: str) -> str:
+    """Nombre válido para Prometheus ([a-zA-Z_][a-zA-Z0-9_]*)"""
+    limpio = re.sub(r"[^a-zA-Z0-9_]", "_", nombre)
+    return limpio if not limpio[:1].isdigit() else f"_{limpio}"
+
+
+def _numero(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf"
+    return repr(float(valor))
+
+
+def _etiquetas(etiquetas: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+    pares = list(etiquetas) + list(extra.items())
+    if not pares:
+        return ""
+    escapar = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{_nombre_metrica(k)}="{escapar(v)}"' for k, v in pares) + "}"
+
+
+class ReporteTiempos:
+    """Spans de una ejecución, en orden de finalización y con su profundidad"""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.fecha = datetime.now().isoformat(timespec="seconds")
+        self.inicio = time.perf_counter()
+        self.duracion: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def agregar(self, nombre: str, etiquetas: Dict[str, Any], inicio: float, duracion: float,
+                profundidad: int, error: Optional[str]) -> None:
+        with self._lock:
+            self.spans.append({
+                "nombre": nombre,
+                "etiquetas": {k: str(v) for k, v in etiquetas.items()},
+                "inicio_s": round(inicio - self.inicio, 4),
+                "duracion_s": round(duracion, 4),
+                "profundidad": profundidad,
+                "error": error,
+            })
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        """Totales por span (nombre + etiquetas), del más costoso al menos costoso"""
+        totales: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for span in self.spans:
+            clave = (span["nombre"], json.dumps(span["etiquetas"], sort_keys=True))
+            total = totales.setdefault(clave, {"nombre": span["nombre"], "etiquetas": span["etiquetas"],
+                                               "veces": 0, "duracion_s": 0.0})
+            total["veces"] += 1
+            total["duracion_s"] += span["duracion_s"]
+        for total in totales.values():
+            total["duracion_s"] = round(total["duracion_s"], 4)
+        return sorted(totales.values(), key=lambda t: t["duracion_s"], reverse=True)
+
+    def a_dict(self) -> Dict[str, Any]:
+        duracion = self.duracion if self.duracion is not None else time.perf_counter() - self.inicio
+        return {
+            "nombre": self.nombre,
+            "fecha": self.fecha,
+            "duracion_s": round(duracion, 4),
+            "resumen": self.resumen(),
+            "spans": sorted(self.spans, key=lambda s: (s["inicio_s"], s["profundidad"])),
+        }
+
+    def guardar(self, ruta: Path) -> Path:
+        """Escribe el reporte como JSON"""
+        return escribir_texto_atomico(ruta, json.dumps(self.a_dict(), ensure_ascii=False, indent=2))
+
+
+_reporte_actual: ContextVar[Optional[ReporteTiempos]] = ContextVar("reporte_tiempos", default=None)
+_profundidad: ContextVar[int] = ContextVar("profundidad_span", default=0)
+
+
+@contextmanager
+def medir(nombre: str, **etiquetas: Any) -> Iterator[None]:
+    """
+    Mide la duración del bloque y la registra en el histograma del proceso
+
+    Args:
+        nombre: Nombre del span (familia de la métrica)
+        **etiquetas: Etiquetas (ej: seccion="GeneradorSeccion3", etapa="render")
+    """
+    profundidad = _profundidad.get()
+    token = _profundidad.set(profundidad + 1)
+    inicio = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duracion = time.perf_counter() - inicio
+        _profundidad.reset(token)
+        get_registro_metricas().observar(nombre, duracion, etiquetas, error is not None)
+        reporte = _reporte_actual.get()
+        if reporte is not None:
+            reporte.agregar(nombre, etiquetas, inicio, duracion, profundidad, error)
+
+
+def medido(nombre: str, **etiquetas: Any):
+    """Decorador equivalente a envolver la función en medir(nombre, **etiquetas)"""
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(nombre, **etiquetas):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+@contextmanager
+def reporte_tiempos(nombre: str) -> Iterator[ReporteTiempos]:
+    """
+    Registra en un ReporteTiempos los spans que se ejecuten dentro del bloque
+
+    Args:
+        nombre: Nombre de la ejecución (ej: "informe_2025_09_v1")
+
+    Yields:
+        ReporteTiempos (guardar() al terminar para escribirlo)
+    """
+    reporte = ReporteTiempos(nombre)
+    token = _reporte_actual.set(reporte)
+    try:
+        yield reporte
+    finally:
+        reporte.duracion = time.perf_counter() - reporte.inicio
+        _reporte_actual.reset(token)
+
+
+# Singleton
+_registro_metricas = None
+
+def get_registro_metricas() -> RegistroMetricas:
+    """Obtiene el registro de métricas del proceso"""
+    global _registro_metricas
+    if _registro_metricas is None:
+        _registro_metricas = RegistroMetricas()
+    return _registro_metricas
@@ -0,0 +1,87 @@
+"""
+Motor vectorizado de penalidades por incumplimiento del ANS
+
+Evalúa la penalidad sobre arreglos de disponibilidad y valor mensual (con
+broadcasting de NumPy) en lugar de un escenario a la vez:
+
+- "lineal": PENALIDAD_CONFIG (ans_config.calcular_penalidad), un porcentaje
+  por cada décima de déficit con tope penalidad_maxima_porcentaje.
+- "escalonada": ESCALA_PENALIDAD, la escala por rangos de déficit que usa
+  la Sección 3.1 del informe.
+
+Los resultados coinciden elemento a elemento con el cálculo escalar.
+"""
+from typing import Any, Dict, Optional
+import numpy as np
+from ans_config import UMBRAL_ANS, PENALIDAD_CONFIG, ESCALA_PENALIDAD
+
+MODO_LINEAL = "lineal"
+MODO_ESCALONADA = "escalonada"
+MODOS = (MODO_LINEAL, MODO_ESCALONADA)
+
+_LIMITES_ESCALA = np.array([limite for limite, _ in ESCALA_PENALIDAD])
+_PORCENTAJES_ESCALA = np.array([porcentaje for _, porcentaje in ESCALA_PENALIDAD])
+
+
+def calcular_penalidades(disponibilidad, valor_mensual=None, umbral: Optional[float] = None,
+                         modo: str = MODO_LINEAL) -> Dict[str, np.ndarray]:
+    """
+    Calcula la penalidad para arreglos de escenarios
+
+    Args:
+        disponibilidad: Disponibilidad (%) escalar o arreglo
+        valor_mensual: Valor mensual del contrato, escalar o arreglo compatible
+            por broadcasting (default: PENALIDAD_CONFIG["valor_mensual_contrato"])
+        umbral: Umbral del ANS (default: UMBRAL_ANS)
+        modo: "lineal" o "escalonada"
+
+    Returns:
+        {"aplica", "deficit", "porcentaje_penalidad", "valor_penalidad"} como
+        arreglos con la forma del broadcasting de las entradas
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de penalidad inválido: {modo}. Opciones: {', '.join(MODOS)}")
+    umbral = UMBRAL_ANS if umbral is None else umbral
+    if valor_mensual is None:
+        valor_mensual = PENALIDAD_CONFIG["valor_mensual_contrato"]
+
+    disponibilidad = np.asarray(disponibilidad, dtype=float)
+    valor_mensual = np.asarray(valor_mensual, dtype=float)
+    aplica = disponibilidad < umbral
+    deficit = np.where(aplica, umbral - disponibilidad, 0.0)
+
+    if modo == MODO_LINEAL:
+        porcentaje = np.minimum(
+            deficit / 0.1 * PENALIDAD_CONFIG["porcentaje_por_decima"],
+            PENALIDAD_CONFIG["penalidad_maxima_porcentaje"]
+        )
+    else:
+        # Primer rango cuyo límite es >= déficit (déficit <= límite)
+        porcentaje = _PORCENTAJES_ESCALA[np.searchsorted(_LIMITES_ESCALA, deficit, side="left")]
+    porcentaje = np.where(aplica, porcentaje, 0.0)
+
+    aplica, valor_mensual = np.broadcast_arrays(aplica, valor_mensual)
+    return {
+        "aplica": aplica,
+        "deficit": np.broadcast_to(deficit, aplica.shape),
+        "porcentaje_penalidad": np.broadcast_to(porcentaje, aplica.shape),
+        "valor_penalidad": valor_mensual * (porcentaje / 100),
+    }
+
+
+def resumir_penalidades(resultado: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Totales de exposición de un conjunto de escenarios
+
+    Returns:
+        {"escenarios", "escenarios_con_penalidad", "valor_total", "valor_maximo",
+         "porcentaje_maximo"}
+    """
+    valores = resultado["valor_penalidad"]
+    return {
+        "escenarios": int(valores.size),
+        "escenarios_con_penalidad": int(np.count_nonzero(resultado["aplica"])),
+        "valor_total": float(valores.sum()),
+        "valor_maximo": float(valores.max()) if valores.size else 0.0,
+        "porcentaje_maximo": float(resultado["porcentaje_penalidad"].max()) if valores.size else 0.0,
+    }
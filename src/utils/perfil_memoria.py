@@ -0,0 +1,340 @@
+"""
+Perfil de memoria por etapa (tracemalloc + RSS)
+
+    with perfil_memoria("informe_2025_09_v1") as perfil:
+        with medir_memoria("seccion", seccion="GeneradorSeccion1"):
+            ...
+    perfil.guardar(ruta)
+
+Fuera de perfil_memoria() las etapas no hacen nada, de modo que
+medir_memoria() y perfilado_memoria() pueden quedar en el código sin costo.
+Dentro del perfil, cada etapa registra la memoria de Python (tracemalloc) al
+inicio, al final y su pico, la memoria residente (RSS) y su pico, y compara
+snapshots de tracemalloc para reportar los sitios que más memoria asignaron.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import json
+import sys
+import sysconfig
+import time
+import tracemalloc
+from src.utils.escritura_segura import escribir_texto_atomico
+
+# Sitios de asignación reportados por etapa
+TOP_SITIOS = 10
+
+# Máximo de snapshots por nombre de etapa: con miles de obligaciones tomar un
+# snapshot por cada una sería más costoso que la generación misma; el resto
+# de etapas con ese nombre registra solo memoria y picos
+MAX_SNAPSHOTS_POR_ETAPA = 20
+
+_MB = 1024 * 1024
+
+# Asignaciones que no pertenecen al código medido
+_FILTROS_SNAPSHOT = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _leer_status_kb(campo: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linea in f:
+                if linea.startswith(campo):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def rss_actual_mb() -> Optional[float]:
+    """Memoria residente actual del proceso (None si no se puede medir)"""
+    kb = _leer_status_kb("VmRSS:")
+    return round(kb / 1024, 1) if kb is not None else None
+
+
+def rss_pico_mb() -> Optional[float]:
+    """Memoria residente máxima del proceso (desde el último reinicio del pico)"""
+    # En Linux, VmHWM es propio del proceso; ru_maxrss se hereda del padre a
+    # través de fork/exec (un subproceso reportaría la memoria de quien lo lanzó)
+    kb = _leer_status_kb("VmHWM:")
+    if kb is not None:
+        return round(kb / 1024, 1)
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes; los demás, KB
+    return round(pico / (_MB if sys.platform == "darwin" else 1024), 1)
+
+
+def reiniciar_pico_rss() -> bool:
+    """
+    Reinicia el pico de RSS del proceso al valor actual (Linux)
+
+    Returns:
+        False si el sistema no lo permite (el pico queda como el del proceso)
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+_STDLIB = Path(sysconfig.get_paths()["stdlib"]).as_posix() + "/"
+
+
+def _sitio(frame: tracemalloc.Frame) -> str:
+    """archivo:línea, relativo al proyecto, a site-packages o a la librería estándar"""
+    ruta = frame.filename.replace("\\", "/")
+    if "site-packages/" in ruta:
+        ruta = ruta.split("site-packages/", 1)[1]
+    elif ruta.startswith(_STDLIB):
+        ruta = ruta[len(_STDLIB):]
+    else:
+        try:
+            ruta = Path(ruta).resolve().relative_to(Path.cwd()).as_posix()
+        except ValueError:
+            pass
+    return f"{ruta}:{frame.lineno}"
+
+
+class PerfilMemoria:
+    """Memoria y sitios de asignación por etapa de una ejecución"""
+
+    def __init__(self, nombre: str, top: int = TOP_SITIOS,
+                 max_snapshots: int = MAX_SNAPSHOTS_POR_ETAPA):
+        self.nombre = nombre
+        self.top = top
+        self.max_snapshots = max_snapshots
+        self.fecha = datetime.now().isoformat(timespec="seconds")
+        self.etapas: List[Dict[str, Any]] = []
+        self.rss_por_etapa = True
+        self._pila: List[Dict[str, Any]] = []
+        self._snapshots: Dict[str, int] = {}
+
+    def _propagar_picos(self, pico: float, rss_pico: Optional[float]) -> None:
+        """Conserva en las etapas abiertas los picos que se van a reiniciar"""
+        for abierta in self._pila:
+            abierta["pico"] = max(abierta["pico"], pico)
+            if rss_pico is not None:
+                abierta["rss_pico"] = max(abierta["rss_pico"] or 0.0, rss_pico)
+
+    @contextmanager
+    def etapa(self, nombre: str, detalle: Optional[str] = None, **etiquetas: Any) -> Iterator[None]:
+        """
+        Mide la memoria del bloque
+
+        Args:
+            nombre: Nombre de la etapa (ej: "seccion", "obligacion")
+            detalle: Identificador de la instancia (ej: ítem de la obligación);
+                     no forma parte del agrupamiento del resumen
+            **etiquetas: Etiquetas de la etapa (ej: seccion="GeneradorSeccion1")
+        """
+        # El snapshot también ocupa memoria de Python: se toma antes de fijar
+        # la línea base y de reiniciar el pico para no atribuírselo a la etapa
+        antes = None
+        if self._snapshots.get(nombre, 0) < self.max_snapshots:
+            self._snapshots[nombre] = self._snapshots.get(nombre, 0) + 1
+            antes = tracemalloc.take_snapshot().filter_traces(_FILTROS_SNAPSHOT)
+
+        actual, pico = tracemalloc.get_traced_memory()
+        self._propagar_picos(pico, rss_pico_mb())
+        tracemalloc.reset_peak()
+        if not reiniciar_pico_rss():
+            self.rss_por_etapa = False
+
+        abierta = {"pico": actual, "rss_pico": rss_actual_mb()}
+        profundidad = len(self._pila)
+        self._pila.append(abierta)
+        rss_inicio = rss_actual_mb()
+        inicio = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duracion = time.perf_counter() - inicio
+            fin, pico = tracemalloc.get_traced_memory()
+            rss_pico = rss_pico_mb()
+            self._pila.pop()
+            abierta["pico"] = max(abierta["pico"], pico)
+            if rss_pico is not None:
+                abierta["rss_pico"] = max(abierta["rss_pico"] or 0.0, rss_pico)
+            self._propagar_picos(abierta["pico"], abierta["rss_pico"])
+
+            registro = {
+                "nombre": nombre,
+                "etiquetas": {k: str(v) for k, v in etiquetas.items()},
+                "detalle": detalle,
+                "profundidad": profundidad,
+                "duracion_s": round(duracion, 4),
+                "memoria_inicio_mb": round(actual / _MB, 2),
+                "memoria_fin_mb": round(fin / _MB, 2),
+                "neto_mb": round((fin - actual) / _MB, 2),
+                "pico_mb": round(abierta["pico"] / _MB, 2),
+                "rss_inicio_mb": rss_inicio,
+                "rss_fin_mb": rss_actual_mb(),
+                "rss_pico_mb": abierta["rss_pico"],
+                "error": error,
+                "sitios": None,
+            }
+            if antes is not None:
+                despues = tracemalloc.take_snapshot().filter_traces(_FILTROS_SNAPSHOT)
+                registro["sitios"] = self._sitios(antes, despues)
+            self.etapas.append(registro)
+
+    def _sitios(self, antes: tracemalloc.Snapshot, despues: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """Sitios que más memoria retuvieron entre los dos snapshots"""
+        diferencias = [d for d in despues.compare_to(antes, "lineno") if d.size_diff > 0]
+        return [
+            {
+                "sitio": _sitio(d.traceback[0]),
+                "neto_kb": round(d.size_diff / 1024, 1),
+                "bloques": d.count_diff,
+            }
+            for d in diferencias[:self.top]
+        ]
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        """
+        Etapas agrupadas por nombre + etiquetas, de mayor a menor pico
+
+        Returns:
+            Por grupo: veces, picos máximos, neto total y los sitios de
+            asignación sumados entre sus snapshots
+        """
+        grupos: Dict[str, Dict[str, Any]] = {}
+        for etapa in self.etapas:
+            clave = json.dumps([etapa["nombre"], etapa["etiquetas"]], sort_keys=True)
+            grupo = grupos.setdefault(clave, {
+                "nombre": etapa["nombre"], "etiquetas": etapa["etiquetas"], "veces": 0,
+                "pico_mb": 0.0, "rss_pico_mb": None, "neto_mb": 0.0, "mayor_pico": None, "sitios": {},
+            })
+            grupo["veces"] += 1
+            grupo["neto_mb"] += etapa["neto_mb"]
+            if etapa["pico_mb"] >= grupo["pico_mb"]:
+                grupo["pico_mb"] = etapa["pico_mb"]
+                grupo["mayor_pico"] = etapa["detalle"]
+            if etapa["rss_pico_mb"] is not None:
+                grupo["rss_pico_mb"] = max(grupo["rss_pico_mb"] or 0.0, etapa["rss_pico_mb"])
+            for sitio in etapa["sitios"] or []:
+                total = grupo["sitios"].setdefault(sitio["sitio"], {"sitio": sitio["sitio"], "neto_kb": 0.0, "bloques": 0})
+                total["neto_kb"] += sitio["neto_kb"]
+                total["bloques"] += sitio["bloques"]
+
+        resumen = []
+        for grupo in grupos.values():
+            grupo["neto_mb"] = round(grupo["neto_mb"], 2)
+            sitios = sorted(grupo["sitios"].values(), key=lambda s: s["neto_kb"], reverse=True)[:self.top]
+            grupo["sitios"] = [{**s, "neto_kb": round(s["neto_kb"], 1)} for s in sitios]
+            resumen.append(grupo)
+        return sorted(resumen, key=lambda g: g["pico_mb"], reverse=True)
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "nombre": self.nombre,
+            "fecha": self.fecha,
+            "rss_pico_mb": rss_pico_mb(),
+            "rss_por_etapa": self.rss_por_etapa,
+            "resumen": self.resumen(),
+            "etapas": self.etapas,
+        }
+
+    def guardar(self, ruta: Path) -> Path:
+        """Escribe el perfil como JSON"""
+        return escribir_texto_atomico(ruta, json.dumps(self.a_dict(), ensure_ascii=False, indent=2))
+
+    def imprimir_resumen(self, sitios: int = 3) -> None:
+        """Imprime el pico de cada grupo de etapas y sus principales sitios de asignación"""
+        print("[INFO] Perfil de memoria por etapa:")
+        for grupo in self.resumen():
+            etiquetas = ", ".join(f"{k}={v}" for k, v in grupo["etiquetas"].items())
+            rss = f"{grupo['rss_pico_mb']:.1f} MB" if grupo["rss_pico_mb"] is not None else "N/D"
+            print(f"   {grupo['nombre']}{f' ({etiquetas})' if etiquetas else ''} x{grupo['veces']}: "
+                  f"pico Python {grupo['pico_mb']:.1f} MB, RSS pico {rss}, neto {grupo['neto_mb']:+.1f} MB")
+            for sitio in grupo["sitios"][:sitios]:
+                print(f"      {sitio['neto_kb']:>10.1f} KB  {sitio['sitio']}")
+
+
+_perfil_actual: ContextVar[Optional[PerfilMemoria]] = ContextVar("perfil_memoria", default=None)
+
+
+@contextmanager
+def perfil_memoria(nombre: str, top: int = TOP_SITIOS,
+                   max_snapshots: int = MAX_SNAPSHOTS_POR_ETAPA) -> Iterator[PerfilMemoria]:
+    """
+    Activa el perfil de memoria para las etapas que se ejecuten dentro del bloque
+
+    Inicia tracemalloc si no estaba activo (y lo detiene al salir).
+
+    Args:
+        nombre: Nombre de la ejecución (ej: "informe_2025_09_v1")
+        top: Sitios de asignación reportados por etapa
+        max_snapshots: Snapshots de tracemalloc por nombre de etapa
+
+    Yields:
+        PerfilMemoria (guardar() al terminar para escribirlo)
+    """
+    iniciado = not tracemalloc.is_tracing()
+    if iniciado:
+        tracemalloc.start()
+    perfil = PerfilMemoria(nombre, top=top, max_snapshots=max_snapshots)
+    token = _perfil_actual.set(perfil)
+    try:
+        yield perfil
+    finally:
+        _perfil_actual.reset(token)
+        if iniciado:
+            tracemalloc.stop()
+
+
+@contextmanager
+def medir_memoria(nombre: str, detalle: Optional[str] = None, **etiquetas: Any) -> Iterator[None]:
+    """
+    Mide la memoria del bloque si hay un perfil de memoria activo
+
+    Args:
+        nombre: Nombre de la etapa
+        detalle: Identificador de la instancia (no agrupa en el resumen)
+        **etiquetas: Etiquetas de la etapa
+    """
+    perfil = _perfil_actual.get()
+    if perfil is None:
+        yield
+        return
+    with perfil.etapa(nombre, detalle, **etiquetas):
+        yield
+
+
+def perfilado_memoria(nombre: str, detalle: Optional[Callable[..., Any]] = None, **etiquetas: Any):
+    """
+    Decorador equivalente a envolver la función en medir_memoria()
+
+    Args:
+        nombre: Nombre de la etapa
+        detalle: Función que recibe los argumentos de la llamada y retorna
+                 el identificador de la instancia
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _perfil_actual.get() is None:
+                return funcion(*args, **kwargs)
+            with medir_memoria(nombre, detalle(*args, **kwargs) if detalle else None, **etiquetas):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
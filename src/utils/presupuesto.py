@@ -0,0 +1,215 @@
+"""
+Motor vectorizado de ejecución presupuestal (Sección 8)
+
+Carga una vez el libro de ejecución del contrato (una fila por mes y
+categoría: anio, mes, categoria, presupuesto, ejecutado) y calcula con pandas
+y NumPy, para todos los meses a la vez:
+
+- la ejecución por categoría de cada mes y su acumulado por categoría,
+- los totales de cada mes y sus sumas prefijas (acumulado del contrato).
+
+Consultar la Sección 8 de cualquier mes es después una búsqueda por periodo,
+sin volver a recorrer el libro.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+import numpy as np
+import pandas as pd
+import config
+from src.extractores.fuentes_tabulares import leer_fuente_tabla
+from src.utils.formato_moneda import formato_moneda_serie
+
+# Columnas del libro de ejecución presupuestal
+COLUMNAS_LIBRO = ["anio", "mes", "categoria", "presupuesto", "ejecutado"]
+
+_motores: Dict[str, Tuple[Tuple[int, int], "MotorPresupuestal"]] = {}
+_lock = threading.Lock()
+
+
+def _periodo(anio: int, mes: int) -> int:
+    """Índice absoluto del mes (anio * 12 + mes - 1)"""
+    return int(anio) * 12 + int(mes) - 1
+
+
+def porcentaje_ejecucion(ejecutado, presupuesto) -> np.ndarray:
+    """Porcentaje de ejecución redondeado a 2 decimales (0 sin presupuesto)"""
+    ejecutado = np.asarray(ejecutado, dtype=float)
+    presupuesto = np.asarray(presupuesto, dtype=float)
+    porcentaje = np.divide(ejecutado * 100, presupuesto, out=np.zeros_like(ejecutado), where=presupuesto > 0)
+    return np.round(porcentaje, 2)
+
+
+def calcular_ejecucion(registros: Iterable[Dict[str, Any]], presupuesto: str = "presupuesto",
+                       ejecutado: str = "ejecutado") -> List[Dict[str, Any]]:
+    """
+    Agrega porcentaje de ejecución y valores formateados a filas de presupuesto
+
+    Args:
+        registros: Filas con columnas de presupuesto y ejecutado
+        presupuesto: Nombre de la columna de presupuesto
+        ejecutado: Nombre de la columna de ejecutado
+
+    Returns:
+        Filas con porcentaje_ejecucion, {presupuesto}_formato y {ejecutado}_formato
+    """
+    df = pd.DataFrame(list(registros))
+    if df.empty:
+        return []
+    for columna in (presupuesto, ejecutado):
+        if columna not in df.columns:
+            df[columna] = 0
+        df[columna] = df[columna].fillna(0)
+
+    df["porcentaje_ejecucion"] = porcentaje_ejecucion(df[ejecutado], df[presupuesto])
+    df[f"{presupuesto}_formato"] = formato_moneda_serie(df[presupuesto])
+    df[f"{ejecutado}_formato"] = formato_moneda_serie(df[ejecutado])
+    return df.to_dict("records")
+
+
+class MotorPresupuestal:
+    """Ejecución presupuestal precalculada para todos los meses del libro"""
+
+    def __init__(self, libro: pd.DataFrame):
+        """
+        Args:
+            libro: Filas anio, mes, categoria, presupuesto, ejecutado (varias
+                   filas del mismo mes y categoría se suman)
+
+        Raises:
+            ValueError: Si faltan columnas o el libro está vacío
+        """
+        faltantes = [columna for columna in COLUMNAS_LIBRO if columna not in libro.columns]
+        if faltantes:
+            raise ValueError(f"Columnas faltantes en el libro presupuestal: {', '.join(faltantes)}")
+        if libro.empty:
+            raise ValueError("El libro presupuestal está vacío")
+
+        df = libro[COLUMNAS_LIBRO].copy()
+        df[["presupuesto", "ejecutado"]] = df[["presupuesto", "ejecutado"]].fillna(0)
+        df["periodo"] = df["anio"].astype(int) * 12 + df["mes"].astype(int) - 1
+
+        # Ejecución por mes y categoría, con su acumulado por categoría
+        detalle = (
+            df.groupby(["periodo", "categoria"], sort=True)[["presupuesto", "ejecutado"]]
+            .sum()
+            .reset_index()
+        )
+        acumulado = detalle.groupby("categoria")[["presupuesto", "ejecutado"]].cumsum()
+        detalle["presupuesto_acumulado"] = acumulado["presupuesto"]
+        detalle["ejecutado_acumulado"] = acumulado["ejecutado"]
+        detalle["porcentaje_ejecucion"] = porcentaje_ejecucion(detalle["ejecutado"], detalle["presupuesto"])
+        detalle["porcentaje_acumulado"] = porcentaje_ejecucion(
+            detalle["ejecutado_acumulado"], detalle["presupuesto_acumulado"]
+        )
+        for columna in ("presupuesto", "ejecutado", "presupuesto_acumulado", "ejecutado_acumulado"):
+            detalle[f"{columna}_formato"] = formato_moneda_serie(detalle[columna])
+
+        self._ejecucion: Dict[int, List[Dict[str, Any]]] = {
+            int(periodo): grupo.drop(columns="periodo").to_dict("records")
+            for periodo, grupo in detalle.groupby("periodo", sort=False)
+        }
+
+        # Totales por mes en un rango continuo (meses sin registros en 0) y sumas prefijas
+        self.periodo_inicial = int(detalle["periodo"].min())
+        self.periodo_final = int(detalle["periodo"].max())
+        totales = (
+            detalle.groupby("periodo")[["presupuesto", "ejecutado"]].sum()
+            .reindex(range(self.periodo_inicial, self.periodo_final + 1), fill_value=0)
+        )
+        self._presupuesto_mes = totales["presupuesto"].to_numpy(dtype=float)
+        self._ejecutado_mes = totales["ejecutado"].to_numpy(dtype=float)
+        self._presupuesto_acumulado = np.cumsum(self._presupuesto_mes)
+        self._ejecutado_acumulado = np.cumsum(self._ejecutado_mes)
+
+        consolidado = pd.DataFrame({
+            "mes": [f"{config.MESES[p % 12 + 1]} {p // 12}" for p in totales.index],
+            "presupuesto_mes": self._presupuesto_mes,
+            "ejecutado_mes": self._ejecutado_mes,
+            "porcentaje_ejecucion": porcentaje_ejecucion(self._ejecutado_mes, self._presupuesto_mes),
+            "presupuesto_acumulado": self._presupuesto_acumulado,
+            "ejecutado_acumulado": self._ejecutado_acumulado,
+            "porcentaje_acumulado": porcentaje_ejecucion(self._ejecutado_acumulado, self._presupuesto_acumulado),
+        })
+        for columna in ("presupuesto_mes", "ejecutado_mes", "presupuesto_acumulado", "ejecutado_acumulado"):
+            consolidado[f"{columna}_formato"] = formato_moneda_serie(consolidado[columna])
+        self._consolidado: List[Dict[str, Any]] = consolidado.to_dict("records")
+
+    def _indice(self, anio: int, mes: int) -> int:
+        periodo = _periodo(anio, mes)
+        if not self.periodo_inicial <= periodo <= self.periodo_final:
+            raise KeyError(f"El libro presupuestal no cubre {config.MESES[mes]} {anio}")
+        return periodo - self.periodo_inicial
+
+    def contiene(self, anio: int, mes: int) -> bool:
+        """Indica si el mes está dentro del rango del libro"""
+        return self.periodo_inicial <= _periodo(anio, mes) <= self.periodo_final
+
+    def ejecucion_mes(self, anio: int, mes: int) -> List[Dict[str, Any]]:
+        """
+        Ejecución por categoría del mes (8.1)
+
+        Returns:
+            Filas {categoria, presupuesto, ejecutado, porcentaje_ejecucion,
+            presupuesto_acumulado, ejecutado_acumulado, porcentaje_acumulado, *_formato}
+        """
+        self._indice(anio, mes)
+        return [dict(fila) for fila in self._ejecucion.get(_periodo(anio, mes), [])]
+
+    def consolidado(self, anio: int, mes: int) -> List[Dict[str, Any]]:
+        """
+        Consolidado mes a mes desde el inicio del libro hasta el mes (8.2)
+
+        Returns:
+            Filas {mes, presupuesto_mes, ejecutado_mes, porcentaje_ejecucion,
+            presupuesto_acumulado, ejecutado_acumulado, porcentaje_acumulado, *_formato}
+        """
+        return [dict(fila) for fila in self._consolidado[:self._indice(anio, mes) + 1]]
+
+    def totales(self, anio: int, mes: int) -> Dict[str, Any]:
+        """
+        Totales del mes y acumulados del contrato hasta el mes (sumas prefijas)
+
+        Returns:
+            {total_presupuesto, total_ejecutado, porcentaje_total_ejecucion,
+             total_presupuesto_acumulado, total_ejecutado_acumulado, porcentaje_acumulado_ejecucion}
+        """
+        i = self._indice(anio, mes)
+        return {
+            "total_presupuesto": float(self._presupuesto_mes[i]),
+            "total_ejecutado": float(self._ejecutado_mes[i]),
+            "porcentaje_total_ejecucion": float(porcentaje_ejecucion(self._ejecutado_mes[i], self._presupuesto_mes[i])),
+            "total_presupuesto_acumulado": float(self._presupuesto_acumulado[i]),
+            "total_ejecutado_acumulado": float(self._ejecutado_acumulado[i]),
+            "porcentaje_acumulado_ejecucion": float(
+                porcentaje_ejecucion(self._ejecutado_acumulado[i], self._presupuesto_acumulado[i])
+            ),
+        }
+
+
+def get_motor_presupuestal(ruta: Optional[Path] = None) -> Optional[MotorPresupuestal]:
+    """
+    Motor del libro presupuestal, reconstruido solo si el archivo cambió
+
+    Args:
+        ruta: Libro CSV/Excel (default: FUENTES_DIR/libro_presupuestal.csv)
+
+    Returns:
+        MotorPresupuestal o None si el libro no existe
+    """
+    ruta = Path(ruta or config.FUENTES_DIR / "libro_presupuestal.csv")
+    if not ruta.exists():
+        return None
+
+    stat = ruta.stat()
+    firma = (stat.st_mtime_ns, stat.st_size)
+    clave = str(ruta.resolve())
+    with _lock:
+        guardado = _motores.get(clave)
+        if guardado and guardado[0] == firma:
+            return guardado[1]
+
+    motor = MotorPresupuestal(leer_fuente_tabla(ruta, columnas=COLUMNAS_LIBRO))
+    with _lock:
+        _motores[clave] = (firma, motor)
+    return motor
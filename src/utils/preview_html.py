@@ -0,0 +1,203 @@
+"""
+Vista previa HTML de las secciones del informe
+
+La sección se renderiza como siempre (template docxtpl o python-docx) y el
+cuerpo de word/document.xml se convierte directamente a HTML liviano:
+títulos, párrafos con negrita/cursiva, listas y tablas (con colspan y color
+de fondo de las celdas). Así la vista previa refleja exactamente el .docx
+sin mantener templates HTML paralelos.
+
+El HTML se guarda en config.CACHE_DIR / "previews" con una clave que combina
+la sección, el hash del template y el hash del contexto procesado: mientras
+los datos no cambien, la vista previa no vuelve a renderizar el documento.
+"""
+from html import escape
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import hashlib
+import zipfile
+from lxml import etree
+import config
+from src.utils.analisis_plantilla import hash_plantilla
+from src.utils.docx_streaming import PARTE_DOCUMENTO
+from src.utils.escritura_segura import escribir_texto_atomico
+from src.utils.metricas import medir
+from src.utils.snapshot_datos import hash_contexto, leer_snapshot
+
+CACHE_PREVIEWS_DIR = config.CACHE_DIR / "previews"
+
+# Cambiar al modificar la conversión: invalida las vistas previas en caché
+VERSION_HTML = 1
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_NS = {"w": _W}
+_PARTE_ESTILOS = "word/styles.xml"
+
+
+def _w(nombre: str) -> str:
+    return f"{{{_W}}}{nombre}"
+
+
+def _activo(propiedades: Optional[etree._Element], nombre: str) -> bool:
+    """Indica si una propiedad booleana de formato (w:b, w:i) está activa"""
+    if propiedades is None:
+        return False
+    elemento = propiedades.find(_w(nombre))
+    return elemento is not None and elemento.get(_w("val"), "true") not in ("0", "false")
+
+
+def _niveles_titulo(xml_estilos: Optional[bytes]) -> Dict[str, int]:
+    """Mapea el id de cada estilo de título (Heading1, Ttulo1, Title...) a su nivel HTML"""
+    niveles = {"Title": 1}
+    if not xml_estilos:
+        return niveles
+    for estilo in etree.fromstring(xml_estilos).iterfind("w:style", _NS):
+        nombre = estilo.find("w:name", _NS)
+        nombre = (nombre.get(_w("val")) if nombre is not None else "").lower()
+        if nombre == "title":
+            niveles[estilo.get(_w("styleId"))] = 1
+        elif nombre.startswith(("heading ", "título ", "titulo ")) and nombre.split()[-1].isdigit():
+            niveles[estilo.get(_w("styleId"))] = min(int(nombre.split()[-1]), 6)
+    return niveles
+
+
+class _ConversorHtml:
+    """Convierte el cuerpo de un documento WordprocessingML a HTML"""
+
+    def __init__(self, niveles_titulo: Dict[str, int]):
+        self.niveles_titulo = niveles_titulo
+
+    def runs(self, parrafo: etree._Element) -> str:
+        partes = []
+        for run in parrafo.iter(_w("r")):
+            texto = []
+            for hijo in run:
+                if hijo.tag == _w("t"):
+                    texto.append(escape(hijo.text or ""))
+                elif hijo.tag == _w("tab"):
+                    texto.append(" ")
+                elif hijo.tag in (_w("br"), _w("cr")):
+                    texto.append("<br>")
+                elif hijo.tag == _w("drawing"):
+                    texto.append('<span class="imagen">[Imagen]</span>')
+            if not texto:
+                continue
+            html = "".join(texto)
+            propiedades = run.find(_w("rPr"))
+            if _activo(propiedades, "i"):
+                html = f"<em>{html}</em>"
+            if _activo(propiedades, "b"):
+                html = f"<strong>{html}</strong>"
+            partes.append(html)
+        return "".join(partes)
+
+    def parrafo(self, parrafo: etree._Element) -> str:
+        contenido = self.runs(parrafo)
+        propiedades = parrafo.find(_w("pPr"))
+        estilo = propiedades.find("w:pStyle", _NS) if propiedades is not None else None
+        nivel = self.niveles_titulo.get(estilo.get(_w("val"))) if estilo is not None else None
+        if nivel:
+            return f"<h{nivel}>{contenido}</h{nivel}>" if contenido else ""
+        if not contenido:
+            return ""
+        clase = ' class="lista"' if propiedades is not None and propiedades.find(_w("numPr")) is not None else ""
+        alineacion = propiedades.find(_w("jc")) if propiedades is not None else None
+        if alineacion is not None and alineacion.get(_w("val")) in ("center", "right"):
+            return f'<p{clase} style="text-align:{alineacion.get(_w("val"))}">{contenido}</p>'
+        return f"<p{clase}>{contenido}</p>"
+
+    def celda(self, celda: etree._Element, etiqueta: str) -> str:
+        atributos = ""
+        propiedades = celda.find(_w("tcPr"))
+        if propiedades is not None:
+            span = propiedades.find(_w("gridSpan"))
+            if span is not None and int(span.get(_w("val"), "1")) > 1:
+                atributos += f' colspan="{int(span.get(_w("val")))}"'
+            fondo = propiedades.find(_w("shd"))
+            color = fondo.get(_w("fill")) if fondo is not None else None
+            if color and color.lower() not in ("auto", "ffffff"):
+                atributos += f' style="background:#{escape(color)}"'
+        contenido = "<br>".join(filter(None, (self.runs(p) for p in celda.iter(_w("p")))))
+        return f"<{etiqueta}{atributos}>{contenido}</{etiqueta}>"
+
+    def tabla(self, tabla: etree._Element) -> str:
+        filas = []
+        for i, fila in enumerate(tabla.iterfind("w:tr", _NS)):
+            propiedades = fila.find(_w("trPr"))
+            encabezado = i == 0 or (propiedades is not None and propiedades.find(_w("tblHeader")) is not None)
+            etiqueta = "th" if encabezado else "td"
+            celdas = "".join(self.celda(celda, etiqueta) for celda in fila.iterfind("w:tc", _NS))
+            filas.append(f"<tr>{celdas}</tr>")
+        return f"<table>{''.join(filas)}</table>"
+
+    def bloques(self, contenedor: etree._Element) -> List[str]:
+        html = []
+        for elemento in contenedor:
+            if elemento.tag == _w("p"):
+                html.append(self.parrafo(elemento))
+            elif elemento.tag == _w("tbl"):
+                html.append(self.tabla(elemento))
+            elif elemento.tag == _w("sdt"):
+                contenido = elemento.find(_w("sdtContent"))
+                if contenido is not None:
+                    html.extend(self.bloques(contenido))
+        return html
+
+
+def docx_a_html(paquete: Union[bytes, Path]) -> str:
+    """
+    Convierte el cuerpo de un .docx a un fragmento HTML
+
+    Args:
+        paquete: Contenido del .docx o ruta al archivo
+
+    Returns:
+        Fragmento <article class="preview-seccion">...</article>
+    """
+    origen = BytesIO(paquete) if isinstance(paquete, bytes) else paquete
+    with zipfile.ZipFile(origen) as docx:
+        cuerpo = etree.fromstring(docx.read(PARTE_DOCUMENTO)).find(_w("body"))
+        estilos = docx.read(_PARTE_ESTILOS) if _PARTE_ESTILOS in docx.namelist() else None
+    bloques = _ConversorHtml(_niveles_titulo(estilos)).bloques(cuerpo)
+    return f'<article class="preview-seccion">{"".join(filter(None, bloques))}</article>'
+
+
+def preview_seccion(anio: int, mes: int, numero: int, desde_datos: bool = True) -> str:
+    """
+    Vista previa HTML de una sección, desde la caché si el contexto no cambió
+
+    Args:
+        anio: Año del informe
+        mes: Mes del informe (1-12)
+        numero: Número de la sección
+        desde_datos: Usar el snapshot de main.py --solo-datos si existe (no
+                     consulta las fuentes); si no, se cargan y procesan los datos
+
+    Returns:
+        Fragmento HTML de la sección
+    """
+    from src.generadores import obtener_generador
+
+    generador = obtener_generador(numero)(anio, mes)
+    etiquetas = {"seccion": type(generador).__name__}
+
+    snapshot = leer_snapshot(config.get_ruta_snapshot_datos(anio, mes, numero)) if desde_datos else None
+    with medir("preview", etapa="datos", **etiquetas):
+        contexto = snapshot["contexto"] if snapshot is not None else generador.datos_contexto()
+        # El render usa el mismo contexto: no se vuelven a consultar las fuentes
+        generador.restaurar_contexto(contexto)
+
+    plantilla = hash_plantilla(generador.template_path) if generador.template_path.exists() else ""
+    clave = hashlib.sha256(
+        f"{VERSION_HTML}|{numero}|{plantilla}|{hash_contexto(contexto)}".encode("utf-8")
+    ).hexdigest()
+    ruta_cache = CACHE_PREVIEWS_DIR / f"seccion_{numero:02d}_{clave[:20]}.html"
+    if ruta_cache.exists():
+        return ruta_cache.read_text(encoding="utf-8")
+
+    with medir("preview", etapa="render", **etiquetas):
+        html = docx_a_html(generador.a_bytes())
+
+    escribir_texto_atomico(ruta_cache, html)
+    return html
@@ -0,0 +1,85 @@
+"""
+Snapshots JSON del contexto de cada sección (main.py --solo-datos)
+
+Un snapshot guarda el contexto completo que produce cargar_datos + procesar,
+sin renderizar el template. Sirve para revisar el contenido de un mes sin
+abrir los .docx y para volver a renderizar después sin consultar las fuentes
+(main.py --desde-datos).
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+from src.utils.escritura_segura import escribir_texto_atomico
+
+
+def _valor_json(valor: Any) -> Any:
+    """Convierte a JSON los tipos que aparecen en los contextos (numpy, fechas, rutas)"""
+    if hasattr(valor, "tolist"):
+        # Escalares y arreglos de numpy, Series de pandas (sin importar numpy al arrancar)
+        return valor.tolist()
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, Path):
+        return str(valor)
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor, key=str)
+    raise TypeError(f"Valor no serializable en el contexto: {type(valor).__name__}")
+
+
+def snapshot_json(numero: int, nombre: str, anio: int, mes: int, contexto: Dict[str, Any]) -> str:
+    """
+    Serializa el contexto de una sección como JSON compacto
+
+    Args:
+        numero: Número de la sección
+        nombre: Nombre de la sección
+        anio: Año del informe
+        mes: Mes del informe
+        contexto: Contexto completo (ver GeneradorSeccion.datos_contexto)
+
+    Returns:
+        Texto JSON {seccion, nombre, anio, mes, generado_en, contexto}
+    """
+    return json.dumps(
+        {
+            "seccion": numero,
+            "nombre": nombre,
+            "anio": anio,
+            "mes": mes,
+            "generado_en": datetime.now().isoformat(timespec="seconds"),
+            "contexto": contexto,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_valor_json,
+    )
+
+
+def hash_contexto(contexto: Dict[str, Any]) -> str:
+    """SHA-256 del contexto serializado (claves ordenadas), para cachés derivadas"""
+    texto = json.dumps(contexto, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=_valor_json)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def guardar_snapshot(ruta: Path, texto: str) -> Path:
+    """Escribe el snapshot de forma atómica (ver escribir_atomico)"""
+    return escribir_texto_atomico(ruta, texto)
+
+
+def leer_snapshot(ruta: Path) -> Optional[Dict[str, Any]]:
+    """
+    Lee un snapshot guardado
+
+    Returns:
+        Snapshot {seccion, nombre, anio, mes, generado_en, contexto} o None si no existe
+    """
+    ruta = Path(ruta)
+    if not ruta.exists():
+        return None
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,260 @@
+"""
+Motor para llenar tablas dinámicas de plantillas Word (docxtpl / python-docx)
+
+Las plantillas traen tablas con encabezado y filas de ejemplo con estilo
+(sombreado, fuente, sangrías). En lugar de reconstruir cada fila celda por
+celda, se toma una fila de la plantilla como prototipo, se prepara una sola
+vez y se clona en bloque para todas las filas de datos.
+
+Las tablas se ubican con un índice de anclas construido en una sola pasada
+por el cuerpo del documento: cada párrafo (título, texto o marcador) queda
+asociado a la tabla que le sigue.
+"""
+import copy
+import unicodedata
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from docx.table import Table
+
+# Elementos que se eliminan de la fila/celda prototipo para que el contenido
+# nuevo no herede alturas fijas, combinaciones ni espaciados de la plantilla
+_ELEMENTOS_FILA_DESCARTADOS = (qn('w:trHeight'),)
+_ELEMENTOS_CELDA_DESCARTADOS = (qn('w:vMerge'), qn('w:hMerge'))
+_ELEMENTOS_RUN_DESCARTADOS = (qn('w:spacing'),)
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza texto para comparaciones: mayúsculas, sin tildes y sin
+    espacios repetidos ni saltos de línea
+    """
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.split()).upper()
+
+
+def _texto_elemento(elemento) -> str:
+    """Texto concatenado de todos los w:t de un elemento XML"""
+    return ''.join(t.text or '' for t in elemento.iter(qn('w:t')))
+
+
+class IndiceAnclas:
+    """
+    Índice ancla → tabla construido en una sola pasada por el documento
+
+    Cada párrafo del cuerpo con texto y cada marcador (w:bookmarkStart) se
+    registra como ancla de la siguiente tabla del documento.
+    """
+
+    def __init__(self, doc):
+        """
+        Args:
+            doc: Documento python-docx (o DocxTemplate.docx)
+        """
+        self.doc = doc
+        self.anclas: List[Tuple[str, Table]] = []
+        self.marcadores: Dict[str, Table] = {}
+        self.tablas: List[Table] = []
+        self._encabezados: Dict[int, str] = {}
+        self._construir()
+
+    def _construir(self) -> None:
+        """Recorre una sola vez los elementos del cuerpo del documento"""
+        tag_p = qn('w:p')
+        tag_tbl = qn('w:tbl')
+        tag_bookmark = qn('w:bookmarkStart')
+
+        pendientes_texto: List[str] = []
+        pendientes_marcador: List[str] = []
+
+        for elemento in self.doc.element.body.iterchildren():
+            if elemento.tag == tag_p:
+                texto = normalizar_texto(_texto_elemento(elemento))
+                if texto:
+                    pendientes_texto.append(texto)
+                for marcador in elemento.iter(tag_bookmark):
+                    pendientes_marcador.append(marcador.get(qn('w:name')))
+            elif elemento.tag == tag_bookmark:
+                pendientes_marcador.append(elemento.get(qn('w:name')))
+            elif elemento.tag == tag_tbl:
+                tabla = Table(elemento, self.doc._body)
+                self.tablas.append(tabla)
+                self.anclas.extend((texto, tabla) for texto in pendientes_texto)
+                for nombre in pendientes_marcador:
+                    self.marcadores.setdefault(nombre, tabla)
+                pendientes_texto = []
+                pendientes_marcador = []
+
+    def encabezado(self, tabla: Table) -> str:
+        """Texto normalizado de la primera fila de la tabla (se calcula una vez)"""
+        clave = id(tabla._tbl)
+        if clave not in self._encabezados:
+            tr = tabla._tbl.find(qn('w:tr'))
+            self._encabezados[clave] = normalizar_texto(
+                ' '.join(_texto_elemento(tc) for tc in tr.iter(qn('w:tc')))
+            ) if tr is not None else ''
+        return self._encabezados[clave]
+
+    def _encabezado_coincide(self, tabla: Table, encabezados: Iterable[str]) -> bool:
+        texto = self.encabezado(tabla)
+        return all(normalizar_texto(palabra) in texto for palabra in encabezados)
+
+    def tabla_despues_de(self, *palabras: str, encabezados: Iterable[str] = (),
+                         excluir: Iterable[Table] = ()) -> Optional[Table]:
+        """
+        Retorna la primera tabla que sigue a un párrafo con todas las palabras
+
+        Args:
+            palabras: Palabras que debe contener el párrafo ancla (sin importar tildes)
+            encabezados: Palabras que debe contener la fila de encabezado de la tabla
+            excluir: Tablas ya utilizadas que no deben retornarse
+
+        Returns:
+            Tabla encontrada o None
+        """
+        palabras = [normalizar_texto(p) for p in palabras]
+        excluidas = {id(t._tbl) for t in excluir}
+        for texto, tabla in self.anclas:
+            if id(tabla._tbl) in excluidas:
+                continue
+            if all(p in texto for p in palabras) and self._encabezado_coincide(tabla, encabezados):
+                return tabla
+        return None
+
+    def tabla_por_marcador(self, nombre: str) -> Optional[Table]:
+        """Retorna la tabla que sigue al marcador (bookmark) indicado"""
+        return self.marcadores.get(nombre)
+
+    def tabla_por_encabezados(self, *encabezados: str, excluir: Iterable[Table] = ()) -> Optional[Table]:
+        """Retorna la primera tabla cuyo encabezado contiene todas las palabras"""
+        excluidas = {id(t._tbl) for t in excluir}
+        for tabla in self.tablas:
+            if id(tabla._tbl) not in excluidas and self._encabezado_coincide(tabla, encabezados):
+                return tabla
+        return None
+
+
+def _preparar_celda(tc, columna: Dict[str, Any]) -> None:
+    """
+    Deja la celda prototipo con un único párrafo y un único run vacío,
+    conservando tcPr, pPr y rPr de la plantilla
+    """
+    tc_pr = tc.tcPr
+    if tc_pr is not None:
+        for hijo in list(tc_pr):
+            if hijo.tag in _ELEMENTOS_CELDA_DESCARTADOS:
+                tc_pr.remove(hijo)
+
+    parrafos = tc.findall(qn('w:p'))
+    # Usar como modelo el primer párrafo con texto (los vacíos suelen ser relleno)
+    modelo = next((p for p in parrafos if p.find(qn('w:r')) is not None), None)
+    if modelo is None:
+        modelo = parrafos[0] if parrafos else OxmlElement('w:p')
+    run_modelo = modelo.find(qn('w:r'))
+    r_pr = copy.deepcopy(run_modelo.find(qn('w:rPr'))) if run_modelo is not None else None
+
+    for hijo in list(tc):
+        if hijo.tag != qn('w:tcPr'):
+            tc.remove(hijo)
+
+    parrafo = copy.deepcopy(modelo)
+    for hijo in list(parrafo):
+        if hijo.tag != qn('w:pPr'):
+            parrafo.remove(hijo)
+
+    if r_pr is None:
+        r_pr = OxmlElement('w:rPr')
+    for hijo in list(r_pr):
+        if hijo.tag in _ELEMENTOS_RUN_DESCARTADOS:
+            r_pr.remove(hijo)
+
+    # Ajustes de formato por columna (se aplican una sola vez al prototipo)
+    if columna.get('alineacion') is not None:
+        parrafo.get_or_add_pPr().jc_val = columna['alineacion']
+    if columna.get('negrita') is not None:
+        r_pr._set_bool_val('b', columna['negrita'])
+    if columna.get('fuente'):
+        r_pr.rFonts_ascii = columna['fuente']
+        r_pr.rFonts_hAnsi = columna['fuente']
+    if columna.get('tamano'):
+        r_pr.sz_val = Pt(columna['tamano'])
+
+    run = OxmlElement('w:r')
+    if len(r_pr):
+        run.append(r_pr)
+    t = OxmlElement('w:t')
+    t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+    run.append(t)
+    parrafo.append(run)
+    tc.append(parrafo)
+
+
+def preparar_fila_prototipo(tabla: Table, indice_fila: int = 1,
+                            columnas: Optional[List[Dict[str, Any]]] = None):
+    """
+    Crea una copia limpia de una fila de la tabla para usarla como prototipo
+
+    Args:
+        tabla: Tabla de la plantilla
+        indice_fila: Fila que se toma como modelo (por defecto la primera de datos)
+        columnas: Ajustes opcionales por columna (alineacion, tamano, negrita, fuente)
+
+    Returns:
+        Elemento w:tr listo para clonar
+    """
+    filas = tabla._tbl.tr_lst
+    if not filas:
+        raise ValueError("La tabla no tiene filas para usar como prototipo")
+    tr = copy.deepcopy(filas[min(indice_fila, len(filas) - 1)])
+
+    tr_pr = tr.trPr
+    if tr_pr is not None:
+        for hijo in list(tr_pr):
+            if hijo.tag in _ELEMENTOS_FILA_DESCARTADOS:
+                tr_pr.remove(hijo)
+
+    columnas = columnas or []
+    for i, tc in enumerate(tr.tc_lst):
+        _preparar_celda(tc, columnas[i] if i < len(columnas) else {})
+    return tr
+
+
+def llenar_tabla_desde_prototipo(tabla: Table, filas: List[List[Any]],
+                                 filas_encabezado: int = 1, indice_prototipo: Optional[int] = None,
+                                 columnas: Optional[List[Dict[str, Any]]] = None) -> int:
+    """
+    Reemplaza las filas de datos de una tabla clonando una fila prototipo
+
+    El encabezado se conserva; las filas de datos de la plantilla se eliminan
+    en una sola operación y las nuevas filas se agregan en bloque.
+
+    Args:
+        tabla: Tabla de la plantilla
+        filas: Lista de filas (cada fila es una lista de valores por columna)
+        filas_encabezado: Número de filas de encabezado que se conservan
+        indice_prototipo: Fila modelo (por defecto la primera fila de datos)
+        columnas: Ajustes opcionales por columna (alineacion, tamano, negrita, fuente)
+
+    Returns:
+        Número de filas de datos agregadas
+    """
+    if indice_prototipo is None:
+        indice_prototipo = filas_encabezado
+    prototipo = preparar_fila_prototipo(tabla, indice_prototipo, columnas)
+
+    tbl = tabla._tbl
+    for tr in tbl.tr_lst[filas_encabezado:]:
+        tbl.remove(tr)
+
+    tag_t = qn('w:t')
+    for valores in filas:
+        tr = copy.deepcopy(prototipo)
+        textos = [tc.find(qn('w:p')).find(qn('w:r')).find(tag_t) for tc in tr.tc_lst]
+        for i, t in enumerate(textos):
+            valor = valores[i] if i < len(valores) else ''
+            t.text = str(valor) if valor is not None else ''
+        tbl.append(tr)
+
+    return len(filas)
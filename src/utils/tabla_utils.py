@@ -1,10 +1,22 @@
 """
 Utilidades para crear tablas en documentos Word
 """
-from typing import List, Dict, Any
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from xml.sax.saxutils import escape
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.table import Table
+
+# Caracteres de control no permitidos en XML (se eliminan del texto de las celdas)
+_CARACTERES_INVALIDOS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Salto de línea dentro de una celda (equivale a cell.text = "a\nb" en python-docx)
+_SALTO_LINEA = '</w:t><w:br/><w:t xml:space="preserve">'
 
 def crear_tabla_desde_dict(doc: Document, datos: List[Dict[str, Any]], encabezados: List[str]) -> None:
     """
@@ -79,3 +91,261 @@ def crear_tabla_desde_lista(doc: Document, datos: List[List[Any]], encabezados:
     return tabla
 
 
+
+
+def _color_hex(color: Any) -> Optional[str]:
+    """Normaliza un color (RGBColor o texto hex) a 'RRGGBB'"""
+    if color is None:
+        return None
+    return str(color).lstrip("#").upper()
+
+
+def _alineacion_xml(alineacion: Any) -> Optional[str]:
+    """Convierte WD_ALIGN_PARAGRAPH (o su valor XML en texto) al valor de w:jc"""
+    if alineacion is None:
+        return None
+    return getattr(alineacion, "xml_value", alineacion)
+
+
+@lru_cache(maxsize=256)
+def _prototipo_celda(ancho: Optional[int], alineacion: Optional[str], negrita: bool,
+                     color_texto: Optional[str], color_fondo: Optional[str],
+                     tamano: Optional[float], centrar_vertical: bool) -> Tuple[str, str]:
+    """
+    Construye el XML de una celda con estilo, partido alrededor del texto
+
+    Cada combinación de estilo se construye una sola vez; las celdas de la
+    tabla solo concatenan apertura + texto + cierre.
+
+    Returns:
+        Tupla (apertura, cierre) del XML de la celda
+    """
+    tc_pr = ""
+    if ancho is not None:
+        tc_pr += f'<w:tcW w:w="{ancho}" w:type="dxa"/>'
+    if color_fondo:
+        tc_pr += f'<w:shd w:val="clear" w:color="auto" w:fill="{color_fondo}"/>'
+    if centrar_vertical:
+        tc_pr += '<w:vAlign w:val="center"/>'
+
+    p_pr = f'<w:pPr><w:jc w:val="{alineacion}"/></w:pPr>' if alineacion else ""
+
+    r_pr = ""
+    if negrita:
+        r_pr += "<w:b/>"
+    if color_texto:
+        r_pr += f'<w:color w:val="{color_texto}"/>'
+    if tamano:
+        medios_puntos = int(round(tamano * 2))
+        r_pr += f'<w:sz w:val="{medios_puntos}"/>'
+    if r_pr:
+        r_pr = f"<w:rPr>{r_pr}</w:rPr>"
+
+    apertura = (
+        f"<w:tc>{'<w:tcPr>' + tc_pr + '</w:tcPr>' if tc_pr else ''}"
+        f'<w:p>{p_pr}<w:r>{r_pr}<w:t xml:space="preserve">'
+    )
+    cierre = "</w:t></w:r></w:p></w:tc>"
+    return apertura, cierre
+
+
+def _texto_celda(valor: Any) -> str:
+    """Escapa el valor de una celda para insertarlo en w:t"""
+    if valor is None:
+        return ""
+    texto = _CARACTERES_INVALIDOS.sub("", str(valor))
+    return escape(texto).replace("\n", _SALTO_LINEA)
+
+
+def iterar_tabla_xml(encabezados: List[str], filas: Iterable[List[Any]],
+                     columnas: Optional[List[Dict[str, Any]]] = None,
+                     ancho_bloque: int = 9972,
+                     estilo_id: Optional[str] = None,
+                     color_encabezado: Any = "1F4E79",
+                     color_texto_encabezado: Any = "FFFFFF",
+                     tamano_fuente: float = 10,
+                     centrar_vertical: bool = True,
+                     colores_fila: Optional[List[Any]] = None,
+                     fila_total: Optional[List[Any]] = None,
+                     color_fila_total: Any = "D9E1F2",
+                     estilos_celda: Optional[Dict[Tuple[int, int], Dict[str, Any]]] = None,
+                     repetir_encabezado: bool = False,
+                     filas_por_bloque: int = 500) -> Iterator[str]:
+    """
+    Genera el XML w:tbl de una tabla en bloques de texto
+
+    El primer bloque contiene propiedades, grid y encabezado; luego un bloque
+    por cada filas_por_bloque filas y al final la fila de total y el cierre.
+    Las filas se consumen a medida que se generan los bloques, de modo que
+    filas puede ser un generador y el XML completo nunca está en memoria.
+
+    Args:
+        encabezados: Textos del encabezado
+        filas: Filas de datos (cualquier iterable de listas de valores)
+        columnas: Especificación por columna (ver agregar_tabla_xml)
+        ancho_bloque: Ancho útil de la página en twips (reparto de columnas sin ancho)
+        estilo_id: Id del estilo de tabla del documento (None = sin estilo)
+        filas_por_bloque: Filas de datos por bloque generado
+        (resto de argumentos: ver agregar_tabla_xml)
+
+    Yields:
+        Fragmentos consecutivos del XML de la tabla
+    """
+    num_cols = len(encabezados)
+    columnas = list(columnas or [])
+    columnas += [{}] * (num_cols - len(columnas))
+
+    # Anchos en twips (1 twip = 635 EMU); sin anchos se reparte el ancho útil
+    anchos = [int(col["ancho"]) // 635 if col.get("ancho") is not None else None
+              for col in columnas[:num_cols]]
+    ancho_defecto = ancho_bloque // max(num_cols, 1)
+    anchos_grid = [ancho if ancho is not None else ancho_defecto for ancho in anchos]
+    alineaciones = [_alineacion_xml(col.get("alineacion", WD_ALIGN_PARAGRAPH.LEFT))
+                    for col in columnas[:num_cols]]
+
+    color_encabezado = _color_hex(color_encabezado)
+    color_texto_encabezado = _color_hex(color_texto_encabezado)
+    estilos_celda = estilos_celda or {}
+
+    partes = [f"<w:tbl {nsdecls('w')}><w:tblPr>"]
+    if estilo_id:
+        partes.append(f'<w:tblStyle w:val="{estilo_id}"/>')
+    partes.append(
+        '<w:tblW w:type="auto" w:w="0"/><w:jc w:val="center"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+        'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>'
+    )
+    partes.extend(f'<w:gridCol w:w="{ancho}"/>' for ancho in anchos_grid)
+    partes.append("</w:tblGrid>")
+
+    # Encabezado
+    partes.append("<w:tr><w:trPr><w:tblHeader/></w:trPr>" if repetir_encabezado else "<w:tr>")
+    for i, texto in enumerate(encabezados):
+        apertura, cierre = _prototipo_celda(
+            anchos[i], "center", True, color_texto_encabezado, color_encabezado,
+            tamano_fuente, centrar_vertical
+        )
+        partes.append(apertura + _texto_celda(texto) + cierre)
+    partes.append("</w:tr>")
+    yield "".join(partes)
+
+    # Prototipos base de las filas de datos (uno por columna)
+    prototipos = [
+        _prototipo_celda(anchos[i], alineaciones[i], False, None, None, tamano_fuente, centrar_vertical)
+        for i in range(num_cols)
+    ]
+
+    partes = []
+    for idx, fila in enumerate(filas):
+        color_fila = None
+        if colores_fila and idx < len(colores_fila):
+            color_fila = _color_hex(colores_fila[idx])
+
+        partes.append("<w:tr>")
+        for i in range(num_cols):
+            valor = fila[i] if i < len(fila) else ""
+            estilo = estilos_celda.get((idx, i))
+            if estilo is None and color_fila is None:
+                apertura, cierre = prototipos[i]
+            else:
+                estilo = estilo or {}
+                apertura, cierre = _prototipo_celda(
+                    anchos[i], alineaciones[i], bool(estilo.get("negrita", False)),
+                    _color_hex(estilo.get("color_texto")),
+                    _color_hex(estilo.get("color_fondo")) or color_fila,
+                    tamano_fuente, centrar_vertical
+                )
+            partes.append(apertura + _texto_celda(valor) + cierre)
+        partes.append("</w:tr>")
+
+        if (idx + 1) % filas_por_bloque == 0:
+            yield "".join(partes)
+            partes = []
+
+    # Fila de total
+    if fila_total:
+        color_total = _color_hex(color_fila_total)
+        partes.append("<w:tr>")
+        for i in range(num_cols):
+            valor = fila_total[i] if i < len(fila_total) else ""
+            apertura, cierre = _prototipo_celda(
+                anchos[i], "center", True, None, color_total, tamano_fuente, centrar_vertical
+            )
+            partes.append(apertura + _texto_celda(valor) + cierre)
+        partes.append("</w:tr>")
+
+    partes.append("</w:tbl>")
+    yield "".join(partes)
+
+
+def estilo_tabla_id(doc: Document, estilo_tabla: str) -> Optional[str]:
+    """Id del estilo de tabla en el documento (None si no existe)"""
+    try:
+        return doc.styles[estilo_tabla].style_id
+    except KeyError:
+        return None
+
+
+def agregar_tabla_xml(doc: Document, encabezados: List[str], filas: List[List[Any]],
+                      columnas: Optional[List[Dict[str, Any]]] = None,
+                      color_encabezado: Any = "1F4E79",
+                      color_texto_encabezado: Any = "FFFFFF",
+                      tamano_fuente: float = 10,
+                      centrar_vertical: bool = True,
+                      colores_fila: Optional[List[Any]] = None,
+                      fila_total: Optional[List[Any]] = None,
+                      color_fila_total: Any = "D9E1F2",
+                      estilos_celda: Optional[Dict[Tuple[int, int], Dict[str, Any]]] = None,
+                      estilo_tabla: str = "Table Grid",
+                      repetir_encabezado: bool = False) -> Table:
+    """
+    Agrega una tabla generando el XML w:tbl completo en una sola pasada
+
+    Reemplaza la construcción celda por celda de python-docx (add_row + bucles
+    sobre párrafos y runs), que es muy lenta en tablas de cientos de filas.
+    El resultado es equivalente a la tabla con formato que construían las
+    secciones programáticas: encabezado sombreado en negrita, texto de tamaño
+    fijo, alineación por columna y anchos en cada celda.
+
+    Args:
+        doc: Documento Word
+        encabezados: Textos del encabezado
+        filas: Lista de filas (cada fila es una lista de valores)
+        columnas: Especificación por columna, lista de diccionarios con:
+                  - ancho: Length de python-docx (Inches, Cm)
+                  - alineacion: WD_ALIGN_PARAGRAPH (default LEFT)
+        color_encabezado: Color de fondo del encabezado (hex o RGBColor)
+        color_texto_encabezado: Color del texto del encabezado
+        tamano_fuente: Tamaño de fuente en puntos
+        centrar_vertical: Si True, centra verticalmente todas las celdas
+        colores_fila: Color de fondo opcional por fila de datos
+        fila_total: Fila final opcional (centrada, negrita y sombreada)
+        color_fila_total: Color de fondo de la fila de total
+        estilos_celda: Estilos puntuales por (índice_fila, índice_columna) de
+                       las filas de datos, con claves color_fondo, color_texto
+                       y negrita (ej: semáforo de disponibilidad)
+        estilo_tabla: Nombre del estilo de tabla del documento
+        repetir_encabezado: Si True, el encabezado se repite en cada página
+
+    Returns:
+        Tabla agregada al final del documento
+    """
+    xml = "".join(iterar_tabla_xml(
+        encabezados, filas,
+        columnas=columnas,
+        ancho_bloque=int(doc._block_width) // 635,
+        estilo_id=estilo_tabla_id(doc, estilo_tabla),
+        color_encabezado=color_encabezado,
+        color_texto_encabezado=color_texto_encabezado,
+        tamano_fuente=tamano_fuente,
+        centrar_vertical=centrar_vertical,
+        colores_fila=colores_fila,
+        fila_total=fila_total,
+        color_fila_total=color_fila_total,
+        estilos_celda=estilos_celda,
+        repetir_encabezado=repetir_encabezado,
+        filas_por_bloque=max(len(filas), 1)
+    ))
+    tbl = parse_xml(xml)
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
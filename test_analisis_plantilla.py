@@ -0,0 +1,123 @@
+"""
+Script de prueba para el análisis de variables de templates y el contexto
+perezoso (src/utils/analisis_plantilla.py)
+"""
+import tempfile
+from pathlib import Path
+from docx import Document
+from src.generadores.base import GeneradorSeccion
+from src.generadores.seccion_1_info_general import GeneradorSeccion1
+from src.utils import analisis_plantilla
+from src.utils.analisis_plantilla import ContextoPerezoso, Perezoso, variables_plantilla
+
+
+def _crear_template(ruta: Path, *parrafos: str) -> Path:
+    doc = Document()
+    for texto in parrafos:
+        doc.add_paragraph(texto)
+    doc.save(str(ruta))
+    return ruta
+
+
+class _GeneradorPrueba(GeneradorSeccion):
+    """Sección mínima sobre un template temporal"""
+
+    nombre_seccion = "PRUEBA"
+    template_file = "prueba.docx"
+
+    def __init__(self, ruta: Path, calculadas: list):
+        super().__init__(2025, 9)
+        self.ruta = ruta
+        self.calculadas = calculadas
+
+    @property
+    def template_path(self) -> Path:
+        return self.ruta
+
+    def cargar_datos(self) -> None:
+        pass
+
+    def _calcular(self, clave: str):
+        self.calculadas.append(clave)
+        return [{"x": clave}]
+
+    def procesar(self):
+        return ContextoPerezoso({
+            "titulo": "Informe",
+            "filas": Perezoso(lambda: self._calcular("filas")),
+            "tabla_costosa": Perezoso(lambda: self._calcular("tabla_costosa")),
+        })
+
+
+def test_variables_plantilla():
+    """Variables del cuerpo y de los bucles, cacheadas por hash del archivo"""
+    print("=" * 70)
+    print("PRUEBA ANÁLISIS DE VARIABLES DE TEMPLATES")
+    print("=" * 70)
+
+    cache_original = analisis_plantilla.CACHE_PLANTILLAS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        analisis_plantilla.CACHE_PLANTILLAS_DIR = Path(tmp) / "cache"
+        try:
+            ruta = _crear_template(Path(tmp) / "a.docx", "{{ titulo|moneda }}",
+                                   "{% for f in filas %}{{ f.x }}{% endfor %}")
+            assert variables_plantilla(ruta) == {"titulo", "filas"}
+            assert len(list(analisis_plantilla.CACHE_PLANTILLAS_DIR.glob("*.json"))) == 1
+
+            # Mismo contenido en otra ruta: se reutiliza el análisis por hash
+            copia = Path(tmp) / "copia.docx"
+            copia.write_bytes(ruta.read_bytes())
+            assert variables_plantilla(copia) == {"titulo", "filas"}
+
+            _crear_template(ruta, "{{ otra }}")
+            assert variables_plantilla(ruta) == {"otra"}
+            assert len(list(analisis_plantilla.CACHE_PLANTILLAS_DIR.glob("*.json"))) == 2
+
+            # Sintaxis inválida: None (se calculan todas las claves) y no se cachea en disco
+            invalido = _crear_template(Path(tmp) / "b.docx", "{% if %}")
+            assert variables_plantilla(invalido) is None
+            assert len(list(analisis_plantilla.CACHE_PLANTILLAS_DIR.glob("*.json"))) == 2
+        finally:
+            analisis_plantilla.CACHE_PLANTILLAS_DIR = cache_original
+    print("   [OK] Variables extraídas y cacheadas por hash")
+
+
+def test_contexto_perezoso():
+    """Los valores se calculan una sola vez y solo si se leen"""
+    llamadas = []
+    compartido = Perezoso(lambda: llamadas.append("tabla") or [1, 2])
+    contexto = ContextoPerezoso({"a": 1, "tabla": compartido, "alias": compartido,
+                                 "nunca": Perezoso(lambda: llamadas.append("nunca"))})
+
+    assert contexto.resolver({"tabla", "alias"}) == {"a": 1, "tabla": [1, 2], "alias": [1, 2]}
+    assert llamadas == ["tabla"] and contexto.pendientes() == {"nunca"}
+    assert contexto.get("falta", "x") == "x" and len(contexto) == 4
+    print("   [OK] ContextoPerezoso")
+
+
+def test_render_solo_variables_usadas():
+    """La sección solo calcula las claves que su template referencia"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = _crear_template(Path(tmp) / "seccion.docx", "{{ titulo }} {{ periodo }}",
+                               "{% for f in filas %}{{ f.x }}{% endfor %}")
+        calculadas = []
+        generador = _GeneradorPrueba(ruta, calculadas)
+        doc = generador.generar()
+        textos = [p.text for p in doc.docx.paragraphs]
+
+    assert calculadas == ["filas"]
+    assert textos[0] == "Informe Septiembre de 2025" and textos[1] == "filas"
+    assert generador.usa_variable("filas") and not generador.usa_variable("tabla_costosa")
+
+    # El template vigente de la Sección 1 no usa variables: no se cargan comunicados ni personal
+    seccion1 = GeneradorSeccion1(2025, 9, usar_llm_observaciones=False)
+    if seccion1.variables_template() == frozenset():
+        seccion1.cargar_datos()
+        assert not seccion1.comunicados_emitidos and not seccion1.personal_minimo
+    print(f"   [OK] Claves calculadas: {calculadas}")
+
+
+if __name__ == "__main__":
+    test_variables_plantilla()
+    test_contexto_perezoso()
+    test_render_solo_variables_usadas()
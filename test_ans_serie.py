@@ -0,0 +1,165 @@
+"""
+Script de prueba para validar la serie mensual del ANS con acumulados y
+promedios móviles (src/extractores/ans_serie.py)
+"""
+import json
+import random
+import tempfile
+from pathlib import Path
+import config
+from src.extractores.ans_serie import SerieANS, get_serie_ans, periodo, anio_mes
+
+UMBRAL = 98.9
+
+
+def _meses(desde=(2024, 11), n=12):
+    inicio = periodo(*desde)
+    return [anio_mes(inicio + i) for i in range(n)]
+
+
+def _esperado(valores, umbral=UMBRAL):
+    return {
+        "meses": len(valores),
+        "meses_cumplidos": sum(v >= umbral for v in valores),
+        "promedio": sum(valores) / len(valores),
+        "movil_3": sum(valores[-3:]) / len(valores[-3:]),
+        "movil_12": sum(valores[-12:]) / len(valores[-12:]),
+    }
+
+
+def _comparar(obtenido, esperado):
+    for clave, valor in esperado.items():
+        assert abs(obtenido[clave] - valor) < 1e-9, (clave, obtenido[clave], valor)
+
+
+def test_cierre_incremental():
+    """Cerrar mes a mes produce los mismos agregados que recorrer la serie"""
+    print("=" * 70)
+    print("PRUEBA SERIE DEL ANS")
+    print("=" * 70)
+
+    aleatorio = random.Random(4)
+    with tempfile.TemporaryDirectory() as tmp:
+        serie = SerieANS(Path(tmp) / "ans.db")
+        try:
+            valores = []
+            for anio, mes in _meses(n=14):
+                disponibilidad = round(aleatorio.uniform(98.5, 99.6), 2)
+                valores.append(disponibilidad)
+                serie.cerrar_mes(
+                    anio, mes, disponibilidad, horas_totales=1000.0, horas_operativas=disponibilidad * 10,
+                    por_localidad=[{"localidad": "SUBA", "disponibilidad": disponibilidad - 0.1},
+                                   {"localidad": "KENNEDY", "disponibilidad": disponibilidad + 0.1,
+                                    "horas_operativas": 90.0, "horas_no_operativas": 10.0}],
+                    umbral=UMBRAL
+                )
+                _comparar(serie.acumulado(anio, mes), _esperado(valores))
+
+            acumulado = serie.acumulado(2025, 12)
+            assert abs(acumulado["disponibilidad_ponderada"] - sum(valores) / len(valores)) < 1e-9
+            assert acumulado["meses_no_cumplidos"] == 14 - acumulado["meses_cumplidos"]
+            print(f"   [OK] 14 meses cerrados: promedio {acumulado['promedio']:.3f}%, "
+                  f"móvil 3 meses {acumulado['movil_3']:.3f}%")
+
+            historico = serie.historico(2025, 9, meses_atras=12)
+            assert len(historico) == 11 and historico[0]["mes"] == "Noviembre 2024"
+            assert historico[-1]["mes"] == "Septiembre 2025"
+            assert [h["disponibilidad"] for h in historico] == valores[:11]
+            print("   [OK] Histórico de la ventana con promedios móviles")
+
+            suba = serie.acumulado(2025, 12, "localidad", "SUBA")
+            _comparar(suba, _esperado([v - 0.1 for v in valores]))
+            ranking = serie.ranking(2025, 12)
+            assert [r["localidad"] for r in ranking] == ["KENNEDY", "SUBA"]
+            print("   [OK] Acumulados y ranking por localidad")
+        finally:
+            serie.cerrar()
+
+
+def test_correccion_y_meses_fuera_de_orden():
+    """Corregir un mes o cerrar uno anterior recalcula los acumulados posteriores"""
+    with tempfile.TemporaryDirectory() as tmp:
+        serie = SerieANS(Path(tmp) / "ans.db")
+        try:
+            meses = _meses(n=6)
+            valores = [99.0, 98.0, 99.5, 99.2, 98.7, 99.9]
+            # Se cierran todos menos el segundo
+            for i, (anio, mes) in enumerate(meses):
+                if i != 1:
+                    serie.cerrar_mes(anio, mes, valores[i], umbral=UMBRAL)
+            serie.cerrar_mes(*meses[1], valores[1], umbral=UMBRAL)
+            _comparar(serie.acumulado(*meses[-1]), _esperado(valores))
+
+            # Corrección del tercer mes
+            valores[2] = 97.0
+            serie.cerrar_mes(*meses[2], valores[2], umbral=UMBRAL)
+            for i, (anio, mes) in enumerate(meses):
+                _comparar(serie.acumulado(anio, mes), _esperado(valores[:i + 1]))
+            print("   [OK] Correcciones y meses fuera de orden")
+
+            agregados = serie.importar_historico([
+                {"mes": "Octubre 2024", "disponibilidad": 99.3, "observaciones": "Inicio"},
+                {"mes": f"{config.MESES[meses[0][1]]} {meses[0][0]}", "disponibilidad": 10.0},
+                {"mes": "Mes inválido", "disponibilidad": 1.0},
+            ], umbral=UMBRAL)
+            assert agregados == 1
+            _comparar(serie.acumulado(*meses[-1]), _esperado([99.3] + valores))
+            assert serie.historico(2024, 10, 1)[0]["observaciones"] == "Inicio"
+            print("   [OK] Importación de histórico sin sobrescribir meses cerrados")
+        finally:
+            serie.cerrar()
+
+
+def test_seccion3_usa_serie():
+    """Solo la generación del informe cierra el mes; la carga de datos es de solo lectura"""
+    from src.generadores.seccion_3_ans import GeneradorSeccion3
+
+    fuentes_original, serie_original = config.FUENTES_DIR, config.ANS_SERIE_DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        config.FUENTES_DIR = Path(tmp)
+        config.ANS_SERIE_DB_PATH = Path(tmp) / "ans_mensual.db"
+        try:
+            historico_json = [
+                {"mes": f"{config.MESES[m]} {a}", "disponibilidad": 99.0 + i / 10, "observaciones": "-"}
+                for i, (a, m) in enumerate(_meses(n=10))
+            ]
+            (Path(tmp) / "ans_9_2025.json").write_text(json.dumps({
+                "disponibilidad_porcentaje": 98.5, "horas_totales": 1000, "horas_operativas": 985,
+                "disponibilidad_por_localidad": [{"localidad": "SUBA", "disponibilidad": 98.5},
+                                                 {"nombre": "KENNEDY", "disponibilidad": 97.0}],
+                "historico_ans": historico_json,
+            }), encoding="utf-8")
+
+            # Vista previa / snapshot / benchmark: no se escribe en la serie
+            previa = GeneradorSeccion3(2025, 9)
+            previa.cargar_datos()
+            assert not config.ANS_SERIE_DB_PATH.exists()
+            assert previa.datos["historico_ans"] == historico_json and "ans_acumulado" not in previa.datos
+
+            gen = GeneradorSeccion3(2025, 9)
+            gen.registrar_resultados = True
+            gen.cargar_datos()
+
+            # Con el mes ya cerrado, la carga de solo lectura toma los datos de la serie
+            lectura = GeneradorSeccion3(2025, 9)
+            lectura.cargar_datos()
+            assert lectura.datos["ans_acumulado"] == gen.datos["ans_acumulado"]
+            serie = get_serie_ans()
+            localidades = serie.ranking(2025, 9)
+        finally:
+            config.FUENTES_DIR, config.ANS_SERIE_DB_PATH = fuentes_original, serie_original
+
+        assert [h["mes"] for h in gen.datos["historico_ans"]][-1] == "Septiembre 2025"
+        assert len(gen.datos["historico_ans"]) == 11
+        _comparar(gen.datos["ans_acumulado"], _esperado([h["disponibilidad"] for h in historico_json] + [98.5]))
+        assert [l["localidad"] for l in localidades] == ["SUBA", "KENNEDY"]
+        assert serie.acumulado(2025, 9, "localidad", "SUBA")["meses"] == 1
+        gen.generar()
+        serie.cerrar()
+    print("   [OK] Sección 3 con histórico y resumen acumulado desde la serie")
+
+
+if __name__ == "__main__":
+    test_cierre_incremental()
+    test_correccion_y_meses_fuera_de_orden()
+    test_seccion3_usa_serie()
@@ -0,0 +1,84 @@
+"""
+Script de prueba para validar el arranque diferido de la CLI y la API
+(registro de generadores y selección de secciones)
+"""
+import argparse
+from benchmark_arranque import MODULOS_ARRANQUE, medir_importacion, tiempo_total_ms
+
+
+def test_arranque_sin_dependencias_pesadas():
+    """Importar main o app no carga python-docx, pandas, OpenAI ni MongoDB"""
+    print("=" * 70)
+    print("PRUEBA ARRANQUE - IMPORTACIONES DIFERIDAS")
+    print("=" * 70)
+
+    for modulo, prohibidos in MODULOS_ARRANQUE.items():
+        registros, cargados = medir_importacion(modulo)
+        assert not [m for m in prohibidos if m in cargados], f"{modulo} carga dependencias pesadas"
+        print(f"   [OK] import {modulo}: {tiempo_total_ms(registros, modulo):.1f} ms")
+
+
+def test_registro_generadores():
+    """Las clases se resuelven bajo demanda desde el registro"""
+    from src.generadores import obtener_generador, secciones_disponibles, GeneradorSeccion12
+
+    assert secciones_disponibles() == list(range(1, 15))
+    assert obtener_generador(12) is GeneradorSeccion12
+    assert obtener_generador(3).__name__ == "GeneradorSeccion3"
+    try:
+        obtener_generador(15)
+        assert False, "Debió fallar con sección inexistente"
+    except ValueError:
+        pass
+    print("   [OK] Registro de generadores")
+
+
+def test_parsear_secciones():
+    """--secciones 2,3,8"""
+    from main import parsear_secciones
+
+    assert parsear_secciones("2,3,8") == [2, 3, 8]
+    assert parsear_secciones(" 8, 2,8 ") == [8, 2]
+    assert parsear_secciones("1,,8") == [1, 8]
+    for invalido in ("0", "15", "a", ","):
+        try:
+            parsear_secciones(invalido)
+            assert False, f"Debió rechazar '{invalido}'"
+        except argparse.ArgumentTypeError:
+            pass
+    print("   [OK] Selección de secciones")
+
+
+def test_validaciones_compartidas_con_api():
+    """El API valida secciones y periodo con las mismas reglas que la CLI"""
+    import config
+    from main import validar_periodo
+    from src.services.informes_service import get_informes_service
+
+    service = get_informes_service()
+    assert service.parsear_secciones("1,,8") == [1, 8]
+    assert service.parsear_secciones("") is None
+    for invalido in ("0", "a", ","):
+        try:
+            service.parsear_secciones(invalido)
+            assert False, f"Debió rechazar '{invalido}'"
+        except ValueError:
+            pass
+
+    for anio, mes in ((2024, 10), (2024, 11), (2025, 10), (2025, 11)):
+        en_rango = validar_periodo(anio, mes)
+        assert en_rango == config.periodo_en_contrato(anio, mes)
+        try:
+            service.validar_periodo(anio, mes)
+            assert en_rango
+        except ValueError:
+            assert not en_rango
+    assert config.get_rango_periodos_texto() == "Noviembre 2024 - Octubre 2025"
+    print("   [OK] Validaciones compartidas entre CLI y API")
+
+
+if __name__ == "__main__":
+    test_arranque_sin_dependencias_pesadas()
+    test_registro_generadores()
+    test_parsear_secciones()
+    test_validaciones_compartidas_con_api()
@@ -0,0 +1,90 @@
+"""
+Script de prueba para el benchmark de secciones con fuentes sintéticas
+(benchmark_secciones.py)
+"""
+import json
+import tempfile
+from pathlib import Path
+import pandas as pd
+from benchmark_secciones import (
+    ETAPA_ENSAMBLADO, comparar, ejecutar_benchmark, generar_fuentes_sinteticas, volumenes
+)
+from src.extractores.glpi_almacen import AlmacenTicketsGLPI
+
+
+def test_fuentes_sinteticas():
+    """Los volúmenes pedidos llegan a cada fuente con el formato que leen los generadores"""
+    print("=" * 70)
+    print("PRUEBA BENCHMARK DE SECCIONES")
+    print("=" * 70)
+
+    escala = volumenes(0.01, tickets=500)
+    assert escala["obligaciones"] == 100 and escala["tickets"] == 500 and escala["riesgos"] == 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fuentes = Path(tmp) / "fuentes"
+        ruta_glpi = Path(tmp) / "glpi.db"
+        registros = generar_fuentes_sinteticas(fuentes, 2025, 9, escala, ruta_glpi=ruta_glpi)
+
+        obligaciones = json.loads((fuentes / "obligaciones_9_2025.json").read_text(encoding="utf-8"))
+        assert sum(len(v) for v in obligaciones.values()) == 100
+        laboratorio = json.loads((fuentes / "laboratorio_9_2025.json").read_text(encoding="utf-8"))
+        assert laboratorio["estadisticas"]["equipos_recibidos"] == escala["equipos"]
+        assert len(pd.read_csv(fuentes / "matriz_riesgos.csv")) == escala["riesgos"]
+        eventos = pd.read_csv(fuentes / "eventos_camaras_9_2025.csv")
+        assert list(eventos.columns) == ["id_camara", "inicio", "fin", "estado"]
+        assert len(eventos) == escala["camaras"] * 5
+
+        almacen = AlmacenTicketsGLPI(ruta_glpi)
+        try:
+            assert almacen.contar_tickets_mes(9, 2025) == registros["tickets"] == 500
+        finally:
+            almacen.cerrar()
+
+        # Misma semilla -> mismos datos
+        generar_fuentes_sinteticas(Path(tmp) / "otra", 2025, 9, escala)
+        assert (Path(tmp) / "otra" / "matriz_riesgos.csv").read_bytes() == (fuentes / "matriz_riesgos.csv").read_bytes()
+    print(f"   [OK] Fuentes sintéticas: {registros}")
+
+
+def test_benchmark_escala_reducida():
+    """Cada sección y el ensamblado se miden en su propio subproceso"""
+    resultado = ejecutar_benchmark([2, 3, 5, 9], volumenes(0.01))
+    etapas = resultado["resultados"]
+    assert list(etapas) == ["seccion_2", "seccion_3", "seccion_5", "seccion_9", ETAPA_ENSAMBLADO]
+    for nombre, metricas in etapas.items():
+        assert "error" not in metricas, f"{nombre}: {metricas}"
+        assert metricas["tiempo_s"] > 0 and metricas["tamano_kb"] > 0
+    assert etapas[ETAPA_ENSAMBLADO]["tamano_kb"] >= max(m["tamano_kb"] for m in etapas.values()) * 0.9
+    assert resultado["escala"]["tickets"] == 1000
+    json.dumps(resultado)  # La línea base se puede guardar como JSON
+    print(f"   [OK] {len(etapas)} etapas medidas (commit {resultado['commit']})")
+
+
+def test_comparar_detecta_regresiones():
+    """Regresiones por tolerancia relativa + mínimo absoluto, y etapas que ahora fallan"""
+    escala = volumenes(0.1)
+    base = {"escala": escala, "resultados": {
+        "seccion_1": {"tiempo_s": 10.0, "rss_pico_mb": 200.0, "tamano_kb": 500.0},
+        "seccion_2": {"tiempo_s": 0.05, "rss_pico_mb": 90.0, "tamano_kb": 40.0},
+        "seccion_3": {"tiempo_s": 1.0, "rss_pico_mb": 100.0, "tamano_kb": 40.0},
+        "seccion_4": {"error": "timeout"},
+    }}
+    actual = {"escala": escala, "resultados": {
+        "seccion_1": {"tiempo_s": 13.0, "rss_pico_mb": 205.0, "tamano_kb": 500.0},
+        "seccion_2": {"tiempo_s": 0.12, "rss_pico_mb": 91.0, "tamano_kb": 40.0},  # x2.4 pero < 0.25 s
+        "seccion_3": {"error": "KeyError: 'ticket'"},
+        "seccion_4": {"tiempo_s": 1.0, "rss_pico_mb": 100.0, "tamano_kb": 40.0},
+    }}
+    regresiones = comparar(base, actual, tolerancia=0.2)
+    assert [(r["etapa"], r["metrica"]) for r in regresiones] == [("seccion_1", "tiempo_s"), ("seccion_3", "error")]
+    assert regresiones[0]["variacion"] == 0.3
+    assert comparar(base, actual, tolerancia=0.5) == [regresiones[1]]
+    assert comparar(actual, actual) == []
+    print("   [OK] Comparación de líneas base")
+
+
+if __name__ == "__main__":
+    test_fuentes_sinteticas()
+    test_benchmark_escala_reducida()
+    test_comparar_detecta_regresiones()
@@ -0,0 +1,194 @@
+"""
+Script de prueba para validar el motor de disponibilidad desde intervalos
+de caída y mantenimiento (src/utils/disponibilidad.py)
+"""
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import config
+from src.utils.disponibilidad import calcular_disponibilidad, fusionar_intervalos
+
+T = pd.Timestamp
+
+
+def test_caso_manual():
+    """Solapes, recorte al mes y exclusión de mantenimiento"""
+    print("=" * 70)
+    print("PRUEBA MOTOR DE DISPONIBILIDAD")
+    print("=" * 70)
+
+    camaras = pd.DataFrame({
+        "id_camara": ["A", "B", "C"],
+        "localidad": ["KENNEDY", "KENNEDY", "SUBA"],
+        "subsistema": ["DOMO PTZ", "CÁMARA FIJA", "DOMO PTZ"],
+    })
+    eventos = pd.DataFrame([
+        # A: dos caídas solapadas 10:00-14:00 y 12:00-16:00 -> 6 h
+        ("A", T("2025-09-02 10:00"), T("2025-09-02 14:00"), "Falla"),
+        ("A", T("2025-09-02 12:00"), T("2025-09-02 16:00"), "Fuera de línea"),
+        # A: mantenimiento 15:00-18:00 -> 3 h excluidas, 1 h de caída solapada se descuenta
+        ("A", T("2025-09-02 15:00"), T("2025-09-02 18:00"), "Preventivo"),
+        # B: caída que empieza en agosto -> solo cuentan 2 h de septiembre
+        ("B", T("2025-08-31 20:00"), T("2025-09-01 02:00"), "Falla"),
+        # B: evento operativo (se ignora) y caída posterior al mes
+        ("B", T("2025-09-10 00:00"), T("2025-09-11 00:00"), "Operativa"),
+        ("B", T("2025-10-01 00:00"), T("2025-10-01 05:00"), "Falla"),
+    ], columns=["id_camara", "inicio", "fin", "estado"])
+
+    resultado = calcular_disponibilidad(eventos, 2025, 9, camaras)
+    por_camara = resultado["por_camara"].set_index("id_camara")
+
+    assert por_camara.loc["A", "horas_mantenimiento"] == 3
+    assert por_camara.loc["A", "horas_no_operativas"] == 5
+    assert por_camara.loc["A", "horas_totales"] == 720 - 3
+    assert por_camara.loc["B", "horas_no_operativas"] == 2
+    assert por_camara.loc["C", "disponibilidad"] == 100
+    print("   [OK] Solapes fusionados, recorte al mes y mantenimiento excluido")
+
+    resumen = resultado["resumen"]
+    assert resumen["total_camaras"] == 3
+    assert resumen["horas_totales"] == 3 * 720 - 3
+    assert resumen["horas_no_operativas"] == 7
+    assert abs(resumen["disponibilidad_porcentaje"] - (2157 - 7) / 2157 * 100) < 1e-9
+
+    localidades = resultado["por_localidad"].set_index("localidad")
+    assert localidades.loc["KENNEDY", "total_camaras"] == 2
+    assert localidades.loc["KENNEDY", "horas_no_operativas"] == 7
+    assert list(resultado["por_localidad"]["localidad"]) == ["SUBA", "KENNEDY"]
+    assert set(resultado["por_subsistema"]["subsistema"]) == {"DOMO PTZ", "CÁMARA FIJA"}
+    print(f"   [OK] Disponibilidad total {resumen['disponibilidad_porcentaje']:.4f}%")
+
+
+def test_eventos_abiertos_e_inventario_duplicado():
+    """Un evento sin fin cuenta hasta el cierre del mes; cámaras repetidas se cuentan una vez"""
+    camaras = pd.DataFrame({
+        "id_camara": ["A", "B", "A"],
+        "localidad": ["KENNEDY", "SUBA", "KENNEDY"],
+        "subsistema": ["DOMO PTZ", "DOMO PTZ", "DOMO PTZ"],
+    })
+    eventos = pd.DataFrame({
+        "id_camara": ["A"],
+        "inicio": [T("2025-09-30 14:00")],
+        "fin": [pd.NaT],
+        "estado": ["Falla"],
+    })
+
+    resultado = calcular_disponibilidad(eventos, 2025, 9, camaras)
+    por_camara = resultado["por_camara"].set_index("id_camara")
+    assert resultado["resumen"]["total_camaras"] == 2
+    assert por_camara.loc["A", "horas_no_operativas"] == 10
+    assert por_camara.loc["B", "disponibilidad"] == 100
+    print("   [OK] Evento abierto contado hasta fin de mes e inventario deduplicado")
+
+
+def test_fusionar_intervalos():
+    """Intervalos solapados o contiguos se fusionan por cámara"""
+    intervalos = pd.DataFrame({
+        "id_camara": ["A", "A", "A", "B", "A"],
+        "inicio": [1, 2, 10, 2, 5],
+        "fin": [4, 5, 12, 3, 6],
+    })
+    fusionados = fusionar_intervalos(intervalos)
+    assert fusionados.values.tolist() == [["A", 1, 6], ["A", 10, 12], ["B", 2, 3]]
+    print("   [OK] Fusión de intervalos")
+
+
+def test_contra_calculo_por_minuto():
+    """El barrido vectorizado coincide con un cálculo minuto a minuto"""
+    rng = np.random.default_rng(11)
+    n_camaras, n_eventos = 20, 400
+    origen = T("2025-02-01")
+    minutos_mes = 28 * 24 * 60
+
+    inicio_min = rng.integers(-600, minutos_mes, n_eventos)
+    duracion_min = rng.integers(1, 2000, n_eventos)
+    eventos = pd.DataFrame({
+        "id_camara": [f"C{i}" for i in rng.integers(0, n_camaras, n_eventos)],
+        "inicio": origen + pd.to_timedelta(inicio_min, unit="min"),
+        "fin": origen + pd.to_timedelta(inicio_min + duracion_min, unit="min"),
+        "estado": rng.choice(["Falla", "Correctivo", "No operativa"], n_eventos),
+    })
+    camaras = pd.DataFrame({"id_camara": [f"C{i}" for i in range(n_camaras)], "localidad": "X"})
+    resultado = calcular_disponibilidad(eventos, 2025, 2, camaras).get("por_camara").set_index("id_camara")
+
+    for camara in camaras["id_camara"]:
+        caida = np.zeros(minutos_mes, dtype=bool)
+        mantenimiento = np.zeros(minutos_mes, dtype=bool)
+        for _, e in eventos[eventos["id_camara"] == camara].iterrows():
+            a = max(int((e["inicio"] - origen).total_seconds() // 60), 0)
+            b = min(int((e["fin"] - origen).total_seconds() // 60), minutos_mes)
+            if b > a:
+                (mantenimiento if e["estado"] == "Correctivo" else caida)[a:b] = True
+        assert abs(resultado.loc[camara, "horas_mantenimiento"] - mantenimiento.sum() / 60) < 1e-9
+        assert abs(resultado.loc[camara, "horas_no_operativas"] - (caida & ~mantenimiento).sum() / 60) < 1e-9
+    print("   [OK] Coincide con el cálculo minuto a minuto")
+
+
+def test_volumen():
+    """Un millón de intervalos en pocos segundos"""
+    rng = np.random.default_rng(3)
+    n_camaras, n_eventos = 6000, 1_000_000
+    origen = T("2025-09-01")
+    inicio = origen + pd.to_timedelta(rng.integers(0, 30 * 24 * 3600, n_eventos), unit="s")
+    eventos = pd.DataFrame({
+        "id_camara": rng.integers(0, n_camaras, n_eventos),
+        "inicio": inicio,
+        "fin": inicio + pd.to_timedelta(rng.integers(60, 4 * 3600, n_eventos), unit="s"),
+        "estado": rng.choice(["Falla", "Preventivo"], n_eventos, p=[0.9, 0.1]),
+    })
+    camaras = pd.DataFrame({
+        "id_camara": np.arange(n_camaras),
+        "localidad": np.arange(n_camaras) % 20,
+        "subsistema": np.arange(n_camaras) % 4,
+    })
+
+    inicio_calculo = time.perf_counter()
+    resultado = calcular_disponibilidad(eventos, 2025, 9, camaras)
+    duracion = time.perf_counter() - inicio_calculo
+
+    assert len(resultado["por_localidad"]) == 20
+    assert 0 < resultado["resumen"]["disponibilidad_porcentaje"] < 100
+    assert duracion < 30
+    print(f"   [OK] {n_eventos:,} eventos en {duracion:.2f} s")
+
+
+def test_seccion3_desde_eventos():
+    """La Sección 3 recalcula la disponibilidad si hay eventos crudos"""
+    from src.generadores.seccion_3_ans import GeneradorSeccion3
+
+    fuentes_original, serie_original = config.FUENTES_DIR, config.ANS_SERIE_DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        config.FUENTES_DIR = Path(tmp)
+        config.ANS_SERIE_DB_PATH = Path(tmp) / "ans_mensual.db"
+        try:
+            pd.DataFrame({
+                "id_camara": ["A", "B"], "inicio": ["2025-09-02 10:00", "2025-09-03 00:00"],
+                "fin": ["2025-09-02 22:00", "2025-09-03 06:00"], "estado": ["Falla", "Preventivo"],
+            }).to_csv(Path(tmp) / "eventos_camaras_9_2025.csv", index=False)
+            pd.DataFrame({
+                "id_camara": ["A", "B", "C"], "localidad": ["KENNEDY", "SUBA", "SUBA"],
+                "subsistema": ["DOMO PTZ"] * 3,
+            }).to_csv(Path(tmp) / "inventario_camaras.csv", index=False)
+
+            gen = GeneradorSeccion3(2025, 9)
+            gen.cargar_datos()
+        finally:
+            config.FUENTES_DIR, config.ANS_SERIE_DB_PATH = fuentes_original, serie_original
+
+    assert gen.datos["total_camaras"] == 3
+    assert gen.datos["horas_no_operativas"] == 12
+    assert gen.datos["horas_totales"] == 3 * 720 - 6
+    assert [l["localidad"] for l in gen.datos["disponibilidad_por_localidad"]] == ["SUBA", "KENNEDY"]
+    assert abs(gen.disponibilidad - (2154 - 12) / 2154 * 100) < 1e-9
+    print(f"   [OK] Sección 3 recalculada desde eventos: {gen.disponibilidad:.3f}%")
+
+
+if __name__ == "__main__":
+    test_caso_manual()
+    test_eventos_abiertos_e_inventario_duplicado()
+    test_fusionar_intervalos()
+    test_contra_calculo_por_minuto()
+    test_volumen()
+    test_seccion3_desde_eventos()
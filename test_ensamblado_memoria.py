@@ -0,0 +1,84 @@
+"""
+Script de prueba para el ensamblado del informe en memoria: documento() y
+a_bytes() de los generadores y generar_informe sin archivos por sección
+"""
+import tempfile
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from docx import Document
+import config
+import main
+from src.generadores.seccion_4_bienes import GeneradorSeccion4
+from src.generadores.seccion_5_laboratorio import GeneradorSeccion5
+from src.generadores.seccion_8_presupuesto import GeneradorSeccion8
+from src.utils.docx_streaming import PARTE_DOCUMENTO
+
+
+def _datos_laboratorio(n: int) -> dict:
+    return {
+        "estadisticas": {"equipos_recibidos": n},
+        "equipos_reparados": [{"tipo_equipo": "Cámara", "serial": f"R-{i}", "fecha_ingreso": "01/09/2025"}
+                              for i in range(n)],
+    }
+
+
+def test_documento_y_bytes():
+    """Las secciones docxtpl y python-docx se obtienen en memoria"""
+    print("=" * 70)
+    print("PRUEBA ENSAMBLADO EN MEMORIA")
+    print("=" * 70)
+
+    for clase in (GeneradorSeccion4, GeneradorSeccion8):
+        documento = clase(2025, 9).documento()
+        paquete = clase(2025, 9).a_bytes()
+        assert len(Document(BytesIO(paquete)).paragraphs) == len(documento.paragraphs)
+        print(f"   [OK] {clase.__name__}: {len(paquete) / 1024:.1f} KB en memoria")
+
+    # Sección 5 con tablas diferidas: el paquete en memoria ya trae las filas
+    generador = GeneradorSeccion5(2025, 9, streaming=True)
+    generador.datos = _datos_laboratorio(50)
+    with zipfile.ZipFile(BytesIO(generador.a_bytes())) as paquete:
+        xml = paquete.read(PARTE_DOCUMENTO).decode("utf-8")
+    assert "__TABLA_DIFERIDA_" not in xml and "R-49" in xml
+    print("   [OK] Sección 5 con tablas diferidas en memoria")
+
+
+def test_informe_sin_archivos_de_seccion():
+    """El informe completo se escribe una vez; las secciones solo con guardar_secciones"""
+    output_original = config.OUTPUT_DIR
+    disponibles_original = main.secciones_disponibles
+    umbral_original = GeneradorSeccion5.UMBRAL_FILAS_STREAMING
+    with tempfile.TemporaryDirectory() as tmp:
+        config.OUTPUT_DIR = Path(tmp)
+        main.secciones_disponibles = lambda: [4, 5]
+        GeneradorSeccion5.UMBRAL_FILAS_STREAMING = 0  # Tablas de la Sección 5 en streaming
+        try:
+            informe = main.generar_informe(2025, 9, 1)
+            directorio = informe.parent
+            assert not list(directorio.glob("seccion_*.docx"))
+
+            con_secciones = main.generar_informe(2025, 9, 2, guardar_secciones=True)
+            archivos = sorted(p.name for p in directorio.glob("seccion_*.docx"))
+            tablas_secciones = sum(len(Document(directorio / nombre).tables) for nombre in archivos)
+
+            final = Document(informe)
+            textos = [p.text for p in final.paragraphs]
+            tablas_informe = len(final.tables)
+            tablas_v2 = len(Document(con_secciones).tables)
+        finally:
+            config.OUTPUT_DIR = output_original
+            main.secciones_disponibles = disponibles_original
+            GeneradorSeccion5.UMBRAL_FILAS_STREAMING = umbral_original
+
+    assert archivos == ["seccion_4_bienes_servicios.docx", "seccion_5_laboratorio.docx"]
+    assert tablas_informe == tablas_v2 == tablas_secciones > 0
+    assert not any("__TABLA_DIFERIDA_" in texto for texto in textos)
+    assert any("LABORATORIO" in texto.upper() for texto in textos)
+    print(f"   [OK] Informe ensamblado en memoria ({tablas_informe} tablas); "
+          f"--guardar-secciones escribe {len(archivos)} archivos")
+
+
+if __name__ == "__main__":
+    test_documento_y_bytes()
+    test_informe_sin_archivos_de_seccion()
@@ -0,0 +1,133 @@
+"""
+Script de prueba para la escritura atómica, el bloqueo entre procesos
+(src/utils/escritura_segura.py) y la coalescencia de generaciones concurrentes
+del mismo informe en main.generar_informe
+"""
+import multiprocessing
+import tempfile
+import threading
+import time
+from pathlib import Path
+import config
+import main
+from src.utils.escritura_segura import BloqueoOcupado, bloqueo_archivo, escribir_atomico, escribir_texto_atomico
+
+
+def _retener_bloqueo(ruta: str, tomado, segundos: float) -> None:
+    with bloqueo_archivo(ruta):
+        tomado.set()
+        time.sleep(segundos)
+
+
+def test_escritura_atomica():
+    """Escritores concurrentes y fallidos nunca dejan un archivo a medias"""
+    print("=" * 70)
+    print("PRUEBA ESCRITURA CONCURRENTE")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = Path(tmp) / "salida" / "seccion.csv"
+        escribir_texto_atomico(destino, "original")
+
+        def fallar(ruta: Path) -> None:
+            ruta.write_text("incompleto", encoding="utf-8")
+            raise OSError("disco lleno")
+
+        try:
+            escribir_atomico(destino, fallar)
+            raise AssertionError("Se esperaba OSError")
+        except OSError:
+            pass
+        assert destino.read_text(encoding="utf-8") == "original"
+
+        contenidos = [str(i) * 200_000 for i in range(8)]
+        hilos = [threading.Thread(target=escribir_texto_atomico, args=(destino, c)) for c in contenidos]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        assert destino.read_text(encoding="utf-8") in contenidos
+        assert [p.name for p in destino.parent.iterdir()] == ["seccion.csv"]
+    print("   [OK] Sin archivos parciales ni temporales huérfanos")
+
+
+def test_bloqueo_entre_procesos():
+    """El bloqueo espera a otro proceso e indica que hubo que esperar"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = str(Path(tmp) / ".informe.lock")
+        tomado = multiprocessing.Event()
+        proceso = multiprocessing.Process(target=_retener_bloqueo, args=(ruta, tomado, 0.5))
+        proceso.start()
+        try:
+            assert tomado.wait(10)
+            try:
+                with bloqueo_archivo(ruta, timeout=0.05):
+                    raise AssertionError("Se esperaba BloqueoOcupado")
+            except BloqueoOcupado:
+                pass
+            inicio = time.perf_counter()
+            with bloqueo_archivo(ruta) as espero:
+                espera = time.perf_counter() - inicio
+        finally:
+            proceso.join()
+        with bloqueo_archivo(ruta) as espero_libre:
+            pass
+
+    assert espero and espera >= 0.2
+    assert not espero_libre
+    print(f"   [OK] Timeout vencido y bloqueo liberado por el otro proceso tras {espera:.2f} s")
+
+
+def test_generaciones_concurrentes_coalescen():
+    """Dos generaciones del mismo informe: una construye, la otra reutiliza el resultado"""
+    output_original = config.OUTPUT_DIR
+    fuentes_original = config.FUENTES_DIR
+    disponibles_original = main.secciones_disponibles
+    construir_original = main._construir_informe
+    construcciones = []
+    en_curso = threading.Event()
+
+    def construir_contando(*args, **kwargs):
+        construcciones.append(1)
+        en_curso.set()
+        time.sleep(0.3)  # La segunda petición llega con la primera en curso
+        return construir_original(*args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.OUTPUT_DIR = Path(tmp)
+        config.FUENTES_DIR = Path(tmp) / "fuentes"
+        main.secciones_disponibles = lambda: [8]
+        main._construir_informe = construir_contando
+        resultados = []
+        try:
+            primera = threading.Thread(target=lambda: resultados.append(main.generar_informe(2025, 9, 1)))
+            primera.start()
+            assert en_curso.wait(30)
+            segunda = main.generar_informe(2025, 9, 1)
+            primera.join()
+
+            # Con otras opciones el informe del otro no sirve: se construye tras esperar
+            en_curso.clear()
+            tercera = threading.Thread(target=lambda: resultados.append(main.generar_informe(2025, 9, 1)))
+            tercera.start()
+            assert en_curso.wait(30)
+            con_secciones = main.generar_informe(2025, 9, 1, guardar_secciones=True)
+            tercera.join()
+            otra_version = main.generar_informe(2025, 9, 2)
+        finally:
+            config.OUTPUT_DIR = output_original
+            config.FUENTES_DIR = fuentes_original
+            main.secciones_disponibles = disponibles_original
+            main._construir_informe = construir_original
+
+    assert resultados[0] is not None and segunda == resultados[0]
+    assert con_secciones == resultados[1]
+    assert otra_version is not None and otra_version != segunda
+    assert len(construcciones) == 4  # v1 simple una vez, v1 otra vez y con secciones, v2 aparte
+    print("   [OK] La generación concurrente reutilizó el informe solo con las mismas opciones")
+
+
+if __name__ == "__main__":
+    test_escritura_atomica()
+    test_bloqueo_entre_procesos()
+    test_generaciones_concurrentes_coalescen()
@@ -0,0 +1,118 @@
+"""
+Script de prueba para validar la lectura en streaming de los Excel de la
+Sección 4 (src/extractores/excel_extractor.py)
+"""
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+from openpyxl import Workbook
+from src.extractores.excel_extractor import ExcelExtractor, leer_hojas
+
+
+def _crear_libro(ruta: Path, hoja_datos: str, encabezados, filas, comunicado=None):
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet(hoja_datos)
+    hoja.append(encabezados)
+    for fila in filas:
+        hoja.append(fila)
+    if comunicado is not None:
+        meta = libro.create_sheet("Comunicado")
+        meta.append(list(comunicado.keys()))
+        meta.append(list(comunicado.values()))
+    libro.save(ruta)
+
+
+def test_entradas_y_bolsa():
+    """Items y comunicado en una sola lectura, con valores vacíos y tipos mixtos"""
+    print("=" * 70)
+    print("PRUEBA LECTOR EXCEL EN STREAMING")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        _crear_libro(
+            base / "entradas_almacen_9_2025.xlsx", "Items",
+            ["descripcion", "cantidad", "unidad", "valor_unitario", "valor_total"],
+            [["Cámara PTZ", 2, "UN", 1500000, 3000000],
+             ["Cable UTP", "10", None, 2500.5, None],
+             [None, None, None, None, None]],
+            {"numero": "GSC-7444969-2025", "titulo": "Entradas", "fecha": datetime(2025, 9, 5)},
+        )
+        _crear_libro(
+            base / "inclusiones_bolsa_septiembre_2025.xlsx", "Items",
+            ["descripcion", "cantidad", "valor_total", "justificacion"],
+            [["Switch", 1, 900000, "Reposición"]],
+            {"numero": "GSC-1", "titulo": "Bolsa", "fecha": "2025-09-10", "estado": "Aprobado"},
+        )
+
+        extractor = ExcelExtractor(base)
+        entradas = extractor.get_entradas_almacen(2025, 9)
+        assert entradas["items"] == [
+            {"descripcion": "Cámara PTZ", "cantidad": 2, "unidad": "UN",
+             "valor_unitario": 1500000.0, "valor_total": 3000000.0},
+            {"descripcion": "Cable UTP", "cantidad": 10, "unidad": "UN",
+             "valor_unitario": 2500.5, "valor_total": 0.0},
+        ]
+        assert type(entradas["items"][0]["cantidad"]) is int
+        assert entradas["comunicado"] == {
+            "numero": "GSC-7444969-2025", "titulo": "Entradas", "fecha": "2025-09-05 00:00:00"
+        }
+        print("   [OK] Entradas al almacén con coerción de columnas")
+
+        bolsa = extractor.get_inclusiones_bolsa(2025, 9)
+        assert bolsa["estado"] == "Aprobado"
+        assert bolsa["items"][0]["unidad"] == "UN"
+        assert bolsa["items"][0]["justificacion"] == "Reposición"
+        print("   [OK] Inclusiones a la bolsa (columnas faltantes con valor por defecto)")
+
+
+def test_equipos_sin_comunicado():
+    """La hoja Comunicado es opcional"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        _crear_libro(
+            base / "equipos_no_operativos_9_2025.xlsx", "Equipos",
+            ["descripcion", "serial", "cantidad", "motivo", "valor"],
+            [["Domo", 12345, None, "Vandalismo", 800000]],
+        )
+        equipos = ExcelExtractor(base).get_equipos_no_operativos(2025, 9)
+        assert equipos["comunicado"] == {}
+        assert equipos["equipos"] == [
+            {"descripcion": "Domo", "serial": "12345", "cantidad": 1, "motivo": "Vandalismo", "valor": 800000.0}
+        ]
+        assert ExcelExtractor(base).get_entradas_almacen(2025, 9)["items"] == []
+        print("   [OK] Equipos no operativos sin hoja Comunicado")
+
+
+def test_volumen():
+    """Libro grande: una sola apertura frente a dos pd.read_excel"""
+    n = 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "entradas_almacen_9_2025.xlsx"
+        _crear_libro(
+            ruta, "Items", ["descripcion", "cantidad", "unidad", "valor_unitario", "valor_total"],
+            ([f"Item {i}", i % 7, "UN", i * 1.5, i * 10.5] for i in range(n)),
+            {"numero": "1", "titulo": "T", "fecha": "2025-09-01"},
+        )
+
+        inicio = time.perf_counter()
+        entradas = ExcelExtractor(Path(tmp)).get_entradas_almacen(2025, 9)
+        duracion = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        pd.read_excel(ruta, sheet_name="Items")
+        pd.read_excel(ruta, sheet_name="Comunicado")
+        duracion_pandas = time.perf_counter() - inicio
+
+        assert len(entradas["items"]) == n
+        assert entradas["items"][-1]["valor_total"] == (n - 1) * 10.5
+        assert set(leer_hojas(ruta, ("Items", "NoExiste"))) == {"Items"}
+        print(f"   [OK] {n:,} filas en {duracion:.2f} s (pd.read_excel x2: {duracion_pandas:.2f} s)")
+
+
+if __name__ == "__main__":
+    test_entradas_y_bolsa()
+    test_equipos_sin_comunicado()
+    test_volumen()
@@ -0,0 +1,82 @@
+"""
+Script de prueba para el motor de formato colombiano (src/utils/formato_moneda.py):
+conversión a letras memoizada, formato por columnas y filtros Jinja
+"""
+import math
+import pandas as pd
+from src.generadores.seccion_8_presupuesto import GeneradorSeccion8
+from src.utils.formato_moneda import (
+    _entero_a_letras, formatear_columnas_moneda, formato_cantidad, formato_cantidad_serie,
+    formato_moneda_cop, formato_moneda_serie, formato_porcentaje, formato_porcentaje_serie,
+    get_entorno_jinja, numero_a_letras
+)
+
+
+def test_formato_valores():
+    """Moneda, cantidades, porcentajes y letras de un valor"""
+    print("=" * 70)
+    print("PRUEBA MOTOR DE FORMATO COLOMBIANO")
+    print("=" * 70)
+
+    assert formato_moneda_cop(56909324) == "$56.909.324"
+    assert formato_moneda_cop(1250000.6) == "$1.250.001"
+    assert formato_cantidad(1234.5, 2) == "1.234,50"
+    assert formato_porcentaje(98.756) == "98,76%"
+    assert numero_a_letras(56909000) == "CINCUENTA Y SEIS MILLONES NOVECIENTOS NUEVE MIL PESOS M/CTE"
+    assert numero_a_letras(1500.25) == "MIL QUINIENTOS PESOS CON 25/100 M/CTE"
+    assert numero_a_letras(245000, incluir_moneda=False) == "DOSCIENTOS CUARENTA Y CINCO MIL"
+    assert numero_a_letras(math.nan) == "nan"
+    print("   [OK] Formatos de valores individuales")
+
+
+def test_conversion_memoizada():
+    """Los enteros repetidos se convierten con num2words una sola vez"""
+    _entero_a_letras.cache_clear()
+    for _ in range(50):
+        numero_a_letras(18750000)
+        numero_a_letras(18750000.5)
+    info = _entero_a_letras.cache_info()
+    assert info.misses == 1 and info.hits == 99, info
+    print(f"   [OK] {info.hits} conversiones desde caché")
+
+
+def test_formato_columnas():
+    """Las columnas se formatean igual que valor a valor, conservando el índice"""
+    valores = pd.Series([1250000, 18750000, None, 1250000, "x", 0.4], index=list("abcdef"))
+    monedas = formato_moneda_serie(valores)
+    assert list(monedas.index) == list("abcdef")
+    assert monedas.tolist() == ["$1.250.000", "$18.750.000", "", "$1.250.000", "", "$0"]
+    assert formato_cantidad_serie([1234.5], 1).tolist() == ["1.234,5"]
+    assert formato_porcentaje_serie([99.5, 100]).tolist() == ["99,50%", "100,00%"]
+
+    registros = [{"valor_total": 245000}, {"valor_total": 1000}, {}]
+    formatear_columnas_moneda(registros, {"valor_total": "valor_total_formato"})
+    assert [r["valor_total_formato"] for r in registros] == ["$245.000", "$1.000", "$0"]
+    assert formatear_columnas_moneda([], {"valor_total": "valor_total_formato"}) == []
+
+    generador = GeneradorSeccion8(anio=2025, mes=9)
+    generador._generar_datos_dummy()
+    for item in generador.ejecucion_mensual + generador.consolidado:
+        assert item["porcentaje_ejecucion"] > 0
+    assert generador.ejecucion_mensual[0]["presupuesto_formato"] == "$200.000.000"
+    assert generador.compras_bolsa[0]["valor_total_formato"] == "$12.000.000"
+    print("   [OK] Formato por columnas (Series, registros y Sección 8)")
+
+
+def test_filtros_jinja():
+    """Los templates formatean valores con los filtros del entorno compartido"""
+    entorno = get_entorno_jinja()
+    assert entorno is get_entorno_jinja()
+    plantilla = entorno.from_string(
+        "{{ v|moneda }} | {{ c|cantidad }} | {{ p|porcentaje(1) }} | {{ v|letras }} | [{{ falta|moneda }}]"
+    )
+    texto = plantilla.render(v=1000000, c=12345, p=97.25)
+    assert texto == "$1.000.000 | 12.345 | 97,2% | UN MILLÓN PESOS M/CTE | []", texto
+    print(f"   [OK] Filtros Jinja: {texto}")
+
+
+if __name__ == "__main__":
+    test_formato_valores()
+    test_conversion_memoizada()
+    test_formato_columnas()
+    test_filtros_jinja()
@@ -0,0 +1,109 @@
+"""
+Script de prueba para validar la caché compartida de archivos fuente
+(src/extractores/fuentes.py) usada por GLPIExtractor y MySQLExtractor
+"""
+import copy
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import config
+from src.extractores.fuentes import (
+    leer_fuente_json, obtener_campo_fuente, limpiar_cache_fuentes, estadisticas_cache_fuentes
+)
+from src.extractores.glpi_extractor import GLPIExtractor
+
+
+def _escribir(ruta: Path, datos) -> None:
+    ruta.write_text(json.dumps(datos), encoding="utf-8")
+
+
+def test_parseo_unico_e_invalidacion():
+    """Un solo parseo por archivo; se vuelve a parsear si cambia"""
+    print("=" * 70)
+    print("PRUEBA CACHE DE FUENTES")
+    print("=" * 70)
+
+    limpiar_cache_fuentes()
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "ans_9_2025.json"
+        _escribir(ruta, {"disponibilidad_mes": {"disponibilidad_porcentaje": 99.1}, "historico_ans": []})
+
+        for _ in range(10):
+            assert obtener_campo_fuente(ruta, "disponibilidad_mes")["disponibilidad_porcentaje"] == 99.1
+        assert obtener_campo_fuente(ruta, "no_existe", "x") == "x"
+        assert estadisticas_cache_fuentes()["lecturas"] == 1
+        print("   [OK] 11 lecturas, 1 parseo")
+
+        _escribir(ruta, {"disponibilidad_mes": {"disponibilidad_porcentaje": 98.0}})
+        os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 1_000_000))
+        assert obtener_campo_fuente(ruta, "disponibilidad_mes")["disponibilidad_porcentaje"] == 98.0
+        assert estadisticas_cache_fuentes()["lecturas"] == 2
+        print("   [OK] Archivo modificado -> se vuelve a parsear")
+
+        assert leer_fuente_json(Path(tmp) / "no_existe.json") is None
+    limpiar_cache_fuentes()
+
+
+def test_vistas_solo_lectura():
+    """Los datos compartidos no se pueden modificar; las copias sí"""
+    limpiar_cache_fuentes()
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "mesa.json"
+        _escribir(ruta, {"tickets_por_estado": [{"estado": "CERRADO", "cantidad": 198}]})
+        datos = leer_fuente_json(ruta)
+
+        for operacion in (
+            lambda: datos.__setitem__("x", 1),
+            lambda: datos["tickets_por_estado"].append({}),
+            lambda: datos["tickets_por_estado"][0].update(cantidad=0),
+        ):
+            try:
+                operacion()
+                assert False, "Debió rechazar la modificación"
+            except TypeError:
+                pass
+        print("   [OK] Vistas de solo lectura")
+
+        copia = dict(datos)
+        copia["mes"] = "Septiembre"
+        profunda = copy.deepcopy(datos)
+        profunda["tickets_por_estado"][0]["cantidad"] = 0
+        assert type(profunda["tickets_por_estado"]) is list
+        assert datos["tickets_por_estado"][0]["cantidad"] == 198
+        assert json.loads(json.dumps(datos)) == {"tickets_por_estado": [{"estado": "CERRADO", "cantidad": 198}]}
+        print("   [OK] Copias modificables y serialización JSON")
+    limpiar_cache_fuentes()
+
+
+def test_hilos_y_extractor_glpi():
+    """Varios hilos comparten un único parseo; GLPIExtractor usa la caché"""
+    limpiar_cache_fuentes()
+    fuentes_original = config.FUENTES_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        config.FUENTES_DIR = Path(tmp)
+        try:
+            _escribir(Path(tmp) / "mesa_servicio_9_2025.json", {
+                "tickets_por_estado": [{"estado": "CERRADO", "cantidad": 1}],
+                "tickets_por_proyecto": [{"proyecto": "CIUDADANA", "generados": 2, "cerrados": 1, "abiertos": 1}],
+            })
+            glpi = GLPIExtractor()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                resultados = list(executor.map(
+                    lambda i: glpi.get_tickets_por_estado(9, 2025) if i % 2 else glpi.get_tickets_por_proyecto(9, 2025),
+                    range(40)
+                ))
+            assert resultados[1][0]["estado"] == "CERRADO"
+            assert resultados[0][0]["proyecto"] == "CIUDADANA"
+            assert estadisticas_cache_fuentes()["lecturas"] == 1
+            print("   [OK] 40 lecturas concurrentes, 1 parseo")
+        finally:
+            config.FUENTES_DIR = fuentes_original
+    limpiar_cache_fuentes()
+
+
+if __name__ == "__main__":
+    test_parseo_unico_e_invalidacion()
+    test_vistas_solo_lectura()
+    test_hilos_y_extractor_glpi()
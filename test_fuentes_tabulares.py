@@ -0,0 +1,128 @@
+"""
+Script de prueba para validar la caché columnar de fuentes CSV/XLSX
+(src/extractores/fuentes_tabulares.py)
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import src.extractores.fuentes_tabulares as fuentes_tabulares
+from src.extractores.fuentes_tabulares import (
+    leer_fuente_tabla, limpiar_cache_tablas, estadisticas_cache_tablas
+)
+
+
+class _CacheTemporal:
+    """Redirige la caché a un directorio temporal durante la prueba"""
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._original = fuentes_tabulares.CACHE_FUENTES_DIR
+        fuentes_tabulares.CACHE_FUENTES_DIR = Path(self._tmp.name) / "cache"
+        limpiar_cache_tablas()
+        return Path(self._tmp.name)
+
+    def __exit__(self, *exc):
+        fuentes_tabulares.CACHE_FUENTES_DIR = self._original
+        self._tmp.cleanup()
+
+
+def test_conversion_y_aciertos():
+    """La primera lectura convierte, las siguientes leen la copia tipada"""
+    print("=" * 70)
+    print(f"PRUEBA CACHÉ COLUMNAR ({estadisticas_cache_tablas()['formato']})")
+    print("=" * 70)
+
+    with _CacheTemporal() as tmp:
+        ruta = tmp / "ejecucion_presupuestal.csv"
+        pd.DataFrame({
+            "categoria": ["Personal", "Repuestos"], "presupuesto": [100, 200],
+            "ejecutado": [90.5, 150.0], "fecha": ["2025-09-01", "2025-09-02"],
+        }).to_csv(ruta, index=False)
+
+        original = leer_fuente_tabla(ruta, parse_dates=["fecha"])
+        copia = leer_fuente_tabla(ruta, parse_dates=["fecha"])
+        pd.testing.assert_frame_equal(original, copia)
+        assert str(copia["fecha"].dtype).startswith("datetime64")
+        assert estadisticas_cache_tablas()["conversiones"] == 1
+        assert estadisticas_cache_tablas()["aciertos"] == 1
+        print("   [OK] Segunda lectura servida desde la copia tipada")
+
+        proyeccion = leer_fuente_tabla(ruta, columnas=["categoria", "ejecutado", "no_existe"], parse_dates=["fecha"])
+        assert list(proyeccion.columns) == ["categoria", "ejecutado"]
+        print("   [OK] Proyección de columnas (las inexistentes se ignoran)")
+
+        # Otras opciones de lectura -> copia independiente
+        leer_fuente_tabla(ruta)
+        assert estadisticas_cache_tablas()["conversiones"] == 2
+
+
+def test_invalidacion():
+    """mtime nuevo con el mismo contenido no reconvierte; contenido nuevo sí"""
+    with _CacheTemporal() as tmp:
+        ruta = tmp / "anexos.csv"
+        ruta.write_text("nombre,numero\nActa,1\n", encoding="utf-8")
+        leer_fuente_tabla(ruta)
+
+        stat = ruta.stat()
+        os.utime(ruta, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        leer_fuente_tabla(ruta)
+        assert estadisticas_cache_tablas()["conversiones"] == 1
+        print("   [OK] Archivo tocado sin cambios: se valida por hash y no se reconvierte")
+
+        ruta.write_text("nombre,numero\nActa,1\nInforme,2\n", encoding="utf-8")
+        assert len(leer_fuente_tabla(ruta)) == 2
+        assert estadisticas_cache_tablas()["conversiones"] == 2
+        print("   [OK] Contenido modificado: se reconvierte")
+
+        limpiar_cache_tablas()
+        assert len(leer_fuente_tabla(ruta)) == 2
+        assert estadisticas_cache_tablas()["conversiones"] == 1
+
+
+def test_excel():
+    """Las hojas de Excel también se convierten"""
+    with _CacheTemporal() as tmp:
+        ruta = tmp / "matriz.xlsx"
+        with pd.ExcelWriter(ruta) as writer:
+            pd.DataFrame({"a": [1]}).to_excel(writer, sheet_name="Primera", index=False)
+            pd.DataFrame({"riesgo": ["R1", "R2"], "nivel": [3, 5]}).to_excel(writer, sheet_name="Riesgos", index=False)
+        assert leer_fuente_tabla(ruta, hoja="Riesgos")["nivel"].tolist() == [3, 5]
+        assert leer_fuente_tabla(ruta, hoja="Riesgos", columnas=["riesgo"])["riesgo"].tolist() == ["R1", "R2"]
+        assert list(leer_fuente_tabla(ruta).columns) == ["a"]
+        print("   [OK] Hojas de Excel")
+
+
+def test_volumen():
+    """CSV grande: la copia se lee mucho más rápido que el CSV"""
+    with _CacheTemporal() as tmp:
+        ruta = tmp / "eventos.csv"
+        n = 300_000
+        rng = np.random.default_rng(5)
+        pd.DataFrame({
+            "id_camara": rng.integers(0, 5000, n).astype(str),
+            "inicio": pd.Timestamp("2025-09-01") + pd.to_timedelta(rng.integers(0, 2_592_000, n), unit="s"),
+            "estado": rng.choice(["Falla", "Preventivo"], n),
+            "valor": rng.random(n),
+        }).to_csv(ruta, index=False)
+
+        inicio = time.perf_counter()
+        leer_fuente_tabla(ruta, parse_dates=["inicio"], dtype={"id_camara": str})
+        primera = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        df = leer_fuente_tabla(ruta, columnas=["id_camara", "inicio"], parse_dates=["inicio"], dtype={"id_camara": str})
+        segunda = time.perf_counter() - inicio
+
+        assert len(df) == n
+        assert segunda < primera
+        print(f"   [OK] {n:,} filas: conversión {primera:.2f} s, lectura en caché {segunda:.3f} s")
+
+
+if __name__ == "__main__":
+    test_conversion_y_aciertos()
+    test_invalidacion()
+    test_excel()
+    test_volumen()
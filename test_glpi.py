@@ -0,0 +1,219 @@
+"""
+Script de prueba para validar la ingesta REST de GLPI (paginación
+concurrente, sincronización incremental y agregados desde el almacén local)
+contra un servidor GLPI simulado
+"""
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+import config
+from src.extractores.glpi_almacen import AlmacenTicketsGLPI
+from src.extractores.glpi_cliente import GLPIClient
+from src.extractores.glpi_extractor import GLPIExtractor
+
+
+class ServidorGLPIFalso:
+    """apirest.php mínimo: initSession, killSession y search/Ticket"""
+
+    def __init__(self, tickets):
+        self.tickets = tickets
+        self.peticiones = []
+        self.sesiones = 0
+        self.sesion_vigente = None
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, codigo, cuerpo):
+                datos = json.dumps(cuerpo).encode("utf-8")
+                self.send_response(codigo)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                parametros = {k: v[0] for k, v in parse_qs(url.query).items()}
+                servidor.peticiones.append((url.path, parametros))
+                if url.path.endswith("/initSession"):
+                    if self.headers.get("Authorization") != "user_token secreto":
+                        return self._responder(401, ["ERROR_LOGIN"])
+                    servidor.sesiones += 1
+                    servidor.sesion_vigente = f"sesion-{servidor.sesiones}"
+                    return self._responder(200, {"session_token": servidor.sesion_vigente})
+                if self.headers.get("Session-Token") != servidor.sesion_vigente:
+                    return self._responder(401, ["ERROR_SESSION_TOKEN_INVALID"])
+                if url.path.endswith("/killSession"):
+                    return self._responder(200, {})
+                if url.path.endswith("/search/Ticket"):
+                    filas = sorted(servidor.tickets, key=lambda t: t["19"])
+                    if parametros.get("criteria[0][field]") == "19":
+                        filas = [t for t in filas if t["19"] > parametros["criteria[0][value]"]]
+                    inicio, fin = (int(x) for x in parametros["range"].split("-"))
+                    pagina = filas[inicio:fin + 1]
+                    codigo = 200 if len(pagina) == len(filas) else 206
+                    return self._responder(codigo, {"totalcount": len(filas), "count": len(pagina), "data": pagina})
+                self._responder(404, ["ERROR_RESOURCE_NOT_FOUND_NOR_COMMONDBTM"])
+
+        self.http = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.url = f"http://127.0.0.1:{self.http.server_address[1]}/apirest.php"
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def busquedas(self):
+        return [p for ruta, p in self.peticiones if ruta.endswith("/search/Ticket")]
+
+    def detener(self):
+        self.http.shutdown()
+        self.http.server_close()
+
+
+def _ticket(i, estado, apertura, date_mod, entidad="ETB > CIUDADANA", categoria="CCTV > DOMO PTZ"):
+    return {"2": i, "1": f"Ticket {i}", "12": estado, "15": apertura, "16": None,
+            "19": date_mod, "80": entidad, "7": categoria}
+
+
+def _tickets_iniciales(n=2500):
+    tickets = []
+    for i in range(1, n + 1):
+        apertura = f"2025-09-{(i % 28) + 1:02d} 08:00:00" if i <= 2000 else "2025-08-15 08:00:00"
+        tickets.append(_ticket(
+            i, estado=6 if i % 4 else 2, apertura=apertura,
+            date_mod=f"2025-09-30 {i // 3600:02d}:{(i // 60) % 60:02d}:{i % 60:02d}",
+            entidad="ETB > CIUDADANA" if i % 5 else "ETB > COLEGIOS",
+            categoria="CCTV > DOMO PTZ" if i % 2 else "CCTV > CÁMARA FIJA",
+        ))
+    return tickets
+
+
+def test_sincronizacion_incremental():
+    """Paginación concurrente completa y luego solo los tickets modificados"""
+    print("=" * 70)
+    print("PRUEBA INGESTA GLPI")
+    print("=" * 70)
+
+    servidor = ServidorGLPIFalso(_tickets_iniciales())
+    with tempfile.TemporaryDirectory() as tmp:
+        almacen = AlmacenTicketsGLPI(Path(tmp) / "glpi.db")
+        cliente = GLPIClient(api_url=servidor.url, user_token="secreto", app_token="",
+                             tamano_pagina=300, hilos=4)
+        try:
+            assert almacen.sincronizar(cliente) == 2500
+            assert len(servidor.busquedas()) == 9
+            assert almacen.ultimo_date_mod() == "2025-09-30 00:41:40"
+            assert almacen.contar_tickets_mes(9, 2025) == 2000
+            print("   [OK] 2500 tickets en 9 páginas concurrentes")
+
+            # Un ticket cerrado y uno nuevo después de la primera sincronización
+            servidor.tickets[3] = _ticket(4, 6, "2025-09-05 08:00:00", "2025-10-01 09:00:00")
+            servidor.tickets.append(_ticket(9999, 1, "2025-09-29 10:00:00", "2025-10-01 09:30:00"))
+            servidor.peticiones.clear()
+
+            # 2 modificados + el último ya sincronizado (margen de un segundo, sin duplicar)
+            assert almacen.sincronizar(cliente) == 3
+            busqueda = servidor.busquedas()[0]
+            assert busqueda["criteria[0][value]"] == "2025-09-30 00:41:39"
+            assert len(servidor.busquedas()) == 1
+            assert almacen.contar_tickets_mes(9, 2025) == 2001
+            print("   [OK] Sincronización incremental trae solo los tickets modificados")
+
+            estados = {e["estado"]: e["cantidad"] for e in almacen.tickets_por_estado(9, 2025)}
+            assert estados == {"CERRADO": 1501, "EN PROCESO": 499, "NUEVO": 1}
+            proyectos = {p["proyecto"]: p for p in almacen.tickets_por_proyecto(9, 2025)}
+            assert proyectos["CIUDADANA"]["generados"] == 1601
+            assert proyectos["COLEGIOS"]["generados"] == 400
+            assert proyectos["COLEGIOS"]["abiertos"] == 100
+            subsistemas = almacen.tickets_por_subsistema(9, 2025)
+            assert sum(s["cantidad"] for s in subsistemas) == 2001
+            assert abs(sum(s["porcentaje"] for s in subsistemas) - 100) < 0.2
+            print("   [OK] Agregados del mes por estado, proyecto y subsistema")
+        finally:
+            cliente.cerrar_sesion()
+            almacen.cerrar()
+            servidor.detener()
+
+
+def test_extractor_usa_almacen():
+    """GLPIExtractor sincroniza una vez y responde desde el almacén local"""
+    servidor = ServidorGLPIFalso(_tickets_iniciales(50))
+    with tempfile.TemporaryDirectory() as tmp:
+        almacen = AlmacenTicketsGLPI(Path(tmp) / "glpi.db")
+        cliente = GLPIClient(api_url=servidor.url, user_token="secreto", app_token="", tamano_pagina=20)
+        extractor = GLPIExtractor(almacen=almacen, cliente=cliente)
+        try:
+            estados = extractor.get_tickets_por_estado(9, 2025)
+            extractor.get_tickets_por_proyecto(9, 2025)
+            extractor.get_tickets_por_subsistema(9, 2025)
+            assert sum(e["cantidad"] for e in estados) == 50
+            assert len(servidor.busquedas()) == 3
+            print("   [OK] El extractor sincroniza una sola vez por ejecución")
+
+            # Mes sin tickets sincronizados: vuelve a los datos de fuentes/ejemplo
+            assert extractor.get_tickets_por_estado(1, 2020)
+        finally:
+            cliente.cerrar_sesion()
+            almacen.cerrar()
+            servidor.detener()
+
+
+def test_sesion_vencida():
+    """Un Session-Token rechazado se renueva con initSession y la página se reintenta"""
+    servidor = ServidorGLPIFalso(_tickets_iniciales(50))
+    cliente = GLPIClient(api_url=servidor.url, user_token="secreto", app_token="", tamano_pagina=20)
+    try:
+        assert len(cliente.buscar_tickets()) == 50
+        servidor.sesion_vigente = "vencida-en-el-servidor"
+        assert len(cliente.buscar_tickets()) == 50
+        assert servidor.sesiones == 2
+        print("   [OK] Sesión vencida renovada sin reiniciar el proceso")
+    finally:
+        cliente.cerrar_sesion()
+        servidor.detener()
+
+
+def test_extractor_resincroniza():
+    """La sincronización vence con el TTL y una fallida se reintenta"""
+    servidor = ServidorGLPIFalso(_tickets_iniciales(50))
+    with tempfile.TemporaryDirectory() as tmp:
+        almacen = AlmacenTicketsGLPI(Path(tmp) / "glpi.db")
+        cliente = GLPIClient(api_url=servidor.url, user_token="otro-token", app_token="", tamano_pagina=20)
+        extractor = GLPIExtractor(almacen=almacen, cliente=cliente)
+        ttl_original = config.GLPI_SINCRONIZACION_TTL_S
+        try:
+            # Token inválido: falla, no queda marcada como sincronizada y se reintenta
+            assert extractor.sincronizar() == 0
+            extractor.REINTENTO_FALLIDO_S = 0
+            cliente.user_token = "secreto"
+            assert extractor.sincronizar() == 50
+
+            servidor.tickets.append(_ticket(9999, 1, "2025-09-29 10:00:00", "2025-10-01 09:30:00"))
+            assert extractor.sincronizar() == 0  # Vigente dentro del TTL
+            config.GLPI_SINCRONIZACION_TTL_S = 0
+            assert extractor.sincronizar() == 2  # Nuevo + último ya sincronizado (margen)
+            print("   [OK] Reintento tras fallo y resincronización al vencer el TTL")
+        finally:
+            config.GLPI_SINCRONIZACION_TTL_S = ttl_original
+            cliente.cerrar_sesion()
+            almacen.cerrar()
+            servidor.detener()
+
+
+def test_sin_api_configurada():
+    """Sin token real no se intenta conectar"""
+    extractor = GLPIExtractor(api_token="TU_TOKEN_AQUI")
+    assert not extractor.api_configurada
+    assert extractor.get_tickets_por_estado(9, 2025)
+    print("   [OK] Sin API se usan fuentes JSON o datos de ejemplo")
+
+
+if __name__ == "__main__":
+    test_sincronizacion_incremental()
+    test_extractor_usa_almacen()
+    test_sesion_vencida()
+    test_extractor_resincroniza()
+    test_sin_api_configurada()
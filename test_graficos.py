@@ -0,0 +1,82 @@
+"""
+Script de prueba para validar el servicio de gráficos con caché (src/utils/graficos.py)
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+from src.utils import graficos
+from src.utils.graficos import generar_grafico, clave_grafico, podar_cache
+
+
+def test_cache_graficos():
+    """El segundo render con los mismos datos sale de la caché"""
+    print("=" * 70)
+    print("PRUEBA SERVICIO DE GRAFICOS - CACHE")
+    print("=" * 70)
+
+    if not graficos.MATPLOTLIB_DISPONIBLE:
+        print("   [SKIP] matplotlib no disponible")
+        return
+
+    datos = {"etiquetas": ["Abiertos", "Cerrados"], "valores": [3, 7]}
+    cache_original = graficos.CACHE_GRAFICOS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        graficos.CACHE_GRAFICOS_DIR = Path(tmp)
+        try:
+            ruta = generar_grafico("barras", datos, estilo={"titulo": "Prueba"})
+            assert ruta and os.path.exists(ruta)
+            inodo = os.stat(ruta).st_ino
+            hace_un_mes = time.time() - 30 * 86400
+            os.utime(ruta, (hace_un_mes, hace_un_mes))
+            print(f"   [OK] Gráfico generado: {ruta}")
+
+            inicio = time.perf_counter()
+            assert generar_grafico("barras", datos, estilo={"titulo": "Prueba"}) == ruta
+            # Sin volver a renderizar (mismo archivo), pero el acierto renueva el mtime
+            assert os.stat(ruta).st_ino == inodo
+            assert os.stat(ruta).st_mtime > hace_un_mes + 86400
+            print(f"   [OK] Acierto de caché en {time.perf_counter() - inicio:.4f} s")
+        finally:
+            graficos.CACHE_GRAFICOS_DIR = cache_original
+            graficos.cerrar()
+
+
+def test_podar_cache():
+    """Se eliminan los PNG vencidos y luego los más antiguos hasta cumplir el tamaño"""
+    cache_original = graficos.CACHE_GRAFICOS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        graficos.CACHE_GRAFICOS_DIR = Path(tmp)
+        try:
+            ahora = time.time()
+            rutas = []
+            for i, edad_dias in enumerate([40, 3, 2, 1]):
+                ruta = Path(tmp) / f"barras_{i}.png"
+                ruta.write_bytes(b"x" * 400 * 1024)
+                os.utime(ruta, (ahora - edad_dias * 86400,) * 2)
+                rutas.append(ruta)
+
+            assert podar_cache(max_dias=30, max_mb=100) == 1
+            assert not rutas[0].exists() and all(r.exists() for r in rutas[1:])
+
+            # 1.2 MB con límite de 1 MB: sale la más antigua, salvo si se pide conservarla
+            assert podar_cache(max_dias=30, max_mb=1, conservar=rutas[1]) == 1
+            assert rutas[1].exists() and not rutas[2].exists() and rutas[3].exists()
+        finally:
+            graficos.CACHE_GRAFICOS_DIR = cache_original
+    print("   [OK] Poda por edad y por tamaño")
+
+
+def test_clave_grafico():
+    """La clave cambia con los datos y el estilo, no con el orden de las llaves"""
+    base = clave_grafico("barras", {"etiquetas": ["a"], "valores": [1]}, {"titulo": "T"})
+    assert base == clave_grafico("barras", {"valores": [1], "etiquetas": ["a"]}, {"titulo": "T"})
+    assert base != clave_grafico("barras", {"etiquetas": ["a"], "valores": [2]}, {"titulo": "T"})
+    assert base != clave_grafico("barras", {"etiquetas": ["a"], "valores": [1]}, {"titulo": "U"})
+    print("   [OK] Clave de caché determinista")
+
+
+if __name__ == "__main__":
+    test_cache_graficos()
+    test_podar_cache()
+    test_clave_grafico()
@@ -0,0 +1,75 @@
+"""
+Script de prueba para validar los endpoints de generación y descarga del informe
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import config
+from src.routes import informes_routes
+
+app = FastAPI()
+app.include_router(informes_routes.router, prefix="/api")
+client = TestClient(app)
+
+ANIO, MES, VERSION = 2025, 9, 99
+
+
+def _crear_informe_prueba(contenido: bytes):
+    """Crea un informe falso en la ruta de salida del periodo"""
+    ruta = config.get_directorio_salida(ANIO, MES) / config.get_nombre_informe(ANIO, MES, VERSION)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_bytes(contenido)
+    return ruta
+
+
+def test_descarga_y_cache_http():
+    """Descarga en streaming y respuestas 304 con ETag / Last-Modified"""
+    print("=" * 70)
+    print("PRUEBA API INFORMES - DESCARGA")
+    print("=" * 70)
+
+    contenido = b"PK" + b"x" * 200000
+    ruta = _crear_informe_prueba(contenido)
+    try:
+        url = f"/api/informes/{ANIO}/{MES}/{VERSION}"
+        respuesta = client.get(url)
+        assert respuesta.status_code == 200
+        assert respuesta.content == contenido
+        assert respuesta.headers["content-type"].startswith(
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+        etag = respuesta.headers["etag"]
+        last_modified = respuesta.headers["last-modified"]
+        print(f"   [OK] Descarga completa ({len(respuesta.content)} bytes), ETag {etag}")
+
+        respuesta = client.get(url, headers={"If-None-Match": etag})
+        assert respuesta.status_code == 304
+        assert respuesta.content == b""
+        print("   [OK] If-None-Match -> 304")
+
+        respuesta = client.get(url, headers={"If-Modified-Since": last_modified})
+        assert respuesta.status_code == 304
+        print("   [OK] If-Modified-Since -> 304")
+
+        respuesta = client.get(url, headers={"If-None-Match": '"otro"'})
+        assert respuesta.status_code == 200
+        print("   [OK] ETag distinto -> 200")
+    finally:
+        ruta.unlink(missing_ok=True)
+
+
+def test_errores():
+    """Informe inexistente y periodos inválidos"""
+    respuesta = client.get(f"/api/informes/{ANIO}/{MES}/{VERSION + 1}")
+    assert respuesta.status_code == 404
+    print("   [OK] Informe inexistente -> 404")
+
+    respuesta = client.post(f"/api/informes/{ANIO}/13")
+    assert respuesta.status_code == 400
+    respuesta = client.post("/api/informes/2023/1")
+    assert respuesta.status_code == 400
+    print("   [OK] Periodo inválido -> 400")
+
+
+if __name__ == "__main__":
+    test_descarga_y_cache_http()
+    test_errores()
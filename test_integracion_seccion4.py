@@ -137,21 +137,21 @@ def test_valores_totales():
     total_equipos = sum(eq.get('valor', 0) for eq in equipos.get('equipos', []))
     total_inclusiones = sum(item.get('valor_total', 0) for item in inclusiones.get('items', []))
     
-    print(f"   Total entradas: {gen._formato_moneda(total_entradas)}")
-    print(f"   Total equipos: {gen._formato_moneda(total_equipos)}")
-    print(f"   Total inclusiones: {gen._formato_moneda(total_inclusiones)}")
+    print(f"   Total entradas: {formato_moneda_cop(total_entradas)}")
+    print(f"   Total equipos: {formato_moneda_cop(total_equipos)}")
+    print(f"   Total inclusiones: {formato_moneda_cop(total_inclusiones)}")
     
     # Verificar conversion a letras
     if total_entradas > 0:
-        letras = gen._numero_a_letras(total_entradas)
+        letras = numero_a_letras(total_entradas)
         print(f"   Entradas en letras: {letras[:80]}...")
     
     if total_equipos > 0:
-        letras = gen._numero_a_letras(total_equipos)
+        letras = numero_a_letras(total_equipos)
         print(f"   Equipos en letras: {letras[:80]}...")
     
     if total_inclusiones > 0:
-        letras = gen._numero_a_letras(total_inclusiones)
+        letras = numero_a_letras(total_inclusiones)
         print(f"   Inclusiones en letras: {letras[:80]}...")
 
 def main():
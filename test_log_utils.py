@@ -0,0 +1,166 @@
+"""
+Script de prueba para el logging asíncrono con campos estructurados
+(src/utils/log_utils.py)
+"""
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from src.ia.extractor_observaciones import ExtractorObservaciones
+from src.utils.log_utils import campos_log, configurar_logging, detener_logging
+
+logger = logging.getLogger("test_log_utils")
+
+
+class _StreamLento(io.StringIO):
+    """Destino que tarda en escribir (stdout bloqueado)"""
+
+    def __init__(self, demora: float):
+        super().__init__()
+        self.demora = demora
+        self.hilos = set()
+
+    def write(self, texto):
+        self.hilos.add(threading.get_ident())
+        time.sleep(self.demora)
+        return super().write(texto)
+
+
+class _Costoso:
+    """Argumento de log que cuenta cuántas veces se formatea"""
+
+    def __init__(self):
+        self.formateos = 0
+
+    def __str__(self):
+        self.formateos += 1
+        return "x" * 200
+
+
+def test_campos_estructurados_y_debug_perezoso():
+    """Campos de extra= y campos_log(); los DEBUG deshabilitados no se formatean"""
+    print("=" * 70)
+    print("PRUEBA LOGGING ESTRUCTURADO")
+    print("=" * 70)
+
+    salida = io.StringIO()
+    configurar_logging("INFO", stream=salida)
+    try:
+        costoso = _Costoso()
+        with campos_log(seccion=1):
+            with campos_log(item="7"):
+                logger.info("Observación generada", extra={"duracion_s": 0.123456})
+            logger.warning("Sin anexo: %s", "ruta.pdf")
+            logger.debug("Texto extraído: %s", costoso)
+        logger.info("Fuera del bloque")
+        detener_logging()
+
+        lineas = salida.getvalue().splitlines()
+        assert lineas == [
+            "[INFO] Observación generada | seccion=1 item=7 duracion_s=0.1235",
+            "[WARNING] Sin anexo: ruta.pdf | seccion=1",
+            "[INFO] Fuera del bloque",
+        ], lineas
+        assert costoso.formateos == 0
+        print("   [OK] Campos estructurados y DEBUG sin formatear")
+
+        salida = io.StringIO()
+        configurar_logging("DEBUG", stream=salida)
+        logger.debug("Texto extraído: %s", costoso)
+        detener_logging()
+        assert costoso.formateos == 1 and "x" * 200 in salida.getvalue()
+        print("   [OK] DEBUG habilitado se formatea una vez")
+    finally:
+        detener_logging()
+
+
+def test_traceback_de_errores_en_info():
+    """Los fallos registrados con exc_info muestran el traceback con el nivel por defecto"""
+    salida = io.StringIO()
+    configurar_logging("INFO", stream=salida)
+    try:
+        try:
+            {}["falta"]
+        except KeyError as e:
+            logger.warning("Error al leer archivo: %s", e, exc_info=True)
+        detener_logging()
+    finally:
+        detener_logging()
+
+    texto = salida.getvalue()
+    assert texto.startswith("[WARNING] Error al leer archivo: 'falta'")
+    assert "Traceback (most recent call last)" in texto and "KeyError: 'falta'" in texto
+    print("   [OK] Traceback incluido en el registro del error")
+
+
+def test_emision_no_bloqueante():
+    """Quien registra no espera al destino: escribe el hilo del QueueListener"""
+    lento = _StreamLento(0.02)
+    configurar_logging("INFO", stream=lento)
+    try:
+        inicio = time.perf_counter()
+        for i in range(20):
+            logger.info("Mensaje %s", i)
+        transcurrido = time.perf_counter() - inicio
+        detener_logging()
+        assert transcurrido < 0.2, transcurrido  # Escribir los 20 toma >= 0.4 s
+        assert len(lento.getvalue().splitlines()) == 20
+        assert threading.get_ident() not in lento.hilos
+        print(f"   [OK] 20 registros encolados en {transcurrido * 1000:.1f} ms")
+
+        # Modo síncrono: escribe el mismo hilo
+        sincrono = _StreamLento(0)
+        configurar_logging("INFO", asincrono=False, stream=sincrono)
+        with campos_log(item="3"):
+            logger.info("Síncrono")
+        assert sincrono.getvalue() == "[INFO] Síncrono | item=3\n"
+        assert sincrono.hilos == {threading.get_ident()}
+    finally:
+        detener_logging()
+        logging.getLogger().handlers.clear()
+
+
+def test_json_fork_y_obligaciones():
+    """LOG_FORMATO=json, listener reiniciado tras fork e ítem en los logs de obligaciones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "log.jsonl"
+        os.environ["LOG_FORMATO"] = "json"
+        destino = open(ruta, "w", encoding="utf-8")
+        try:
+            configurar_logging("INFO", stream=destino)
+            if hasattr(os, "fork"):
+                pid = os.fork()
+                if pid == 0:  # Proceso hijo (como un worker del pool)
+                    logger.info("Desde el hijo", extra={"seccion": 2})
+                    detener_logging()
+                    destino.flush()
+                    os._exit(0)
+                os.waitpid(pid, 0)
+
+            extractor = ExtractorObservaciones(api_key="")
+            extractor.procesar_obligacion({"item": 5, "obligacion": "O", "revisaranexo": False,
+                                           "defaultobservaciones": "Cumple"})
+            detener_logging()
+        finally:
+            os.environ.pop("LOG_FORMATO", None)
+            logging.getLogger().handlers.clear()
+            destino.close()
+
+        registros = [json.loads(l) for l in ruta.read_text(encoding="utf-8").splitlines()]
+    if hasattr(os, "fork"):
+        assert {"nivel": "INFO", "mensaje": "Desde el hijo", "seccion": 2}.items() <= registros[0].items()
+        print("   [OK] Registro emitido desde un proceso hijo (fork)")
+    obligacion = [r for r in registros if r["logger"] == "src.ia.extractor_observaciones"]
+    assert obligacion and all(r["item"] == 5 for r in obligacion)
+    print(f"   [OK] {len(obligacion)} registro(s) de la obligación con item=5 en JSON")
+
+
+if __name__ == "__main__":
+    test_campos_estructurados_y_debug_perezoso()
+    test_traceback_de_errores_en_info()
+    test_emision_no_bloqueante()
+    test_json_fork_y_obligaciones()
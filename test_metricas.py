@@ -0,0 +1,150 @@
+"""
+Script de prueba para los spans de tiempo por etapa (src/utils/metricas.py),
+el reporte de tiempos del informe y el endpoint /metrics
+"""
+import json
+import tempfile
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from fastapi.testclient import TestClient
+import config
+from src.utils.metricas import (
+    BUCKETS, RegistroMetricas, get_registro_metricas, medido, medir, reporte_tiempos
+)
+
+
+def _valor(texto: str, linea_inicio: str) -> float:
+    """Valor de la primera muestra Prometheus que empieza con linea_inicio"""
+    for linea in texto.splitlines():
+        if linea.startswith(linea_inicio):
+            return float(linea.rsplit(" ", 1)[1])
+    raise AssertionError(f"Muestra no encontrada: {linea_inicio}")
+
+
+def test_spans_e_histogramas():
+    """Cada span se acumula por nombre+etiquetas; el reporte guarda orden y anidamiento"""
+    print("=" * 70)
+    print("PRUEBA MÉTRICAS POR ETAPA")
+    print("=" * 70)
+
+    registro = get_registro_metricas()
+    registro.limpiar()
+
+    @medido("prueba", operacion="decorada")
+    def decorada():
+        time.sleep(0.002)
+        return 7
+
+    with reporte_tiempos("prueba") as reporte:
+        with medir("prueba", operacion="externa"):
+            assert decorada() == 7
+            assert decorada() == 7
+            time.sleep(0.002)  # Tiempo propio: evita empates al redondear el resumen
+        try:
+            with medir("prueba", operacion="falla"):
+                raise ValueError("x")
+        except ValueError:
+            pass
+
+    exportado = {r["etiquetas"]["operacion"]: r for r in registro.exportar()}
+    assert exportado["decorada"]["total"] == 2 and exportado["decorada"]["suma"] >= 0.004
+    assert exportado["externa"]["suma"] >= exportado["decorada"]["suma"]
+    assert exportado["falla"]["errores"] == 1
+
+    datos = reporte.a_dict()
+    assert [s["etiquetas"]["operacion"] for s in datos["spans"]] == ["externa", "decorada", "decorada", "falla"]
+    assert [s["profundidad"] for s in datos["spans"]] == [0, 1, 1, 0]
+    assert datos["spans"][-1]["error"] == "ValueError"
+    assert datos["resumen"][0]["etiquetas"]["operacion"] == "externa"
+    print(f"   [OK] {len(datos['spans'])} spans registrados con anidamiento")
+
+
+def test_formato_prometheus_y_fusion():
+    """Buckets acumulados, +Inf == count y suma de histogramas de otro proceso"""
+    registro = RegistroMetricas()
+    for segundos in (0.001, 0.2, 0.2, 7.0, 1000.0):
+        registro.observar("generador", segundos, {"seccion": "GeneradorSeccion9", "etapa": "render"})
+    otro = RegistroMetricas()
+    otro.observar("generador", 0.3, {"etapa": "render", "seccion": "GeneradorSeccion9"})
+    registro.fusionar(otro.exportar())
+
+    texto = registro.formato_prometheus()
+    assert "# TYPE informes_generador_segundos histogram" in texto
+    etiquetas = 'etapa="render",seccion="GeneradorSeccion9"'
+    assert _valor(texto, f'informes_generador_segundos_bucket{{{etiquetas},le="0.005"}}') == 1
+    assert _valor(texto, f'informes_generador_segundos_bucket{{{etiquetas},le="0.25"}}') == 3
+    assert _valor(texto, f'informes_generador_segundos_bucket{{{etiquetas},le="0.5"}}') == 4
+    assert _valor(texto, f'informes_generador_segundos_bucket{{{etiquetas},le="{float(BUCKETS[-1])!r}"}}') == 5
+    assert _valor(texto, f'informes_generador_segundos_bucket{{{etiquetas},le="+Inf"}}') == 6
+    assert _valor(texto, f"informes_generador_segundos_count{{{etiquetas}}}") == 6
+    assert abs(_valor(texto, f"informes_generador_segundos_sum{{{etiquetas}}}") - 1007.701) < 1e-9
+    assert _valor(texto, f"informes_generador_errores_total{{{etiquetas}}}") == 0
+    print("   [OK] Exposición Prometheus y fusión entre procesos")
+
+
+def test_etapas_generador_y_reporte_informe():
+    """GeneradorSeccion registra cargar_datos/procesar/render/guardar y main escribe el reporte"""
+    from main import generar_informe
+
+    registro = get_registro_metricas()
+    registro.limpiar()
+    output_original = config.OUTPUT_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        config.OUTPUT_DIR = Path(tmp)
+        try:
+            generar_informe(2025, 9, 1, secciones=[5, 9])
+        finally:
+            config.OUTPUT_DIR = output_original
+
+        ruta = Path(tmp) / "2025" / "09_Septiembre" / config.get_nombre_reporte_tiempos(2025, 9, 1)
+        reporte = json.loads(ruta.read_text(encoding="utf-8"))
+
+    etapas = {(s["etiquetas"].get("seccion"), s["etiquetas"].get("etapa"))
+              for s in reporte["spans"] if s["nombre"] == "generador"}
+    for etapa in ("cargar_contexto_base", "cargar_datos", "procesar", "render", "guardar"):
+        assert ("GeneradorSeccion9", etapa) in etapas, etapa
+    for etapa in ("cargar_datos", "render", "guardar"):
+        assert ("GeneradorSeccion5", etapa) in etapas, etapa
+    secciones = [s for s in reporte["spans"] if s["nombre"] == "seccion"]
+    assert [s["etiquetas"]["seccion"] for s in secciones] == ["GeneradorSeccion5", "GeneradorSeccion9"]
+    assert all(s["profundidad"] == 0 for s in secciones)
+    assert reporte["duracion_s"] >= sum(s["duracion_s"] for s in secciones)
+    assert any(r["etiquetas"].get("etapa") == "render" for r in registro.exportar())
+    print(f"   [OK] Reporte de tiempos con {len(reporte['spans'])} spans ({reporte['duracion_s']:.2f} s)")
+
+
+def test_endpoint_metrics():
+    """/metrics expone los histogramas del API y los del worker de informes"""
+    import app
+    from src.services.informes_service import InformesService
+
+    registro = get_registro_metricas()
+    registro.limpiar()
+    with medir("obligaciones", operacion="cargar_json"):
+        pass
+
+    # Resultado de un worker: ruta + histogramas exportados en ese proceso
+    worker = RegistroMetricas()
+    worker.observar("seccion", 2.5, {"seccion": "GeneradorSeccion1"})
+    servicio = InformesService()
+    clave = (2025, 9, 1)
+    future = Future()
+    servicio._trabajos[clave] = {"estado": "generando", "future": future}
+    future.set_result(("/tmp/informe.docx", worker.exportar()))
+    servicio._finalizar_trabajo(clave, future)
+    assert servicio._trabajos[clave]["estado"] == "completado"
+
+    respuesta = TestClient(app.app).get("/metrics")
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'informes_obligaciones_segundos_count{operacion="cargar_json"} 1' in respuesta.text
+    assert 'informes_seccion_segundos_sum{seccion="GeneradorSeccion1"} 2.5' in respuesta.text
+    print("   [OK] /metrics en formato Prometheus")
+
+
+if __name__ == "__main__":
+    test_spans_e_histogramas()
+    test_formato_prometheus_y_fusion()
+    test_etapas_generador_y_reporte_informe()
+    test_endpoint_metrics()
@@ -0,0 +1,127 @@
+"""
+Script de prueba para validar el motor de disponibilidad (MySQLExtractor)
+sobre la base local SQLite: pool, rangos de fecha indexables y streaming
+"""
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+import config
+from src.extractores.mysql_extractor import MySQLExtractor, rango_mes
+
+LOCALIDADES = ["KENNEDY", "SUBA", "ENGATIVÁ", "USAQUÉN", "BOSA"]
+
+
+def _crear_base(ruta: Path, camaras: int = 300) -> MySQLExtractor:
+    """Base local con datos diarios de ago-2024 a oct-2025"""
+    extractor = MySQLExtractor({"motor": "sqlite", "ruta": str(ruta), "pool_size": 4})
+    extractor.crear_esquema()
+
+    aleatorio = random.Random(7)
+    filas = []
+    dia = date(2024, 8, 1)
+    while dia <= date(2025, 10, 31):
+        for c in range(camaras):
+            caida = aleatorio.choice([0, 0, 0, 0.5, 2])
+            filas.append((dia.isoformat(), f"CAM{c:05d}", LOCALIDADES[c % 5], 24 - caida, caida))
+        dia += timedelta(days=1)
+
+    with extractor._conexion() as conexion:
+        conexion.executemany("INSERT INTO disponibilidad_diaria VALUES (?, ?, ?, ?, ?)", filas)
+        conexion.commit()
+    return extractor
+
+
+def test_disponibilidad_sqlite():
+    """Agregaciones en el servidor coinciden con el cálculo fila a fila"""
+    print("=" * 70)
+    print("PRUEBA MOTOR DE DISPONIBILIDAD (SQLITE)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = _crear_base(Path(tmp) / "disponibilidad.db")
+        try:
+            inicio = time.perf_counter()
+            mes = extractor.get_disponibilidad_mes(2025, 9)
+            print(f"   [OK] Disponibilidad septiembre: {mes['disponibilidad_porcentaje']:.3f}% "
+                  f"({time.perf_counter() - inicio:.4f} s)")
+
+            detalle = list(extractor.iterar_disponibilidad_diaria(2025, 9, tamano_lote=1000))
+            assert len(detalle) == 30 * 300
+            assert {d["fecha"][:7] for d in detalle} == {"2025-09"}
+            horas_op = sum(d["horas_operativas"] for d in detalle)
+            horas_no_op = sum(d["horas_no_operativas"] for d in detalle)
+            assert abs(mes["horas_operativas"] - horas_op) < 1e-6
+            assert abs(mes["disponibilidad_porcentaje"] - horas_op * 100 / (horas_op + horas_no_op)) < 1e-9
+            assert mes["horas_totales_mes"] == 720
+            print(f"   [OK] Streaming de {len(detalle)} filas coincide con la agregación")
+
+            localidades = extractor.get_disponibilidad_por_localidad(2025, 9)
+            assert len(localidades) == 5
+            assert all(l["total_camaras"] == 60 for l in localidades)
+            disponibilidades = [l["disponibilidad"] for l in localidades]
+            assert disponibilidades == sorted(disponibilidades, reverse=True)
+            print("   [OK] Disponibilidad por localidad ordenada")
+
+            serie_original = config.ANS_SERIE_DB_PATH
+            config.ANS_SERIE_DB_PATH = Path(tmp) / "ans_mensual.db"
+            try:
+                historico = extractor.get_historico_ans(meses_atras=12, anio=2025, mes=9)
+                assert not config.ANS_SERIE_DB_PATH.exists()  # Leer no crea ni escribe la serie
+                assert extractor.get_historico_ans(meses_atras=12, anio=2025, mes=9, registrar=True) == historico
+                assert [h["mes"] for h in historico][:2] == ["Octubre 2024", "Noviembre 2024"]
+                assert historico[-1]["mes"] == "Septiembre 2025" and len(historico) == 12
+                assert abs(historico[-1]["disponibilidad"] - mes["disponibilidad_porcentaje"]) < 1e-9
+                print("   [OK] Histórico de 12 meses")
+
+                # Los meses cerrados quedan en la serie del ANS y no se vuelven a consultar
+                consultas = extractor.consultar
+                extractor.consultar = None
+                try:
+                    desde_serie = extractor.get_historico_ans(meses_atras=6, anio=2025, mes=9)
+                finally:
+                    extractor.consultar = consultas
+                assert [h["disponibilidad"] for h in desde_serie] == [h["disponibilidad"] for h in historico[-6:]]
+                print("   [OK] Histórico servido desde la serie del ANS")
+            finally:
+                config.ANS_SERIE_DB_PATH = serie_original
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                resultados = list(executor.map(lambda m: extractor.get_disponibilidad_mes(2025, m), range(1, 11)))
+            assert len(resultados) == 10
+            print("   [OK] Consultas concurrentes con el pool")
+        finally:
+            extractor.desconectar()
+
+
+def test_consultas_indexables():
+    """El filtro por rango de fechas usa el índice (sin YEAR()/MONTH())"""
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = _crear_base(Path(tmp) / "disponibilidad.db", camaras=20)
+        try:
+            plan = extractor.consultar(
+                "EXPLAIN QUERY PLAN SELECT SUM(horas_operativas) FROM disponibilidad_diaria "
+                "WHERE fecha >= %s AND fecha < %s", rango_mes(2025, 12)
+            )
+            detalle = " ".join(str(p["detail"]) for p in plan)
+            assert "SEARCH" in detalle and "idx_disponibilidad_fecha_localidad" in detalle
+            print(f"   [OK] Plan: {detalle}")
+        finally:
+            extractor.desconectar()
+    assert rango_mes(2025, 12) == ("2025-12-01", "2026-01-01")
+
+
+def test_sin_base_configurada():
+    """Sin base configurada se mantiene la lectura desde JSON de fuentes"""
+    extractor = MySQLExtractor({"motor": "mysql", "host": ""})
+    assert not extractor.configurado
+    assert extractor.get_disponibilidad_mes(2025, 2)["horas_totales_mes"] == 28 * 24
+    print("   [OK] Respaldo en JSON de fuentes")
+
+
+if __name__ == "__main__":
+    test_disponibilidad_sqlite()
+    test_consultas_indexables()
+    test_sin_base_configurada()
@@ -0,0 +1,129 @@
+"""
+Script de prueba para validar el motor vectorizado de penalidades del ANS
+(src/utils/penalidades.py) y el endpoint /api/ans/simulacion
+"""
+import time
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ans_config import calcular_penalidad, UMBRAL_ANS, PENALIDAD_CONFIG
+from src.routes import ans_routes
+from src.utils.penalidades import calcular_penalidades, MODO_ESCALONADA
+
+app = FastAPI()
+app.include_router(ans_routes.router, prefix="/api")
+client = TestClient(app)
+
+
+def _escalonada(disponibilidad, valor):
+    """Escala de la Sección 3.1 (referencia escalar)"""
+    if disponibilidad >= UMBRAL_ANS:
+        return 0.0, 0.0
+    deficit = UMBRAL_ANS - disponibilidad
+    porcentaje = 0.5 if deficit <= 0.5 else 1.0 if deficit <= 1.0 else 1.5 if deficit <= 1.5 else 2.0
+    return porcentaje, valor * (porcentaje / 100)
+
+
+def test_coincide_con_calculo_escalar():
+    """Cada elemento coincide con ans_config.calcular_penalidad y la escala del informe"""
+    print("=" * 70)
+    print("PRUEBA MOTOR DE PENALIDADES ANS")
+    print("=" * 70)
+
+    rng = np.random.default_rng(8)
+    disponibilidad = np.concatenate([rng.uniform(95, 100, 2000), [UMBRAL_ANS, 98.4, 98.8, 97.4, 96.9]])
+    valores = rng.uniform(1e8, 6e8, disponibilidad.size)
+
+    lineal = calcular_penalidades(disponibilidad, valores)
+    escalonada = calcular_penalidades(disponibilidad, valores, modo=MODO_ESCALONADA)
+    for i, (d, v) in enumerate(zip(disponibilidad, valores)):
+        esperado = calcular_penalidad(d, UMBRAL_ANS, v)
+        assert lineal["aplica"][i] == esperado["aplica"]
+        assert lineal["porcentaje_penalidad"][i] == esperado["porcentaje_penalidad"]
+        assert lineal["valor_penalidad"][i] == esperado["valor_penalidad"]
+        porcentaje, valor = _escalonada(d, v)
+        assert escalonada["porcentaje_penalidad"][i] == porcentaje
+        assert escalonada["valor_penalidad"][i] == valor
+    assert lineal["porcentaje_penalidad"].max() == PENALIDAD_CONFIG["penalidad_maxima_porcentaje"]
+    print(f"   [OK] {disponibilidad.size} escenarios idénticos al cálculo escalar (lineal y escalonada)")
+
+
+def test_broadcasting_y_volumen():
+    """Malla disponibilidad x valor mensual en una sola operación"""
+    disponibilidad = np.arange(9000, 10001) / 100
+    valores = np.linspace(1e8, 5e8, 1000)
+    inicio = time.perf_counter()
+    resultado = calcular_penalidades(disponibilidad[:, None], valores[None, :])
+    duracion = time.perf_counter() - inicio
+    assert resultado["valor_penalidad"].shape == (1001, 1000)
+    assert not resultado["aplica"][disponibilidad >= UMBRAL_ANS].any()
+    print(f"   [OK] {resultado['valor_penalidad'].size:,} escenarios en {duracion * 1000:.1f} ms")
+
+
+def test_seccion3_usa_motor():
+    """La Sección 3 obtiene la misma penalidad escalonada que antes"""
+    from src.generadores.seccion_3_ans import GeneradorSeccion3
+
+    gen = GeneradorSeccion3(2025, 9)
+    gen.datos = {"valor_mensual_contrato": 500000000}
+    for disponibilidad, porcentaje in ((99.5, 0.0), (98.6, 0.5), (98.0, 1.0), (97.5, 1.5), (90.0, 2.0)):
+        gen.disponibilidad = disponibilidad
+        penalidad = gen._calcular_penalidad()
+        assert penalidad["porcentaje_penalidad"] == porcentaje
+        assert penalidad["aplica"] is (porcentaje > 0)
+        assert penalidad["valor_penalidad"] == 500000000 * (porcentaje / 100)
+    print("   [OK] Sección 3.1 con el motor vectorizado")
+
+
+def test_endpoint_simulacion():
+    """Escenarios etiquetados y barrido en una sola llamada"""
+    respuesta = client.post("/api/ans/simulacion", json={
+        "modo": "lineal",
+        "valor_mensual": 100000000,
+        "escenarios": [
+            {"etiqueta": "KENNEDY", "disponibilidad": 98.4},
+            {"etiqueta": "SUBA", "disponibilidad": 99.5, "valor_mensual": 200000000},
+        ],
+        "barrido": {"desde": 97.0, "hasta": 100.0, "paso": 0.01, "valores_mensuales": [100000000, 150000000]},
+    })
+    assert respuesta.status_code == 200, respuesta.text
+    datos = respuesta.json()
+    kennedy, suba = datos["escenarios"]
+    assert kennedy["etiqueta"] == "KENNEDY" and kennedy["aplica"]
+    assert abs(kennedy["valor_penalidad"] - calcular_penalidad(98.4, UMBRAL_ANS, 1e8)["valor_penalidad"]) < 0.01
+    assert not suba["aplica"] and suba["valor_penalidad"] == 0
+
+    barrido = datos["barrido"]
+    assert len(barrido["disponibilidad"]) == 301
+    assert barrido["disponibilidad"][-1] == 100.0
+    assert len(barrido["valor_penalidad"]) == 301 and len(barrido["valor_penalidad"][0]) == 2
+    assert datos["resumen"]["escenarios"] == 2 + 301 * 2
+    print(f"   [OK] /api/ans/simulacion: {datos['resumen']['escenarios']} escenarios, "
+          f"exposición máxima ${datos['resumen']['valor_maximo']:,.0f}")
+
+    assert client.post("/api/ans/simulacion", json={}).status_code == 400
+    assert client.post("/api/ans/simulacion", json={"modo": "otro", "escenarios": [{"disponibilidad": 1}]}).status_code == 400
+    assert client.post("/api/ans/simulacion", json={"escenarios": [{"etiqueta": "x"}]}).status_code == 400
+    assert client.post("/api/ans/simulacion", json={
+        "barrido": {"desde": 0, "hasta": 100, "paso": 0.00001}
+    }).status_code == 400
+    assert client.post("/api/ans/simulacion", json={
+        "barrido": {"desde": 97, "hasta": 99, "valores_mensuales": []}
+    }).status_code == 400
+    for no_finito in ("nan", "inf"):
+        assert client.post("/api/ans/simulacion", json={"escenarios": [{"disponibilidad": no_finito}]}).status_code == 400
+        assert client.post("/api/ans/simulacion", json={
+            "escenarios": [{"disponibilidad": 98, "valor_mensual": no_finito}]
+        }).status_code == 400
+        assert client.post("/api/ans/simulacion", json={"barrido": {"desde": 97, "hasta": no_finito}}).status_code == 400
+        assert client.post("/api/ans/simulacion", json={
+            "barrido": {"desde": 97, "hasta": 99, "paso": no_finito}
+        }).status_code == 400
+    print("   [OK] Validación de peticiones inválidas")
+
+
+if __name__ == "__main__":
+    test_coincide_con_calculo_escalar()
+    test_broadcasting_y_volumen()
+    test_seccion3_usa_motor()
+    test_endpoint_simulacion()
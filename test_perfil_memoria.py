@@ -0,0 +1,131 @@
+"""
+Script de prueba para el perfil de memoria por etapa (src/utils/perfil_memoria.py),
+main.py --perfil-memoria y el perfil expuesto por el API de informes
+"""
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import config
+from src.ia.extractor_observaciones import ExtractorObservaciones
+from src.routes import informes_routes
+from src.services.informes_service import get_informes_service
+from src.utils.perfil_memoria import medir_memoria, perfil_memoria
+
+MB = 1024 * 1024
+
+
+def _asignar_bloques(mb: int) -> list:
+    return [bytearray(1024) for _ in range(mb * 1024)]
+
+
+def test_etapas_picos_y_sitios():
+    """Neto, pico anidado y sitios de asignación por etapa"""
+    print("=" * 70)
+    print("PRUEBA PERFIL DE MEMORIA")
+    print("=" * 70)
+
+    with medir_memoria("fuera_del_perfil"):
+        pass
+    assert not tracemalloc.is_tracing()
+
+    retenido = []
+    with perfil_memoria("prueba", max_snapshots=1) as perfil:
+        with medir_memoria("seccion", seccion="A"):
+            with medir_memoria("obligacion", detalle="1"):
+                temporal = _asignar_bloques(8)
+                del temporal
+            for item in ("2", "3"):
+                with medir_memoria("obligacion", detalle=item):
+                    retenido.extend(_asignar_bloques(2))
+    assert not tracemalloc.is_tracing()
+
+    obligaciones = [e for e in perfil.etapas if e["nombre"] == "obligacion"]
+    seccion = perfil.etapas[-1]
+    assert [e["detalle"] for e in obligaciones] == ["1", "2", "3"]
+    assert all(e["profundidad"] == 1 for e in obligaciones) and seccion["profundidad"] == 0
+
+    # La obligación 1 libera todo lo que asigna; las demás retienen ~2 MB
+    assert obligaciones[0]["neto_mb"] < 0.5 and obligaciones[0]["pico_mb"] >= 8
+    assert 1.8 < obligaciones[1]["neto_mb"] < 2.5
+    # El pico de la sección conserva el de la obligación 1 aunque se reinició
+    assert seccion["pico_mb"] >= obligaciones[0]["pico_mb"]
+    assert 3.5 < seccion["neto_mb"] < 5
+
+    # Un snapshot por nombre de etapa: sitios solo en la primera obligación
+    assert obligaciones[0]["sitios"] is not None and obligaciones[1]["sitios"] is None
+    assert any(s["sitio"].startswith("test_perfil_memoria.py:") for s in seccion["sitios"])
+
+    resumen = {g["nombre"]: g for g in perfil.resumen()}
+    assert resumen["obligacion"]["veces"] == 3 and resumen["obligacion"]["mayor_pico"] == "1"
+    assert resumen["seccion"]["etiquetas"] == {"seccion": "A"}
+    print(f"   [OK] {len(perfil.etapas)} etapas, pico sección {seccion['pico_mb']} MB")
+
+
+def test_obligaciones_y_generar_informe():
+    """Cada obligación procesada y cada sección quedan en el perfil guardado"""
+    extractor = ExtractorObservaciones(api_key="")
+    obligaciones = [
+        {"item": i, "obligacion": f"Obligación {i}", "revisaranexo": False, "defaultobservaciones": "Cumple"}
+        for i in range(1, 4)
+    ]
+    with perfil_memoria("obligaciones") as perfil:
+        procesadas = [extractor.procesar_obligacion(o) for o in obligaciones]
+    assert all(p["observaciones"] == "Cumple" for p in procesadas)
+    assert [e["detalle"] for e in perfil.etapas] == [1, 2, 3]
+    print("   [OK] procesar_obligacion registrada por ítem")
+
+    from main import generar_informe
+    output_original = config.OUTPUT_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        config.OUTPUT_DIR = Path(tmp)
+        try:
+            generar_informe(2025, 9, 1, secciones=[5], perfil_memoria=True)
+            sin_perfil = config.get_nombre_reporte_memoria(2025, 9, 2)
+            generar_informe(2025, 9, 2, secciones=[5])
+        finally:
+            config.OUTPUT_DIR = output_original
+
+        directorio = Path(tmp) / "2025" / "09_Septiembre"
+        datos = json.loads((directorio / config.get_nombre_reporte_memoria(2025, 9, 1)).read_text(encoding="utf-8"))
+        assert not (directorio / sin_perfil).exists()
+
+    etapa = datos["etapas"][0]
+    assert etapa["etiquetas"] == {"seccion": "GeneradorSeccion5"}
+    assert etapa["pico_mb"] > 0 and etapa["sitios"]
+    assert datos["resumen"][0]["nombre"] == "seccion"
+    print(f"   [OK] Perfil de memoria del informe (pico Sección 5: {etapa['pico_mb']} MB)")
+
+
+def test_api_perfil_memoria():
+    """El trabajo informa la URL del perfil y el endpoint lo sirve"""
+    app = FastAPI()
+    app.include_router(informes_routes.router, prefix="/api")
+    client = TestClient(app)
+    servicio = get_informes_service()
+    anio, mes, version = 2025, 9, 98
+
+    url = f"/api/informes/{anio}/{mes}/{version}/memoria"
+    assert client.get(url).status_code == 404
+    assert client.get(f"/api/informes/{anio}/13/{version}/memoria").status_code == 400
+
+    ruta = servicio.get_ruta_perfil_memoria(anio, mes, version)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(json.dumps({"nombre": "prueba", "resumen": [], "etapas": []}), encoding="utf-8")
+    try:
+        respuesta = client.get(url)
+        assert respuesta.status_code == 200 and respuesta.json()["nombre"] == "prueba"
+    finally:
+        ruta.unlink(missing_ok=True)
+
+    resumen = servicio._resumen_trabajo((anio, mes, version), {"estado": "completado", "perfil_memoria": True})
+    assert resumen["url_perfil_memoria"] == url
+    print("   [OK] /api/informes/{anio}/{mes}/{version}/memoria")
+
+
+if __name__ == "__main__":
+    test_etapas_picos_y_sitios()
+    test_obligaciones_y_generar_informe()
+    test_api_perfil_memoria()
@@ -0,0 +1,129 @@
+"""
+Script de prueba para el motor vectorizado de ejecución presupuestal
+(src/utils/presupuesto.py) y su uso en la Sección 8
+"""
+import csv
+import os
+import tempfile
+from pathlib import Path
+import pandas as pd
+import config
+from src.generadores.seccion_8_presupuesto import GeneradorSeccion8
+from src.utils.presupuesto import MotorPresupuestal, calcular_ejecucion, get_motor_presupuestal
+
+CATEGORIAS = ["Mano de obra", "Repuestos", "Servicios técnicos"]
+
+
+def _libro() -> pd.DataFrame:
+    """Nov-2024 a dic-2025 sin filas en febrero de 2025; Repuestos duplicado en enero"""
+    filas = []
+    for indice, (anio, mes) in enumerate([(2024, 11), (2024, 12)] + [(2025, m) for m in range(1, 13)]):
+        if (anio, mes) == (2025, 2):
+            continue
+        for i, categoria in enumerate(CATEGORIAS):
+            filas.append({"anio": anio, "mes": mes, "categoria": categoria,
+                          "presupuesto": 1000000 * (i + 1), "ejecutado": 900000 * (i + 1) + indice})
+    filas.append({"anio": 2025, "mes": 1, "categoria": "Repuestos", "presupuesto": 500000, "ejecutado": None})
+    return pd.DataFrame(filas)
+
+
+def test_motor_presupuestal():
+    """Ejecución del mes, acumulados por categoría y sumas prefijas"""
+    print("=" * 70)
+    print("PRUEBA MOTOR DE EJECUCIÓN PRESUPUESTAL")
+    print("=" * 70)
+
+    libro = _libro()
+    motor = MotorPresupuestal(libro)
+    libro["ejecutado"] = libro["ejecutado"].fillna(0)
+    libro["periodo"] = libro["anio"] * 12 + libro["mes"]
+
+    for anio, mes in [(2024, 11), (2025, 1), (2025, 3), (2025, 12)]:
+        hasta = libro[libro["periodo"] <= anio * 12 + mes]
+        del_mes = hasta[hasta["periodo"] == anio * 12 + mes]
+
+        # 8.1: una fila por categoría, con su acumulado desde el inicio del libro
+        ejecucion = {fila["categoria"]: fila for fila in motor.ejecucion_mes(anio, mes)}
+        assert sorted(ejecucion) == CATEGORIAS
+        for categoria, fila in ejecucion.items():
+            esperado = del_mes[del_mes["categoria"] == categoria][["presupuesto", "ejecutado"]].sum()
+            acumulado = hasta[hasta["categoria"] == categoria][["presupuesto", "ejecutado"]].sum()
+            assert (fila["presupuesto"], fila["ejecutado"]) == tuple(esperado)
+            assert (fila["presupuesto_acumulado"], fila["ejecutado_acumulado"]) == tuple(acumulado)
+            assert fila["porcentaje_ejecucion"] == round(esperado["ejecutado"] / esperado["presupuesto"] * 100, 2)
+
+        # 8.2 y totales: consolidado continuo (febrero en 0) y acumulado del contrato
+        consolidado = motor.consolidado(anio, mes)
+        assert len(consolidado) == (anio * 12 + mes) - (2024 * 12 + 11) + 1
+        assert consolidado[-1]["mes"] == f"{config.MESES[mes]} {anio}"
+        totales = motor.totales(anio, mes)
+        assert totales["total_presupuesto"] == del_mes["presupuesto"].sum()
+        assert totales["total_ejecutado_acumulado"] == hasta["ejecutado"].sum()
+        assert consolidado[-1]["ejecutado_acumulado"] == totales["total_ejecutado_acumulado"]
+
+    febrero = motor.consolidado(2025, 2)[-1]
+    assert motor.ejecucion_mes(2025, 2) == [] and febrero["presupuesto_mes"] == 0
+    assert febrero["porcentaje_ejecucion"] == 0 and febrero["presupuesto_mes_formato"] == "$0"
+    assert motor.ejecucion_mes(2025, 1)[1]["presupuesto_formato"] == "$2.500.000"
+
+    assert not motor.contiene(2026, 1)
+    for error, llamada in [(KeyError, lambda: motor.totales(2024, 10)),
+                           (ValueError, lambda: MotorPresupuestal(libro.drop(columns="ejecutado")))]:
+        try:
+            llamada()
+            assert False, "Debió fallar"
+        except error:
+            pass
+    print(f"   [OK] {len(motor.consolidado(2025, 12))} meses consolidados con sumas prefijas")
+
+
+def test_calcular_ejecucion():
+    """Porcentajes y formatos por columna para las fuentes JSON/CSV"""
+    filas = calcular_ejecucion([
+        {"categoria": "A", "presupuesto": 200000000, "ejecutado": 180000000},
+        {"categoria": "B", "presupuesto": 0, "ejecutado": 5},
+        {"categoria": "C", "presupuesto": 3, "ejecutado": None},
+    ])
+    assert [f["porcentaje_ejecucion"] for f in filas] == [90.0, 0.0, 0.0]
+    assert filas[0]["presupuesto_formato"] == "$200.000.000" and filas[2]["ejecutado_formato"] == "$0"
+    assert calcular_ejecucion([]) == []
+    print("   [OK] calcular_ejecucion")
+
+
+def test_seccion8_con_libro():
+    """La Sección 8 toma 8.1, 8.2 y los totales del libro y reutiliza el motor"""
+    fuentes_original = config.FUENTES_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        config.FUENTES_DIR = Path(tmp)
+        try:
+            gen = GeneradorSeccion8(anio=2025, mes=9)
+            gen.cargar_datos()
+            assert not gen.totales_libro  # Sin libro: datos dummy
+
+            ruta = Path(tmp) / "libro_presupuestal.csv"
+            _libro().to_csv(ruta, index=False)
+            motor = get_motor_presupuestal()
+            assert motor is get_motor_presupuestal()
+
+            gen = GeneradorSeccion8(anio=2025, mes=9)
+            gen.cargar_datos()
+            contexto = gen.procesar()
+
+            with open(ruta, "a", encoding="utf-8", newline="") as f:
+                csv.writer(f).writerow([2026, 1, "Repuestos", 100, 50])
+            os.utime(ruta, ns=(ruta.stat().st_atime_ns, ruta.stat().st_mtime_ns + 10**9))
+            assert get_motor_presupuestal() is not motor and get_motor_presupuestal().contiene(2026, 1)
+        finally:
+            config.FUENTES_DIR = fuentes_original
+
+    assert len(gen.ejecucion_mensual) == 3 and len(gen.consolidado) == 11
+    assert contexto["total_presupuesto"] == 6000000
+    assert contexto["total_presupuesto_acumulado"] == 6000000 * 10 + 500000
+    assert contexto["total_presupuesto_acumulado_formato"] == "$60.500.000"
+    print(f"   [OK] Sección 8 desde el libro: {contexto['porcentaje_acumulado_ejecucion']}% acumulado")
+
+
+if __name__ == "__main__":
+    test_motor_presupuestal()
+    test_calcular_ejecucion()
+    test_seccion8_con_libro()
@@ -0,0 +1,90 @@
+"""
+Script de prueba para la vista previa HTML de las secciones
+(src/utils/preview_html.py) y GET /api/informes/{anio}/{mes}/secciones/{n}/preview
+"""
+import tempfile
+import time
+from pathlib import Path
+from docx import Document
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.generadores.seccion_8_presupuesto import GeneradorSeccion8
+from src.routes import informes_routes
+from src.utils import preview_html
+from src.utils.preview_html import docx_a_html, preview_seccion
+
+
+def test_docx_a_html():
+    """Títulos, formato de texto, tablas y escape de HTML"""
+    print("=" * 70)
+    print("PRUEBA VISTA PREVIA HTML")
+    print("=" * 70)
+
+    doc = Document()
+    doc.add_heading("8. EJECUCIÓN", level=1)
+    parrafo = doc.add_paragraph("Total ")
+    parrafo.add_run("$1.000").bold = True
+    parrafo.add_run(" <nota>").italic = True
+    tabla = doc.add_table(rows=2, cols=2)
+    tabla.cell(0, 0).text, tabla.cell(0, 1).text = "Categoría", "Valor"
+    tabla.cell(1, 0).text, tabla.cell(1, 1).text = "Repuestos", "$5"
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "prueba.docx"
+        doc.save(str(ruta))
+        html = docx_a_html(ruta)
+
+    assert "<h1>8. EJECUCIÓN</h1>" in html
+    assert "<p>Total <strong>$1.000</strong><em> &lt;nota&gt;</em></p>" in html
+    assert "<tr><th>Categoría</th><th>Valor</th></tr><tr><td>Repuestos</td><td>$5</td></tr>" in html
+    print("   [OK] Conversión DOCX -> HTML")
+
+
+def test_preview_cacheada():
+    """La segunda vista previa sale de la caché sin renderizar"""
+    cache_original = preview_html.CACHE_PREVIEWS_DIR
+    generar_original = GeneradorSeccion8.generar
+    with tempfile.TemporaryDirectory() as tmp:
+        preview_html.CACHE_PREVIEWS_DIR = Path(tmp)
+        renders = []
+
+        def generar_contando(self):
+            renders.append(1)
+            return generar_original(self)
+
+        GeneradorSeccion8.generar = generar_contando
+        try:
+            html = preview_seccion(2025, 9, 8, desde_datos=False)
+            inicio = time.perf_counter()
+            assert preview_seccion(2025, 9, 8, desde_datos=False) == html
+            duracion = time.perf_counter() - inicio
+            archivos = list(Path(tmp).glob("seccion_08_*.html"))
+        finally:
+            preview_html.CACHE_PREVIEWS_DIR = cache_original
+            GeneradorSeccion8.generar = generar_original
+
+    assert len(renders) == 1 and len(archivos) == 1
+    assert "<h1>8. EJECUCIÓN PRESUPUESTAL</h1>" in html and "<table>" in html
+    assert duracion < 1
+    print(f"   [OK] Sección 8: {len(html)} caracteres, desde caché en {duracion * 1000:.0f} ms")
+
+
+def test_endpoint_preview():
+    """GET /api/informes/{anio}/{mes}/secciones/{n}/preview"""
+    app = FastAPI()
+    app.include_router(informes_routes.router, prefix="/api")
+    client = TestClient(app)
+
+    respuesta = client.get("/api/informes/2025/9/secciones/12/preview", params={"desde_datos": False})
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.headers["content-type"].startswith("text/html")
+    assert respuesta.text.startswith('<article class="preview-seccion">')
+
+    assert client.get("/api/informes/2025/9/secciones/99/preview").status_code == 400
+    assert client.get("/api/informes/2025/13/secciones/1/preview").status_code == 400
+    print("   [OK] Endpoint de vista previa")
+
+
+if __name__ == "__main__":
+    test_docx_a_html()
+    test_preview_cacheada()
+    test_endpoint_preview()
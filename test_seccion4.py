@@ -2,6 +2,7 @@
 Script de prueba para validar la generacion de la Seccion 4
 """
 from src.generadores.seccion_4_bienes import GeneradorSeccion4
+from src.utils.formato_moneda import numero_a_letras, formato_moneda_cop
 from pathlib import Path
 
 def test_seccion4():
@@ -36,11 +37,11 @@ def test_seccion4():
     valor_inclusiones = sum(item.get('valor_total', 0) for item in inclusiones_items)
     
     print(f"   [OK] Entradas al almacen: {len(entradas_items)} items")
-    print(f"   [OK] Valor total entradas: {gen._formato_moneda(valor_entradas)}")
+    print(f"   [OK] Valor total entradas: {formato_moneda_cop(valor_entradas)}")
     print(f"   [OK] Equipos no operativos: {len(equipos_list)} equipos")
-    print(f"   [OK] Valor total equipos: {gen._formato_moneda(valor_equipos)}")
+    print(f"   [OK] Valor total equipos: {formato_moneda_cop(valor_equipos)}")
     print(f"   [OK] Inclusiones a bolsa: {len(inclusiones_items)} items")
-    print(f"   [OK] Valor total inclusiones: {gen._formato_moneda(valor_inclusiones)}")
+    print(f"   [OK] Valor total inclusiones: {formato_moneda_cop(valor_inclusiones)}")
     
     # Verificar comunicados
     print("\n[4] Verificando comunicados...")
@@ -58,8 +59,8 @@ def test_seccion4():
     # Verificar conversion a letras
     print("\n[5] Verificando conversion a letras...")
     test_valor = 18750000
-    letras = gen._numero_a_letras(test_valor)
-    print(f"   [OK] Valor: {gen._formato_moneda(test_valor)}")
+    letras = numero_a_letras(test_valor)
+    print(f"   [OK] Valor: {formato_moneda_cop(test_valor)}")
     print(f"   [OK] En letras: {letras[:80]}...")
     
     # Generar documento
@@ -98,9 +99,9 @@ def test_seccion4():
     mes = gen.datos.get('mes', 'Septiembre')
     anio = gen.datos.get('anio', 2025)
     print(f"   Periodo: {mes} {anio}")
-    print(f"   Entradas al almacen: {len(entradas_items)} items ({gen._formato_moneda(valor_entradas)})")
-    print(f"   Equipos no operativos: {len(equipos_list)} equipos ({gen._formato_moneda(valor_equipos)})")
-    print(f"   Solicitudes de inclusion: {len(inclusiones_items)} items ({gen._formato_moneda(valor_inclusiones)})")
+    print(f"   Entradas al almacen: {len(entradas_items)} items ({formato_moneda_cop(valor_entradas)})")
+    print(f"   Equipos no operativos: {len(equipos_list)} equipos ({formato_moneda_cop(valor_equipos)})")
+    print(f"   Solicitudes de inclusion: {len(inclusiones_items)} items ({formato_moneda_cop(valor_inclusiones)})")
     print("=" * 70)
     print("[OK] PRUEBA COMPLETADA")
     print("=" * 70)
@@ -0,0 +1,123 @@
+"""
+Script de prueba para la escritura en streaming de las tablas de la Sección 5
+(src/utils/docx_streaming.py, iterar_tabla_xml y resumen de partes con pandas)
+"""
+import tempfile
+import tracemalloc
+import zipfile
+from pathlib import Path
+from lxml import etree
+from docx import Document
+from docx.oxml.ns import qn
+from src.generadores.seccion_5_laboratorio import GeneradorSeccion5
+from src.utils.docx_streaming import PARTE_DOCUMENTO
+from src.utils.tabla_utils import iterar_tabla_xml
+
+
+def _datos(n: int) -> dict:
+    return {
+        "estadisticas": {"equipos_recibidos": 2 * n},
+        "equipos_reparados": [
+            {"tipo_equipo": "Cámara PTZ", "serial": f"R-{i:06d}", "diagnostico": "Fuente <averiada> & otros",
+             "reparacion": "Reemplazo", "fecha_ingreso": "01/09/2025", "fecha_salida": "05/09/2025"}
+            for i in range(n)
+        ],
+        "equipos_pendientes_parte": [
+            {"tipo_equipo": "NVR", "serial": f"P-{i:06d}", "parte_requerida": f"Parte {i % 3}",
+             "fecha_solicitud": "02/09/2025", "estado_gestion": "Solicitado" if i % 4 else "En compra"}
+            for i in range(n)
+        ],
+        "equipos_rma_proceso": [{"tipo_equipo": "Cámara IP", "serial": "M-1", "dias_espera": 0}],
+    }
+
+
+def _tablas(ruta: Path) -> list:
+    """Texto de cada celda de cada tabla, leído directamente de document.xml"""
+    with zipfile.ZipFile(ruta) as paquete:
+        cuerpo = etree.fromstring(paquete.read(PARTE_DOCUMENTO))
+    return [
+        [["".join(celda.itertext()) for celda in fila.iter(qn("w:tc"))] for fila in tabla.iter(qn("w:tr"))]
+        for tabla in cuerpo.iter(qn("w:tbl"))
+    ]
+
+
+def _guardar(n: int, streaming: bool, ruta: Path) -> int:
+    """Guarda la sección y retorna el pico de memoria de Python (bytes)"""
+    generador = GeneradorSeccion5(2025, 9, streaming=streaming)
+    generador.datos = _datos(n)
+    tracemalloc.start()
+    try:
+        generador.guardar(ruta)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_bloques_tabla_xml():
+    """iterar_tabla_xml produce el encabezado y un bloque por cada N filas"""
+    print("=" * 70)
+    print("PRUEBA TABLAS EN STREAMING - SECCIÓN 5")
+    print("=" * 70)
+
+    filas = ([f"Fila {i}", i] for i in range(25))
+    bloques = list(iterar_tabla_xml(["Nombre", "Valor"], filas, filas_por_bloque=10))
+    # Encabezado, dos bloques de 10 filas y las 5 restantes con el cierre
+    assert len(bloques) == 4
+    assert bloques[0].startswith("<w:tbl ") and bloques[-1].endswith("</w:tbl>")
+    assert [b.count("<w:tr>") for b in bloques[1:]] == [10, 10, 5]
+    print("   [OK] 25 filas en bloques de 10")
+
+
+def test_streaming_equivalente():
+    """El documento en streaming tiene las mismas tablas y párrafos"""
+    with tempfile.TemporaryDirectory() as tmp:
+        normal, streaming = Path(tmp) / "normal.docx", Path(tmp) / "streaming.docx"
+        _guardar(300, False, normal)
+        _guardar(300, True, streaming)
+
+        tablas = _tablas(normal)
+        assert tablas == _tablas(streaming)
+        assert [p.text for p in Document(normal).paragraphs] == [p.text for p in Document(streaming).paragraphs]
+        assert not any("__TABLA_DIFERIDA_" in p.text for p in Document(streaming).paragraphs)
+
+    reparados, rma = tablas[0], tablas[1]
+    assert len(reparados) == 301 and reparados[1][2] == "Fuente <averiada> & otros"
+    assert rma[1][5] == "0"  # Los ceros no se pierden
+    print(f"   [OK] {len(tablas)} tablas idénticas con y sin streaming")
+
+
+def test_memoria_constante():
+    """El pico de memoria en streaming no crece con el número de filas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pico_chico = _guardar(2000, True, Path(tmp) / "chico.docx")
+        pico_grande = _guardar(8000, True, Path(tmp) / "grande.docx")
+        pico_normal = _guardar(8000, False, Path(tmp) / "normal.docx")
+    assert pico_grande < pico_chico * 1.5, (pico_chico, pico_grande)
+    assert pico_grande < pico_normal / 2, (pico_grande, pico_normal)
+    print(f"   [OK] Pico 2000 filas: {pico_chico / 2**20:.1f} MB, 8000 filas: {pico_grande / 2**20:.1f} MB "
+          f"(sin streaming: {pico_normal / 2**20:.1f} MB)")
+
+
+def test_resumen_partes_requeridas():
+    """El resumen de partes se agrupa desde los equipos si la fuente no lo trae"""
+    generador = GeneradorSeccion5(2025, 9)
+    resumen = generador._calcular_resumen_partes_requeridas(_datos(12)["equipos_pendientes_parte"] + [
+        {"serial": "X", "parte_requerida": None, "estado_gestion": "Solicitado"}
+    ])
+    assert resumen == [
+        {"parte": "Parte 0", "cantidad": 3, "estado": "Solicitado"},
+        {"parte": "Parte 1", "cantidad": 3, "estado": "Solicitado"},
+        {"parte": "Parte 2", "cantidad": 3, "estado": "Solicitado"},
+        {"parte": "Parte 0", "cantidad": 1, "estado": "En compra"},
+        {"parte": "Parte 1", "cantidad": 1, "estado": "En compra"},
+        {"parte": "Parte 2", "cantidad": 1, "estado": "En compra"},
+    ], resumen
+    assert generador._calcular_resumen_partes_requeridas([]) == []
+    print(f"   [OK] {len(resumen)} grupos parte/estado")
+
+
+if __name__ == "__main__":
+    test_bloques_tabla_xml()
+    test_streaming_equivalente()
+    test_memoria_constante()
+    test_resumen_partes_requeridas()
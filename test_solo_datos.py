@@ -0,0 +1,117 @@
+"""
+Script de prueba para el modo solo datos: snapshots JSON del contexto de cada
+sección (main.py --solo-datos), render desde snapshots (--desde-datos) y
+GET /api/informes/{anio}/{mes}/datos
+"""
+import json
+import tempfile
+from pathlib import Path
+from docx import Document
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import config
+import main
+from src.generadores.seccion_4_bienes import GeneradorSeccion4
+from src.generadores.seccion_8_presupuesto import GeneradorSeccion8
+from src.generadores.seccion_9_riesgos import GeneradorSeccion9
+from src.routes import informes_routes
+from src.utils.snapshot_datos import guardar_snapshot, leer_snapshot
+
+
+def _sin_fuentes(self):
+    raise AssertionError("Con desde_datos no se deben consultar las fuentes")
+
+
+def test_snapshots_y_render_desde_datos():
+    """Los snapshots se generan en paralelo y se renderizan sin consultar las fuentes"""
+    print("=" * 70)
+    print("PRUEBA MODO SOLO DATOS")
+    print("=" * 70)
+
+    output_original = config.OUTPUT_DIR
+    disponibles_original = main.secciones_disponibles
+    with tempfile.TemporaryDirectory() as tmp:
+        config.OUTPUT_DIR = Path(tmp)
+        main.secciones_disponibles = lambda: [4, 8]
+        try:
+            snapshots = main.generar_datos(2025, 9)
+            assert sorted(snapshots) == [4, 8]
+            ruta8 = config.get_ruta_snapshot_datos(2025, 9, 8)
+            snapshot8 = leer_snapshot(ruta8)
+            assert json.loads(snapshots[8]) == snapshot8
+            assert "\n" not in snapshots[8]  # JSON compacto
+            contexto8 = snapshot8["contexto"]
+            assert contexto8["periodo"] and contexto8["hay_ejecucion_mensual"]
+            assert leer_snapshot(config.get_ruta_snapshot_datos(2025, 9, 4))["contexto"]["datos"]
+            print(f"   [OK] Snapshots: { {n: len(t) for n, t in snapshots.items()} } bytes")
+
+            # Editar el snapshot y renderizar sin volver a cargar los datos
+            contexto8["texto_intro"] = "TEXTO DESDE SNAPSHOT"
+            guardar_snapshot(ruta8, json.dumps(snapshot8))
+            cargar_original = GeneradorSeccion8.cargar_datos
+            GeneradorSeccion8.cargar_datos = _sin_fuentes
+            try:
+                informe = main.generar_informe(2025, 9, 1, desde_datos=True)
+            finally:
+                GeneradorSeccion8.cargar_datos = cargar_original
+            textos = [p.text for p in Document(informe).paragraphs]
+        finally:
+            config.OUTPUT_DIR = output_original
+            main.secciones_disponibles = disponibles_original
+
+    assert "TEXTO DESDE SNAPSHOT" in textos
+    assert any("BIENES Y SERVICIOS" in texto for texto in textos)
+    print("   [OK] Informe renderizado desde los snapshots")
+
+
+def test_restaurar_contexto_python_docx():
+    """Las secciones python-docx restauran sus ATRIBUTOS_DATOS"""
+    generador = GeneradorSeccion4(2025, 9)
+    contexto = json.loads(json.dumps(generador.datos_contexto()))
+    restaurado = GeneradorSeccion4(2025, 9)
+    restaurado.restaurar_contexto(contexto)
+    assert restaurado.datos == generador.datos
+    assert len(restaurado.documento().tables) == len(generador.documento().tables)
+    print("   [OK] Sección 4 restaurada desde su contexto")
+
+
+def test_snapshot_heatmap_seccion9():
+    """El snapshot de la Sección 9 incluye el heatmap y lo reconstruye desde sus riesgos"""
+    contexto = json.loads(json.dumps(GeneradorSeccion9(2025, 9).datos_contexto()))
+    assert contexto["riesgos"] and Path(contexto["grafico_matriz_img"]).is_file()
+
+    restaurado = GeneradorSeccion9(2025, 9)
+    restaurado.restaurar_contexto(dict(contexto, grafico_matriz_img=""))
+    cargar_original = GeneradorSeccion9.cargar_datos
+    GeneradorSeccion9.cargar_datos = _sin_fuentes
+    try:
+        restaurado.generar()
+    finally:
+        GeneradorSeccion9.cargar_datos = cargar_original
+    assert restaurado.contexto["grafico_matriz_img"] == contexto["grafico_matriz_img"]
+    print("   [OK] Heatmap de la Sección 9 desde el snapshot")
+
+
+def test_endpoint_datos():
+    """GET /api/informes/{anio}/{mes}/datos"""
+    app = FastAPI()
+    app.include_router(informes_routes.router, prefix="/api")
+    client = TestClient(app)
+
+    respuesta = client.get("/api/informes/2025/9/datos", params={"secciones": "12,8"})
+    assert respuesta.status_code == 200, respuesta.text
+    cuerpo = respuesta.json()
+    assert (cuerpo["anio"], cuerpo["mes"]) == (2025, 9)
+    assert sorted(cuerpo["secciones"]) == ["12", "8"]
+    assert cuerpo["secciones"]["8"]["contexto"]["total_presupuesto_formato"].startswith("$")
+
+    assert client.get("/api/informes/2025/9/datos", params={"secciones": "99"}).status_code == 400
+    assert client.get("/api/informes/2025/13/datos").status_code == 400
+    print("   [OK] Endpoint de datos")
+
+
+if __name__ == "__main__":
+    test_snapshots_y_render_desde_datos()
+    test_restaurar_contexto_python_docx()
+    test_snapshot_heatmap_seccion9()
+    test_endpoint_datos()
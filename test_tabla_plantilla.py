@@ -0,0 +1,88 @@
+"""
+Script de prueba para validar el índice de anclas y el llenado de tablas por
+clonación de fila prototipo (usado en las obligaciones de la Sección 1)
+"""
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+import config
+from src.generadores.seccion_1_info_general import GeneradorSeccion1
+from src.utils.tabla_plantilla import IndiceAnclas, llenar_tabla_desde_prototipo, normalizar_texto
+
+TEMPLATE = config.TEMPLATES_DIR / "seccion_1_info_general.docx"
+
+
+def test_indice_anclas():
+    """Ubica las tablas de obligaciones por título en una sola pasada"""
+    print("=" * 70)
+    print("PRUEBA INDICE DE ANCLAS - SECCION 1")
+    print("=" * 70)
+
+    doc = Document(str(TEMPLATE))
+    indice = IndiceAnclas(doc)
+    assert len(indice.tablas) == len(doc.tables)
+
+    generales = indice.tabla_despues_de("OBLIGACIONES", "GENERALES", encabezados=("ITEM", "OBLIGACION"))
+    assert generales is not None
+    assert generales._tbl is doc.tables[4]._tbl
+    print("   [OK] Tabla de obligaciones generales encontrada")
+
+    especificas = indice.tabla_despues_de(
+        "OBLIGACIONES", "ESPECÍFICAS", "CONTRATISTA",
+        encabezados=("ITEM", "OBLIGACION"), excluir=[generales]
+    )
+    assert especificas is not None
+    assert especificas._tbl is doc.tables[5]._tbl
+    print("   [OK] Tabla de obligaciones específicas encontrada")
+
+    assert indice.tabla_despues_de("TITULO QUE NO EXISTE") is None
+    assert normalizar_texto("  Obligaciones\nEspecíficas ") == "OBLIGACIONES ESPECIFICAS"
+
+
+def test_llenar_tabla_desde_prototipo():
+    """Las filas se clonan de la plantilla conservando el encabezado y el estilo"""
+    doc = Document(str(TEMPLATE))
+    indice = IndiceAnclas(doc)
+    tabla = indice.tabla_por_encabezados("ITEM", "OBLIGACION", "PERIODICIDAD")
+    encabezado = [c.text for c in tabla.rows[0].cells]
+    sombreado = tabla.rows[1].cells[0]._tc.tcPr.xpath("./w:shd/@w:fill")
+
+    filas = [[i, f"Obligación {i}", "Permanente", "Cumplió", None, "ruta"] for i in range(1, 301)]
+    columnas = [{"alineacion": WD_ALIGN_PARAGRAPH.CENTER, "tamano": 10}]
+    agregadas = llenar_tabla_desde_prototipo(tabla, filas, columnas=columnas)
+
+    assert agregadas == 300
+    assert len(tabla.rows) == 301
+    assert [c.text for c in tabla.rows[0].cells] == encabezado
+    assert [c.text for c in tabla.rows[300].cells] == ["300", "Obligación 300", "Permanente", "Cumplió", "", "ruta"]
+    print("   [OK] 300 filas clonadas")
+
+    celda = tabla.rows[1].cells[0]
+    assert celda._tc.tcPr.xpath("./w:shd/@w:fill") == sombreado
+    assert len(celda.paragraphs) == 1
+    assert celda.paragraphs[0].alignment == WD_ALIGN_PARAGRAPH.CENTER
+    assert celda.paragraphs[0].runs[0].font.size.pt == 10
+    assert tabla.rows[1]._tr.xpath("./w:trPr/w:trHeight") == []
+    print("   [OK] Estilo de la fila prototipo conservado")
+
+
+def test_tabla_obligaciones_sin_columnas():
+    """Si el template trae menos columnas, se agregan antes de clonar (sin perder campos)"""
+    doc = Document()
+    tabla = doc.add_table(rows=2, cols=4)
+    for celda, titulo in zip(tabla.rows[0].cells, ["ÍTEM", "OBLIGACIÓN", "PERIODICIDAD", "CUMPLIÓ"]):
+        celda.text = titulo
+    tabla.rows[1].cells[0].text = "1"
+
+    obligacion = {"item": 1, "obligacion": "Obligación 1", "periodicidad": "Mensual",
+                  "cumplio": "Cumplió", "observaciones": "Sin novedad", "anexo": "anexo.pdf"}
+    GeneradorSeccion1(2025, 9)._llenar_tabla_obligaciones(tabla, [obligacion], [])
+
+    assert [c.text for c in tabla.rows[0].cells][-2:] == ["OBSERVACIONES", "ANEXO"]
+    assert [c.text for c in tabla.rows[1].cells] == ["1", "Obligación 1", "Mensual", "Cumplió", "Sin novedad", "anexo.pdf"]
+    print("   [OK] Columnas faltantes agregadas")
+
+
+if __name__ == "__main__":
+    test_indice_anclas()
+    test_llenar_tabla_desde_prototipo()
+    test_tabla_obligaciones_sin_columnas()
@@ -0,0 +1,77 @@
+"""
+Script de prueba para validar el generador de tablas XML (agregar_tabla_xml)
+"""
+import time
+from docx import Document
+from docx.shared import Cm
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from src.utils.tabla_utils import agregar_tabla_xml
+
+
+def test_formato_tabla():
+    """Encabezado, anchos, alineación, semáforo y fila de total"""
+    print("=" * 70)
+    print("PRUEBA TABLA XML - FORMATO")
+    print("=" * 70)
+
+    doc = Document()
+    tabla = agregar_tabla_xml(
+        doc,
+        ["Localidad", "Valor"],
+        [["Usaquén <norte>", 10], ["Suba\nOccidente", None]],
+        columnas=[{"ancho": Cm(4)}, {"ancho": Cm(2), "alineacion": WD_ALIGN_PARAGRAPH.CENTER}],
+        tamano_fuente=9,
+        estilos_celda={(0, 1): {"color_fondo": "C6EFCE", "color_texto": "00B050"}},
+        fila_total=["TOTAL", "10"]
+    )
+
+    assert len(tabla.rows) == 4
+    assert tabla.style.name == "Table Grid"
+    assert tabla.cell(1, 0).text == "Usaquén <norte>"
+    assert tabla.cell(2, 0).text == "Suba\nOccidente"
+    assert tabla.cell(2, 1).text == ""
+    print("   [OK] Textos escapados y saltos de línea")
+
+    encabezado = tabla.cell(0, 0)
+    run = encabezado.paragraphs[0].runs[0]
+    assert run.bold and run.font.size.pt == 9
+    assert str(run.font.color.rgb) == "FFFFFF"
+    assert encabezado._tc.tcPr.find(qn("w:shd")).get(qn("w:fill")) == "1F4E79"
+    print("   [OK] Encabezado sombreado en negrita")
+
+    assert tabla.cell(1, 0).width == Cm(4) // 635 * 635
+    assert tabla.cell(1, 1).paragraphs[0].alignment == WD_ALIGN_PARAGRAPH.CENTER
+    assert tabla.cell(1, 0).paragraphs[0].alignment == WD_ALIGN_PARAGRAPH.LEFT
+    print("   [OK] Anchos y alineación por columna")
+
+    semaforo = tabla.cell(1, 1)
+    assert semaforo._tc.tcPr.find(qn("w:shd")).get(qn("w:fill")) == "C6EFCE"
+    assert str(semaforo.paragraphs[0].runs[0].font.color.rgb) == "00B050"
+    assert tabla.cell(2, 1)._tc.tcPr.find(qn("w:shd")) is None
+    print("   [OK] Estilos puntuales por celda")
+
+    total = tabla.cell(3, 0)
+    assert total.paragraphs[0].runs[0].bold
+    assert total._tc.tcPr.find(qn("w:shd")).get(qn("w:fill")) == "D9E1F2"
+    print("   [OK] Fila de total")
+
+
+def test_tabla_grande():
+    """Una tabla de 2000 filas se genera en una sola pasada"""
+    doc = Document()
+    filas = [[f"Equipo {i}", f"SN{i:06d}", "Diagnóstico", "2025-09-01"] for i in range(2000)]
+
+    inicio = time.perf_counter()
+    tabla = agregar_tabla_xml(doc, ["Tipo", "Serial", "Diagnóstico", "Fecha"], filas, tamano_fuente=9)
+    duracion = time.perf_counter() - inicio
+
+    assert len(tabla.rows) == 2001
+    assert tabla.cell(2000, 1).text == "SN001999"
+    assert duracion < 5
+    print(f"   [OK] 2000 filas en {duracion:.3f} s")
+
+
+if __name__ == "__main__":
+    test_formato_tabla()
+    test_tabla_grande()